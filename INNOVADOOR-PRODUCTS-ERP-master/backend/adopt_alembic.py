@@ -0,0 +1,146 @@
+"""
+Bring a database created before the Alembic version chain (init_db plus the
+one-off migrate_*.py / fix_*.py scripts) to the current schema and stamp it at
+the Alembic head, so that startup only has to read alembic_version.
+
+- creates tables that are missing,
+- adds missing columns (as nullable - existing rows have no value for them),
+- creates missing indexes and unique constraints (as unique indexes),
+- backfills the running-balance tables that were just created (credit
+  exposure, material stock, site progress, ledger entries and snapshots), the
+  search index and the production paper measurement item rows,
+- stamps the database at head.
+
+Run once per database; afterwards use "alembic upgrade head".
+
+Usage:
+    python adopt_alembic.py [--dry-run]
+"""
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import Index, UniqueConstraint, inspect, text
+
+from app.db.base import Base
+from app.db.database import engine, SessionLocal
+from app.db.migrations import current_revision, head_revision, stamp_head
+import app.db.models  # noqa: F401 - register all tables
+
+
+def column_ddl(table, column) -> str:
+    preparer = engine.dialect.identifier_preparer
+    ddl = f"ALTER TABLE {preparer.quote(table.name)} ADD COLUMN {preparer.quote(column.name)} {column.type.compile(dialect=engine.dialect)}"
+    default = column.server_default
+    if default is not None and hasattr(default, "arg") and hasattr(default.arg, "text"):
+        ddl += f" DEFAULT {default.arg.text}"
+    return ddl
+
+
+def plan_changes():
+    """(tables to create, [(table, column)] to add, [(table, name, columns, unique)] to index)"""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    create_tables = [table for table in Base.metadata.sorted_tables if table.name not in existing_tables]
+
+    add_columns = []
+    add_indexes = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        add_columns.extend((table, column) for column in table.columns if column.name not in columns)
+
+        names = {index["name"] for index in inspector.get_indexes(table.name)}
+        names |= {constraint["name"] for constraint in inspector.get_unique_constraints(table.name)}
+        for index in table.indexes:
+            if index.name not in names:
+                add_indexes.append((table, index.name, [column.name for column in index.columns], bool(index.unique)))
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint) and constraint.name and constraint.name not in names:
+                add_indexes.append((table, constraint.name, [column.name for column in constraint.columns], True))
+    return create_tables, add_columns, add_indexes
+
+
+def backfill(created: set) -> None:
+    """Rebuild running-balance tables that did not exist before"""
+    db = SessionLocal()
+    try:
+        if "party_credit_exposures" in created:
+            from app.utils.credit_exposure import rebuild_credit_exposure
+            print(f"[OK] Built credit exposure for {rebuild_credit_exposure(db)} parties")
+        if "material_stock" in created:
+            from app.utils.material_stock import rebuild_material_stock
+            print(f"[OK] Built material stock for {rebuild_material_stock(db)} materials")
+        if "site_wing_progress" in created:
+            from app.utils.site_progress import rebuild_site_progress
+            print(f"[OK] Built site progress for {rebuild_site_progress(db)} wings")
+        if "search_documents" in created:
+            from app.utils.search_index import rebuild_search_index
+            print(f"[OK] Indexed {sum(rebuild_search_index(db).values())} records for search")
+        if "production_paper_measurement_items" in created:
+            from app.utils.paper_measurement_items import rebuild_paper_measurement_items
+            print(f"[OK] Linked {rebuild_paper_measurement_items(db)} selected measurement items to production papers")
+        if "ledger_balance_snapshots" in created:
+            from app.db.models.user import User
+            from app.utils.ledger_posting import repost_all_documents, rebuild_snapshots
+            admin = db.query(User).filter(User.role == "admin").order_by(User.id).first()
+            if admin is None:
+                print("No admin user found - run 'python migrate_add_ledger_posting.py' after creating one")
+            else:
+                count = repost_all_documents(db, admin.id)
+                print(f"[OK] Posted {count} ledger entries, closed {rebuild_snapshots(db)} months")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dry-run", action="store_true", help="List the changes without applying them")
+    args = parser.parse_args()
+
+    current = current_revision(engine)
+    if current is not None:
+        print(f"[OK] Database is already managed by Alembic (at {current}) - use 'alembic upgrade head'")
+        return 0
+
+    create_tables, add_columns, add_indexes = plan_changes()
+    for table in create_tables:
+        print(f"create table {table.name}")
+    for table, column in add_columns:
+        print(f"add column {table.name}.{column.name}" + ("" if column.nullable else " (NOT NULL in the model, added as nullable)"))
+    for table, name, columns, unique in add_indexes:
+        print(f"create {'unique ' if unique else ''}index {name} on {table.name} ({', '.join(columns)})")
+    if args.dry_run:
+        print(f"[DRY RUN] Would stamp the database at {head_revision()}")
+        return 0
+
+    Base.metadata.create_all(bind=engine, tables=create_tables)
+    failed = 0
+    with engine.connect() as conn:
+        for table, column in add_columns:
+            conn.execute(text(column_ddl(table, column)))
+        conn.commit()
+    for table, name, columns, unique in add_indexes:
+        try:
+            Index(name, *[table.c[column] for column in columns], unique=unique).create(bind=engine)
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] Could not create index {name}: {e}")
+    backfill({table.name for table in create_tables})
+
+    if failed:
+        print(f"[FAIL] {failed} indexes could not be created (duplicate rows?) - fix them and re-run")
+        return 1
+    stamp_head()
+    print(f"[OK] Database stamped at {head_revision()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
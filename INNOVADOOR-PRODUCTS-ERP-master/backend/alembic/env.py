@@ -4,38 +4,63 @@ from alembic import context
 from app.core.config import settings
 from app.db.base import Base
 # Import all models to ensure they are registered with SQLAlchemy
-from app.db.models.user import (
-    User, Measurement, Party, ProductionPaper, ProductionSchedule,
-    Product, Department, ProductionSupervisor, ProductionTask,
-    ProductionIssue, TaskProgress, ProductionTracking, ManufacturingStage, Design
-)
-from app.db.models.raw_material import Supplier, RawMaterialCheck, Order, ProductSupplierMapping
-from app.db.models.quality_check import QualityCheck, ReworkJob, QCCertificate
-from app.db.models.billing import BillingRequest, DeliveryChallan, TaxInvoice, TallySync
-from app.db.models.dispatch import Dispatch, DispatchItem, GatePass, DeliveryTracking
-from app.db.models.logistics import Vehicle, Driver, LogisticsAssignment, DeliveryIssue
-from app.db.models.accounts import (
-    PaymentReceipt, PaymentAllocation, AccountReceivable, AccountReconciliation,
-    VendorPayable, VendorPayment, Ledger, LedgerEntry,
-    Contractor, ContractorWorkOrder, ContractorOutput, ContractorPayment,
-    OrderCosting, CreditControl
-)
-from app.db.models.sales import Lead, SiteProject, Quotation, SalesOrder, MeasurementRequest, FollowUp
+import app.db.models  # noqa: F401
+from app.db.models.search import FTS_TABLE, POSTGRES_INDEXES
 
 config = context.config
-fileConfig(config.config_file_name)
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
 target_metadata = Base.metadata
 
+
+def get_url() -> str:
+    """-x url=... on the command line, else an explicit sqlalchemy.url, else DATABASE_URL"""
+    return context.get_x_argument(as_dictionary=True).get("url") or config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave out dialect specific search indexes that are not model objects"""
+    if type_ == "table" and name.startswith(FTS_TABLE):
+        return False
+    if type_ == "index" and name in POSTGRES_INDEXES:
+        return False
+    return True
+
+
+def run_migrations_offline():
+    url = get_url()
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=url.startswith("sqlite"),
+        compare_type=True,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
 def run_migrations_online():
     connectable = engine_from_config(
-        {"sqlalchemy.url": settings.DATABASE_URL},
+        {"sqlalchemy.url": get_url()},
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite",
+            compare_type=True,
+            include_object=include_object,
+        )
         with context.begin_transaction():
             context.run_migrations()
 
-run_migrations_online()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,2729 @@
+"""baseline schema
+
+Full schema as of the move to Alembic (previously init_db's create_all plus
+the one-off migrate_*.py scripts). Databases created before this revision are
+brought to it and stamped by adopt_alembic.py instead of running it.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 12:06:27.408547
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('departments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('code', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_departments_code'), 'departments', ['code'], unique=True)
+    op.create_index(op.f('ix_departments_id'), 'departments', ['id'], unique=False)
+    op.create_index(op.f('ix_departments_name'), 'departments', ['name'], unique=True)
+    op.create_table('drivers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('mobile', sa.String(), nullable=False),
+    sa.Column('license_number', sa.String(), nullable=False),
+    sa.Column('license_expiry', sa.Date(), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_drivers_id'), 'drivers', ['id'], unique=False)
+    op.create_index(op.f('ix_drivers_license_number'), 'drivers', ['license_number'], unique=True)
+    op.create_index(op.f('ix_drivers_mobile'), 'drivers', ['mobile'], unique=True)
+    op.create_index(op.f('ix_drivers_name'), 'drivers', ['name'], unique=False)
+    op.create_table('material_stock',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('material_category', sa.String(), nullable=False),
+    sa.Column('material_name', sa.String(), nullable=False),
+    sa.Column('category_key', sa.String(), nullable=False),
+    sa.Column('name_key', sa.String(), nullable=False),
+    sa.Column('unit', sa.String(), nullable=True),
+    sa.Column('received_quantity', sa.Float(), nullable=False),
+    sa.Column('returned_quantity', sa.Float(), nullable=False),
+    sa.Column('consumed_quantity', sa.Float(), nullable=False),
+    sa.Column('balance_quantity', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('category_key', 'name_key', name='uq_material_stock_material')
+    )
+    op.create_index(op.f('ix_material_stock_category_key'), 'material_stock', ['category_key'], unique=False)
+    op.create_index(op.f('ix_material_stock_id'), 'material_stock', ['id'], unique=False)
+    op.create_table('production_docs_settings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('auto_generate_rm_frame', sa.Boolean(), nullable=False),
+    sa.Column('auto_generate_rm_shutter', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_production_docs_settings_id'), 'production_docs_settings', ['id'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('role', sa.String(), nullable=False),
+    sa.Column('profile_image', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('serial_number_prefix', sa.String(), nullable=True),
+    sa.Column('serial_number_counter', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_serial_number_prefix'), 'users', ['serial_number_prefix'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('vehicles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('vehicle_no', sa.String(), nullable=False),
+    sa.Column('vehicle_type', sa.String(), nullable=False),
+    sa.Column('capacity_tonnes', sa.Float(), nullable=True),
+    sa.Column('capacity_cubic_meters', sa.Float(), nullable=True),
+    sa.Column('is_available', sa.Boolean(), nullable=False),
+    sa.Column('current_location', sa.String(), nullable=True),
+    sa.Column('gps_enabled', sa.Boolean(), nullable=False),
+    sa.Column('insurance_expiry', sa.Date(), nullable=True),
+    sa.Column('registration_expiry', sa.Date(), nullable=True),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_vehicles_id'), 'vehicles', ['id'], unique=False)
+    op.create_index(op.f('ix_vehicles_vehicle_no'), 'vehicles', ['vehicle_no'], unique=True)
+    op.create_table('bank_statements',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('bank_account', sa.String(), nullable=True),
+    sa.Column('file_name', sa.String(), nullable=True),
+    sa.Column('file_format', sa.String(), nullable=False),
+    sa.Column('period_start', sa.Date(), nullable=True),
+    sa.Column('period_end', sa.Date(), nullable=True),
+    sa.Column('line_count', sa.Integer(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_bank_statements_id'), 'bank_statements', ['id'], unique=False)
+    op.create_table('contractors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('contractor_code', sa.String(), nullable=False),
+    sa.Column('contractor_name', sa.String(), nullable=False),
+    sa.Column('contractor_type', sa.String(), nullable=False),
+    sa.Column('contact_person', sa.String(), nullable=True),
+    sa.Column('phone', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('payment_method', sa.String(), nullable=False),
+    sa.Column('door_rate', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('frame_rate', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_contractors_contractor_code'), 'contractors', ['contractor_code'], unique=True)
+    op.create_index(op.f('ix_contractors_id'), 'contractors', ['id'], unique=False)
+    op.create_table('designs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('design_name', sa.String(), nullable=False),
+    sa.Column('design_code', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('image', sa.Text(), nullable=True),
+    sa.Column('product_category', sa.String(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_designs_design_code'), 'designs', ['design_code'], unique=True)
+    op.create_index(op.f('ix_designs_design_name'), 'designs', ['design_name'], unique=True)
+    op.create_index(op.f('ix_designs_id'), 'designs', ['id'], unique=False)
+    op.create_table('manufacturing_stages',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('stage_name', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_manufacturing_stages_id'), 'manufacturing_stages', ['id'], unique=False)
+    op.create_index(op.f('ix_manufacturing_stages_stage_name'), 'manufacturing_stages', ['stage_name'], unique=True)
+    op.create_table('parties',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('party_type', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('display_name', sa.String(), nullable=True),
+    sa.Column('customer_code', sa.String(), nullable=True),
+    sa.Column('business_type', sa.String(), nullable=True),
+    sa.Column('contact_persons', sa.Text(), nullable=True),
+    sa.Column('office_address_line1', sa.String(), nullable=True),
+    sa.Column('office_address_line2', sa.String(), nullable=True),
+    sa.Column('office_area', sa.String(), nullable=True),
+    sa.Column('office_city', sa.String(), nullable=True),
+    sa.Column('office_state', sa.String(), nullable=True),
+    sa.Column('office_pin_code', sa.String(), nullable=True),
+    sa.Column('office_country', sa.String(), nullable=True),
+    sa.Column('site_addresses', sa.Text(), nullable=True),
+    sa.Column('gst_registration_type', sa.String(), nullable=True),
+    sa.Column('gstin_number', sa.String(), nullable=True),
+    sa.Column('pan_number', sa.String(), nullable=True),
+    sa.Column('state_code', sa.String(), nullable=True),
+    sa.Column('msme_udyam_number', sa.String(), nullable=True),
+    sa.Column('customer_category', sa.String(), nullable=True),
+    sa.Column('industry_type', sa.String(), nullable=True),
+    sa.Column('estimated_monthly_volume', sa.String(), nullable=True),
+    sa.Column('estimated_yearly_volume', sa.String(), nullable=True),
+    sa.Column('price_category', sa.String(), nullable=True),
+    sa.Column('assigned_sales_executive', sa.String(), nullable=True),
+    sa.Column('marketing_source', sa.String(), nullable=True),
+    sa.Column('payment_terms', sa.String(), nullable=True),
+    sa.Column('credit_limit', sa.String(), nullable=True),
+    sa.Column('credit_days', sa.Integer(), nullable=True),
+    sa.Column('security_cheque_pdc', sa.Boolean(), nullable=True),
+    sa.Column('preferred_delivery_location', sa.String(), nullable=True),
+    sa.Column('unloading_responsibility', sa.String(), nullable=True),
+    sa.Column('working_hours_at_site', sa.String(), nullable=True),
+    sa.Column('special_instructions', sa.Text(), nullable=True),
+    sa.Column('product_preferences', sa.Text(), nullable=True),
+    sa.Column('documents', sa.Text(), nullable=True),
+    sa.Column('frame_requirements', sa.Text(), nullable=True),
+    sa.Column('door_requirements', sa.Text(), nullable=True),
+    sa.Column('customer_status', sa.String(), nullable=True),
+    sa.Column('approval_status', sa.String(), nullable=True),
+    sa.Column('contact_person', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('phone', sa.String(), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_parties_customer_code'), 'parties', ['customer_code'], unique=True)
+    op.create_index(op.f('ix_parties_gstin_number'), 'parties', ['gstin_number'], unique=False)
+    op.create_index(op.f('ix_parties_id'), 'parties', ['id'], unique=False)
+    op.create_index(op.f('ix_parties_name'), 'parties', ['name'], unique=True)
+    op.create_index(op.f('ix_parties_pan_number'), 'parties', ['pan_number'], unique=False)
+    op.create_table('production_supervisors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('department_id', sa.Integer(), nullable=False),
+    sa.Column('supervisor_type', sa.String(), nullable=False),
+    sa.Column('shift', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('backup_supervisor_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['backup_supervisor_id'], ['production_supervisors.id'], ),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_production_supervisors_department_id'), 'production_supervisors', ['department_id'], unique=False)
+    op.create_index(op.f('ix_production_supervisors_id'), 'production_supervisors', ['id'], unique=False)
+    op.create_index(op.f('ix_production_supervisors_supervisor_type'), 'production_supervisors', ['supervisor_type'], unique=False)
+    op.create_index(op.f('ix_production_supervisors_user_id'), 'production_supervisors', ['user_id'], unique=True)
+    op.create_table('products',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_code', sa.String(), nullable=False),
+    sa.Column('product_category', sa.String(), nullable=False),
+    sa.Column('product_type', sa.String(), nullable=False),
+    sa.Column('sub_type', sa.String(), nullable=True),
+    sa.Column('variant', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('specifications', sa.Text(), nullable=True),
+    sa.Column('manufacturing_process', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_products_id'), 'products', ['id'], unique=False)
+    op.create_index(op.f('ix_products_product_code'), 'products', ['product_code'], unique=True)
+    op.create_table('raw_material_categories',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('code', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_raw_material_categories_code'), 'raw_material_categories', ['code'], unique=True)
+    op.create_index(op.f('ix_raw_material_categories_id'), 'raw_material_categories', ['id'], unique=False)
+    op.create_index(op.f('ix_raw_material_categories_name'), 'raw_material_categories', ['name'], unique=True)
+    op.create_table('vendors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('vendor_code', sa.String(), nullable=False),
+    sa.Column('vendor_name', sa.String(), nullable=False),
+    sa.Column('display_name', sa.String(), nullable=True),
+    sa.Column('vendor_type', sa.String(), nullable=False),
+    sa.Column('contact_person', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('phone', sa.String(), nullable=True),
+    sa.Column('alternate_phone', sa.String(), nullable=True),
+    sa.Column('address_line1', sa.String(), nullable=True),
+    sa.Column('address_line2', sa.String(), nullable=True),
+    sa.Column('area', sa.String(), nullable=True),
+    sa.Column('city', sa.String(), nullable=True),
+    sa.Column('state', sa.String(), nullable=True),
+    sa.Column('pin_code', sa.String(), nullable=True),
+    sa.Column('country', sa.String(), nullable=True),
+    sa.Column('gstin', sa.String(), nullable=True),
+    sa.Column('pan_number', sa.String(), nullable=True),
+    sa.Column('state_code', sa.String(), nullable=True),
+    sa.Column('material_categories', sa.Text(), nullable=True),
+    sa.Column('rate_contracts', sa.Text(), nullable=True),
+    sa.Column('payment_terms', sa.String(), nullable=True),
+    sa.Column('credit_days', sa.Integer(), nullable=True),
+    sa.Column('credit_limit', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_vendors_gstin'), 'vendors', ['gstin'], unique=False)
+    op.create_index(op.f('ix_vendors_id'), 'vendors', ['id'], unique=False)
+    op.create_index(op.f('ix_vendors_vendor_code'), 'vendors', ['vendor_code'], unique=True)
+    op.create_index(op.f('ix_vendors_vendor_name'), 'vendors', ['vendor_name'], unique=False)
+    op.create_table('account_reconciliations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('reconciliation_number', sa.String(), nullable=False),
+    sa.Column('reconciliation_date', sa.Date(), nullable=False),
+    sa.Column('period_start', sa.Date(), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False),
+    sa.Column('party_id', sa.Integer(), nullable=True),
+    sa.Column('opening_balance', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('invoices_issued', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('payments_received', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('closing_balance', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('discrepancies', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_account_reconciliations_id'), 'account_reconciliations', ['id'], unique=False)
+    op.create_index(op.f('ix_account_reconciliations_party_id'), 'account_reconciliations', ['party_id'], unique=False)
+    op.create_index(op.f('ix_account_reconciliations_reconciliation_number'), 'account_reconciliations', ['reconciliation_number'], unique=True)
+    op.create_table('contractor_payments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('payment_number', sa.String(), nullable=False),
+    sa.Column('contractor_id', sa.Integer(), nullable=False),
+    sa.Column('period_start', sa.Date(), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False),
+    sa.Column('payment_date', sa.Date(), nullable=False),
+    sa.Column('payment_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('payment_method', sa.String(), nullable=False),
+    sa.Column('doors_completed', sa.Integer(), nullable=False),
+    sa.Column('frames_completed', sa.Integer(), nullable=False),
+    sa.Column('total_payable_qty', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['contractor_id'], ['contractors.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_contractor_payments_contractor_id'), 'contractor_payments', ['contractor_id'], unique=False)
+    op.create_index(op.f('ix_contractor_payments_id'), 'contractor_payments', ['id'], unique=False)
+    op.create_index(op.f('ix_contractor_payments_payment_number'), 'contractor_payments', ['payment_number'], unique=True)
+    op.create_table('credit_controls',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('party_id', sa.Integer(), nullable=False),
+    sa.Column('credit_limit', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('credit_days', sa.Integer(), nullable=True),
+    sa.Column('current_outstanding', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('available_credit', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('is_blocked', sa.Boolean(), nullable=False),
+    sa.Column('block_reason', sa.Text(), nullable=True),
+    sa.Column('blocked_by', sa.Integer(), nullable=True),
+    sa.Column('blocked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('override_allowed', sa.Boolean(), nullable=False),
+    sa.Column('last_override_by', sa.Integer(), nullable=True),
+    sa.Column('last_override_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['blocked_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['last_override_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_credit_controls_id'), 'credit_controls', ['id'], unique=False)
+    op.create_index(op.f('ix_credit_controls_party_id'), 'credit_controls', ['party_id'], unique=True)
+    op.create_table('leads',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('lead_number', sa.String(), nullable=False),
+    sa.Column('lead_type', sa.String(), nullable=False),
+    sa.Column('customer_name', sa.String(), nullable=False),
+    sa.Column('contact_person', sa.String(), nullable=True),
+    sa.Column('mobile', sa.String(), nullable=True),
+    sa.Column('whatsapp', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('city', sa.String(), nullable=True),
+    sa.Column('area', sa.String(), nullable=True),
+    sa.Column('requirement_summary', sa.Text(), nullable=True),
+    sa.Column('lead_source', sa.String(), nullable=True),
+    sa.Column('lead_status', sa.String(), nullable=False),
+    sa.Column('converted_to_party_id', sa.Integer(), nullable=True),
+    sa.Column('converted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('assigned_to', sa.Integer(), nullable=True),
+    sa.Column('assigned_sales_executive', sa.String(), nullable=True),
+    sa.Column('first_contact_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_follow_up_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('next_follow_up_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['assigned_to'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['converted_to_party_id'], ['parties.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_leads_converted_to_party_id'), 'leads', ['converted_to_party_id'], unique=False)
+    op.create_index(op.f('ix_leads_customer_name'), 'leads', ['customer_name'], unique=False)
+    op.create_index(op.f('ix_leads_id'), 'leads', ['id'], unique=False)
+    op.create_index(op.f('ix_leads_lead_number'), 'leads', ['lead_number'], unique=True)
+    op.create_index(op.f('ix_leads_mobile'), 'leads', ['mobile'], unique=False)
+    op.create_table('measurement_tasks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_number', sa.String(), nullable=False),
+    sa.Column('assigned_to', sa.Integer(), nullable=False),
+    sa.Column('assigned_by', sa.Integer(), nullable=False),
+    sa.Column('party_id', sa.Integer(), nullable=True),
+    sa.Column('party_name', sa.String(), nullable=False),
+    sa.Column('project_site_name', sa.String(), nullable=True),
+    sa.Column('site_address', sa.Text(), nullable=True),
+    sa.Column('task_description', sa.Text(), nullable=True),
+    sa.Column('priority', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('due_date', sa.Date(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['assigned_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['assigned_to'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_measurement_tasks_assigned_to'), 'measurement_tasks', ['assigned_to'], unique=False)
+    op.create_index(op.f('ix_measurement_tasks_id'), 'measurement_tasks', ['id'], unique=False)
+    op.create_index(op.f('ix_measurement_tasks_task_number'), 'measurement_tasks', ['task_number'], unique=True)
+    op.create_table('party_credit_exposures',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('party_id', sa.Integer(), nullable=False),
+    sa.Column('invoiced_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('paid_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('uncleared_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('outstanding_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_party_credit_exposures_id'), 'party_credit_exposures', ['id'], unique=False)
+    op.create_index(op.f('ix_party_credit_exposures_party_id'), 'party_credit_exposures', ['party_id'], unique=True)
+    op.create_table('party_history',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('party_id', sa.Integer(), nullable=False),
+    sa.Column('field_name', sa.String(), nullable=False),
+    sa.Column('old_value', sa.Text(), nullable=True),
+    sa.Column('new_value', sa.Text(), nullable=True),
+    sa.Column('changed_by', sa.Integer(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('change_reason', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['changed_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_party_history_id'), 'party_history', ['id'], unique=False)
+    op.create_index(op.f('ix_party_history_party_id'), 'party_history', ['party_id'], unique=False)
+    op.create_table('site_projects',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_code', sa.String(), nullable=True),
+    sa.Column('party_id', sa.Integer(), nullable=False),
+    sa.Column('party_name', sa.String(), nullable=False),
+    sa.Column('project_name', sa.String(), nullable=False),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('city', sa.String(), nullable=True),
+    sa.Column('state', sa.String(), nullable=True),
+    sa.Column('pin_code', sa.String(), nullable=True),
+    sa.Column('no_of_units', sa.Integer(), nullable=True),
+    sa.Column('tentative_door_count', sa.Integer(), nullable=True),
+    sa.Column('expected_timeline', sa.String(), nullable=True),
+    sa.Column('project_status', sa.String(), nullable=False),
+    sa.Column('site_contact_person', sa.String(), nullable=True),
+    sa.Column('site_contact_mobile', sa.String(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_site_projects_id'), 'site_projects', ['id'], unique=False)
+    op.create_index(op.f('ix_site_projects_party_id'), 'site_projects', ['party_id'], unique=False)
+    op.create_index(op.f('ix_site_projects_project_code'), 'site_projects', ['project_code'], unique=True)
+    op.create_index(op.f('ix_site_projects_project_name'), 'site_projects', ['project_name'], unique=False)
+    op.create_table('suppliers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('code', sa.String(), nullable=True),
+    sa.Column('contact_person', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('phone', sa.String(), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('city', sa.String(), nullable=True),
+    sa.Column('state', sa.String(), nullable=True),
+    sa.Column('pin_code', sa.String(), nullable=True),
+    sa.Column('gstin_number', sa.String(), nullable=True),
+    sa.Column('pan_number', sa.String(), nullable=True),
+    sa.Column('payment_terms', sa.String(), nullable=True),
+    sa.Column('credit_days', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['raw_material_categories.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_suppliers_category_id'), 'suppliers', ['category_id'], unique=False)
+    op.create_index(op.f('ix_suppliers_code'), 'suppliers', ['code'], unique=True)
+    op.create_index(op.f('ix_suppliers_id'), 'suppliers', ['id'], unique=False)
+    op.create_index(op.f('ix_suppliers_name'), 'suppliers', ['name'], unique=True)
+    op.create_table('measurements',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('measurement_type', sa.String(), nullable=False),
+    sa.Column('measurement_number', sa.String(), nullable=False),
+    sa.Column('party_id', sa.Integer(), nullable=True),
+    sa.Column('party_name', sa.String(), nullable=True),
+    sa.Column('thickness', sa.String(), nullable=True),
+    sa.Column('measurement_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('site_location', sa.String(), nullable=True),
+    sa.Column('items', sa.Text(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('approval_status', sa.String(), nullable=False),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('deletion_reason', sa.Text(), nullable=True),
+    sa.Column('external_foam_patti', sa.String(), nullable=True),
+    sa.Column('measurement_time', sa.String(), nullable=True),
+    sa.Column('task_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('metadata_json', sa.Text(), nullable=True),
+    sa.Column('rejection_reason', sa.Text(), nullable=True),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_edit_remark', sa.Text(), nullable=True),
+    sa.Column('last_edited_by', sa.Integer(), nullable=True),
+    sa.Column('last_edited_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['last_edited_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.ForeignKeyConstraint(['task_id'], ['measurement_tasks.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_measurements_approval_status'), 'measurements', ['approval_status'], unique=False)
+    op.create_index(op.f('ix_measurements_id'), 'measurements', ['id'], unique=False)
+    op.create_index(op.f('ix_measurements_is_deleted'), 'measurements', ['is_deleted'], unique=False)
+    op.create_index(op.f('ix_measurements_measurement_number'), 'measurements', ['measurement_number'], unique=False)
+    op.create_index(op.f('ix_measurements_task_id'), 'measurements', ['task_id'], unique=False)
+    op.create_table('production_papers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('paper_number', sa.String(), nullable=False),
+    sa.Column('party_id', sa.Integer(), nullable=True),
+    sa.Column('party_name', sa.String(), nullable=True),
+    sa.Column('measurement_id', sa.Integer(), nullable=True),
+    sa.Column('project_site_name', sa.String(), nullable=True),
+    sa.Column('order_type', sa.String(), nullable=False),
+    sa.Column('product_category', sa.String(), nullable=False),
+    sa.Column('product_type', sa.String(), nullable=True),
+    sa.Column('product_sub_type', sa.String(), nullable=True),
+    sa.Column('expected_dispatch_date', sa.Date(), nullable=True),
+    sa.Column('production_start_date', sa.Date(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('raw_material_order_status', sa.String(), nullable=False),
+    sa.Column('shutter_available', sa.Boolean(), nullable=True),
+    sa.Column('laminate_available', sa.Boolean(), nullable=True),
+    sa.Column('frame_material_available', sa.Boolean(), nullable=True),
+    sa.Column('raw_material_check_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('site_name', sa.String(), nullable=True),
+    sa.Column('site_location', sa.String(), nullable=True),
+    sa.Column('area', sa.String(), nullable=True),
+    sa.Column('concept', sa.String(), nullable=True),
+    sa.Column('thickness', sa.String(), nullable=True),
+    sa.Column('design', sa.String(), nullable=True),
+    sa.Column('frontside_design', sa.String(), nullable=True),
+    sa.Column('backside_design', sa.String(), nullable=True),
+    sa.Column('gel_colour', sa.String(), nullable=True),
+    sa.Column('laminate', sa.String(), nullable=True),
+    sa.Column('core', sa.String(), nullable=True),
+    sa.Column('remark', sa.Text(), nullable=True),
+    sa.Column('total_quantity', sa.String(), nullable=True),
+    sa.Column('wall_type', sa.String(), nullable=True),
+    sa.Column('rebate', sa.String(), nullable=True),
+    sa.Column('sub_frame', sa.String(), nullable=True),
+    sa.Column('construction', sa.String(), nullable=True),
+    sa.Column('cover_moulding', sa.String(), nullable=True),
+    sa.Column('frontside_laminate', sa.String(), nullable=True),
+    sa.Column('backside_laminate', sa.String(), nullable=True),
+    sa.Column('grade', sa.String(), nullable=True),
+    sa.Column('side_frame', sa.String(), nullable=True),
+    sa.Column('filler', sa.String(), nullable=True),
+    sa.Column('foam_bottom', sa.String(), nullable=True),
+    sa.Column('frp_coating', sa.String(), nullable=True),
+    sa.Column('selected_measurement_items', sa.Text(), nullable=True),
+    sa.Column('client_requirement_party_id', sa.Integer(), nullable=True),
+    sa.Column('client_requirement_type', sa.String(), nullable=True),
+    sa.Column('client_requirement_index', sa.Integer(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('deletion_reason', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['client_requirement_party_id'], ['parties.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['measurement_id'], ['measurements.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_production_papers_client_requirement_party_id'), 'production_papers', ['client_requirement_party_id'], unique=False)
+    op.create_index(op.f('ix_production_papers_id'), 'production_papers', ['id'], unique=False)
+    op.create_index(op.f('ix_production_papers_is_deleted'), 'production_papers', ['is_deleted'], unique=False)
+    op.create_index(op.f('ix_production_papers_paper_number'), 'production_papers', ['paper_number'], unique=True)
+    op.create_index(op.f('ix_production_papers_raw_material_order_status'), 'production_papers', ['raw_material_order_status'], unique=False)
+    op.create_table('purchase_requisitions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('pr_number', sa.String(), nullable=False),
+    sa.Column('source_type', sa.String(), nullable=False),
+    sa.Column('production_paper_id', sa.Integer(), nullable=True),
+    sa.Column('production_paper_number', sa.String(), nullable=True),
+    sa.Column('material_category', sa.String(), nullable=False),
+    sa.Column('material_name', sa.String(), nullable=False),
+    sa.Column('specification', sa.Text(), nullable=True),
+    sa.Column('quantity_required', sa.Float(), nullable=False),
+    sa.Column('unit', sa.String(), nullable=False),
+    sa.Column('required_date', sa.Date(), nullable=False),
+    sa.Column('urgency', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('rejection_reason', sa.Text(), nullable=True),
+    sa.Column('po_created', sa.Boolean(), nullable=False),
+    sa.Column('po_id', sa.Integer(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_purchase_requisitions_id'), 'purchase_requisitions', ['id'], unique=False)
+    op.create_index(op.f('ix_purchase_requisitions_pr_number'), 'purchase_requisitions', ['pr_number'], unique=True)
+    op.create_index(op.f('ix_purchase_requisitions_production_paper_id'), 'purchase_requisitions', ['production_paper_id'], unique=False)
+    op.create_index(op.f('ix_purchase_requisitions_production_paper_number'), 'purchase_requisitions', ['production_paper_number'], unique=False)
+    op.create_table('purchase_orders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('po_number', sa.String(), nullable=False),
+    sa.Column('vendor_id', sa.Integer(), nullable=False),
+    sa.Column('vendor_name', sa.String(), nullable=False),
+    sa.Column('pr_id', sa.Integer(), nullable=True),
+    sa.Column('pr_number', sa.String(), nullable=True),
+    sa.Column('production_paper_id', sa.Integer(), nullable=True),
+    sa.Column('production_paper_number', sa.String(), nullable=True),
+    sa.Column('po_date', sa.Date(), nullable=False),
+    sa.Column('delivery_date', sa.Date(), nullable=False),
+    sa.Column('payment_terms', sa.String(), nullable=True),
+    sa.Column('line_items', sa.Text(), nullable=False),
+    sa.Column('subtotal', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('tax_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('sent_to_vendor_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('total_quantity', sa.Float(), nullable=False),
+    sa.Column('received_quantity', sa.Float(), nullable=False),
+    sa.Column('pending_quantity', sa.Float(), nullable=False),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['pr_id'], ['purchase_requisitions.id'], ),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_purchase_orders_id'), 'purchase_orders', ['id'], unique=False)
+    op.create_index(op.f('ix_purchase_orders_po_number'), 'purchase_orders', ['po_number'], unique=True)
+    op.create_index(op.f('ix_purchase_orders_pr_id'), 'purchase_orders', ['pr_id'], unique=False)
+    op.create_index(op.f('ix_purchase_orders_pr_number'), 'purchase_orders', ['pr_number'], unique=False)
+    op.create_index(op.f('ix_purchase_orders_production_paper_id'), 'purchase_orders', ['production_paper_id'], unique=False)
+    op.create_index(op.f('ix_purchase_orders_production_paper_number'), 'purchase_orders', ['production_paper_number'], unique=False)
+    op.create_index(op.f('ix_purchase_orders_vendor_id'), 'purchase_orders', ['vendor_id'], unique=False)
+    op.create_table('grns',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('grn_number', sa.String(), nullable=False),
+    sa.Column('po_id', sa.Integer(), nullable=False),
+    sa.Column('po_number', sa.String(), nullable=False),
+    sa.Column('vendor_id', sa.Integer(), nullable=False),
+    sa.Column('vendor_name', sa.String(), nullable=False),
+    sa.Column('material_category', sa.String(), nullable=False),
+    sa.Column('material_name', sa.String(), nullable=False),
+    sa.Column('specification', sa.Text(), nullable=True),
+    sa.Column('ordered_quantity', sa.Float(), nullable=False),
+    sa.Column('received_quantity', sa.Float(), nullable=False),
+    sa.Column('rejected_quantity', sa.Float(), nullable=False),
+    sa.Column('shortage_quantity', sa.Float(), nullable=False),
+    sa.Column('accepted_quantity', sa.Float(), nullable=False),
+    sa.Column('qc_status', sa.String(), nullable=False),
+    sa.Column('qc_checked_by', sa.Integer(), nullable=True),
+    sa.Column('qc_checked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('qc_remarks', sa.Text(), nullable=True),
+    sa.Column('qc_parameters', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('purchase_return_id', sa.Integer(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['po_id'], ['purchase_orders.id'], ),
+    sa.ForeignKeyConstraint(['qc_checked_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_grns_grn_number'), 'grns', ['grn_number'], unique=True)
+    op.create_index(op.f('ix_grns_id'), 'grns', ['id'], unique=False)
+    op.create_index(op.f('ix_grns_po_id'), 'grns', ['po_id'], unique=False)
+    op.create_index(op.f('ix_grns_po_number'), 'grns', ['po_number'], unique=False)
+    op.create_index(op.f('ix_grns_vendor_id'), 'grns', ['vendor_id'], unique=False)
+    op.create_table('vendor_bills',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('bill_number', sa.String(), nullable=False),
+    sa.Column('grn_id', sa.Integer(), nullable=False),
+    sa.Column('grn_number', sa.String(), nullable=False),
+    sa.Column('po_id', sa.Integer(), nullable=True),
+    sa.Column('po_number', sa.String(), nullable=True),
+    sa.Column('vendor_id', sa.Integer(), nullable=False),
+    sa.Column('vendor_name', sa.String(), nullable=False),
+    sa.Column('vendor_gstin', sa.String(), nullable=True),
+    sa.Column('vendor_bill_no', sa.String(), nullable=False),
+    sa.Column('vendor_bill_date', sa.Date(), nullable=False),
+    sa.Column('bill_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('tax_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('gst_breakup', sa.Text(), nullable=True),
+    sa.Column('payment_status', sa.String(), nullable=False),
+    sa.Column('payment_approved_by', sa.Integer(), nullable=True),
+    sa.Column('payment_approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('payment_details', sa.Text(), nullable=True),
+    sa.Column('tally_synced', sa.Boolean(), nullable=False),
+    sa.Column('tally_sync_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('tally_voucher_no', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['grn_id'], ['grns.id'], ),
+    sa.ForeignKeyConstraint(['payment_approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['po_id'], ['purchase_orders.id'], ),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_vendor_bills_bill_number'), 'vendor_bills', ['bill_number'], unique=True)
+    op.create_index(op.f('ix_vendor_bills_grn_id'), 'vendor_bills', ['grn_id'], unique=False)
+    op.create_index(op.f('ix_vendor_bills_grn_number'), 'vendor_bills', ['grn_number'], unique=False)
+    op.create_index(op.f('ix_vendor_bills_id'), 'vendor_bills', ['id'], unique=False)
+    op.create_index(op.f('ix_vendor_bills_po_id'), 'vendor_bills', ['po_id'], unique=False)
+    op.create_index(op.f('ix_vendor_bills_vendor_bill_no'), 'vendor_bills', ['vendor_bill_no'], unique=False)
+    op.create_index(op.f('ix_vendor_bills_vendor_id'), 'vendor_bills', ['vendor_id'], unique=False)
+    op.create_table('ledgers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ledger_code', sa.String(), nullable=False),
+    sa.Column('ledger_name', sa.String(), nullable=False),
+    sa.Column('ledger_type', sa.String(), nullable=False),
+    sa.Column('party_id', sa.Integer(), nullable=True),
+    sa.Column('supplier_id', sa.Integer(), nullable=True),
+    sa.Column('opening_balance', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('opening_balance_type', sa.String(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ledgers_id'), 'ledgers', ['id'], unique=False)
+    op.create_index(op.f('ix_ledgers_ledger_code'), 'ledgers', ['ledger_code'], unique=True)
+    op.create_index(op.f('ix_ledgers_party_id'), 'ledgers', ['party_id'], unique=False)
+    op.create_index(op.f('ix_ledgers_supplier_id'), 'ledgers', ['supplier_id'], unique=False)
+    op.create_table('product_supplier_mappings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_name', sa.String(), nullable=False),
+    sa.Column('supplier_id', sa.Integer(), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_product_supplier_mappings_id'), 'product_supplier_mappings', ['id'], unique=False)
+    op.create_index(op.f('ix_product_supplier_mappings_product_name'), 'product_supplier_mappings', ['product_name'], unique=False)
+    op.create_table('quotations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('quotation_number', sa.String(), nullable=False),
+    sa.Column('party_id', sa.Integer(), nullable=False),
+    sa.Column('party_name', sa.String(), nullable=False),
+    sa.Column('site_project_id', sa.Integer(), nullable=True),
+    sa.Column('lead_id', sa.Integer(), nullable=True),
+    sa.Column('validity_date', sa.Date(), nullable=True),
+    sa.Column('payment_terms', sa.String(), nullable=True),
+    sa.Column('delivery_timeline', sa.String(), nullable=True),
+    sa.Column('line_items', sa.Text(), nullable=False),
+    sa.Column('subtotal', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('discount_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('discount_percentage', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('tax_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('discount_approved_by', sa.Integer(), nullable=True),
+    sa.Column('discount_approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['discount_approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['lead_id'], ['leads.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.ForeignKeyConstraint(['site_project_id'], ['site_projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_quotations_id'), 'quotations', ['id'], unique=False)
+    op.create_index(op.f('ix_quotations_lead_id'), 'quotations', ['lead_id'], unique=False)
+    op.create_index(op.f('ix_quotations_party_id'), 'quotations', ['party_id'], unique=False)
+    op.create_index(op.f('ix_quotations_quotation_number'), 'quotations', ['quotation_number'], unique=True)
+    op.create_index(op.f('ix_quotations_site_project_id'), 'quotations', ['site_project_id'], unique=False)
+    op.create_table('sites',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('site_project_id', sa.Integer(), nullable=False),
+    sa.Column('site_code', sa.String(), nullable=True),
+    sa.Column('builder_name', sa.String(), nullable=False),
+    sa.Column('project_name', sa.String(), nullable=False),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('wings', sa.Text(), nullable=True),
+    sa.Column('total_floors', sa.Integer(), nullable=True),
+    sa.Column('total_flats', sa.Integer(), nullable=True),
+    sa.Column('site_status', sa.String(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['site_project_id'], ['site_projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sites_id'), 'sites', ['id'], unique=False)
+    op.create_index(op.f('ix_sites_project_name'), 'sites', ['project_name'], unique=False)
+    op.create_index(op.f('ix_sites_site_code'), 'sites', ['site_code'], unique=True)
+    op.create_index(op.f('ix_sites_site_project_id'), 'sites', ['site_project_id'], unique=False)
+    op.create_table('vendor_payables',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('bill_number', sa.String(), nullable=False),
+    sa.Column('po_number', sa.String(), nullable=True),
+    sa.Column('vendor_id', sa.Integer(), nullable=False),
+    sa.Column('vendor_name', sa.String(), nullable=False),
+    sa.Column('bill_date', sa.Date(), nullable=False),
+    sa.Column('due_date', sa.Date(), nullable=True),
+    sa.Column('bill_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('paid_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('pending_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('payment_terms', sa.String(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['vendor_id'], ['suppliers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_vendor_payables_bill_number'), 'vendor_payables', ['bill_number'], unique=True)
+    op.create_index(op.f('ix_vendor_payables_id'), 'vendor_payables', ['id'], unique=False)
+    op.create_index(op.f('ix_vendor_payables_po_number'), 'vendor_payables', ['po_number'], unique=False)
+    op.create_index(op.f('ix_vendor_payables_vendor_id'), 'vendor_payables', ['vendor_id'], unique=False)
+    op.create_table('carpenter_captains',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('wing', sa.String(), nullable=True),
+    sa.Column('assigned_date', sa.Date(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_carpenter_captains_id'), 'carpenter_captains', ['id'], unique=False)
+    op.create_index(op.f('ix_carpenter_captains_site_id'), 'carpenter_captains', ['site_id'], unique=False)
+    op.create_index(op.f('ix_carpenter_captains_user_id'), 'carpenter_captains', ['user_id'], unique=True)
+    op.create_table('daily_site_progress',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('report_date', sa.Date(), nullable=False),
+    sa.Column('wing', sa.String(), nullable=True),
+    sa.Column('floors_covered', sa.String(), nullable=True),
+    sa.Column('frames_fixed_today', sa.Integer(), nullable=True),
+    sa.Column('doors_fixed_today', sa.Integer(), nullable=True),
+    sa.Column('work_front_available', sa.Boolean(), nullable=True),
+    sa.Column('constraints', sa.Text(), nullable=True),
+    sa.Column('tomorrow_plan', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_daily_site_progress_id'), 'daily_site_progress', ['id'], unique=False)
+    op.create_index(op.f('ix_daily_site_progress_report_date'), 'daily_site_progress', ['report_date'], unique=False)
+    op.create_index(op.f('ix_daily_site_progress_site_id'), 'daily_site_progress', ['site_id'], unique=False)
+    op.create_table('flats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('flat_number', sa.String(), nullable=False),
+    sa.Column('wing', sa.String(), nullable=False),
+    sa.Column('floor', sa.Integer(), nullable=False),
+    sa.Column('main_door_required', sa.Boolean(), nullable=True),
+    sa.Column('bedroom_door_required', sa.Boolean(), nullable=True),
+    sa.Column('bathroom_door_required', sa.Boolean(), nullable=True),
+    sa.Column('kitchen_door_required', sa.Boolean(), nullable=True),
+    sa.Column('frame_fixed', sa.Boolean(), nullable=True),
+    sa.Column('door_fixed', sa.Boolean(), nullable=True),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('site_id', 'wing', 'flat_number', name='uq_flats_site_wing_flat_number')
+    )
+    op.create_index(op.f('ix_flats_flat_number'), 'flats', ['flat_number'], unique=False)
+    op.create_index(op.f('ix_flats_floor'), 'flats', ['floor'], unique=False)
+    op.create_index(op.f('ix_flats_id'), 'flats', ['id'], unique=False)
+    op.create_index(op.f('ix_flats_site_id'), 'flats', ['site_id'], unique=False)
+    op.create_index(op.f('ix_flats_wing'), 'flats', ['wing'], unique=False)
+    op.create_table('ledger_balance_snapshots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ledger_id', sa.Integer(), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False),
+    sa.Column('closing_balance', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('period_debit', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('period_credit', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['ledger_id'], ['ledgers.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('ledger_id', 'period_end', name='uq_ledger_balance_snapshots_ledger_period')
+    )
+    op.create_index(op.f('ix_ledger_balance_snapshots_id'), 'ledger_balance_snapshots', ['id'], unique=False)
+    op.create_index(op.f('ix_ledger_balance_snapshots_ledger_id'), 'ledger_balance_snapshots', ['ledger_id'], unique=False)
+    op.create_index(op.f('ix_ledger_balance_snapshots_period_end'), 'ledger_balance_snapshots', ['period_end'], unique=False)
+    op.create_table('ledger_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entry_number', sa.String(), nullable=False),
+    sa.Column('ledger_id', sa.Integer(), nullable=False),
+    sa.Column('entry_date', sa.Date(), nullable=False),
+    sa.Column('entry_type', sa.String(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('reference_type', sa.String(), nullable=True),
+    sa.Column('reference_id', sa.Integer(), nullable=True),
+    sa.Column('reference_number', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('narration', sa.Text(), nullable=True),
+    sa.Column('period_locked', sa.Boolean(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['ledger_id'], ['ledgers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ledger_entries_entry_number'), 'ledger_entries', ['entry_number'], unique=True)
+    op.create_index(op.f('ix_ledger_entries_id'), 'ledger_entries', ['id'], unique=False)
+    op.create_index('ix_ledger_entries_ledger_date', 'ledger_entries', ['ledger_id', 'entry_date'], unique=False)
+    op.create_index(op.f('ix_ledger_entries_ledger_id'), 'ledger_entries', ['ledger_id'], unique=False)
+    op.create_index('ix_ledger_entries_reference', 'ledger_entries', ['reference_type', 'reference_id'], unique=False)
+    op.create_table('measurement_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=True),
+    sa.Column('measurement_number', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=True),
+    sa.Column('party_name', sa.String(), nullable=False),
+    sa.Column('thickness', sa.String(), nullable=True),
+    sa.Column('external_foam_patti', sa.String(), nullable=True),
+    sa.Column('measurement_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('measurement_time', sa.String(), nullable=True),
+    sa.Column('measurement_items', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('sent_to_production_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('production_measurement_id', sa.Integer(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['production_measurement_id'], ['measurements.id'], ),
+    sa.ForeignKeyConstraint(['task_id'], ['measurement_tasks.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_measurement_entries_id'), 'measurement_entries', ['id'], unique=False)
+    op.create_index(op.f('ix_measurement_entries_measurement_number'), 'measurement_entries', ['measurement_number'], unique=True)
+    op.create_index(op.f('ix_measurement_entries_task_id'), 'measurement_entries', ['task_id'], unique=False)
+    op.create_table('site_wing_progress',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('wing', sa.String(), nullable=False),
+    sa.Column('total_flats', sa.Integer(), nullable=False),
+    sa.Column('frames_fixed', sa.Integer(), nullable=False),
+    sa.Column('doors_fixed', sa.Integer(), nullable=False),
+    sa.Column('both_fixed', sa.Integer(), nullable=False),
+    sa.Column('frame_fixed_doors_pending', sa.Integer(), nullable=False),
+    sa.Column('doors_fixed_frames_pending', sa.Integer(), nullable=False),
+    sa.Column('both_pending', sa.Integer(), nullable=False),
+    sa.Column('doors_required', sa.Integer(), nullable=False),
+    sa.Column('doors_pending', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('site_id', 'wing', name='uq_site_wing_progress_site_wing')
+    )
+    op.create_index(op.f('ix_site_wing_progress_id'), 'site_wing_progress', ['id'], unique=False)
+    op.create_index(op.f('ix_site_wing_progress_site_id'), 'site_wing_progress', ['site_id'], unique=False)
+    op.create_table('vendor_payments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('payment_number', sa.String(), nullable=False),
+    sa.Column('vendor_payable_id', sa.Integer(), nullable=False),
+    sa.Column('payment_date', sa.Date(), nullable=False),
+    sa.Column('payment_method', sa.String(), nullable=False),
+    sa.Column('payment_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('bank_name', sa.String(), nullable=True),
+    sa.Column('cheque_number', sa.String(), nullable=True),
+    sa.Column('transaction_reference', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['vendor_payable_id'], ['vendor_payables.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_vendor_payments_id'), 'vendor_payments', ['id'], unique=False)
+    op.create_index(op.f('ix_vendor_payments_payment_number'), 'vendor_payments', ['payment_number'], unique=True)
+    op.create_index(op.f('ix_vendor_payments_vendor_payable_id'), 'vendor_payments', ['vendor_payable_id'], unique=False)
+    op.create_table('billing_requests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('dispatch_request_no', sa.String(), nullable=False),
+    sa.Column('production_paper_id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_number', sa.String(), nullable=False),
+    sa.Column('party_id', sa.Integer(), nullable=False),
+    sa.Column('party_name', sa.String(), nullable=False),
+    sa.Column('party_gstin', sa.String(), nullable=True),
+    sa.Column('site_name', sa.String(), nullable=True),
+    sa.Column('delivery_address', sa.Text(), nullable=False),
+    sa.Column('vehicle_no', sa.String(), nullable=True),
+    sa.Column('driver_name', sa.String(), nullable=True),
+    sa.Column('dispatch_date', sa.Date(), nullable=True),
+    sa.Column('items', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_billing_requests_dispatch_request_no'), 'billing_requests', ['dispatch_request_no'], unique=True)
+    op.create_index(op.f('ix_billing_requests_id'), 'billing_requests', ['id'], unique=False)
+    op.create_index(op.f('ix_billing_requests_party_id'), 'billing_requests', ['party_id'], unique=False)
+    op.create_index(op.f('ix_billing_requests_production_paper_id'), 'billing_requests', ['production_paper_id'], unique=False)
+    op.create_index(op.f('ix_billing_requests_production_paper_number'), 'billing_requests', ['production_paper_number'], unique=False)
+    op.create_table('bom',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_number', sa.String(), nullable=False),
+    sa.Column('material_category', sa.String(), nullable=False),
+    sa.Column('material_name', sa.String(), nullable=False),
+    sa.Column('specification', sa.Text(), nullable=True),
+    sa.Column('quantity_required', sa.Float(), nullable=False),
+    sa.Column('unit', sa.String(), nullable=False),
+    sa.Column('pr_created', sa.Boolean(), nullable=False),
+    sa.Column('pr_id', sa.Integer(), nullable=True),
+    sa.Column('po_created', sa.Boolean(), nullable=False),
+    sa.Column('po_id', sa.Integer(), nullable=True),
+    sa.Column('material_received', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['po_id'], ['purchase_orders.id'], ),
+    sa.ForeignKeyConstraint(['pr_id'], ['purchase_requisitions.id'], ),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_bom_id'), 'bom', ['id'], unique=False)
+    op.create_index(op.f('ix_bom_production_paper_id'), 'bom', ['production_paper_id'], unique=False)
+    op.create_index(op.f('ix_bom_production_paper_number'), 'bom', ['production_paper_number'], unique=False)
+    op.create_table('carpenter_attendances',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('captain_id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('attendance_date', sa.Date(), nullable=False),
+    sa.Column('carpenter_name', sa.String(), nullable=False),
+    sa.Column('present', sa.Boolean(), nullable=True),
+    sa.Column('work_hours', sa.Float(), nullable=True),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['captain_id'], ['carpenter_captains.id'], ),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_carpenter_attendances_attendance_date'), 'carpenter_attendances', ['attendance_date'], unique=False)
+    op.create_index(op.f('ix_carpenter_attendances_captain_id'), 'carpenter_attendances', ['captain_id'], unique=False)
+    op.create_index(op.f('ix_carpenter_attendances_id'), 'carpenter_attendances', ['id'], unique=False)
+    op.create_index(op.f('ix_carpenter_attendances_site_id'), 'carpenter_attendances', ['site_id'], unique=False)
+    op.create_table('carpenter_door_fixings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('flat_id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('captain_id', sa.Integer(), nullable=False),
+    sa.Column('door_type', sa.String(), nullable=False),
+    sa.Column('fixing_status', sa.String(), nullable=False),
+    sa.Column('fixing_date', sa.Date(), nullable=True),
+    sa.Column('carpenter_name', sa.String(), nullable=True),
+    sa.Column('reason', sa.Text(), nullable=True),
+    sa.Column('customer_instruction', sa.Text(), nullable=True),
+    sa.Column('photo_url', sa.Text(), nullable=True),
+    sa.Column('supervisor_approved', sa.Boolean(), nullable=True),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['captain_id'], ['carpenter_captains.id'], ),
+    sa.ForeignKeyConstraint(['flat_id'], ['flats.id'], ),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_carpenter_door_fixings_captain_id'), 'carpenter_door_fixings', ['captain_id'], unique=False)
+    op.create_index(op.f('ix_carpenter_door_fixings_flat_id'), 'carpenter_door_fixings', ['flat_id'], unique=False)
+    op.create_index(op.f('ix_carpenter_door_fixings_id'), 'carpenter_door_fixings', ['id'], unique=False)
+    op.create_index(op.f('ix_carpenter_door_fixings_site_id'), 'carpenter_door_fixings', ['site_id'], unique=False)
+    op.create_table('carpenter_frame_fixings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('flat_id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('captain_id', sa.Integer(), nullable=False),
+    sa.Column('frame_type', sa.String(), nullable=False),
+    sa.Column('fixing_status', sa.String(), nullable=False),
+    sa.Column('fixing_date', sa.Date(), nullable=True),
+    sa.Column('carpenter_name', sa.String(), nullable=True),
+    sa.Column('issue', sa.Text(), nullable=True),
+    sa.Column('photo_url', sa.Text(), nullable=True),
+    sa.Column('supervisor_approved', sa.Boolean(), nullable=True),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['captain_id'], ['carpenter_captains.id'], ),
+    sa.ForeignKeyConstraint(['flat_id'], ['flats.id'], ),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_carpenter_frame_fixings_captain_id'), 'carpenter_frame_fixings', ['captain_id'], unique=False)
+    op.create_index(op.f('ix_carpenter_frame_fixings_flat_id'), 'carpenter_frame_fixings', ['flat_id'], unique=False)
+    op.create_index(op.f('ix_carpenter_frame_fixings_id'), 'carpenter_frame_fixings', ['id'], unique=False)
+    op.create_index(op.f('ix_carpenter_frame_fixings_site_id'), 'carpenter_frame_fixings', ['site_id'], unique=False)
+    op.create_table('carpenter_issues',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('captain_id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('flat_id', sa.Integer(), nullable=True),
+    sa.Column('issue_type', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('reported_date', sa.Date(), nullable=False),
+    sa.Column('resolved_date', sa.Date(), nullable=True),
+    sa.Column('photo_url', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['captain_id'], ['carpenter_captains.id'], ),
+    sa.ForeignKeyConstraint(['flat_id'], ['flats.id'], ),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_carpenter_issues_captain_id'), 'carpenter_issues', ['captain_id'], unique=False)
+    op.create_index(op.f('ix_carpenter_issues_flat_id'), 'carpenter_issues', ['flat_id'], unique=False)
+    op.create_index(op.f('ix_carpenter_issues_id'), 'carpenter_issues', ['id'], unique=False)
+    op.create_index(op.f('ix_carpenter_issues_site_id'), 'carpenter_issues', ['site_id'], unique=False)
+    op.create_table('contractor_work_orders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('work_order_number', sa.String(), nullable=False),
+    sa.Column('production_paper_id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_number', sa.String(), nullable=False),
+    sa.Column('contractor_id', sa.Integer(), nullable=False),
+    sa.Column('product_type', sa.String(), nullable=False),
+    sa.Column('stage', sa.String(), nullable=True),
+    sa.Column('assigned_quantity', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('assigned_by', sa.Integer(), nullable=False),
+    sa.Column('assigned_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['assigned_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['contractor_id'], ['contractors.id'], ),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_contractor_work_orders_contractor_id'), 'contractor_work_orders', ['contractor_id'], unique=False)
+    op.create_index(op.f('ix_contractor_work_orders_id'), 'contractor_work_orders', ['id'], unique=False)
+    op.create_index(op.f('ix_contractor_work_orders_production_paper_id'), 'contractor_work_orders', ['production_paper_id'], unique=False)
+    op.create_index(op.f('ix_contractor_work_orders_work_order_number'), 'contractor_work_orders', ['work_order_number'], unique=True)
+    op.create_table('door_fixings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('flat_id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('door_type', sa.String(), nullable=False),
+    sa.Column('fixing_status', sa.String(), nullable=False),
+    sa.Column('reason', sa.Text(), nullable=True),
+    sa.Column('expected_resume_date', sa.Date(), nullable=True),
+    sa.Column('customer_instruction', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['flat_id'], ['flats.id'], ),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_door_fixings_flat_id'), 'door_fixings', ['flat_id'], unique=False)
+    op.create_index(op.f('ix_door_fixings_id'), 'door_fixings', ['id'], unique=False)
+    op.create_index(op.f('ix_door_fixings_site_id'), 'door_fixings', ['site_id'], unique=False)
+    op.create_table('frame_fixings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('flat_id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('frame_type', sa.String(), nullable=False),
+    sa.Column('fixing_status', sa.String(), nullable=False),
+    sa.Column('fixing_date', sa.Date(), nullable=True),
+    sa.Column('contractor', sa.String(), nullable=True),
+    sa.Column('floor_readiness', sa.Boolean(), nullable=True),
+    sa.Column('issue', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['flat_id'], ['flats.id'], ),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_frame_fixings_flat_id'), 'frame_fixings', ['flat_id'], unique=False)
+    op.create_index(op.f('ix_frame_fixings_id'), 'frame_fixings', ['id'], unique=False)
+    op.create_index(op.f('ix_frame_fixings_site_id'), 'frame_fixings', ['site_id'], unique=False)
+    op.create_table('order_costings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_number', sa.String(), nullable=False),
+    sa.Column('material_cost', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('labor_cost', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('overhead_cost', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('logistics_cost', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('contractor_cost', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('total_cost', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('invoice_amount', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('revenue', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('profit', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('profit_margin', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('door_count', sa.Integer(), nullable=False),
+    sa.Column('frame_count', sa.Integer(), nullable=False),
+    sa.Column('door_profit', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('frame_profit', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('calculated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_order_costings_id'), 'order_costings', ['id'], unique=False)
+    op.create_index(op.f('ix_order_costings_production_paper_id'), 'order_costings', ['production_paper_id'], unique=True)
+    op.create_table('production_schedules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_id', sa.Integer(), nullable=False),
+    sa.Column('production_start_date', sa.Date(), nullable=False),
+    sa.Column('target_completion_date', sa.Date(), nullable=False),
+    sa.Column('priority', sa.String(), nullable=False),
+    sa.Column('department_schedule', sa.Text(), nullable=True),
+    sa.Column('primary_supervisor', sa.String(), nullable=True),
+    sa.Column('backup_supervisor', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('measurement_received', sa.Boolean(), nullable=True),
+    sa.Column('production_paper_approved', sa.Boolean(), nullable=True),
+    sa.Column('shutter_available', sa.Boolean(), nullable=True),
+    sa.Column('laminate_available', sa.Boolean(), nullable=True),
+    sa.Column('frame_material_available', sa.Boolean(), nullable=True),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('scheduled_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.ForeignKeyConstraint(['scheduled_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_production_schedules_id'), 'production_schedules', ['id'], unique=False)
+    op.create_index(op.f('ix_production_schedules_production_paper_id'), 'production_schedules', ['production_paper_id'], unique=False)
+    op.create_table('production_shutter_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_id', sa.Integer(), nullable=False),
+    sa.Column('item_no', sa.String(), nullable=True),
+    sa.Column('ro_width', sa.String(), nullable=True),
+    sa.Column('ro_height', sa.String(), nullable=True),
+    sa.Column('thickness', sa.String(), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=True),
+    sa.Column('sq_ft', sa.Float(), nullable=True),
+    sa.Column('sq_meter', sa.Float(), nullable=True),
+    sa.Column('laminate_sheets', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_production_shutter_items_id'), 'production_shutter_items', ['id'], unique=False)
+    op.create_index(op.f('ix_production_shutter_items_production_paper_id'), 'production_shutter_items', ['production_paper_id'], unique=False)
+    op.create_table('production_tracking',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_number', sa.String(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=True),
+    sa.Column('product_type', sa.String(), nullable=False),
+    sa.Column('product_category', sa.String(), nullable=True),
+    sa.Column('stage_name', sa.String(), nullable=False),
+    sa.Column('stage_sequence', sa.Integer(), nullable=False),
+    sa.Column('start_date_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('end_date_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('estimated_duration_hours', sa.Float(), nullable=True),
+    sa.Column('actual_duration_hours', sa.Float(), nullable=True),
+    sa.Column('supervisor_name', sa.String(), nullable=True),
+    sa.Column('supervisor_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('rework_flag', sa.Boolean(), nullable=False),
+    sa.Column('rework_reason', sa.Text(), nullable=True),
+    sa.Column('quality_status', sa.String(), nullable=True),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.ForeignKeyConstraint(['supervisor_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_production_tracking_id'), 'production_tracking', ['id'], unique=False)
+    op.create_index(op.f('ix_production_tracking_production_paper_id'), 'production_tracking', ['production_paper_id'], unique=False)
+    op.create_index(op.f('ix_production_tracking_production_paper_number'), 'production_tracking', ['production_paper_number'], unique=False)
+    op.create_table('quality_checks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('qc_number', sa.String(), nullable=False),
+    sa.Column('production_paper_id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_number', sa.String(), nullable=False),
+    sa.Column('party_id', sa.Integer(), nullable=True),
+    sa.Column('party_name', sa.String(), nullable=True),
+    sa.Column('product_type', sa.String(), nullable=False),
+    sa.Column('product_category', sa.String(), nullable=True),
+    sa.Column('product_variant', sa.String(), nullable=True),
+    sa.Column('order_type', sa.String(), nullable=False),
+    sa.Column('total_quantity', sa.Float(), nullable=False),
+    sa.Column('accepted_quantity', sa.Float(), nullable=True),
+    sa.Column('rework_quantity', sa.Float(), nullable=True),
+    sa.Column('rejected_quantity', sa.Float(), nullable=True),
+    sa.Column('checklist_results', sa.JSON(), nullable=True),
+    sa.Column('qc_status', sa.String(), nullable=False),
+    sa.Column('defect_category', sa.String(), nullable=True),
+    sa.Column('severity', sa.String(), nullable=True),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('photos', sa.JSON(), nullable=True),
+    sa.Column('production_completed_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('supervisor_name', sa.String(), nullable=True),
+    sa.Column('completed_stages_summary', sa.Text(), nullable=True),
+    sa.Column('inspector_id', sa.Integer(), nullable=True),
+    sa.Column('inspector_name', sa.String(), nullable=True),
+    sa.Column('inspection_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('rework_job_id', sa.Integer(), nullable=True),
+    sa.Column('rework_department', sa.String(), nullable=True),
+    sa.Column('rework_target_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('cost_impact', sa.Float(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['inspector_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_quality_checks_id'), 'quality_checks', ['id'], unique=False)
+    op.create_index(op.f('ix_quality_checks_production_paper_id'), 'quality_checks', ['production_paper_id'], unique=False)
+    op.create_index(op.f('ix_quality_checks_production_paper_number'), 'quality_checks', ['production_paper_number'], unique=False)
+    op.create_index(op.f('ix_quality_checks_qc_number'), 'quality_checks', ['qc_number'], unique=True)
+    op.create_table('qc_certificates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('certificate_number', sa.String(), nullable=False),
+    sa.Column('quality_check_id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_number', sa.String(), nullable=False),
+    sa.Column('product_details', sa.JSON(), nullable=True),
+    sa.Column('inspection_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('inspector_name', sa.String(), nullable=False),
+    sa.Column('inspector_signature', sa.Text(), nullable=True),
+    sa.Column('is_approved', sa.Boolean(), nullable=False),
+    sa.Column('certificate_pdf_path', sa.String(), nullable=True),
+    sa.Column('is_mandatory', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.ForeignKeyConstraint(['quality_check_id'], ['quality_checks.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_qc_certificates_certificate_number'), 'qc_certificates', ['certificate_number'], unique=True)
+    op.create_index(op.f('ix_qc_certificates_id'), 'qc_certificates', ['id'], unique=False)
+    op.create_index(op.f('ix_qc_certificates_production_paper_id'), 'qc_certificates', ['production_paper_id'], unique=False)
+    op.create_index(op.f('ix_qc_certificates_quality_check_id'), 'qc_certificates', ['quality_check_id'], unique=False)
+    op.create_table('raw_material_checks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('check_number', sa.String(), nullable=False),
+    sa.Column('production_paper_id', sa.Integer(), nullable=True),
+    sa.Column('party_id', sa.Integer(), nullable=True),
+    sa.Column('supplier_id', sa.Integer(), nullable=True),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('product_name', sa.String(), nullable=False),
+    sa.Column('quantity', sa.Float(), nullable=False),
+    sa.Column('unit', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('checked_by', sa.Integer(), nullable=True),
+    sa.Column('checked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['category_id'], ['raw_material_categories.id'], ),
+    sa.ForeignKeyConstraint(['checked_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_raw_material_checks_category_id'), 'raw_material_checks', ['category_id'], unique=False)
+    op.create_index(op.f('ix_raw_material_checks_check_number'), 'raw_material_checks', ['check_number'], unique=True)
+    op.create_index(op.f('ix_raw_material_checks_id'), 'raw_material_checks', ['id'], unique=False)
+    op.create_table('raw_material_shutter_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_id', sa.Integer(), nullable=False),
+    sa.Column('sr_no', sa.String(), nullable=True),
+    sa.Column('ro_width', sa.String(), nullable=True),
+    sa.Column('ro_height', sa.String(), nullable=True),
+    sa.Column('bldg_wings', sa.String(), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=True),
+    sa.Column('sq_ft', sa.Float(), nullable=True),
+    sa.Column('sq_meter', sa.Float(), nullable=True),
+    sa.Column('laminate_sheets', sa.Float(), nullable=True),
+    sa.Column('thickness', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_raw_material_shutter_items_id'), 'raw_material_shutter_items', ['id'], unique=False)
+    op.create_index(op.f('ix_raw_material_shutter_items_production_paper_id'), 'raw_material_shutter_items', ['production_paper_id'], unique=False)
+    op.create_table('sales_orders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('order_number', sa.String(), nullable=False),
+    sa.Column('quotation_id', sa.Integer(), nullable=True),
+    sa.Column('party_id', sa.Integer(), nullable=False),
+    sa.Column('party_name', sa.String(), nullable=False),
+    sa.Column('site_project_id', sa.Integer(), nullable=True),
+    sa.Column('po_number', sa.String(), nullable=True),
+    sa.Column('order_date', sa.Date(), nullable=False),
+    sa.Column('expected_delivery_date', sa.Date(), nullable=True),
+    sa.Column('payment_terms', sa.String(), nullable=True),
+    sa.Column('payment_terms_accepted', sa.Boolean(), nullable=True),
+    sa.Column('total_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('measurement_requested', sa.Boolean(), nullable=True),
+    sa.Column('measurement_id', sa.Integer(), nullable=True),
+    sa.Column('production_paper_id', sa.Integer(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['measurement_id'], ['measurements.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.ForeignKeyConstraint(['quotation_id'], ['quotations.id'], ),
+    sa.ForeignKeyConstraint(['site_project_id'], ['site_projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sales_orders_id'), 'sales_orders', ['id'], unique=False)
+    op.create_index(op.f('ix_sales_orders_order_number'), 'sales_orders', ['order_number'], unique=True)
+    op.create_index(op.f('ix_sales_orders_party_id'), 'sales_orders', ['party_id'], unique=False)
+    op.create_index(op.f('ix_sales_orders_po_number'), 'sales_orders', ['po_number'], unique=False)
+    op.create_index(op.f('ix_sales_orders_quotation_id'), 'sales_orders', ['quotation_id'], unique=False)
+    op.create_index(op.f('ix_sales_orders_site_project_id'), 'sales_orders', ['site_project_id'], unique=False)
+    op.create_table('site_issues',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('flat_id', sa.Integer(), nullable=True),
+    sa.Column('issue_type', sa.String(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('wing', sa.String(), nullable=True),
+    sa.Column('floor', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('resolved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('resolution_notes', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('resolved_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['flat_id'], ['flats.id'], ),
+    sa.ForeignKeyConstraint(['resolved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_site_issues_flat_id'), 'site_issues', ['flat_id'], unique=False)
+    op.create_index(op.f('ix_site_issues_id'), 'site_issues', ['id'], unique=False)
+    op.create_index(op.f('ix_site_issues_site_id'), 'site_issues', ['site_id'], unique=False)
+    op.create_table('site_measurements',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('flat_id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('location', sa.String(), nullable=False),
+    sa.Column('width_mm', sa.Float(), nullable=False),
+    sa.Column('height_mm', sa.Float(), nullable=False),
+    sa.Column('wall_thickness', sa.Float(), nullable=True),
+    sa.Column('handing', sa.String(), nullable=True),
+    sa.Column('door_type', sa.String(), nullable=False),
+    sa.Column('frame_type', sa.String(), nullable=True),
+    sa.Column('special_note', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['flat_id'], ['flats.id'], ),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_site_measurements_flat_id'), 'site_measurements', ['flat_id'], unique=False)
+    op.create_index(op.f('ix_site_measurements_id'), 'site_measurements', ['id'], unique=False)
+    op.create_index(op.f('ix_site_measurements_site_id'), 'site_measurements', ['site_id'], unique=False)
+    op.create_table('site_photos',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('flat_id', sa.Integer(), nullable=True),
+    sa.Column('photo_type', sa.String(), nullable=False),
+    sa.Column('photo_url', sa.Text(), nullable=False),
+    sa.Column('caption', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['flat_id'], ['flats.id'], ),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_site_photos_flat_id'), 'site_photos', ['flat_id'], unique=False)
+    op.create_index(op.f('ix_site_photos_id'), 'site_photos', ['id'], unique=False)
+    op.create_index(op.f('ix_site_photos_site_id'), 'site_photos', ['site_id'], unique=False)
+    op.create_table('work_allocations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('captain_id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('allocation_date', sa.Date(), nullable=False),
+    sa.Column('flat_numbers', sa.Text(), nullable=False),
+    sa.Column('work_type', sa.String(), nullable=False),
+    sa.Column('assigned_carpenters', sa.Text(), nullable=True),
+    sa.Column('target_quantity', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['captain_id'], ['carpenter_captains.id'], ),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_work_allocations_allocation_date'), 'work_allocations', ['allocation_date'], unique=False)
+    op.create_index(op.f('ix_work_allocations_captain_id'), 'work_allocations', ['captain_id'], unique=False)
+    op.create_index(op.f('ix_work_allocations_id'), 'work_allocations', ['id'], unique=False)
+    op.create_index(op.f('ix_work_allocations_site_id'), 'work_allocations', ['site_id'], unique=False)
+    op.create_table('work_completions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('captain_id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('summary_date', sa.Date(), nullable=False),
+    sa.Column('carpenter_name', sa.String(), nullable=False),
+    sa.Column('doors_fixed', sa.Integer(), nullable=True),
+    sa.Column('frames_fixed', sa.Integer(), nullable=True),
+    sa.Column('supervisor_approved', sa.Boolean(), nullable=True),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('submitted_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['captain_id'], ['carpenter_captains.id'], ),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_work_completions_captain_id'), 'work_completions', ['captain_id'], unique=False)
+    op.create_index(op.f('ix_work_completions_id'), 'work_completions', ['id'], unique=False)
+    op.create_index(op.f('ix_work_completions_site_id'), 'work_completions', ['site_id'], unique=False)
+    op.create_index(op.f('ix_work_completions_summary_date'), 'work_completions', ['summary_date'], unique=False)
+    op.create_table('contractor_outputs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('output_date', sa.Date(), nullable=False),
+    sa.Column('contractor_id', sa.Integer(), nullable=False),
+    sa.Column('work_order_id', sa.Integer(), nullable=True),
+    sa.Column('production_paper_id', sa.Integer(), nullable=False),
+    sa.Column('product_type', sa.String(), nullable=False),
+    sa.Column('stage', sa.String(), nullable=True),
+    sa.Column('completed_quantity', sa.Integer(), nullable=False),
+    sa.Column('rework_quantity', sa.Integer(), nullable=False),
+    sa.Column('rejected_quantity', sa.Integer(), nullable=False),
+    sa.Column('qc_approved_quantity', sa.Integer(), nullable=False),
+    sa.Column('supervisor_approval', sa.Boolean(), nullable=False),
+    sa.Column('supervisor_approved_by', sa.Integer(), nullable=True),
+    sa.Column('supervisor_approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('payable_quantity', sa.Integer(), nullable=False),
+    sa.Column('payable_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['contractor_id'], ['contractors.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.ForeignKeyConstraint(['supervisor_approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['work_order_id'], ['contractor_work_orders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_contractor_outputs_contractor_id'), 'contractor_outputs', ['contractor_id'], unique=False)
+    op.create_index(op.f('ix_contractor_outputs_id'), 'contractor_outputs', ['id'], unique=False)
+    op.create_index(op.f('ix_contractor_outputs_production_paper_id'), 'contractor_outputs', ['production_paper_id'], unique=False)
+    op.create_index(op.f('ix_contractor_outputs_work_order_id'), 'contractor_outputs', ['work_order_id'], unique=False)
+    op.create_table('delivery_challans',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('dc_number', sa.String(), nullable=False),
+    sa.Column('billing_request_id', sa.Integer(), nullable=False),
+    sa.Column('dispatch_request_no', sa.String(), nullable=False),
+    sa.Column('party_id', sa.Integer(), nullable=False),
+    sa.Column('party_name', sa.String(), nullable=False),
+    sa.Column('delivery_address', sa.Text(), nullable=False),
+    sa.Column('vehicle_no', sa.String(), nullable=True),
+    sa.Column('driver_name', sa.String(), nullable=True),
+    sa.Column('dc_date', sa.Date(), nullable=False),
+    sa.Column('line_items', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['billing_request_id'], ['billing_requests.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_delivery_challans_billing_request_id'), 'delivery_challans', ['billing_request_id'], unique=False)
+    op.create_index(op.f('ix_delivery_challans_dc_number'), 'delivery_challans', ['dc_number'], unique=True)
+    op.create_index(op.f('ix_delivery_challans_dispatch_request_no'), 'delivery_challans', ['dispatch_request_no'], unique=False)
+    op.create_index(op.f('ix_delivery_challans_id'), 'delivery_challans', ['id'], unique=False)
+    op.create_table('follow_ups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('lead_id', sa.Integer(), nullable=True),
+    sa.Column('sales_order_id', sa.Integer(), nullable=True),
+    sa.Column('party_id', sa.Integer(), nullable=True),
+    sa.Column('follow_up_type', sa.String(), nullable=False),
+    sa.Column('follow_up_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('subject', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('call_duration', sa.String(), nullable=True),
+    sa.Column('email_sent', sa.Boolean(), nullable=True),
+    sa.Column('whatsapp_sent', sa.Boolean(), nullable=True),
+    sa.Column('outcome', sa.String(), nullable=True),
+    sa.Column('next_follow_up_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['lead_id'], ['leads.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.ForeignKeyConstraint(['sales_order_id'], ['sales_orders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_follow_ups_id'), 'follow_ups', ['id'], unique=False)
+    op.create_index(op.f('ix_follow_ups_lead_id'), 'follow_ups', ['lead_id'], unique=False)
+    op.create_index(op.f('ix_follow_ups_party_id'), 'follow_ups', ['party_id'], unique=False)
+    op.create_index(op.f('ix_follow_ups_sales_order_id'), 'follow_ups', ['sales_order_id'], unique=False)
+    op.create_table('measurement_requests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('request_number', sa.String(), nullable=False),
+    sa.Column('sales_order_id', sa.Integer(), nullable=False),
+    sa.Column('sales_order_number', sa.String(), nullable=False),
+    sa.Column('party_id', sa.Integer(), nullable=False),
+    sa.Column('party_name', sa.String(), nullable=False),
+    sa.Column('site_project_id', sa.Integer(), nullable=True),
+    sa.Column('preferred_measurement_date', sa.Date(), nullable=True),
+    sa.Column('preferred_measurement_time', sa.String(), nullable=True),
+    sa.Column('site_address', sa.Text(), nullable=True),
+    sa.Column('site_contact_person', sa.String(), nullable=True),
+    sa.Column('site_contact_mobile', sa.String(), nullable=True),
+    sa.Column('assigned_engineer_id', sa.Integer(), nullable=True),
+    sa.Column('assigned_engineer_name', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('measurement_id', sa.Integer(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['assigned_engineer_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['measurement_id'], ['measurements.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.ForeignKeyConstraint(['sales_order_id'], ['sales_orders.id'], ),
+    sa.ForeignKeyConstraint(['site_project_id'], ['site_projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_measurement_requests_id'), 'measurement_requests', ['id'], unique=False)
+    op.create_index(op.f('ix_measurement_requests_request_number'), 'measurement_requests', ['request_number'], unique=True)
+    op.create_index(op.f('ix_measurement_requests_sales_order_id'), 'measurement_requests', ['sales_order_id'], unique=False)
+    op.create_table('orders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('order_number', sa.String(), nullable=False),
+    sa.Column('raw_material_check_id', sa.Integer(), nullable=True),
+    sa.Column('supplier_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('product_name', sa.String(), nullable=False),
+    sa.Column('quantity', sa.Float(), nullable=False),
+    sa.Column('unit', sa.String(), nullable=False),
+    sa.Column('unit_price', sa.Float(), nullable=True),
+    sa.Column('total_amount', sa.Float(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('order_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('expected_delivery_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('actual_delivery_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('invoice_number', sa.String(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['raw_material_categories.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['raw_material_check_id'], ['raw_material_checks.id'], ),
+    sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_orders_category_id'), 'orders', ['category_id'], unique=False)
+    op.create_index(op.f('ix_orders_id'), 'orders', ['id'], unique=False)
+    op.create_index(op.f('ix_orders_order_number'), 'orders', ['order_number'], unique=True)
+    op.create_table('production_tasks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('schedule_id', sa.Integer(), nullable=False),
+    sa.Column('department_id', sa.Integer(), nullable=False),
+    sa.Column('supervisor_id', sa.Integer(), nullable=True),
+    sa.Column('supervisor_type', sa.String(), nullable=True),
+    sa.Column('production_paper_no', sa.String(), nullable=False),
+    sa.Column('party_name', sa.String(), nullable=True),
+    sa.Column('product_type', sa.String(), nullable=True),
+    sa.Column('order_type', sa.String(), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('planned_start_date', sa.Date(), nullable=True),
+    sa.Column('planned_end_date', sa.Date(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('start_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('expected_end_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('actual_end_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('quantity_completed', sa.Integer(), nullable=False),
+    sa.Column('balance_quantity', sa.Integer(), nullable=False),
+    sa.Column('rework_qty', sa.Integer(), nullable=False),
+    sa.Column('rejection_reason', sa.Text(), nullable=True),
+    sa.Column('on_hold_reason', sa.Text(), nullable=True),
+    sa.Column('paused_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('resumed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('quality_status', sa.String(), nullable=True),
+    sa.Column('accepted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
+    sa.ForeignKeyConstraint(['schedule_id'], ['production_schedules.id'], ),
+    sa.ForeignKeyConstraint(['supervisor_id'], ['production_supervisors.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_production_tasks_department_id'), 'production_tasks', ['department_id'], unique=False)
+    op.create_index(op.f('ix_production_tasks_id'), 'production_tasks', ['id'], unique=False)
+    op.create_index(op.f('ix_production_tasks_production_paper_no'), 'production_tasks', ['production_paper_no'], unique=False)
+    op.create_index(op.f('ix_production_tasks_schedule_id'), 'production_tasks', ['schedule_id'], unique=False)
+    op.create_index(op.f('ix_production_tasks_supervisor_id'), 'production_tasks', ['supervisor_id'], unique=False)
+    op.create_index(op.f('ix_production_tasks_supervisor_type'), 'production_tasks', ['supervisor_type'], unique=False)
+    op.create_table('production_issues',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_no', sa.String(), nullable=False),
+    sa.Column('department_id', sa.Integer(), nullable=False),
+    sa.Column('issue_type', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('photo_url', sa.Text(), nullable=True),
+    sa.Column('severity', sa.String(), nullable=False),
+    sa.Column('affected_quantity', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('assigned_to', sa.String(), nullable=True),
+    sa.Column('resolution_remarks', sa.Text(), nullable=True),
+    sa.Column('downtime_hours', sa.Float(), nullable=True),
+    sa.Column('reported_by', sa.Integer(), nullable=False),
+    sa.Column('reported_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('resolved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
+    sa.ForeignKeyConstraint(['reported_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['task_id'], ['production_tasks.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_production_issues_department_id'), 'production_issues', ['department_id'], unique=False)
+    op.create_index(op.f('ix_production_issues_id'), 'production_issues', ['id'], unique=False)
+    op.create_index(op.f('ix_production_issues_production_paper_no'), 'production_issues', ['production_paper_no'], unique=False)
+    op.create_index(op.f('ix_production_issues_task_id'), 'production_issues', ['task_id'], unique=False)
+    op.create_table('task_progress',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('quantity_completed', sa.Integer(), nullable=False),
+    sa.Column('rework_qty', sa.Integer(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('updated_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['task_id'], ['production_tasks.id'], ),
+    sa.ForeignKeyConstraint(['updated_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_task_progress_id'), 'task_progress', ['id'], unique=False)
+    op.create_index(op.f('ix_task_progress_task_id'), 'task_progress', ['task_id'], unique=False)
+    op.create_table('tax_invoices',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('invoice_number', sa.String(), nullable=False),
+    sa.Column('billing_request_id', sa.Integer(), nullable=False),
+    sa.Column('delivery_challan_id', sa.Integer(), nullable=True),
+    sa.Column('dispatch_request_no', sa.String(), nullable=False),
+    sa.Column('party_id', sa.Integer(), nullable=False),
+    sa.Column('party_name', sa.String(), nullable=False),
+    sa.Column('party_gstin', sa.String(), nullable=True),
+    sa.Column('place_of_supply', sa.String(), nullable=False),
+    sa.Column('state_code', sa.String(), nullable=True),
+    sa.Column('invoice_date', sa.Date(), nullable=False),
+    sa.Column('payment_terms', sa.String(), nullable=True),
+    sa.Column('dc_reference', sa.String(), nullable=True),
+    sa.Column('line_items', sa.Text(), nullable=False),
+    sa.Column('subtotal', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('cgst_total', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('sgst_total', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('igst_total', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('freight', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('round_off', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('grand_total', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('credit_limit_check', sa.Boolean(), nullable=False),
+    sa.Column('credit_limit_exceeded', sa.Boolean(), nullable=False),
+    sa.Column('outstanding_amount', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['billing_request_id'], ['billing_requests.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['delivery_challan_id'], ['delivery_challans.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tax_invoices_billing_request_id'), 'tax_invoices', ['billing_request_id'], unique=False)
+    op.create_index(op.f('ix_tax_invoices_delivery_challan_id'), 'tax_invoices', ['delivery_challan_id'], unique=False)
+    op.create_index(op.f('ix_tax_invoices_dispatch_request_no'), 'tax_invoices', ['dispatch_request_no'], unique=False)
+    op.create_index(op.f('ix_tax_invoices_id'), 'tax_invoices', ['id'], unique=False)
+    op.create_index(op.f('ix_tax_invoices_invoice_number'), 'tax_invoices', ['invoice_number'], unique=True)
+    op.create_table('account_receivables',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tax_invoice_id', sa.Integer(), nullable=False),
+    sa.Column('invoice_number', sa.String(), nullable=False),
+    sa.Column('invoice_date', sa.Date(), nullable=False),
+    sa.Column('invoice_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('party_id', sa.Integer(), nullable=False),
+    sa.Column('party_name', sa.String(), nullable=False),
+    sa.Column('payment_terms', sa.String(), nullable=True),
+    sa.Column('due_date', sa.Date(), nullable=True),
+    sa.Column('total_paid', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('outstanding_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('days_overdue', sa.Integer(), nullable=True),
+    sa.Column('aging_bucket', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('last_payment_date', sa.Date(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.ForeignKeyConstraint(['tax_invoice_id'], ['tax_invoices.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_account_receivables_id'), 'account_receivables', ['id'], unique=False)
+    op.create_index(op.f('ix_account_receivables_invoice_number'), 'account_receivables', ['invoice_number'], unique=False)
+    op.create_index(op.f('ix_account_receivables_party_id'), 'account_receivables', ['party_id'], unique=False)
+    op.create_index(op.f('ix_account_receivables_tax_invoice_id'), 'account_receivables', ['tax_invoice_id'], unique=True)
+    op.create_table('dispatches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('dispatch_number', sa.String(), nullable=False),
+    sa.Column('dispatch_request_no', sa.String(), nullable=True),
+    sa.Column('production_paper_id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_number', sa.String(), nullable=False),
+    sa.Column('billing_request_id', sa.Integer(), nullable=True),
+    sa.Column('delivery_challan_id', sa.Integer(), nullable=True),
+    sa.Column('tax_invoice_id', sa.Integer(), nullable=True),
+    sa.Column('dc_number', sa.String(), nullable=True),
+    sa.Column('invoice_number', sa.String(), nullable=True),
+    sa.Column('party_id', sa.Integer(), nullable=False),
+    sa.Column('party_name', sa.String(), nullable=False),
+    sa.Column('delivery_address', sa.Text(), nullable=False),
+    sa.Column('dispatch_date', sa.Date(), nullable=False),
+    sa.Column('expected_delivery_date', sa.Date(), nullable=True),
+    sa.Column('vehicle_type', sa.String(), nullable=False),
+    sa.Column('vehicle_no', sa.String(), nullable=False),
+    sa.Column('driver_name', sa.String(), nullable=True),
+    sa.Column('driver_mobile', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('qc_approved', sa.Boolean(), nullable=False),
+    sa.Column('billing_approved', sa.Boolean(), nullable=False),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('dispatched_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['billing_request_id'], ['billing_requests.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['delivery_challan_id'], ['delivery_challans.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.ForeignKeyConstraint(['tax_invoice_id'], ['tax_invoices.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_dispatches_billing_request_id'), 'dispatches', ['billing_request_id'], unique=False)
+    op.create_index(op.f('ix_dispatches_dc_number'), 'dispatches', ['dc_number'], unique=False)
+    op.create_index(op.f('ix_dispatches_delivery_challan_id'), 'dispatches', ['delivery_challan_id'], unique=False)
+    op.create_index(op.f('ix_dispatches_dispatch_number'), 'dispatches', ['dispatch_number'], unique=True)
+    op.create_index(op.f('ix_dispatches_dispatch_request_no'), 'dispatches', ['dispatch_request_no'], unique=False)
+    op.create_index(op.f('ix_dispatches_id'), 'dispatches', ['id'], unique=False)
+    op.create_index(op.f('ix_dispatches_invoice_number'), 'dispatches', ['invoice_number'], unique=False)
+    op.create_index(op.f('ix_dispatches_party_id'), 'dispatches', ['party_id'], unique=False)
+    op.create_index(op.f('ix_dispatches_production_paper_id'), 'dispatches', ['production_paper_id'], unique=False)
+    op.create_index(op.f('ix_dispatches_production_paper_number'), 'dispatches', ['production_paper_number'], unique=False)
+    op.create_index(op.f('ix_dispatches_tax_invoice_id'), 'dispatches', ['tax_invoice_id'], unique=False)
+    op.create_table('payment_receipts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('receipt_number', sa.String(), nullable=False),
+    sa.Column('tax_invoice_id', sa.Integer(), nullable=True),
+    sa.Column('party_id', sa.Integer(), nullable=False),
+    sa.Column('party_name', sa.String(), nullable=False),
+    sa.Column('payment_date', sa.Date(), nullable=False),
+    sa.Column('payment_method', sa.String(), nullable=False),
+    sa.Column('payment_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('bank_name', sa.String(), nullable=True),
+    sa.Column('cheque_number', sa.String(), nullable=True),
+    sa.Column('transaction_reference', sa.String(), nullable=True),
+    sa.Column('bank_account', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('cleared_date', sa.Date(), nullable=True),
+    sa.Column('bounced_date', sa.Date(), nullable=True),
+    sa.Column('bounce_reason', sa.Text(), nullable=True),
+    sa.Column('allocated_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('unallocated_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['party_id'], ['parties.id'], ),
+    sa.ForeignKeyConstraint(['tax_invoice_id'], ['tax_invoices.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_payment_receipts_id'), 'payment_receipts', ['id'], unique=False)
+    op.create_index(op.f('ix_payment_receipts_party_id'), 'payment_receipts', ['party_id'], unique=False)
+    op.create_index(op.f('ix_payment_receipts_receipt_number'), 'payment_receipts', ['receipt_number'], unique=True)
+    op.create_index(op.f('ix_payment_receipts_tax_invoice_id'), 'payment_receipts', ['tax_invoice_id'], unique=False)
+    op.create_table('tally_syncs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tax_invoice_id', sa.Integer(), nullable=False),
+    sa.Column('sync_type', sa.String(), nullable=False),
+    sa.Column('sync_status', sa.String(), nullable=False),
+    sa.Column('sync_method', sa.String(), nullable=False),
+    sa.Column('export_data', sa.Text(), nullable=True),
+    sa.Column('import_data', sa.Text(), nullable=True),
+    sa.Column('tally_response', sa.Text(), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('retry_count', sa.Integer(), nullable=False),
+    sa.Column('last_retry_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('synced_by', sa.Integer(), nullable=True),
+    sa.Column('synced_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['synced_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['tax_invoice_id'], ['tax_invoices.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tally_syncs_id'), 'tally_syncs', ['id'], unique=False)
+    op.create_index(op.f('ix_tally_syncs_tax_invoice_id'), 'tally_syncs', ['tax_invoice_id'], unique=False)
+    op.create_table('bank_statement_lines',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('statement_id', sa.Integer(), nullable=False),
+    sa.Column('line_number', sa.Integer(), nullable=False),
+    sa.Column('transaction_date', sa.Date(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('reference', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('payment_receipt_id', sa.Integer(), nullable=True),
+    sa.Column('match_type', sa.String(), nullable=True),
+    sa.Column('match_score', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('reconciliation_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['payment_receipt_id'], ['payment_receipts.id'], ),
+    sa.ForeignKeyConstraint(['reconciliation_id'], ['account_reconciliations.id'], ),
+    sa.ForeignKeyConstraint(['statement_id'], ['bank_statements.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_bank_statement_lines_id'), 'bank_statement_lines', ['id'], unique=False)
+    op.create_index(op.f('ix_bank_statement_lines_payment_receipt_id'), 'bank_statement_lines', ['payment_receipt_id'], unique=False)
+    op.create_index(op.f('ix_bank_statement_lines_reconciliation_id'), 'bank_statement_lines', ['reconciliation_id'], unique=False)
+    op.create_index(op.f('ix_bank_statement_lines_statement_id'), 'bank_statement_lines', ['statement_id'], unique=False)
+    op.create_table('delivery_issues',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('dispatch_id', sa.Integer(), nullable=False),
+    sa.Column('dispatch_number', sa.String(), nullable=False),
+    sa.Column('issue_type', sa.String(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('severity', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('resolution_notes', sa.Text(), nullable=True),
+    sa.Column('resolved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('issue_photo_url', sa.Text(), nullable=True),
+    sa.Column('reported_by', sa.Integer(), nullable=False),
+    sa.Column('reviewed_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['dispatch_id'], ['dispatches.id'], ),
+    sa.ForeignKeyConstraint(['reported_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['reviewed_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_delivery_issues_dispatch_id'), 'delivery_issues', ['dispatch_id'], unique=False)
+    op.create_index(op.f('ix_delivery_issues_dispatch_number'), 'delivery_issues', ['dispatch_number'], unique=False)
+    op.create_index(op.f('ix_delivery_issues_id'), 'delivery_issues', ['id'], unique=False)
+    op.create_table('delivery_tracking',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('dispatch_id', sa.Integer(), nullable=False),
+    sa.Column('dispatch_number', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('delivered_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('receiver_name', sa.String(), nullable=True),
+    sa.Column('receiver_mobile', sa.String(), nullable=True),
+    sa.Column('pod_photo_url', sa.Text(), nullable=True),
+    sa.Column('pod_signature_url', sa.Text(), nullable=True),
+    sa.Column('shortage_remarks', sa.Text(), nullable=True),
+    sa.Column('damage_remarks', sa.Text(), nullable=True),
+    sa.Column('delay_reason', sa.Text(), nullable=True),
+    sa.Column('expected_delivery_date', sa.Date(), nullable=True),
+    sa.Column('actual_delivery_date', sa.Date(), nullable=True),
+    sa.Column('updated_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['dispatch_id'], ['dispatches.id'], ),
+    sa.ForeignKeyConstraint(['updated_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_delivery_tracking_dispatch_id'), 'delivery_tracking', ['dispatch_id'], unique=True)
+    op.create_index(op.f('ix_delivery_tracking_dispatch_number'), 'delivery_tracking', ['dispatch_number'], unique=False)
+    op.create_index(op.f('ix_delivery_tracking_id'), 'delivery_tracking', ['id'], unique=False)
+    op.create_table('dispatch_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('dispatch_id', sa.Integer(), nullable=False),
+    sa.Column('product_type', sa.String(), nullable=False),
+    sa.Column('product_description', sa.String(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('packaging_type', sa.String(), nullable=True),
+    sa.Column('weight', sa.Float(), nullable=True),
+    sa.Column('volume', sa.Float(), nullable=True),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['dispatch_id'], ['dispatches.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_dispatch_items_dispatch_id'), 'dispatch_items', ['dispatch_id'], unique=False)
+    op.create_index(op.f('ix_dispatch_items_id'), 'dispatch_items', ['id'], unique=False)
+    op.create_table('gate_passes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('gate_pass_number', sa.String(), nullable=False),
+    sa.Column('dispatch_id', sa.Integer(), nullable=False),
+    sa.Column('dispatch_number', sa.String(), nullable=False),
+    sa.Column('vehicle_no', sa.String(), nullable=False),
+    sa.Column('driver_name', sa.String(), nullable=True),
+    sa.Column('driver_mobile', sa.String(), nullable=True),
+    sa.Column('item_summary', sa.Text(), nullable=False),
+    sa.Column('verified_by', sa.Integer(), nullable=True),
+    sa.Column('time_out', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('verified', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('verified_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['dispatch_id'], ['dispatches.id'], ),
+    sa.ForeignKeyConstraint(['verified_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_gate_passes_dispatch_id'), 'gate_passes', ['dispatch_id'], unique=True)
+    op.create_index(op.f('ix_gate_passes_dispatch_number'), 'gate_passes', ['dispatch_number'], unique=False)
+    op.create_index(op.f('ix_gate_passes_gate_pass_number'), 'gate_passes', ['gate_pass_number'], unique=True)
+    op.create_index(op.f('ix_gate_passes_id'), 'gate_passes', ['id'], unique=False)
+    op.create_table('logistics_assignments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('dispatch_id', sa.Integer(), nullable=False),
+    sa.Column('dispatch_number', sa.String(), nullable=False),
+    sa.Column('vehicle_id', sa.Integer(), nullable=False),
+    sa.Column('vehicle_no', sa.String(), nullable=False),
+    sa.Column('driver_id', sa.Integer(), nullable=False),
+    sa.Column('driver_name', sa.String(), nullable=False),
+    sa.Column('driver_mobile', sa.String(), nullable=False),
+    sa.Column('planned_delivery_date', sa.Date(), nullable=False),
+    sa.Column('route_area', sa.String(), nullable=True),
+    sa.Column('assignment_notes', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('assigned_by', sa.Integer(), nullable=False),
+    sa.Column('assigned_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['assigned_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['dispatch_id'], ['dispatches.id'], ),
+    sa.ForeignKeyConstraint(['driver_id'], ['drivers.id'], ),
+    sa.ForeignKeyConstraint(['vehicle_id'], ['vehicles.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_logistics_assignments_dispatch_id'), 'logistics_assignments', ['dispatch_id'], unique=True)
+    op.create_index(op.f('ix_logistics_assignments_dispatch_number'), 'logistics_assignments', ['dispatch_number'], unique=False)
+    op.create_index(op.f('ix_logistics_assignments_driver_id'), 'logistics_assignments', ['driver_id'], unique=False)
+    op.create_index(op.f('ix_logistics_assignments_id'), 'logistics_assignments', ['id'], unique=False)
+    op.create_index(op.f('ix_logistics_assignments_vehicle_id'), 'logistics_assignments', ['vehicle_id'], unique=False)
+    op.create_table('payment_allocations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('payment_receipt_id', sa.Integer(), nullable=False),
+    sa.Column('tax_invoice_id', sa.Integer(), nullable=False),
+    sa.Column('allocated_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('allocation_date', sa.Date(), nullable=False),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['payment_receipt_id'], ['payment_receipts.id'], ),
+    sa.ForeignKeyConstraint(['tax_invoice_id'], ['tax_invoices.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_payment_allocations_id'), 'payment_allocations', ['id'], unique=False)
+    op.create_index(op.f('ix_payment_allocations_payment_receipt_id'), 'payment_allocations', ['payment_receipt_id'], unique=False)
+    op.create_index(op.f('ix_payment_allocations_tax_invoice_id'), 'payment_allocations', ['tax_invoice_id'], unique=False)
+    op.create_table('purchase_returns',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('return_number', sa.String(), nullable=False),
+    sa.Column('po_id', sa.Integer(), nullable=False),
+    sa.Column('po_number', sa.String(), nullable=False),
+    sa.Column('grn_id', sa.Integer(), nullable=True),
+    sa.Column('grn_number', sa.String(), nullable=True),
+    sa.Column('vendor_id', sa.Integer(), nullable=False),
+    sa.Column('vendor_name', sa.String(), nullable=False),
+    sa.Column('material_category', sa.String(), nullable=False),
+    sa.Column('material_name', sa.String(), nullable=False),
+    sa.Column('specification', sa.Text(), nullable=True),
+    sa.Column('return_quantity', sa.Float(), nullable=False),
+    sa.Column('unit', sa.String(), nullable=False),
+    sa.Column('return_reason', sa.String(), nullable=False),
+    sa.Column('return_description', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('vendor_notified', sa.Boolean(), nullable=False),
+    sa.Column('vendor_notified_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('stock_updated', sa.Boolean(), nullable=False),
+    sa.Column('stock_updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['grn_id'], ['grns.id'], ),
+    sa.ForeignKeyConstraint(['po_id'], ['purchase_orders.id'], ),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_purchase_returns_grn_id'), 'purchase_returns', ['grn_id'], unique=False)
+    op.create_index(op.f('ix_purchase_returns_id'), 'purchase_returns', ['id'], unique=False)
+    op.create_index(op.f('ix_purchase_returns_po_id'), 'purchase_returns', ['po_id'], unique=False)
+    op.create_index(op.f('ix_purchase_returns_return_number'), 'purchase_returns', ['return_number'], unique=True)
+    op.create_index(op.f('ix_purchase_returns_vendor_id'), 'purchase_returns', ['vendor_id'], unique=False)
+    op.create_table('rework_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('rework_number', sa.String(), nullable=False),
+    sa.Column('quality_check_id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_number', sa.String(), nullable=False),
+    sa.Column('rework_reason', sa.Text(), nullable=False),
+    sa.Column('defect_description', sa.Text(), nullable=True),
+    sa.Column('assigned_department', sa.String(), nullable=False),
+    sa.Column('assigned_to', sa.Integer(), nullable=True),
+    sa.Column('target_completion_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('completed_by', sa.Integer(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completion_notes', sa.Text(), nullable=True),
+    sa.Column('re_qc_required', sa.Boolean(), nullable=False),
+    sa.Column('re_qc_id', sa.Integer(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['assigned_to'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['completed_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.ForeignKeyConstraint(['quality_check_id'], ['quality_checks.id'], ),
+    sa.ForeignKeyConstraint(['re_qc_id'], ['quality_checks.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_rework_jobs_id'), 'rework_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_rework_jobs_production_paper_id'), 'rework_jobs', ['production_paper_id'], unique=False)
+    op.create_index(op.f('ix_rework_jobs_production_paper_number'), 'rework_jobs', ['production_paper_number'], unique=False)
+    op.create_index(op.f('ix_rework_jobs_quality_check_id'), 'rework_jobs', ['quality_check_id'], unique=False)
+    op.create_index(op.f('ix_rework_jobs_rework_number'), 'rework_jobs', ['rework_number'], unique=True)
+
+    # Foreign keys closing the purchase / quality check reference cycles
+    with op.batch_alter_table('grns') as batch_op:
+        batch_op.create_foreign_key('fk_grns_purchase_return_id', 'purchase_returns', ['purchase_return_id'], ['id'])
+    with op.batch_alter_table('purchase_requisitions') as batch_op:
+        batch_op.create_foreign_key('fk_purchase_requisitions_po_id', 'purchase_orders', ['po_id'], ['id'])
+    with op.batch_alter_table('quality_checks') as batch_op:
+        batch_op.create_foreign_key('fk_quality_checks_rework_job_id', 'rework_jobs', ['rework_job_id'], ['id'])
+
+
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('grns') as batch_op:
+        batch_op.drop_constraint('fk_grns_purchase_return_id', type_='foreignkey')
+    with op.batch_alter_table('purchase_requisitions') as batch_op:
+        batch_op.drop_constraint('fk_purchase_requisitions_po_id', type_='foreignkey')
+    with op.batch_alter_table('quality_checks') as batch_op:
+        batch_op.drop_constraint('fk_quality_checks_rework_job_id', type_='foreignkey')
+    op.drop_index(op.f('ix_rework_jobs_rework_number'), table_name='rework_jobs')
+    op.drop_index(op.f('ix_rework_jobs_quality_check_id'), table_name='rework_jobs')
+    op.drop_index(op.f('ix_rework_jobs_production_paper_number'), table_name='rework_jobs')
+    op.drop_index(op.f('ix_rework_jobs_production_paper_id'), table_name='rework_jobs')
+    op.drop_index(op.f('ix_rework_jobs_id'), table_name='rework_jobs')
+    op.drop_table('rework_jobs')
+    op.drop_index(op.f('ix_purchase_returns_vendor_id'), table_name='purchase_returns')
+    op.drop_index(op.f('ix_purchase_returns_return_number'), table_name='purchase_returns')
+    op.drop_index(op.f('ix_purchase_returns_po_id'), table_name='purchase_returns')
+    op.drop_index(op.f('ix_purchase_returns_id'), table_name='purchase_returns')
+    op.drop_index(op.f('ix_purchase_returns_grn_id'), table_name='purchase_returns')
+    op.drop_table('purchase_returns')
+    op.drop_index(op.f('ix_payment_allocations_tax_invoice_id'), table_name='payment_allocations')
+    op.drop_index(op.f('ix_payment_allocations_payment_receipt_id'), table_name='payment_allocations')
+    op.drop_index(op.f('ix_payment_allocations_id'), table_name='payment_allocations')
+    op.drop_table('payment_allocations')
+    op.drop_index(op.f('ix_logistics_assignments_vehicle_id'), table_name='logistics_assignments')
+    op.drop_index(op.f('ix_logistics_assignments_id'), table_name='logistics_assignments')
+    op.drop_index(op.f('ix_logistics_assignments_driver_id'), table_name='logistics_assignments')
+    op.drop_index(op.f('ix_logistics_assignments_dispatch_number'), table_name='logistics_assignments')
+    op.drop_index(op.f('ix_logistics_assignments_dispatch_id'), table_name='logistics_assignments')
+    op.drop_table('logistics_assignments')
+    op.drop_index(op.f('ix_gate_passes_id'), table_name='gate_passes')
+    op.drop_index(op.f('ix_gate_passes_gate_pass_number'), table_name='gate_passes')
+    op.drop_index(op.f('ix_gate_passes_dispatch_number'), table_name='gate_passes')
+    op.drop_index(op.f('ix_gate_passes_dispatch_id'), table_name='gate_passes')
+    op.drop_table('gate_passes')
+    op.drop_index(op.f('ix_dispatch_items_id'), table_name='dispatch_items')
+    op.drop_index(op.f('ix_dispatch_items_dispatch_id'), table_name='dispatch_items')
+    op.drop_table('dispatch_items')
+    op.drop_index(op.f('ix_delivery_tracking_id'), table_name='delivery_tracking')
+    op.drop_index(op.f('ix_delivery_tracking_dispatch_number'), table_name='delivery_tracking')
+    op.drop_index(op.f('ix_delivery_tracking_dispatch_id'), table_name='delivery_tracking')
+    op.drop_table('delivery_tracking')
+    op.drop_index(op.f('ix_delivery_issues_id'), table_name='delivery_issues')
+    op.drop_index(op.f('ix_delivery_issues_dispatch_number'), table_name='delivery_issues')
+    op.drop_index(op.f('ix_delivery_issues_dispatch_id'), table_name='delivery_issues')
+    op.drop_table('delivery_issues')
+    op.drop_index(op.f('ix_bank_statement_lines_statement_id'), table_name='bank_statement_lines')
+    op.drop_index(op.f('ix_bank_statement_lines_reconciliation_id'), table_name='bank_statement_lines')
+    op.drop_index(op.f('ix_bank_statement_lines_payment_receipt_id'), table_name='bank_statement_lines')
+    op.drop_index(op.f('ix_bank_statement_lines_id'), table_name='bank_statement_lines')
+    op.drop_table('bank_statement_lines')
+    op.drop_index(op.f('ix_tally_syncs_tax_invoice_id'), table_name='tally_syncs')
+    op.drop_index(op.f('ix_tally_syncs_id'), table_name='tally_syncs')
+    op.drop_table('tally_syncs')
+    op.drop_index(op.f('ix_payment_receipts_tax_invoice_id'), table_name='payment_receipts')
+    op.drop_index(op.f('ix_payment_receipts_receipt_number'), table_name='payment_receipts')
+    op.drop_index(op.f('ix_payment_receipts_party_id'), table_name='payment_receipts')
+    op.drop_index(op.f('ix_payment_receipts_id'), table_name='payment_receipts')
+    op.drop_table('payment_receipts')
+    op.drop_index(op.f('ix_dispatches_tax_invoice_id'), table_name='dispatches')
+    op.drop_index(op.f('ix_dispatches_production_paper_number'), table_name='dispatches')
+    op.drop_index(op.f('ix_dispatches_production_paper_id'), table_name='dispatches')
+    op.drop_index(op.f('ix_dispatches_party_id'), table_name='dispatches')
+    op.drop_index(op.f('ix_dispatches_invoice_number'), table_name='dispatches')
+    op.drop_index(op.f('ix_dispatches_id'), table_name='dispatches')
+    op.drop_index(op.f('ix_dispatches_dispatch_request_no'), table_name='dispatches')
+    op.drop_index(op.f('ix_dispatches_dispatch_number'), table_name='dispatches')
+    op.drop_index(op.f('ix_dispatches_delivery_challan_id'), table_name='dispatches')
+    op.drop_index(op.f('ix_dispatches_dc_number'), table_name='dispatches')
+    op.drop_index(op.f('ix_dispatches_billing_request_id'), table_name='dispatches')
+    op.drop_table('dispatches')
+    op.drop_index(op.f('ix_account_receivables_tax_invoice_id'), table_name='account_receivables')
+    op.drop_index(op.f('ix_account_receivables_party_id'), table_name='account_receivables')
+    op.drop_index(op.f('ix_account_receivables_invoice_number'), table_name='account_receivables')
+    op.drop_index(op.f('ix_account_receivables_id'), table_name='account_receivables')
+    op.drop_table('account_receivables')
+    op.drop_index(op.f('ix_tax_invoices_invoice_number'), table_name='tax_invoices')
+    op.drop_index(op.f('ix_tax_invoices_id'), table_name='tax_invoices')
+    op.drop_index(op.f('ix_tax_invoices_dispatch_request_no'), table_name='tax_invoices')
+    op.drop_index(op.f('ix_tax_invoices_delivery_challan_id'), table_name='tax_invoices')
+    op.drop_index(op.f('ix_tax_invoices_billing_request_id'), table_name='tax_invoices')
+    op.drop_table('tax_invoices')
+    op.drop_index(op.f('ix_task_progress_task_id'), table_name='task_progress')
+    op.drop_index(op.f('ix_task_progress_id'), table_name='task_progress')
+    op.drop_table('task_progress')
+    op.drop_index(op.f('ix_production_issues_task_id'), table_name='production_issues')
+    op.drop_index(op.f('ix_production_issues_production_paper_no'), table_name='production_issues')
+    op.drop_index(op.f('ix_production_issues_id'), table_name='production_issues')
+    op.drop_index(op.f('ix_production_issues_department_id'), table_name='production_issues')
+    op.drop_table('production_issues')
+    op.drop_index(op.f('ix_production_tasks_supervisor_type'), table_name='production_tasks')
+    op.drop_index(op.f('ix_production_tasks_supervisor_id'), table_name='production_tasks')
+    op.drop_index(op.f('ix_production_tasks_schedule_id'), table_name='production_tasks')
+    op.drop_index(op.f('ix_production_tasks_production_paper_no'), table_name='production_tasks')
+    op.drop_index(op.f('ix_production_tasks_id'), table_name='production_tasks')
+    op.drop_index(op.f('ix_production_tasks_department_id'), table_name='production_tasks')
+    op.drop_table('production_tasks')
+    op.drop_index(op.f('ix_orders_order_number'), table_name='orders')
+    op.drop_index(op.f('ix_orders_id'), table_name='orders')
+    op.drop_index(op.f('ix_orders_category_id'), table_name='orders')
+    op.drop_table('orders')
+    op.drop_index(op.f('ix_measurement_requests_sales_order_id'), table_name='measurement_requests')
+    op.drop_index(op.f('ix_measurement_requests_request_number'), table_name='measurement_requests')
+    op.drop_index(op.f('ix_measurement_requests_id'), table_name='measurement_requests')
+    op.drop_table('measurement_requests')
+    op.drop_index(op.f('ix_follow_ups_sales_order_id'), table_name='follow_ups')
+    op.drop_index(op.f('ix_follow_ups_party_id'), table_name='follow_ups')
+    op.drop_index(op.f('ix_follow_ups_lead_id'), table_name='follow_ups')
+    op.drop_index(op.f('ix_follow_ups_id'), table_name='follow_ups')
+    op.drop_table('follow_ups')
+    op.drop_index(op.f('ix_delivery_challans_id'), table_name='delivery_challans')
+    op.drop_index(op.f('ix_delivery_challans_dispatch_request_no'), table_name='delivery_challans')
+    op.drop_index(op.f('ix_delivery_challans_dc_number'), table_name='delivery_challans')
+    op.drop_index(op.f('ix_delivery_challans_billing_request_id'), table_name='delivery_challans')
+    op.drop_table('delivery_challans')
+    op.drop_index(op.f('ix_contractor_outputs_work_order_id'), table_name='contractor_outputs')
+    op.drop_index(op.f('ix_contractor_outputs_production_paper_id'), table_name='contractor_outputs')
+    op.drop_index(op.f('ix_contractor_outputs_id'), table_name='contractor_outputs')
+    op.drop_index(op.f('ix_contractor_outputs_contractor_id'), table_name='contractor_outputs')
+    op.drop_table('contractor_outputs')
+    op.drop_index(op.f('ix_work_completions_summary_date'), table_name='work_completions')
+    op.drop_index(op.f('ix_work_completions_site_id'), table_name='work_completions')
+    op.drop_index(op.f('ix_work_completions_id'), table_name='work_completions')
+    op.drop_index(op.f('ix_work_completions_captain_id'), table_name='work_completions')
+    op.drop_table('work_completions')
+    op.drop_index(op.f('ix_work_allocations_site_id'), table_name='work_allocations')
+    op.drop_index(op.f('ix_work_allocations_id'), table_name='work_allocations')
+    op.drop_index(op.f('ix_work_allocations_captain_id'), table_name='work_allocations')
+    op.drop_index(op.f('ix_work_allocations_allocation_date'), table_name='work_allocations')
+    op.drop_table('work_allocations')
+    op.drop_index(op.f('ix_site_photos_site_id'), table_name='site_photos')
+    op.drop_index(op.f('ix_site_photos_id'), table_name='site_photos')
+    op.drop_index(op.f('ix_site_photos_flat_id'), table_name='site_photos')
+    op.drop_table('site_photos')
+    op.drop_index(op.f('ix_site_measurements_site_id'), table_name='site_measurements')
+    op.drop_index(op.f('ix_site_measurements_id'), table_name='site_measurements')
+    op.drop_index(op.f('ix_site_measurements_flat_id'), table_name='site_measurements')
+    op.drop_table('site_measurements')
+    op.drop_index(op.f('ix_site_issues_site_id'), table_name='site_issues')
+    op.drop_index(op.f('ix_site_issues_id'), table_name='site_issues')
+    op.drop_index(op.f('ix_site_issues_flat_id'), table_name='site_issues')
+    op.drop_table('site_issues')
+    op.drop_index(op.f('ix_sales_orders_site_project_id'), table_name='sales_orders')
+    op.drop_index(op.f('ix_sales_orders_quotation_id'), table_name='sales_orders')
+    op.drop_index(op.f('ix_sales_orders_po_number'), table_name='sales_orders')
+    op.drop_index(op.f('ix_sales_orders_party_id'), table_name='sales_orders')
+    op.drop_index(op.f('ix_sales_orders_order_number'), table_name='sales_orders')
+    op.drop_index(op.f('ix_sales_orders_id'), table_name='sales_orders')
+    op.drop_table('sales_orders')
+    op.drop_index(op.f('ix_raw_material_shutter_items_production_paper_id'), table_name='raw_material_shutter_items')
+    op.drop_index(op.f('ix_raw_material_shutter_items_id'), table_name='raw_material_shutter_items')
+    op.drop_table('raw_material_shutter_items')
+    op.drop_index(op.f('ix_raw_material_checks_id'), table_name='raw_material_checks')
+    op.drop_index(op.f('ix_raw_material_checks_check_number'), table_name='raw_material_checks')
+    op.drop_index(op.f('ix_raw_material_checks_category_id'), table_name='raw_material_checks')
+    op.drop_table('raw_material_checks')
+    op.drop_index(op.f('ix_qc_certificates_quality_check_id'), table_name='qc_certificates')
+    op.drop_index(op.f('ix_qc_certificates_production_paper_id'), table_name='qc_certificates')
+    op.drop_index(op.f('ix_qc_certificates_id'), table_name='qc_certificates')
+    op.drop_index(op.f('ix_qc_certificates_certificate_number'), table_name='qc_certificates')
+    op.drop_table('qc_certificates')
+    op.drop_index(op.f('ix_quality_checks_qc_number'), table_name='quality_checks')
+    op.drop_index(op.f('ix_quality_checks_production_paper_number'), table_name='quality_checks')
+    op.drop_index(op.f('ix_quality_checks_production_paper_id'), table_name='quality_checks')
+    op.drop_index(op.f('ix_quality_checks_id'), table_name='quality_checks')
+    op.drop_table('quality_checks')
+    op.drop_index(op.f('ix_production_tracking_production_paper_number'), table_name='production_tracking')
+    op.drop_index(op.f('ix_production_tracking_production_paper_id'), table_name='production_tracking')
+    op.drop_index(op.f('ix_production_tracking_id'), table_name='production_tracking')
+    op.drop_table('production_tracking')
+    op.drop_index(op.f('ix_production_shutter_items_production_paper_id'), table_name='production_shutter_items')
+    op.drop_index(op.f('ix_production_shutter_items_id'), table_name='production_shutter_items')
+    op.drop_table('production_shutter_items')
+    op.drop_index(op.f('ix_production_schedules_production_paper_id'), table_name='production_schedules')
+    op.drop_index(op.f('ix_production_schedules_id'), table_name='production_schedules')
+    op.drop_table('production_schedules')
+    op.drop_index(op.f('ix_order_costings_production_paper_id'), table_name='order_costings')
+    op.drop_index(op.f('ix_order_costings_id'), table_name='order_costings')
+    op.drop_table('order_costings')
+    op.drop_index(op.f('ix_frame_fixings_site_id'), table_name='frame_fixings')
+    op.drop_index(op.f('ix_frame_fixings_id'), table_name='frame_fixings')
+    op.drop_index(op.f('ix_frame_fixings_flat_id'), table_name='frame_fixings')
+    op.drop_table('frame_fixings')
+    op.drop_index(op.f('ix_door_fixings_site_id'), table_name='door_fixings')
+    op.drop_index(op.f('ix_door_fixings_id'), table_name='door_fixings')
+    op.drop_index(op.f('ix_door_fixings_flat_id'), table_name='door_fixings')
+    op.drop_table('door_fixings')
+    op.drop_index(op.f('ix_contractor_work_orders_work_order_number'), table_name='contractor_work_orders')
+    op.drop_index(op.f('ix_contractor_work_orders_production_paper_id'), table_name='contractor_work_orders')
+    op.drop_index(op.f('ix_contractor_work_orders_id'), table_name='contractor_work_orders')
+    op.drop_index(op.f('ix_contractor_work_orders_contractor_id'), table_name='contractor_work_orders')
+    op.drop_table('contractor_work_orders')
+    op.drop_index(op.f('ix_carpenter_issues_site_id'), table_name='carpenter_issues')
+    op.drop_index(op.f('ix_carpenter_issues_id'), table_name='carpenter_issues')
+    op.drop_index(op.f('ix_carpenter_issues_flat_id'), table_name='carpenter_issues')
+    op.drop_index(op.f('ix_carpenter_issues_captain_id'), table_name='carpenter_issues')
+    op.drop_table('carpenter_issues')
+    op.drop_index(op.f('ix_carpenter_frame_fixings_site_id'), table_name='carpenter_frame_fixings')
+    op.drop_index(op.f('ix_carpenter_frame_fixings_id'), table_name='carpenter_frame_fixings')
+    op.drop_index(op.f('ix_carpenter_frame_fixings_flat_id'), table_name='carpenter_frame_fixings')
+    op.drop_index(op.f('ix_carpenter_frame_fixings_captain_id'), table_name='carpenter_frame_fixings')
+    op.drop_table('carpenter_frame_fixings')
+    op.drop_index(op.f('ix_carpenter_door_fixings_site_id'), table_name='carpenter_door_fixings')
+    op.drop_index(op.f('ix_carpenter_door_fixings_id'), table_name='carpenter_door_fixings')
+    op.drop_index(op.f('ix_carpenter_door_fixings_flat_id'), table_name='carpenter_door_fixings')
+    op.drop_index(op.f('ix_carpenter_door_fixings_captain_id'), table_name='carpenter_door_fixings')
+    op.drop_table('carpenter_door_fixings')
+    op.drop_index(op.f('ix_carpenter_attendances_site_id'), table_name='carpenter_attendances')
+    op.drop_index(op.f('ix_carpenter_attendances_id'), table_name='carpenter_attendances')
+    op.drop_index(op.f('ix_carpenter_attendances_captain_id'), table_name='carpenter_attendances')
+    op.drop_index(op.f('ix_carpenter_attendances_attendance_date'), table_name='carpenter_attendances')
+    op.drop_table('carpenter_attendances')
+    op.drop_index(op.f('ix_bom_production_paper_number'), table_name='bom')
+    op.drop_index(op.f('ix_bom_production_paper_id'), table_name='bom')
+    op.drop_index(op.f('ix_bom_id'), table_name='bom')
+    op.drop_table('bom')
+    op.drop_index(op.f('ix_billing_requests_production_paper_number'), table_name='billing_requests')
+    op.drop_index(op.f('ix_billing_requests_production_paper_id'), table_name='billing_requests')
+    op.drop_index(op.f('ix_billing_requests_party_id'), table_name='billing_requests')
+    op.drop_index(op.f('ix_billing_requests_id'), table_name='billing_requests')
+    op.drop_index(op.f('ix_billing_requests_dispatch_request_no'), table_name='billing_requests')
+    op.drop_table('billing_requests')
+    op.drop_index(op.f('ix_vendor_payments_vendor_payable_id'), table_name='vendor_payments')
+    op.drop_index(op.f('ix_vendor_payments_payment_number'), table_name='vendor_payments')
+    op.drop_index(op.f('ix_vendor_payments_id'), table_name='vendor_payments')
+    op.drop_table('vendor_payments')
+    op.drop_index(op.f('ix_site_wing_progress_site_id'), table_name='site_wing_progress')
+    op.drop_index(op.f('ix_site_wing_progress_id'), table_name='site_wing_progress')
+    op.drop_table('site_wing_progress')
+    op.drop_index(op.f('ix_measurement_entries_task_id'), table_name='measurement_entries')
+    op.drop_index(op.f('ix_measurement_entries_measurement_number'), table_name='measurement_entries')
+    op.drop_index(op.f('ix_measurement_entries_id'), table_name='measurement_entries')
+    op.drop_table('measurement_entries')
+    op.drop_index('ix_ledger_entries_reference', table_name='ledger_entries')
+    op.drop_index(op.f('ix_ledger_entries_ledger_id'), table_name='ledger_entries')
+    op.drop_index('ix_ledger_entries_ledger_date', table_name='ledger_entries')
+    op.drop_index(op.f('ix_ledger_entries_id'), table_name='ledger_entries')
+    op.drop_index(op.f('ix_ledger_entries_entry_number'), table_name='ledger_entries')
+    op.drop_table('ledger_entries')
+    op.drop_index(op.f('ix_ledger_balance_snapshots_period_end'), table_name='ledger_balance_snapshots')
+    op.drop_index(op.f('ix_ledger_balance_snapshots_ledger_id'), table_name='ledger_balance_snapshots')
+    op.drop_index(op.f('ix_ledger_balance_snapshots_id'), table_name='ledger_balance_snapshots')
+    op.drop_table('ledger_balance_snapshots')
+    op.drop_index(op.f('ix_flats_wing'), table_name='flats')
+    op.drop_index(op.f('ix_flats_site_id'), table_name='flats')
+    op.drop_index(op.f('ix_flats_id'), table_name='flats')
+    op.drop_index(op.f('ix_flats_floor'), table_name='flats')
+    op.drop_index(op.f('ix_flats_flat_number'), table_name='flats')
+    op.drop_table('flats')
+    op.drop_index(op.f('ix_daily_site_progress_site_id'), table_name='daily_site_progress')
+    op.drop_index(op.f('ix_daily_site_progress_report_date'), table_name='daily_site_progress')
+    op.drop_index(op.f('ix_daily_site_progress_id'), table_name='daily_site_progress')
+    op.drop_table('daily_site_progress')
+    op.drop_index(op.f('ix_carpenter_captains_user_id'), table_name='carpenter_captains')
+    op.drop_index(op.f('ix_carpenter_captains_site_id'), table_name='carpenter_captains')
+    op.drop_index(op.f('ix_carpenter_captains_id'), table_name='carpenter_captains')
+    op.drop_table('carpenter_captains')
+    op.drop_index(op.f('ix_vendor_payables_vendor_id'), table_name='vendor_payables')
+    op.drop_index(op.f('ix_vendor_payables_po_number'), table_name='vendor_payables')
+    op.drop_index(op.f('ix_vendor_payables_id'), table_name='vendor_payables')
+    op.drop_index(op.f('ix_vendor_payables_bill_number'), table_name='vendor_payables')
+    op.drop_table('vendor_payables')
+    op.drop_index(op.f('ix_sites_site_project_id'), table_name='sites')
+    op.drop_index(op.f('ix_sites_site_code'), table_name='sites')
+    op.drop_index(op.f('ix_sites_project_name'), table_name='sites')
+    op.drop_index(op.f('ix_sites_id'), table_name='sites')
+    op.drop_table('sites')
+    op.drop_index(op.f('ix_quotations_site_project_id'), table_name='quotations')
+    op.drop_index(op.f('ix_quotations_quotation_number'), table_name='quotations')
+    op.drop_index(op.f('ix_quotations_party_id'), table_name='quotations')
+    op.drop_index(op.f('ix_quotations_lead_id'), table_name='quotations')
+    op.drop_index(op.f('ix_quotations_id'), table_name='quotations')
+    op.drop_table('quotations')
+    op.drop_index(op.f('ix_product_supplier_mappings_product_name'), table_name='product_supplier_mappings')
+    op.drop_index(op.f('ix_product_supplier_mappings_id'), table_name='product_supplier_mappings')
+    op.drop_table('product_supplier_mappings')
+    op.drop_index(op.f('ix_ledgers_supplier_id'), table_name='ledgers')
+    op.drop_index(op.f('ix_ledgers_party_id'), table_name='ledgers')
+    op.drop_index(op.f('ix_ledgers_ledger_code'), table_name='ledgers')
+    op.drop_index(op.f('ix_ledgers_id'), table_name='ledgers')
+    op.drop_table('ledgers')
+    op.drop_index(op.f('ix_vendor_bills_vendor_id'), table_name='vendor_bills')
+    op.drop_index(op.f('ix_vendor_bills_vendor_bill_no'), table_name='vendor_bills')
+    op.drop_index(op.f('ix_vendor_bills_po_id'), table_name='vendor_bills')
+    op.drop_index(op.f('ix_vendor_bills_id'), table_name='vendor_bills')
+    op.drop_index(op.f('ix_vendor_bills_grn_number'), table_name='vendor_bills')
+    op.drop_index(op.f('ix_vendor_bills_grn_id'), table_name='vendor_bills')
+    op.drop_index(op.f('ix_vendor_bills_bill_number'), table_name='vendor_bills')
+    op.drop_table('vendor_bills')
+    op.drop_index(op.f('ix_grns_vendor_id'), table_name='grns')
+    op.drop_index(op.f('ix_grns_po_number'), table_name='grns')
+    op.drop_index(op.f('ix_grns_po_id'), table_name='grns')
+    op.drop_index(op.f('ix_grns_id'), table_name='grns')
+    op.drop_index(op.f('ix_grns_grn_number'), table_name='grns')
+    op.drop_table('grns')
+    op.drop_index(op.f('ix_purchase_orders_vendor_id'), table_name='purchase_orders')
+    op.drop_index(op.f('ix_purchase_orders_production_paper_number'), table_name='purchase_orders')
+    op.drop_index(op.f('ix_purchase_orders_production_paper_id'), table_name='purchase_orders')
+    op.drop_index(op.f('ix_purchase_orders_pr_number'), table_name='purchase_orders')
+    op.drop_index(op.f('ix_purchase_orders_pr_id'), table_name='purchase_orders')
+    op.drop_index(op.f('ix_purchase_orders_po_number'), table_name='purchase_orders')
+    op.drop_index(op.f('ix_purchase_orders_id'), table_name='purchase_orders')
+    op.drop_table('purchase_orders')
+    op.drop_index(op.f('ix_purchase_requisitions_production_paper_number'), table_name='purchase_requisitions')
+    op.drop_index(op.f('ix_purchase_requisitions_production_paper_id'), table_name='purchase_requisitions')
+    op.drop_index(op.f('ix_purchase_requisitions_pr_number'), table_name='purchase_requisitions')
+    op.drop_index(op.f('ix_purchase_requisitions_id'), table_name='purchase_requisitions')
+    op.drop_table('purchase_requisitions')
+    op.drop_index(op.f('ix_production_papers_raw_material_order_status'), table_name='production_papers')
+    op.drop_index(op.f('ix_production_papers_paper_number'), table_name='production_papers')
+    op.drop_index(op.f('ix_production_papers_is_deleted'), table_name='production_papers')
+    op.drop_index(op.f('ix_production_papers_id'), table_name='production_papers')
+    op.drop_index(op.f('ix_production_papers_client_requirement_party_id'), table_name='production_papers')
+    op.drop_table('production_papers')
+    op.drop_index(op.f('ix_measurements_task_id'), table_name='measurements')
+    op.drop_index(op.f('ix_measurements_measurement_number'), table_name='measurements')
+    op.drop_index(op.f('ix_measurements_is_deleted'), table_name='measurements')
+    op.drop_index(op.f('ix_measurements_id'), table_name='measurements')
+    op.drop_index(op.f('ix_measurements_approval_status'), table_name='measurements')
+    op.drop_table('measurements')
+    op.drop_index(op.f('ix_suppliers_name'), table_name='suppliers')
+    op.drop_index(op.f('ix_suppliers_id'), table_name='suppliers')
+    op.drop_index(op.f('ix_suppliers_code'), table_name='suppliers')
+    op.drop_index(op.f('ix_suppliers_category_id'), table_name='suppliers')
+    op.drop_table('suppliers')
+    op.drop_index(op.f('ix_site_projects_project_name'), table_name='site_projects')
+    op.drop_index(op.f('ix_site_projects_project_code'), table_name='site_projects')
+    op.drop_index(op.f('ix_site_projects_party_id'), table_name='site_projects')
+    op.drop_index(op.f('ix_site_projects_id'), table_name='site_projects')
+    op.drop_table('site_projects')
+    op.drop_index(op.f('ix_party_history_party_id'), table_name='party_history')
+    op.drop_index(op.f('ix_party_history_id'), table_name='party_history')
+    op.drop_table('party_history')
+    op.drop_index(op.f('ix_party_credit_exposures_party_id'), table_name='party_credit_exposures')
+    op.drop_index(op.f('ix_party_credit_exposures_id'), table_name='party_credit_exposures')
+    op.drop_table('party_credit_exposures')
+    op.drop_index(op.f('ix_measurement_tasks_task_number'), table_name='measurement_tasks')
+    op.drop_index(op.f('ix_measurement_tasks_id'), table_name='measurement_tasks')
+    op.drop_index(op.f('ix_measurement_tasks_assigned_to'), table_name='measurement_tasks')
+    op.drop_table('measurement_tasks')
+    op.drop_index(op.f('ix_leads_mobile'), table_name='leads')
+    op.drop_index(op.f('ix_leads_lead_number'), table_name='leads')
+    op.drop_index(op.f('ix_leads_id'), table_name='leads')
+    op.drop_index(op.f('ix_leads_customer_name'), table_name='leads')
+    op.drop_index(op.f('ix_leads_converted_to_party_id'), table_name='leads')
+    op.drop_table('leads')
+    op.drop_index(op.f('ix_credit_controls_party_id'), table_name='credit_controls')
+    op.drop_index(op.f('ix_credit_controls_id'), table_name='credit_controls')
+    op.drop_table('credit_controls')
+    op.drop_index(op.f('ix_contractor_payments_payment_number'), table_name='contractor_payments')
+    op.drop_index(op.f('ix_contractor_payments_id'), table_name='contractor_payments')
+    op.drop_index(op.f('ix_contractor_payments_contractor_id'), table_name='contractor_payments')
+    op.drop_table('contractor_payments')
+    op.drop_index(op.f('ix_account_reconciliations_reconciliation_number'), table_name='account_reconciliations')
+    op.drop_index(op.f('ix_account_reconciliations_party_id'), table_name='account_reconciliations')
+    op.drop_index(op.f('ix_account_reconciliations_id'), table_name='account_reconciliations')
+    op.drop_table('account_reconciliations')
+    op.drop_index(op.f('ix_vendors_vendor_name'), table_name='vendors')
+    op.drop_index(op.f('ix_vendors_vendor_code'), table_name='vendors')
+    op.drop_index(op.f('ix_vendors_id'), table_name='vendors')
+    op.drop_index(op.f('ix_vendors_gstin'), table_name='vendors')
+    op.drop_table('vendors')
+    op.drop_index(op.f('ix_raw_material_categories_name'), table_name='raw_material_categories')
+    op.drop_index(op.f('ix_raw_material_categories_id'), table_name='raw_material_categories')
+    op.drop_index(op.f('ix_raw_material_categories_code'), table_name='raw_material_categories')
+    op.drop_table('raw_material_categories')
+    op.drop_index(op.f('ix_products_product_code'), table_name='products')
+    op.drop_index(op.f('ix_products_id'), table_name='products')
+    op.drop_table('products')
+    op.drop_index(op.f('ix_production_supervisors_user_id'), table_name='production_supervisors')
+    op.drop_index(op.f('ix_production_supervisors_supervisor_type'), table_name='production_supervisors')
+    op.drop_index(op.f('ix_production_supervisors_id'), table_name='production_supervisors')
+    op.drop_index(op.f('ix_production_supervisors_department_id'), table_name='production_supervisors')
+    op.drop_table('production_supervisors')
+    op.drop_index(op.f('ix_parties_pan_number'), table_name='parties')
+    op.drop_index(op.f('ix_parties_name'), table_name='parties')
+    op.drop_index(op.f('ix_parties_id'), table_name='parties')
+    op.drop_index(op.f('ix_parties_gstin_number'), table_name='parties')
+    op.drop_index(op.f('ix_parties_customer_code'), table_name='parties')
+    op.drop_table('parties')
+    op.drop_index(op.f('ix_manufacturing_stages_stage_name'), table_name='manufacturing_stages')
+    op.drop_index(op.f('ix_manufacturing_stages_id'), table_name='manufacturing_stages')
+    op.drop_table('manufacturing_stages')
+    op.drop_index(op.f('ix_designs_id'), table_name='designs')
+    op.drop_index(op.f('ix_designs_design_name'), table_name='designs')
+    op.drop_index(op.f('ix_designs_design_code'), table_name='designs')
+    op.drop_table('designs')
+    op.drop_index(op.f('ix_contractors_id'), table_name='contractors')
+    op.drop_index(op.f('ix_contractors_contractor_code'), table_name='contractors')
+    op.drop_table('contractors')
+    op.drop_index(op.f('ix_bank_statements_id'), table_name='bank_statements')
+    op.drop_table('bank_statements')
+    op.drop_index(op.f('ix_vehicles_vehicle_no'), table_name='vehicles')
+    op.drop_index(op.f('ix_vehicles_id'), table_name='vehicles')
+    op.drop_table('vehicles')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_serial_number_prefix'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_production_docs_settings_id'), table_name='production_docs_settings')
+    op.drop_table('production_docs_settings')
+    op.drop_index(op.f('ix_material_stock_id'), table_name='material_stock')
+    op.drop_index(op.f('ix_material_stock_category_key'), table_name='material_stock')
+    op.drop_table('material_stock')
+    op.drop_index(op.f('ix_drivers_name'), table_name='drivers')
+    op.drop_index(op.f('ix_drivers_mobile'), table_name='drivers')
+    op.drop_index(op.f('ix_drivers_license_number'), table_name='drivers')
+    op.drop_index(op.f('ix_drivers_id'), table_name='drivers')
+    op.drop_table('drivers')
+    op.drop_index(op.f('ix_departments_name'), table_name='departments')
+    op.drop_index(op.f('ix_departments_id'), table_name='departments')
+    op.drop_index(op.f('ix_departments_code'), table_name='departments')
+    op.drop_table('departments')
@@ -0,0 +1,99 @@
+"""search documents
+
+Unified search index (search_documents) with its full-text / fuzzy indexes:
+tsvector and pg_trgm GIN indexes on PostgreSQL, an FTS5 trigram table with
+sync triggers on SQLite. Existing records are indexed with plain SQL
+(rebuild_search_index.py re-indexes through the current models).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 13:02:11.274905
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# Frozen copies of the index DDL and the indexed columns as of this revision
+FTS_TABLE = "search_documents_fts"
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_tsv ON search_documents USING gin (to_tsvector('simple', search_text))",
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_trgm ON search_documents USING gin (search_text gin_trgm_ops)",
+]
+SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "search_text, entity_type UNINDEXED, content='search_documents', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, search_text, entity_type) VALUES (new.id, new.search_text, new.entity_type); END",
+    f"CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text, entity_type) VALUES ('delete', old.id, old.search_text, old.entity_type); END",
+    f"CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text, entity_type) VALUES ('delete', old.id, old.search_text, old.entity_type); "
+    f"INSERT INTO {FTS_TABLE}(rowid, search_text, entity_type) VALUES (new.id, new.search_text, new.entity_type); END",
+]
+# (table, entity_type, title, subtitle columns, searched columns, soft delete flag)
+BACKFILL = [
+    ("parties", "party", "name", ["customer_code", "gstin_number"],
+     ["name", "display_name", "customer_code", "gstin_number"], None),
+    ("production_papers", "production_paper", "paper_number", ["party_name", "site_name"],
+     ["paper_number", "party_name", "site_name", "project_site_name"], "is_deleted"),
+    ("measurements", "measurement", "measurement_number", ["party_name", "site_location"],
+     ["measurement_number", "party_name", "site_location"], "is_deleted"),
+    ("leads", "lead", "lead_number", ["customer_name", "contact_person"],
+     ["lead_number", "customer_name", "contact_person", "mobile"], None),
+    ("quotations", "quotation", "quotation_number", ["party_name"],
+     ["quotation_number", "party_name"], None),
+]
+
+
+def search_documents_backfill(table, entity_type, title, subtitle, fields, deleted) -> str:
+    """INSERT ... SELECT indexing every row of ``table`` (portable SQL: ||, COALESCE, NULLIF)"""
+    # Subtitle: non-empty values joined with " · "; search text: trimmed non-blank values joined with " "
+    subtitle_sql = "NULLIF(SUBSTR({}, 4), '')".format(
+        " || ".join(f"COALESCE(' · ' || NULLIF({column}, ''), '')" for column in subtitle)
+    )
+    search_sql = "TRIM({})".format(
+        " || ".join(f"COALESCE(NULLIF(TRIM({column}), '') || ' ', '')" for column in fields)
+    )
+    where = f" WHERE {deleted} IS NOT TRUE" if deleted else ""
+    return (
+        "INSERT INTO search_documents (entity_type, entity_id, title, subtitle, search_text) "
+        f"SELECT '{entity_type}', id, COALESCE({title}, ''), {subtitle_sql}, {search_sql} FROM {table}{where}"
+    )
+
+
+def upgrade() -> None:
+    op.create_table('search_documents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity_type', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('subtitle', sa.String(), nullable=True),
+    sa.Column('search_text', sa.Text(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('entity_type', 'entity_id', name='uq_search_documents_entity')
+    )
+    op.create_index(op.f('ix_search_documents_id'), 'search_documents', ['id'], unique=False)
+
+    dialect = op.get_bind().dialect.name
+    for statement in {"postgresql": POSTGRES_DDL, "sqlite": SQLITE_DDL}.get(dialect, []):
+        op.execute(statement)
+
+    # Index existing records (same values as the ORM writes; see search_documents_backfill)
+    for table, entity_type, title, subtitle, fields, deleted in BACKFILL:
+        op.execute(search_documents_backfill(table, entity_type, title, subtitle, fields, deleted))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS search_documents_fts")
+    op.drop_index(op.f('ix_search_documents_id'), table_name='search_documents')
+    op.drop_table('search_documents')
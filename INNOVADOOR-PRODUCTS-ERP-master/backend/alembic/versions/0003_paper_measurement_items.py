@@ -0,0 +1,106 @@
+"""paper measurement items
+
+Measurement items selected on production papers as rows
+(production_paper_measurement_items) instead of only the
+selected_measurement_items JSON, and an index on
+production_papers.measurement_id. Existing selections are copied.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 12:31:35.020968
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+link_table = sa.table(
+    'production_paper_measurement_items',
+    sa.column('production_paper_id', sa.Integer), sa.column('measurement_id', sa.Integer),
+    sa.column('item_index', sa.Integer), sa.column('item_type', sa.String), sa.column('position', sa.Integer),
+)
+
+
+def selection_rows(selected, paper_measurement_id):
+    """Link rows of one selected_measurement_items value (frozen copy of the rules at this revision)"""
+    if isinstance(selected, str):
+        try:
+            selected = json.loads(selected)
+        except (json.JSONDecodeError, TypeError):
+            return []
+    if not isinstance(selected, list):
+        return []
+    rows = []
+    for position, item in enumerate(selected):
+        if isinstance(item, dict):
+            measurement_id, item_index, item_type = item.get("measurement_id"), item.get("item_index"), item.get("item_type")
+        else:
+            measurement_id, item_index, item_type = paper_measurement_id, item, None
+        if isinstance(item_index, str) and item_index.strip().isdigit():
+            item_index = int(item_index)
+        if not isinstance(measurement_id, int) or not isinstance(item_index, int) or isinstance(item_index, bool):
+            continue
+        rows.append({
+            "measurement_id": measurement_id,
+            "item_index": item_index,
+            "item_type": str(item_type) if item_type is not None else None,
+            "position": position,
+        })
+    return rows
+
+
+def backfill_paper_measurement_items(connection) -> None:
+    """Copy every paper's selected_measurement_items JSON into link rows"""
+    measurement_ids = set(connection.execute(sa.text("SELECT id FROM measurements")).scalars())
+    papers = connection.execute(sa.text(
+        "SELECT id, measurement_id, selected_measurement_items FROM production_papers "
+        "WHERE selected_measurement_items IS NOT NULL"
+    ))
+    batch = []
+    for paper_id, paper_measurement_id, selected in papers.all():
+        batch.extend(
+            {**row, "production_paper_id": paper_id}
+            for row in selection_rows(selected, paper_measurement_id)
+            if row["measurement_id"] in measurement_ids
+        )
+        if len(batch) >= BATCH_SIZE:
+            connection.execute(link_table.insert(), batch)
+            batch = []
+    if batch:
+        connection.execute(link_table.insert(), batch)
+
+
+def upgrade() -> None:
+    op.create_table('production_paper_measurement_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('production_paper_id', sa.Integer(), nullable=False),
+    sa.Column('measurement_id', sa.Integer(), nullable=False),
+    sa.Column('item_index', sa.Integer(), nullable=False),
+    sa.Column('item_type', sa.String(), nullable=True),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['measurement_id'], ['measurements.id'], ),
+    sa.ForeignKeyConstraint(['production_paper_id'], ['production_papers.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('production_paper_id', 'position', name='uq_paper_measurement_items_position')
+    )
+    op.create_index('ix_paper_measurement_items_measurement', 'production_paper_measurement_items', ['measurement_id', 'production_paper_id'], unique=False)
+    op.create_index(op.f('ix_production_paper_measurement_items_id'), 'production_paper_measurement_items', ['id'], unique=False)
+    op.create_index(op.f('ix_production_papers_measurement_id'), 'production_papers', ['measurement_id'], unique=False)
+
+    backfill_paper_measurement_items(op.get_bind())
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_production_papers_measurement_id'), table_name='production_papers')
+    op.drop_index(op.f('ix_production_paper_measurement_items_id'), table_name='production_paper_measurement_items')
+    op.drop_index('ix_paper_measurement_items_measurement', table_name='production_paper_measurement_items')
+    op.drop_table('production_paper_measurement_items')
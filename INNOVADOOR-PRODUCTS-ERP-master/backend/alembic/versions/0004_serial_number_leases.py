@@ -0,0 +1,43 @@
+"""serial number leases
+
+Blocks of consecutive measurement serial numbers leased by users
+(serial_number_leases), so a sheet is numbered with one request and
+unused numbers can be handed out again.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 14:05:12.418302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('serial_number_leases',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('prefix', sa.String(), nullable=False),
+    sa.Column('first_counter', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_serial_number_leases_id'), 'serial_number_leases', ['id'], unique=False)
+    op.create_index('ix_serial_number_leases_user_status', 'serial_number_leases', ['user_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_serial_number_leases_user_status', table_name='serial_number_leases')
+    op.drop_index(op.f('ix_serial_number_leases_id'), table_name='serial_number_leases')
+    op.drop_table('serial_number_leases')
@@ -0,0 +1,29 @@
+"""client requirement index
+
+Covering index on production_papers for the client requirements status
+of a party: (client_requirement_party_id, is_deleted, requirement type,
+requirement index) with paper_number and status, so the status endpoint
+reads the index only.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 15:22:47.391250
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_production_papers_client_requirement', 'production_papers', ['client_requirement_party_id', 'is_deleted', 'client_requirement_type', 'client_requirement_index', 'paper_number', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_production_papers_client_requirement', table_name='production_papers')
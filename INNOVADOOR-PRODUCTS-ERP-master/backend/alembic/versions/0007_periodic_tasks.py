@@ -0,0 +1,34 @@
+"""periodic tasks
+
+One row per periodic task run by every API process (periodic_tasks), with
+when it last started: a process runs the task only after claiming the row,
+so the receivables refresh runs once per interval, not once per process.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 13:21:36.336252
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('periodic_tasks',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('last_started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('locked_by', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('periodic_tasks')
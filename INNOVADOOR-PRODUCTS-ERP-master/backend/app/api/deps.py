@@ -86,6 +86,7 @@ def require_role(allowed_roles: List[str]):
                 detail=f"Access denied. Required roles: {', '.join(allowed_roles)}. Your role: {current_user.role}"
             )
         return current_user
+    role_checker.allowed_roles = allowed_roles
     return role_checker
 
 
@@ -116,6 +117,7 @@ get_sales_manager = require_role(["sales_manager", "admin"])
 get_sales_user = require_role(["marketing_executive", "sales_executive", "sales_manager", "admin"])
 get_site_supervisor = require_role(["site_supervisor", "admin"])
 get_carpenter_captain = require_role(["carpenter_captain", "site_supervisor", "admin"])
+get_site_progress_viewer = require_role(["site_supervisor", "sales_manager", "production_manager", "admin"])
 get_purchase_executive = require_role(["purchase_executive", "purchase_manager", "admin"])
 get_purchase_manager = require_role(["purchase_manager", "admin"])
 get_store_incharge = require_role(["store_incharge", "admin"])
@@ -1,22 +1,46 @@
-from fastapi import APIRouter
+from importlib import import_module
 
-from app.api.v1.endpoints import auth, production, admin, raw_material, scheduler, supervisor, products, quality_check, billing, dispatch, logistics, accounts, sales, site_supervisor, carpenter, purchase, measurement_captain
+from fastapi import APIRouter, FastAPI
 
-api_router = APIRouter()
-api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
-api_router.include_router(production.router, prefix="/production", tags=["production-docs"])
-api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
-api_router.include_router(raw_material.router, prefix="/raw-material", tags=["raw-material"])
-api_router.include_router(scheduler.router, prefix="/scheduler", tags=["production-scheduler"])
-api_router.include_router(supervisor.router, prefix="/supervisor", tags=["production-supervisor"])
-api_router.include_router(site_supervisor.router, prefix="/site-supervisor", tags=["site-supervisor"])
-api_router.include_router(products.router, prefix="/production", tags=["products"])
-api_router.include_router(quality_check.router, prefix="/quality-check", tags=["quality-check"])
-api_router.include_router(billing.router, prefix="/billing", tags=["billing"])
-api_router.include_router(dispatch.router, prefix="/dispatch", tags=["dispatch"])
-api_router.include_router(logistics.router, prefix="/logistics", tags=["logistics"])
-api_router.include_router(accounts.router, prefix="/accounts", tags=["accounts"])
-api_router.include_router(sales.router, prefix="/sales", tags=["sales-marketing"])
-api_router.include_router(carpenter.router, prefix="/carpenter", tags=["carpenter-captain"])
-api_router.include_router(purchase.router, prefix="/purchase", tags=["purchase-management"])
-api_router.include_router(measurement_captain.router, prefix="/measurement-captain", tags=["measurement-captain"])
+from app.core.lazy_router import include_lazy_router
+
+# (endpoint module, prefix, tags) in inclusion order - earlier routers win on overlapping paths
+API_ROUTERS = [
+    ("auth", "/auth", ["authentication"]),
+    ("production", "/production", ["production-docs"]),
+    ("admin", "/admin", ["admin"]),
+    ("raw_material", "/raw-material", ["raw-material"]),
+    ("scheduler", "/scheduler", ["production-scheduler"]),
+    ("supervisor", "/supervisor", ["production-supervisor"]),
+    ("site_supervisor", "/site-supervisor", ["site-supervisor"]),
+    ("products", "/production", ["products"]),
+    ("quality_check", "/quality-check", ["quality-check"]),
+    ("billing", "/billing", ["billing"]),
+    ("dispatch", "/dispatch", ["dispatch"]),
+    ("logistics", "/logistics", ["logistics"]),
+    ("accounts", "/accounts", ["accounts"]),
+    ("sales", "/sales", ["sales-marketing"]),
+    ("carpenter", "/carpenter", ["carpenter-captain"]),
+    ("purchase", "/purchase", ["purchase-management"]),
+    ("measurement_captain", "/measurement-captain", ["measurement-captain"]),
+    ("search", "/search", ["search"]),
+    ("jobs", "/jobs", ["jobs"]),
+]
+ENDPOINTS_PACKAGE = "app.api.v1.endpoints"
+
+
+def build_api_router() -> APIRouter:
+    """All endpoint routers, imported now"""
+    api_router = APIRouter()
+    for module, prefix, tags in API_ROUTERS:
+        api_router.include_router(import_module(f"{ENDPOINTS_PACKAGE}.{module}").router, prefix=prefix, tags=tags)
+    return api_router
+
+
+def include_api_routers(app: FastAPI, prefix: str, lazy: bool = False) -> None:
+    """Include the endpoint routers under ``prefix``; with ``lazy`` each module is imported on its first request"""
+    if not lazy:
+        app.include_router(build_api_router(), prefix=prefix)
+        return
+    for module, router_prefix, tags in API_ROUTERS:
+        include_lazy_router(app, f"{ENDPOINTS_PACKAGE}.{module}", prefix + router_prefix, tags)
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Any, Optional
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
 from decimal import Decimal
 import re
 import json
@@ -11,17 +12,35 @@ from app.schemas.accounts import (
     PaymentAllocation, PaymentAllocationCreate,
     AccountReceivable, AccountReceivableCreate, AccountReceivableUpdate,
     AccountReconciliation, AccountReconciliationCreate, AccountReconciliationUpdate,
-    AccountsDashboardStats, AgingAnalysis
+    AccountsDashboardStats, AgingAnalysis,
+    PartyCreditExposure, CreditExposureMismatch,
+    Ledger, TrialBalance, LedgerStatement,
+    BankStatement, BankStatementLine, BankStatementMatchSummary, BankMatchConfirm
 )
 from app.db.models.accounts import (
     PaymentReceipt as DBPaymentReceipt,
     PaymentAllocation as DBPaymentAllocation,
     AccountReceivable as DBAccountReceivable,
-    AccountReconciliation as DBAccountReconciliation
+    AccountReconciliation as DBAccountReconciliation,
+    PartyCreditExposure as DBPartyCreditExposure,
+    Ledger as DBLedger,
+    BankStatement as DBBankStatement,
+    BankStatementLine as DBBankStatementLine
 )
 from app.db.models.billing import TaxInvoice as DBTaxInvoice
-from app.db.models.user import Party as DBParty
 from app.api.deps import get_db, get_accounts_manager, get_billing_executive
+from app.utils.credit_exposure import (
+    post_payment_allocation, post_receipt_status_change,
+    rebuild_credit_exposure, check_credit_exposure
+)
+from app.utils.bank_reconciliation import import_bank_statement, rematch_statement, confirm_matches
+from app.utils.exports import EXPORT_FORMAT_PATTERN, export_columns, export_response
+from app.utils.jobs import enqueue_job, job_accepted
+from app.utils.receivables import refresh_invoice_receivable, refresh_receivables
+from app.utils.ledger_posting import (
+    sync_receipt_ledger, sync_allocation_ledger, repost_all_documents,
+    close_periods, trial_balance, ledger_statement, check_ledger
+)
 
 router = APIRouter()
 
@@ -55,93 +74,6 @@ def generate_reconciliation_number(db: Session) -> str:
     return f"REC-{next_num:04d}"
 
 
-def calculate_aging_bucket(days_overdue: int) -> str:
-    """Calculate aging bucket based on days overdue"""
-    if days_overdue < 0:
-        return "current"
-    elif days_overdue <= 30:
-        return "0-30"
-    elif days_overdue <= 60:
-        return "31-60"
-    elif days_overdue <= 90:
-        return "61-90"
-    else:
-        return "90+"
-
-
-def update_account_receivable(db: Session, invoice_id: int):
-    """Update or create account receivable record for an invoice"""
-    invoice = db.query(DBTaxInvoice).filter(DBTaxInvoice.id == invoice_id).first()
-    if not invoice:
-        return
-    
-    # Calculate total paid
-    allocations = db.query(DBPaymentAllocation).filter(
-        DBPaymentAllocation.tax_invoice_id == invoice_id
-    ).all()
-    total_paid = sum(Decimal(str(alloc.allocated_amount)) for alloc in allocations)
-    
-    outstanding = Decimal(str(invoice.grand_total)) - total_paid
-    
-    # Calculate days overdue
-    due_date = None
-    days_overdue = 0
-    if invoice.payment_terms:
-        # Try to parse payment terms (e.g., "Net 30", "Credit 45 days")
-        match = re.search(r'(\d+)', invoice.payment_terms)
-        if match:
-            days = int(match.group(1))
-            due_date = invoice.invoice_date + timedelta(days=days)
-            if due_date < date.today():
-                days_overdue = (date.today() - due_date).days
-    
-    aging_bucket = calculate_aging_bucket(days_overdue)
-    
-    # Determine status
-    if outstanding <= Decimal("0.01"):  # Consider paid if less than 1 paisa
-        status = "paid"
-    elif total_paid > Decimal("0"):
-        status = "partially_paid"
-    elif days_overdue > 0:
-        status = "overdue"
-    else:
-        status = "outstanding"
-    
-    # Get or create receivable record
-    receivable = db.query(DBAccountReceivable).filter(
-        DBAccountReceivable.tax_invoice_id == invoice_id
-    ).first()
-    
-    if receivable:
-        receivable.total_paid = total_paid
-        receivable.outstanding_amount = outstanding
-        receivable.days_overdue = days_overdue
-        receivable.aging_bucket = aging_bucket
-        receivable.status = status
-        receivable.last_payment_date = date.today() if total_paid > 0 else None
-    else:
-        party = db.query(DBParty).filter(DBParty.id == invoice.party_id).first()
-        receivable = DBAccountReceivable(
-            tax_invoice_id=invoice_id,
-            invoice_number=invoice.invoice_number,
-            invoice_date=invoice.invoice_date,
-            invoice_amount=invoice.grand_total,
-            party_id=invoice.party_id,
-            party_name=invoice.party_name,
-            payment_terms=invoice.payment_terms,
-            due_date=due_date,
-            total_paid=total_paid,
-            outstanding_amount=outstanding,
-            days_overdue=days_overdue,
-            aging_bucket=aging_bucket,
-            status=status,
-            last_payment_date=date.today() if total_paid > 0 else None
-        )
-        db.add(receivable)
-    
-    db.commit()
-
-
 # Payment Receipt Endpoints
 @router.get("/payment-receipts", response_model=List[PaymentReceipt])
 def get_payment_receipts(
@@ -210,6 +142,8 @@ def create_payment_receipt(
     )
     
     db.add(db_receipt)
+    db.flush()
+    sync_receipt_ledger(db, db_receipt, current_user.id, include_allocations=False)
     db.commit()
     db.refresh(db_receipt)
     
@@ -232,6 +166,7 @@ def update_payment_receipt(
             detail="Payment receipt not found"
         )
     
+    old_status = receipt.status
     update_data = receipt_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(receipt, field, value)
@@ -240,6 +175,12 @@ def update_payment_receipt(
     if receipt_update.status == "cleared" and not receipt.cleared_date:
         receipt.cleared_date = date.today()
     
+    # Move allocated amounts between uncleared and paid credit exposure
+    post_receipt_status_change(db, receipt, old_status)
+    
+    # Post (or reverse) the receipt and its allocations in the ledger
+    sync_receipt_ledger(db, receipt, current_user.id)
+    
     db.commit()
     db.refresh(receipt)
     
@@ -312,8 +253,15 @@ def create_payment_allocation(
     payment_receipt.allocated_amount += allocated_amount
     payment_receipt.unallocated_amount -= allocated_amount
     
+    # Update party credit exposure
+    post_payment_allocation(db, db_allocation, payment_receipt, invoice)
+    
+    # Post the allocation to the customer ledger
+    db.flush()
+    sync_allocation_ledger(db, db_allocation, payment_receipt, invoice, current_user.id)
+    
     # Update account receivable
-    update_account_receivable(db, allocation_data.tax_invoice_id)
+    refresh_invoice_receivable(db, allocation_data.tax_invoice_id)
     
     db.commit()
     db.refresh(db_allocation)
@@ -341,6 +289,18 @@ def get_payment_allocations(
 
 
 # Account Receivable Endpoints
+def _receivable_filters(party_id: Optional[int], status_filter: Optional[str], aging_bucket: Optional[str]) -> list:
+    """Conditions of the receivable list filters (shared by the list and the export)"""
+    conditions = []
+    if party_id:
+        conditions.append(DBAccountReceivable.party_id == party_id)
+    if status_filter:
+        conditions.append(DBAccountReceivable.status == status_filter)
+    if aging_bucket:
+        conditions.append(DBAccountReceivable.aging_bucket == aging_bucket)
+    return conditions
+
+
 @router.get("/receivables", response_model=List[AccountReceivable])
 def get_receivables(
     db: Session = Depends(get_db),
@@ -352,17 +312,28 @@ def get_receivables(
     limit: int = 100
 ) -> Any:
     """Get all account receivables"""
-    query = db.query(DBAccountReceivable)
-    if party_id:
-        query = query.filter(DBAccountReceivable.party_id == party_id)
-    if status_filter:
-        query = query.filter(DBAccountReceivable.status == status_filter)
-    if aging_bucket:
-        query = query.filter(DBAccountReceivable.aging_bucket == aging_bucket)
+    query = db.query(DBAccountReceivable).filter(*_receivable_filters(party_id, status_filter, aging_bucket))
     receivables = query.order_by(DBAccountReceivable.invoice_date.desc()).offset(skip).limit(limit).all()
     return receivables
 
 
+@router.get("/receivables/export")
+def export_receivables(
+    current_user = Depends(get_accounts_manager),
+    party_id: Optional[int] = None,
+    status_filter: Optional[str] = None,
+    aging_bucket: Optional[str] = None,
+    export_format: str = Query("csv", alias="format", pattern=EXPORT_FORMAT_PATTERN)
+) -> Any:
+    """Download all account receivables matching the list filters as CSV or XLSX (streamed)"""
+    stmt = (
+        select(*export_columns(DBAccountReceivable))
+        .where(*_receivable_filters(party_id, status_filter, aging_bucket))
+        .order_by(DBAccountReceivable.invoice_date.desc())
+    )
+    return export_response(stmt, "receivables", export_format)
+
+
 @router.get("/receivables/{receivable_id}", response_model=AccountReceivable)
 def get_receivable(
     receivable_id: int,
@@ -383,16 +354,158 @@ def get_receivable(
 def sync_invoice_to_receivables(
     invoice_id: int,
     db: Session = Depends(get_db),
-    current_user = Depends(get_accounts_manager)
+    current_user = Depends(get_accounts_manager),
+    background: bool = False
 ) -> Any:
     """Sync an invoice to account receivables (creates or updates receivable record)"""
-    update_account_receivable(db, invoice_id)
+    if background:
+        job = enqueue_job(db, "receivables.sync_invoice", {"invoice_id": invoice_id}, created_by=current_user.id)
+        db.commit()
+        return job_accepted(job)
+    refresh_invoice_receivable(db, invoice_id)
+    db.commit()
     receivable = db.query(DBAccountReceivable).filter(
         DBAccountReceivable.tax_invoice_id == invoice_id
     ).first()
     return {"message": "Invoice synced to receivables", "receivable_id": receivable.id if receivable else None}
 
 
+@router.post("/receivables/refresh")
+def refresh_all_receivables(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_accounts_manager),
+    as_of: Optional[date] = None,
+    background: bool = False
+) -> Any:
+    """Recompute paid totals, due dates, days overdue, aging buckets and status of all open receivables"""
+    if background:
+        job = enqueue_job(db, "receivables.refresh", {"as_of": as_of}, created_by=current_user.id)
+        db.commit()
+        return job_accepted(job)
+    result = refresh_receivables(db, as_of)
+    db.commit()
+    return {"message": "Receivables refreshed", **result}
+
+
+# Credit Exposure Endpoints
+@router.get("/credit-exposure", response_model=List[PartyCreditExposure])
+def get_credit_exposure(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_accounts_manager),
+    party_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> Any:
+    """Get running credit exposure per party"""
+    query = db.query(DBPartyCreditExposure)
+    if party_id:
+        query = query.filter(DBPartyCreditExposure.party_id == party_id)
+    return query.order_by(DBPartyCreditExposure.outstanding_amount.desc()).offset(skip).limit(limit).all()
+
+
+@router.get("/credit-exposure/check", response_model=List[CreditExposureMismatch])
+def check_credit_exposure_consistency(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_accounts_manager)
+) -> Any:
+    """Compare stored credit exposure with a full recomputation (empty list = consistent)"""
+    return check_credit_exposure(db)
+
+
+@router.post("/credit-exposure/rebuild")
+def rebuild_credit_exposure_balances(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_accounts_manager)
+) -> Any:
+    """Rebuild credit exposure for all parties from invoices, allocations and receipts"""
+    count = rebuild_credit_exposure(db)
+    db.commit()
+    return {"message": "Credit exposure rebuilt", "parties": count}
+
+
+# Ledger Endpoints
+@router.get("/ledgers", response_model=List[Ledger])
+def get_ledgers(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_accounts_manager),
+    ledger_type: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> Any:
+    """Get all ledgers"""
+    query = db.query(DBLedger)
+    if ledger_type:
+        query = query.filter(DBLedger.ledger_type == ledger_type)
+    return query.order_by(DBLedger.ledger_code).offset(skip).limit(limit).all()
+
+
+@router.get("/ledgers/trial-balance", response_model=TrialBalance)
+def get_trial_balance(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_accounts_manager),
+    as_of: Optional[date] = None
+) -> Any:
+    """Trial balance as of a date (default today), from the nearest month-end snapshot plus later entries"""
+    return trial_balance(db, as_of or date.today())
+
+
+@router.get("/ledgers/check")
+def check_ledger_consistency(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_accounts_manager)
+) -> Any:
+    """Unbalanced documents and month-end snapshots that differ from their entries (empty lists = consistent)"""
+    return check_ledger(db)
+
+
+@router.post("/ledgers/repost")
+def repost_ledger_documents(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_accounts_manager)
+) -> Any:
+    """Post any missing or changed amounts for all invoices, receipts, allocations and vendor documents"""
+    count = repost_all_documents(db, current_user.id)
+    db.commit()
+    return {"message": "Ledger documents reposted", "entries": count}
+
+
+@router.post("/ledgers/close-periods")
+def close_ledger_periods(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_accounts_manager),
+    through: Optional[date] = None
+) -> Any:
+    """Write month-end balance snapshots for every month not yet closed (default: up to last month)"""
+    count = close_periods(db, through)
+    db.commit()
+    return {"message": "Ledger periods closed", "periods": count}
+
+
+@router.get("/ledgers/{ledger_id}/statement", response_model=LedgerStatement)
+def get_ledger_statement(
+    ledger_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_accounts_manager),
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None
+) -> Any:
+    """Ledger statement with opening balance and running balance (default: current month)"""
+    ledger = db.query(DBLedger).filter(DBLedger.id == ledger_id).first()
+    if not ledger:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ledger not found"
+        )
+    to_date = to_date or date.today()
+    from_date = from_date or to_date.replace(day=1)
+    if from_date > to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="from_date must not be after to_date"
+        )
+    return ledger_statement(db, ledger, from_date, to_date)
+
+
 # Account Reconciliation Endpoints
 @router.get("/reconciliations", response_model=List[AccountReconciliation])
 def get_reconciliations(
@@ -500,6 +613,110 @@ def create_reconciliation(
     return db_reconciliation
 
 
+# Bank Statement Reconciliation Endpoints
+def get_bank_statement_or_404(db: Session, statement_id: int) -> DBBankStatement:
+    statement = db.query(DBBankStatement).filter(DBBankStatement.id == statement_id).first()
+    if not statement:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Bank statement not found"
+        )
+    return statement
+
+
+@router.post("/bank-statements/import", response_model=BankStatementMatchSummary)
+def import_statement(
+    file: UploadFile = File(...),
+    bank_account: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_accounts_manager)
+) -> Any:
+    """
+    Import a bank statement (CSV with date, narration, reference and
+    credit/debit or amount columns, or OFX/QFX) and propose a payment receipt
+    for each credit line.
+    """
+    try:
+        result = import_bank_statement(db, file.file, file.filename, bank_account, current_user.id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    db.commit()
+    return result
+
+
+@router.get("/bank-statements", response_model=List[BankStatement])
+def get_bank_statements(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_accounts_manager),
+    skip: int = 0,
+    limit: int = 100
+) -> Any:
+    """Get imported bank statements"""
+    return db.query(DBBankStatement).order_by(DBBankStatement.id.desc()).offset(skip).limit(limit).all()
+
+
+@router.get("/bank-statements/{statement_id}/lines", response_model=List[BankStatementLine])
+def get_bank_statement_lines(
+    statement_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_accounts_manager),
+    status_filter: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 500
+) -> Any:
+    """Get a statement's lines with their proposed or confirmed receipt"""
+    get_bank_statement_or_404(db, statement_id)
+    query = db.query(DBBankStatementLine).filter(DBBankStatementLine.statement_id == statement_id)
+    if status_filter:
+        query = query.filter(DBBankStatementLine.status == status_filter)
+    return query.order_by(DBBankStatementLine.line_number).offset(skip).limit(limit).all()
+
+
+@router.post("/bank-statements/{statement_id}/rematch", response_model=BankStatementMatchSummary)
+def rematch_bank_statement(
+    statement_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_accounts_manager)
+) -> Any:
+    """Replace the statement's proposals with a fresh match against open receipts"""
+    statement = get_bank_statement_or_404(db, statement_id)
+    result = rematch_statement(db, statement)
+    db.commit()
+    return result
+
+
+@router.post("/bank-statements/{statement_id}/confirm", response_model=AccountReconciliation)
+def confirm_bank_statement_matches(
+    statement_id: int,
+    confirm_data: BankMatchConfirm,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_accounts_manager)
+) -> Any:
+    """
+    Confirm proposed (and manual) matches: receipts are marked cleared and one
+    draft reconciliation records the matched lines.
+    """
+    statement = get_bank_statement_or_404(db, statement_id)
+    try:
+        reconciliation = confirm_matches(
+            db, statement, generate_reconciliation_number(db), current_user.id,
+            line_ids=confirm_data.line_ids,
+            manual_matches={match.line_id: match.payment_receipt_id for match in confirm_data.matches},
+        )
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    db.commit()
+    db.refresh(reconciliation)
+    return reconciliation
+
+
 @router.post("/reconciliations/{reconciliation_id}/approve", response_model=AccountReconciliation)
 def approve_reconciliation(
     reconciliation_id: int,
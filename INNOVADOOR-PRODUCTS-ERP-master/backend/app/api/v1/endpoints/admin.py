@@ -17,6 +17,7 @@ from app.db.models.user import (
 )
 from app.api.deps import get_db, get_admin
 from app.core import security
+from app.utils.serial_numbers import close_serial_leases
 
 router = APIRouter()
 
@@ -105,6 +106,7 @@ def assign_serial_prefix(
     # Assign prefix and reset counter
     user.serial_number_prefix = prefix
     user.serial_number_counter = 0  # Reset counter when assigning/changing prefix
+    close_serial_leases(db, user.id)  # Blocks of the old numbering must not be handed out again
     db.commit()
     db.refresh(user)
     
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Any, Optional
 from datetime import datetime, date
@@ -20,6 +21,10 @@ from app.db.models.billing import (
 )
 from app.db.models.user import ProductionPaper as DBProductionPaper, Party as DBParty
 from app.api.deps import get_db, get_billing_executive, get_accounts_manager, get_dispatch_executive
+from app.utils.pricing import sum_invoice_lines
+from app.utils.credit_exposure import get_party_exposure, post_invoice_status_change, post_invoice_total_change
+from app.utils.ledger_posting import sync_invoice_ledger
+from app.utils.exports import EXPORT_FORMAT_PATTERN, export_columns, export_response
 
 router = APIRouter()
 
@@ -363,6 +368,19 @@ def get_tax_invoices(
     return invoices
 
 
+@router.get("/tax-invoices/export")
+def export_tax_invoices(
+    current_user = Depends(get_billing_executive),
+    status_filter: Optional[str] = None,
+    export_format: str = Query("csv", alias="format", pattern=EXPORT_FORMAT_PATTERN)
+) -> Any:
+    """Download all tax invoices matching the list filters as CSV or XLSX (streamed, line items left out)"""
+    stmt = select(*export_columns(DBTaxInvoice, exclude=("line_items",))).order_by(DBTaxInvoice.created_at.desc())
+    if status_filter:
+        stmt = stmt.where(DBTaxInvoice.status == status_filter)
+    return export_response(stmt, "tax_invoices", export_format)
+
+
 @router.get("/tax-invoices/{invoice_id}", response_model=TaxInvoice)
 def get_tax_invoice(
     invoice_id: int,
@@ -398,6 +416,16 @@ def create_tax_invoice(
             detail="Billing request not found"
         )
     
+    # Calculate totals (one pass over the line items, in paise)
+    totals = sum_invoice_lines(invoice_data.line_items, invoice_data.freight, invoice_data.round_off)
+    subtotal = totals["subtotal"]
+    cgst_total = totals["cgst_total"]
+    sgst_total = totals["sgst_total"]
+    igst_total = totals["igst_total"]
+    freight = totals["freight"]
+    round_off = totals["round_off"]
+    grand_total = totals["grand_total"]
+    
     # Check credit limit if party has credit terms
     party = db.query(DBParty).filter(DBParty.id == invoice_data.party_id).first()
     credit_limit_exceeded = False
@@ -406,36 +434,14 @@ def create_tax_invoice(
     if party and party.credit_limit:
         try:
             credit_limit = Decimal(str(party.credit_limit))
-            # Calculate outstanding from unpaid invoices
-            unpaid_invoices = db.query(DBTaxInvoice).filter(
-                DBTaxInvoice.party_id == invoice_data.party_id,
-                DBTaxInvoice.status.in_(["approved", "sent_to_dispatch"])
-            ).all()
+            # Outstanding = approved invoices less allocated payments (running balance)
+            outstanding_amount = get_party_exposure(db, invoice_data.party_id)
             
-            outstanding_amount = sum(Decimal(str(inv.grand_total)) for inv in unpaid_invoices)
-            
-            # Calculate new total
-            new_total = sum(Decimal(str(item.taxable_value)) + Decimal(str(item.cgst_amount)) + 
-                          Decimal(str(item.sgst_amount)) + Decimal(str(item.igst_amount)) 
-                          for item in invoice_data.line_items)
-            new_total += invoice_data.freight or Decimal("0.00")
-            new_total += invoice_data.round_off or Decimal("0.00")
-            
-            if outstanding_amount + new_total > credit_limit:
+            if outstanding_amount + grand_total > credit_limit:
                 credit_limit_exceeded = True
         except:
             pass
     
-    # Calculate totals
-    subtotal = sum(Decimal(str(item.taxable_value)) for item in invoice_data.line_items)
-    cgst_total = sum(Decimal(str(item.cgst_amount)) for item in invoice_data.line_items)
-    sgst_total = sum(Decimal(str(item.sgst_amount)) for item in invoice_data.line_items)
-    igst_total = sum(Decimal(str(item.igst_amount)) for item in invoice_data.line_items)
-    
-    freight = invoice_data.freight or Decimal("0.00")
-    round_off = invoice_data.round_off or Decimal("0.00")
-    grand_total = subtotal + cgst_total + sgst_total + igst_total + freight + round_off
-    
     # Generate invoice number
     invoice_number = generate_invoice_number(db)
     
@@ -503,6 +509,8 @@ def update_tax_invoice(
         )
     
     update_data = invoice_update.model_dump(exclude_unset=True)
+    old_status = invoice.status
+    old_grand_total = invoice.grand_total
     
     # Recalculate totals if freight or round_off changed
     if "freight" in update_data or "round_off" in update_data:
@@ -516,6 +524,13 @@ def update_tax_invoice(
         if field not in ["freight", "round_off"]:
             setattr(invoice, field, value)
     
+    # Keep the party's credit exposure in step with the invoice
+    if invoice.status != old_status:
+        post_invoice_status_change(db, invoice, old_status, old_grand_total)
+    else:
+        post_invoice_total_change(db, invoice, old_grand_total)
+    sync_invoice_ledger(db, invoice, current_user.id)
+    
     db.commit()
     db.refresh(invoice)
     
@@ -543,9 +558,12 @@ def approve_tax_invoice(
             detail="Cannot approve invoice: Credit limit exceeded"
         )
     
+    old_status = invoice.status
     invoice.status = "approved"
     invoice.approved_by = current_user.id
     invoice.approved_at = datetime.now()
+    post_invoice_status_change(db, invoice, old_status)
+    sync_invoice_ledger(db, invoice, current_user.id)
     
     # Update billing request status
     billing_request = db.query(DBBillingRequest).filter(
@@ -27,6 +27,7 @@ from app.db.models.carpenter import (
 from app.db.models.site_supervisor import Site, Flat
 from app.api.deps import get_db, get_carpenter_captain, get_site_supervisor, get_current_user
 from app.db.models.user import User as DBUser
+from app.utils.site_progress import flat_progress_state, post_flat_change, get_wing_progress, sum_counters
 
 router = APIRouter()
 
@@ -92,18 +93,9 @@ def get_dashboard_stats(
         )
     ).scalar() or 0
     
-    # Pending flats (flats with incomplete fixing)
-    pending_flats = db.query(func.count(func.distinct(Flat.id))).join(
-        Site, Flat.site_id == Site.id
-    ).filter(
-        and_(
-            Site.id == captain.site_id,
-            or_(
-                Flat.frame_fixed == False,
-                Flat.door_fixed == False
-            )
-        )
-    ).scalar() or 0
+    # Pending flats (flats with incomplete fixing, from the wing progress counters)
+    site_progress = sum_counters(get_wing_progress(db, captain.site_id).values())
+    pending_flats = site_progress["total_flats"] - site_progress["both_fixed"]
     
     # Today's work list
     today_work_list = []
@@ -282,7 +274,9 @@ def create_frame_fixing(
     if fixing_in.fixing_status == "Completed":
         flat = db.query(Flat).filter(Flat.id == fixing_in.flat_id).first()
         if flat:
+            before = flat_progress_state(flat)
             flat.frame_fixed = True
+            post_flat_change(db, flat, before)
     
     db.commit()
     db.refresh(fixing)
@@ -338,7 +332,9 @@ def create_door_fixing(
     if fixing_in.fixing_status == "Completed":
         flat = db.query(Flat).filter(Flat.id == fixing_in.flat_id).first()
         if flat:
+            before = flat_progress_state(flat)
             flat.door_fixed = True
+            post_flat_change(db, flat, before)
     
     db.commit()
     db.refresh(fixing)
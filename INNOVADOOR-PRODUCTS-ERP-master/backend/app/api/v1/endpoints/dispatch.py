@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Any, Optional
 from datetime import datetime, date
@@ -25,6 +26,7 @@ from app.db.models.billing import (
 from app.db.models.user import ProductionPaper as DBProductionPaper, Party as DBParty
 from app.db.models.quality_check import QualityCheck as DBQualityCheck
 from app.api.deps import get_db, get_dispatch_executive, get_dispatch_supervisor, get_logistics_manager, get_current_user
+from app.utils.exports import EXPORT_FORMAT_PATTERN, export_columns, export_response
 
 router = APIRouter()
 
@@ -212,6 +214,19 @@ def get_dispatches(
     return dispatches
 
 
+@router.get("/dispatches/export")
+def export_dispatches(
+    current_user = Depends(get_dispatch_executive),
+    status_filter: Optional[str] = None,
+    export_format: str = Query("csv", alias="format", pattern=EXPORT_FORMAT_PATTERN)
+) -> Any:
+    """Download all dispatches matching the list filters as CSV or XLSX (streamed)"""
+    stmt = select(*export_columns(DBDispatch)).order_by(DBDispatch.created_at.desc())
+    if status_filter:
+        stmt = stmt.where(DBDispatch.status == status_filter)
+    return export_response(stmt, "dispatches", export_format)
+
+
 @router.get("/dispatches/{dispatch_id}", response_model=Dispatch)
 def get_dispatch(
     dispatch_id: int,
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import Any, List, Optional
+
+from app.schemas.job import Job
+from app.db.models.job import Job as DBJob
+from app.api.deps import get_db, get_current_user
+from app.utils.jobs import job_response
+
+router = APIRouter()
+
+
+@router.get("", response_model=List[Job])
+def get_jobs(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user),
+    status_filter: Optional[str] = None,
+    job_type: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 50
+) -> Any:
+    """Background jobs queued by the current user (all users' for admins), newest first"""
+    query = db.query(DBJob)
+    if current_user.role != "admin":
+        query = query.filter(DBJob.created_by == current_user.id)
+    if status_filter:
+        query = query.filter(DBJob.status == status_filter)
+    if job_type:
+        query = query.filter(DBJob.job_type == job_type)
+    jobs = query.order_by(DBJob.id.desc()).offset(skip).limit(limit).all()
+    return [job_response(job) for job in jobs]
+
+
+@router.get("/{job_id}", response_model=Job)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+) -> Any:
+    """Status, progress and (once succeeded) result of a background job"""
+    job = db.get(DBJob, job_id)
+    if not job or (current_user.role != "admin" and job.created_by != current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job_response(job)
@@ -1,14 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Any, Optional
 from datetime import datetime, date, timedelta
 from sqlalchemy import and_, or_
+import json
 
 from app.schemas.logistics import (
     Vehicle, VehicleCreate, VehicleUpdate,
     Driver, DriverCreate, DriverUpdate,
     LogisticsAssignment, LogisticsAssignmentCreate, LogisticsAssignmentUpdate,
-    DeliveryIssue, DeliveryIssueCreate, DeliveryIssueUpdate
+    DeliveryIssue, DeliveryIssueCreate, DeliveryIssueUpdate,
+    LoadPlan, LoadPlanRequest, LoadPlanCommit
 )
 from app.schemas.dispatch import DeliveryTracking, DeliveryTrackingUpdate
 from app.db.models.logistics import (
@@ -25,9 +30,80 @@ from app.api.deps import (
     get_db, get_logistics_manager, get_logistics_executive, 
     get_logistics_user, get_driver, get_current_user
 )
+from app.core.events import event_bus
+from app.utils.load_planner import OPEN_ASSIGNMENT_STATUSES, build_load_plan
 
 router = APIRouter()
 
+LIVE_DELIVERIES_TOPIC = "logistics.live_deliveries"
+LIVE_BOARD_STATUSES = ["assigned", "in_transit"]
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
+def live_delivery_query(db: Session):
+    """Board rows: assignment joined to its dispatch in a single query"""
+    return db.query(
+        DBLogisticsAssignment.dispatch_id,
+        DBDispatch.dispatch_number,
+        DBDispatch.party_name,
+        DBLogisticsAssignment.vehicle_no,
+        DBLogisticsAssignment.driver_name,
+        DBLogisticsAssignment.status,
+        DBLogisticsAssignment.planned_delivery_date,
+        DBLogisticsAssignment.route_area
+    ).join(DBDispatch, DBDispatch.id == DBLogisticsAssignment.dispatch_id)
+
+
+def live_delivery_row(row) -> dict:
+    return {
+        "dispatch_id": row.dispatch_id,
+        "dispatch_number": row.dispatch_number,
+        "party_name": row.party_name,
+        "vehicle_no": row.vehicle_no,
+        "driver_name": row.driver_name,
+        "status": row.status,
+        "planned_delivery_date": row.planned_delivery_date,
+        "route_area": row.route_area
+    }
+
+
+def get_live_delivery_rows(db: Session, limit: Optional[int] = None) -> List[dict]:
+    query = live_delivery_query(db).filter(
+        DBLogisticsAssignment.status.in_(LIVE_BOARD_STATUSES)
+    ).order_by(DBLogisticsAssignment.planned_delivery_date.asc())
+    if limit:
+        query = query.limit(limit)
+    return [live_delivery_row(row) for row in query.all()]
+
+
+def publish_live_delivery_changes(db: Session, dispatch_ids: List[int], reason: str) -> None:
+    """Push board deltas for the given dispatches to connected live-delivery streams"""
+    if not dispatch_ids or not event_bus.subscriber_count(LIVE_DELIVERIES_TOPIC):
+        return
+    rows = {row.dispatch_id: row for row in live_delivery_query(db).filter(
+        DBLogisticsAssignment.dispatch_id.in_(dispatch_ids)
+    ).all()}
+    for dispatch_id in dispatch_ids:
+        row = rows.get(dispatch_id)
+        if row is not None and row.status in LIVE_BOARD_STATUSES:
+            event = {"type": "upsert", "reason": reason, "row": jsonable_encoder(live_delivery_row(row))}
+        else:
+            event = {"type": "remove", "reason": reason, "dispatch_id": dispatch_id}
+        event_bus.publish(LIVE_DELIVERIES_TOPIC, event)
+
+
+def format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+def vehicle_has_other_drops(db: Session, vehicle_id: int, assignment_id: int) -> bool:
+    """Whether a vehicle still has other open assignments (multi-drop trips)"""
+    return db.query(DBLogisticsAssignment.id).filter(
+        DBLogisticsAssignment.vehicle_id == vehicle_id,
+        DBLogisticsAssignment.id != assignment_id,
+        DBLogisticsAssignment.status.in_(OPEN_ASSIGNMENT_STATUSES)
+    ).first() is not None
+
 
 # ============= DASHBOARD =============
 @router.get("/dashboard/stats")
@@ -84,29 +160,48 @@ def get_live_deliveries(
     limit: int = 20
 ) -> Any:
     """Get live delivery board"""
-    assignments = db.query(DBLogisticsAssignment).filter(
-        DBLogisticsAssignment.status.in_(["assigned", "in_transit"])
-    ).order_by(DBLogisticsAssignment.planned_delivery_date.asc()).limit(limit).all()
-    
-    result = []
-    for assignment in assignments:
-        dispatch = db.query(DBDispatch).filter(
-            DBDispatch.id == assignment.dispatch_id
-        ).first()
-        
-        if dispatch:
-            # Calculate ETA (simplified - can be enhanced with actual routing)
-            result.append({
-                "dispatch_number": dispatch.dispatch_number,
-                "party_name": dispatch.party_name,
-                "vehicle_no": assignment.vehicle_no,
-                "driver_name": assignment.driver_name,
-                "status": assignment.status,
-                "planned_delivery_date": assignment.planned_delivery_date,
-                "route_area": assignment.route_area
-            })
-    
-    return result
+    return get_live_delivery_rows(db, limit=limit)
+
+
+@router.get("/dashboard/live-deliveries/stream")
+async def stream_live_deliveries(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_logistics_user),
+    limit: int = 20
+) -> Any:
+    """
+    Live delivery board as Server-Sent Events: a ``snapshot`` event with the
+    current board, then ``delta`` events (upsert/remove) as assignments, tracking
+    and delivery issues change. A ``reload`` event asks the client to refetch.
+    """
+    subscription = event_bus.subscribe(LIVE_DELIVERIES_TOPIC)
+    try:
+        snapshot = await run_in_threadpool(get_live_delivery_rows, db, limit)
+    finally:
+        # Release the connection - the stream may stay open for hours
+        db.close()
+    
+    async def event_stream():
+        try:
+            yield format_sse("snapshot", snapshot)
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    yield format_sse("reload", {})
+                elif event is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield format_sse("delta", event)
+        finally:
+            subscription.close()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 # ============= ASSIGNED DISPATCH ORDERS =============
@@ -415,6 +510,7 @@ def create_assignment(
     db.add(db_assignment)
     db.commit()
     db.refresh(db_assignment)
+    publish_live_delivery_changes(db, [db_assignment.dispatch_id], "assignment_created")
     return db_assignment
 
 
@@ -441,10 +537,10 @@ def update_assignment(
         if not vehicle:
             raise HTTPException(status_code=404, detail="Vehicle not found")
         
-        # Release old vehicle
+        # Release old vehicle (unless it still carries other drops of a multi-drop trip)
         old_vehicle = db.query(DBVehicle).filter(DBVehicle.id == db_assignment.vehicle_id).first()
         if old_vehicle:
-            old_vehicle.is_available = True
+            old_vehicle.is_available = not vehicle_has_other_drops(db, old_vehicle.id, db_assignment.id)
         
         # Assign new vehicle
         db_assignment.vehicle_id = vehicle.id
@@ -473,11 +569,11 @@ def update_assignment(
         if tracking:
             tracking.status = update_data["status"]
             
-            # If delivered, release vehicle
+            # If delivered, release vehicle once its last drop is delivered
             if update_data["status"] == "delivered":
                 vehicle = db.query(DBVehicle).filter(DBVehicle.id == db_assignment.vehicle_id).first()
                 if vehicle:
-                    vehicle.is_available = True
+                    vehicle.is_available = not vehicle_has_other_drops(db, vehicle.id, db_assignment.id)
                 
                 dispatch = db.query(DBDispatch).filter(DBDispatch.id == db_assignment.dispatch_id).first()
                 if dispatch:
@@ -493,6 +589,7 @@ def update_assignment(
     
     db.commit()
     db.refresh(db_assignment)
+    publish_live_delivery_changes(db, [db_assignment.dispatch_id], "assignment_updated")
     return db_assignment
 
 
@@ -509,6 +606,119 @@ def get_assignments(
     return query.order_by(DBLogisticsAssignment.assigned_at.desc()).all()
 
 
+@router.post("/assignments/plan", response_model=LoadPlan)
+def plan_assignments(
+    plan_request: LoadPlanRequest,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_logistics_manager)
+) -> Any:
+    """Dry run: propose multi-drop vehicle loads for the day's approved dispatches (nothing is saved)"""
+    return build_load_plan(db, plan_request.plan_date, plan_request.dispatch_ids, plan_request.route_areas)
+
+
+@router.post("/assignments/plan/commit", response_model=List[LogisticsAssignment])
+def commit_assignment_plan(
+    plan: LoadPlanCommit,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_logistics_manager)
+) -> Any:
+    """Create all assignments of a (possibly edited) load plan in one transaction (Logistics Manager only)"""
+    dispatch_ids = [dispatch_id for trip in plan.trips for dispatch_id in trip.dispatch_ids]
+    vehicle_ids = [trip.vehicle_id for trip in plan.trips]
+    driver_ids = [trip.driver_id for trip in plan.trips]
+    if not dispatch_ids:
+        raise HTTPException(status_code=400, detail="Plan has no dispatches")
+    if len(set(dispatch_ids)) != len(dispatch_ids):
+        raise HTTPException(status_code=400, detail="A dispatch appears in more than one trip")
+    if len(set(vehicle_ids)) != len(vehicle_ids):
+        raise HTTPException(status_code=400, detail="A vehicle appears in more than one trip")
+    if len(set(driver_ids)) != len(driver_ids):
+        raise HTTPException(status_code=400, detail="A driver appears in more than one trip")
+    
+    # Validate everything up front (one query per table) so nothing is written on error
+    dispatches = {d.id: d for d in db.query(DBDispatch).filter(DBDispatch.id.in_(dispatch_ids)).all()}
+    vehicles = {v.id: v for v in db.query(DBVehicle).filter(DBVehicle.id.in_(vehicle_ids)).all()}
+    drivers = {d.id: d for d in db.query(DBDriver).filter(DBDriver.id.in_(driver_ids)).all()}
+    assigned = {row[0] for row in db.query(DBLogisticsAssignment.dispatch_id).filter(
+        DBLogisticsAssignment.dispatch_id.in_(dispatch_ids)
+    ).all()}
+    trackings = {t.dispatch_id: t for t in db.query(DBDeliveryTracking).filter(
+        DBDeliveryTracking.dispatch_id.in_(dispatch_ids)
+    ).all()}
+    
+    for dispatch_id in dispatch_ids:
+        dispatch = dispatches.get(dispatch_id)
+        if not dispatch:
+            raise HTTPException(status_code=404, detail=f"Dispatch order {dispatch_id} not found")
+        if dispatch.status not in ["approved", "dispatched"]:
+            raise HTTPException(status_code=400, detail=f"Dispatch order {dispatch.dispatch_number} must be approved before assignment")
+        if dispatch_id in assigned:
+            raise HTTPException(status_code=400, detail=f"Dispatch order {dispatch.dispatch_number} already has an assignment")
+    for trip in plan.trips:
+        vehicle = vehicles.get(trip.vehicle_id)
+        if not vehicle:
+            raise HTTPException(status_code=404, detail=f"Vehicle {trip.vehicle_id} not found")
+        if not vehicle.is_available:
+            raise HTTPException(status_code=400, detail=f"Vehicle {vehicle.vehicle_no} is not available")
+        driver = drivers.get(trip.driver_id)
+        if not driver:
+            raise HTTPException(status_code=404, detail=f"Driver {trip.driver_id} not found")
+        if not driver.is_active:
+            raise HTTPException(status_code=400, detail=f"Driver {driver.name} is not active")
+    
+    now = datetime.now()
+    created = []
+    for trip in plan.trips:
+        vehicle = vehicles[trip.vehicle_id]
+        driver = drivers[trip.driver_id]
+        stops = len(trip.dispatch_ids)
+        for stop, dispatch_id in enumerate(trip.dispatch_ids, start=1):
+            dispatch = dispatches[dispatch_id]
+            notes = f"Drop {stop} of {stops}"
+            if plan.assignment_notes:
+                notes = f"{notes} - {plan.assignment_notes}"
+            db_assignment = DBLogisticsAssignment(
+                dispatch_id=dispatch.id,
+                dispatch_number=dispatch.dispatch_number,
+                vehicle_id=vehicle.id,
+                vehicle_no=vehicle.vehicle_no,
+                driver_id=driver.id,
+                driver_name=driver.name,
+                driver_mobile=driver.mobile,
+                planned_delivery_date=plan.plan_date,
+                route_area=trip.route_area,
+                assignment_notes=notes,
+                status="assigned",
+                assigned_by=current_user.id
+            )
+            db.add(db_assignment)
+            created.append(db_assignment)
+            
+            # Update dispatch status
+            dispatch.status = "dispatched"
+            dispatch.vehicle_no = vehicle.vehicle_no
+            dispatch.driver_name = driver.name
+            dispatch.driver_mobile = driver.mobile
+            dispatch.dispatched_at = now
+            
+            # Create delivery tracking
+            if dispatch.id not in trackings:
+                db.add(DBDeliveryTracking(
+                    dispatch_id=dispatch.id,
+                    dispatch_number=dispatch.dispatch_number,
+                    status="dispatched"
+                ))
+        
+        # Update vehicle availability
+        vehicle.is_available = False
+    
+    db.commit()
+    for db_assignment in created:
+        db.refresh(db_assignment)
+    publish_live_delivery_changes(db, dispatch_ids, "assignment_created")
+    return created
+
+
 # ============= DELIVERY TRACKING =============
 @router.get("/tracking", response_model=List[DeliveryTracking])
 def get_delivery_tracking(
@@ -548,10 +758,10 @@ def update_delivery_tracking(
         
         if assignment:
             assignment.status = "delivered"
-            # Release vehicle
+            # Release vehicle once its last drop is delivered
             vehicle = db.query(DBVehicle).filter(DBVehicle.id == assignment.vehicle_id).first()
             if vehicle:
-                vehicle.is_available = True
+                vehicle.is_available = not vehicle_has_other_drops(db, vehicle.id, assignment.id)
         
         dispatch = db.query(DBDispatch).filter(DBDispatch.id == dispatch_id).first()
         if dispatch:
@@ -570,6 +780,7 @@ def update_delivery_tracking(
     
     db.commit()
     db.refresh(db_tracking)
+    publish_live_delivery_changes(db, [dispatch_id], "tracking_updated")
     return db_tracking
 
 
@@ -637,6 +848,7 @@ def create_delivery_issue(
     db.add(db_issue)
     db.commit()
     db.refresh(db_issue)
+    publish_live_delivery_changes(db, [db_issue.dispatch_id], "issue_reported")
     return db_issue
 
 
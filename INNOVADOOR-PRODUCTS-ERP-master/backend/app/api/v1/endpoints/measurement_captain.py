@@ -14,6 +14,7 @@ from app.db.models.user import (
     MeasurementEntry as DBMeasurementEntry, Measurement as DBMeasurement, Party
 )
 from app.api.deps import get_db, get_measurement_captain, get_measurement_task_assigner
+from app.utils.user_directory import resolve_usernames, username_for
 import json
 
 router = APIRouter()
@@ -408,10 +409,7 @@ def create_measurement_entry(
         else:
             metadata_data = measurement.metadata_json
     
-    # Get username
-    username = None
-    if measurement.created_by_user:
-        username = measurement.created_by_user.username
+    username = username_for(db, measurement.created_by)
     
     measurement_dict = {
         'id': measurement.id,
@@ -451,11 +449,7 @@ def get_my_measurements(
     limit: int = 100
 ) -> Any:
     """Get all measurements created by current measurement captain - Now uses unified measurements table"""
-    from sqlalchemy.orm import joinedload
-    
-    query = db.query(DBMeasurement).options(
-        joinedload(DBMeasurement.created_by_user)
-    ).filter(
+    query = db.query(DBMeasurement).filter(
         DBMeasurement.created_by == current_user.id,
         DBMeasurement.is_deleted == False
     )
@@ -468,6 +462,7 @@ def get_my_measurements(
             query = query.filter(DBMeasurement.status == status_filter)
     
     measurements = query.order_by(DBMeasurement.created_at.desc()).offset(skip).limit(limit).all()
+    usernames = resolve_usernames(db, [measurement.created_by for measurement in measurements])
     
     # Parse JSON items and metadata
     result = []
@@ -492,7 +487,7 @@ def get_my_measurements(
             else:
                 metadata_data = measurement.metadata_json
         
-        username = measurement.created_by_user.username if measurement.created_by_user else None
+        username = usernames.get(measurement.created_by)
         
         measurement_dict = {
             'id': measurement.id,
@@ -553,11 +548,7 @@ def get_measurement_entry(
     current_user: DBUser = Depends(get_measurement_captain)
 ) -> Any:
     """Get a specific measurement - Now uses unified measurements table"""
-    from sqlalchemy.orm import joinedload
-    
-    measurement = db.query(DBMeasurement).options(
-        joinedload(DBMeasurement.created_by_user)
-    ).filter(
+    measurement = db.query(DBMeasurement).filter(
         DBMeasurement.id == measurement_id,
         DBMeasurement.created_by == current_user.id,
         DBMeasurement.is_deleted == False
@@ -589,7 +580,7 @@ def get_measurement_entry(
         else:
             metadata_data = measurement.metadata_json
     
-    username = measurement.created_by_user.username if measurement.created_by_user else None
+    username = username_for(db, measurement.created_by)
     
     measurement_dict = {
         'id': measurement.id,
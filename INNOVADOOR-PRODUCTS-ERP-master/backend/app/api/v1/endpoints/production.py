@@ -1,19 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Body, File, Form, UploadFile
 from fastapi.responses import Response
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy.sql import func
-from sqlalchemy import text, inspect
+from sqlalchemy import text, inspect, select
 from sqlalchemy.exc import OperationalError
 from typing import List, Any, Optional
 import json
 import re
 from io import BytesIO
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import mm
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from datetime import datetime
 
 from app.schemas.user import (
@@ -23,30 +17,30 @@ from app.schemas.user import (
     PartyClientRequirementsUpdate, PartyHistoryEntry,
     RMShutterItem, RMGenerationResponse, RawMaterialOrderStatusUpdate,
     RAW_MATERIAL_ORDER_STATUSES,
-    ProductionDocsSettingsResponse, ProductionDocsSettingsUpdate
+    ProductionDocsSettingsResponse, ProductionDocsSettingsUpdate,
+    SerialNumberLease, SerialNumberLeaseRequest, MeasurementImportResult
 )
 from app.db.models.user import (
     Measurement as DBMeasurement, Party as DBParty, 
     ProductionPaper as DBProductionPaper, User as DBUser, 
     PartyHistory as DBPartyHistory, ProductionSchedule as DBProductionSchedule,
     ProductionShutterItem, RawMaterialShutterItem,
-    ProductionDocsSettings
+    ProductionDocsSettings, SerialNumberLease as DBSerialNumberLease
 )
 import traceback
 from app.api.deps import get_db, get_production_manager, get_production_manager_or_scheduler, get_measurement_captain, get_production_manager_or_raw_material_checker, get_production_access, get_admin
-from sqlalchemy.orm import joinedload
+from app.utils.exports import EXPORT_FORMAT_PATTERN, export_columns, export_response
+from app.utils.jobs import enqueue_job, job_accepted
+from app.utils.measurement_import import MeasurementImportError, read_measurement_items
+from app.utils.paper_measurement_items import is_measurement_used, sync_paper_measurement_items
+from app.utils.paper_responses import production_paper_response, production_paper_responses
+from app.utils.party_documents import party_documents
+from app.utils.serial_numbers import lease_serial_numbers, lease_serials, number_items, release_unused_serials
+from app.utils.shutter_items import mirror_rm_shutter_items, populate_shutter_items
+from app.utils.user_directory import resolve_usernames, username_for
 
 router = APIRouter()
 
-# --- HOTFIX: Force DB Column Check on Module Load ---
-try:
-    from app.auto_migrate import fix_missing_columns
-    print("Executing HOTFIX DB Migration from production endpoint...")
-    fix_missing_columns()
-except Exception as e:
-    print(f"HOTFIX Migration failed: {e}")
-# ----------------------------------------------------
-
 
 def _get_or_create_production_docs_settings(db: Session) -> ProductionDocsSettings:
     """
@@ -122,8 +116,12 @@ def update_production_docs_settings(
         raise _docs_settings_error(e)
 
 @router.get("/fix-db-schema")
-def trigger_db_fix(current_user = Depends(get_production_manager)):
+def trigger_db_fix(current_user = Depends(get_production_manager), db: Session = Depends(get_db), background: bool = False):
     """Manually trigger DB schema fix"""
+    if background:
+        job = enqueue_job(db, "production.fix_db_schema", created_by=current_user.id)
+        db.commit()
+        return job_accepted(job)
     results = []
     try:
         from app.db.database import engine
@@ -202,140 +200,15 @@ def convert_party_to_dict(party: DBParty, db: Session = None) -> dict:
     
     # Get creator's username if database session is provided
     if db and party.created_by:
-        creator = db.query(DBUser).filter(DBUser.id == party.created_by).first()
-        if creator:
-            party_dict['created_by_username'] = creator.username
-        else:
-            party_dict['created_by_username'] = None
+        party_dict['created_by_username'] = username_for(db, party.created_by)
     elif hasattr(party, 'created_by_user') and party.created_by_user:
         # If relationship is already loaded
         party_dict['created_by_username'] = party.created_by_user.username
     else:
         party_dict['created_by_username'] = None
     
-    # Parse JSON fields safely
-    if party.contact_persons:
-        if isinstance(party.contact_persons, str):
-            try:
-                party_dict['contact_persons'] = json.loads(party.contact_persons)
-            except (json.JSONDecodeError, TypeError):
-                party_dict['contact_persons'] = []
-        else:
-            party_dict['contact_persons'] = party.contact_persons
-    else:
-        party_dict['contact_persons'] = []
-        
-    if party.site_addresses:
-        if isinstance(party.site_addresses, str):
-            try:
-                parsed = json.loads(party.site_addresses)
-                # Ensure it's a list, not a dict
-                if isinstance(parsed, dict):
-                    party_dict['site_addresses'] = []
-                elif isinstance(parsed, list):
-                    party_dict['site_addresses'] = parsed
-                else:
-                    party_dict['site_addresses'] = []
-            except (json.JSONDecodeError, TypeError):
-                party_dict['site_addresses'] = []
-        else:
-            # If already parsed, ensure it's a list
-            if isinstance(party.site_addresses, dict):
-                party_dict['site_addresses'] = []
-            elif isinstance(party.site_addresses, list):
-                party_dict['site_addresses'] = party.site_addresses
-            else:
-                party_dict['site_addresses'] = []
-    else:
-        party_dict['site_addresses'] = []
-        
-    if party.product_preferences:
-        if isinstance(party.product_preferences, str):
-            try:
-                party_dict['product_preferences'] = json.loads(party.product_preferences)
-            except (json.JSONDecodeError, TypeError):
-                party_dict['product_preferences'] = None
-        else:
-            party_dict['product_preferences'] = party.product_preferences
-    else:
-        party_dict['product_preferences'] = None
-        
-    if party.documents:
-        if isinstance(party.documents, str):
-            try:
-                parsed_docs = json.loads(party.documents)
-                # Normalize documents to match Document schema
-                if isinstance(parsed_docs, list):
-                    normalized_docs = []
-                    for doc in parsed_docs:
-                        if isinstance(doc, dict):
-                            # Handle old format with document_type, content, content_type
-                            if 'document_type' in doc:
-                                doc = {**doc, 'type': doc.pop('document_type')}
-                            # Convert content to url (data URL) if needed
-                            if 'content' in doc and 'url' not in doc:
-                                content_type = doc.get('content_type', 'application/octet-stream')
-                                doc['url'] = f"data:{content_type};base64,{doc['content']}"
-                                # Remove old fields if they exist
-                                doc.pop('content', None)
-                                doc.pop('content_type', None)
-                            # Ensure type field exists (required by schema)
-                            if 'type' not in doc:
-                                doc['type'] = doc.get('document_type', 'Other')
-                            normalized_docs.append(doc)
-                        else:
-                            normalized_docs.append(doc)
-                    party_dict['documents'] = normalized_docs
-                else:
-                    party_dict['documents'] = []
-            except (json.JSONDecodeError, TypeError):
-                party_dict['documents'] = []
-        else:
-            # Normalize if it's already a list
-            if isinstance(party.documents, list):
-                normalized_docs = []
-                for doc in party.documents:
-                    if isinstance(doc, dict):
-                        if 'document_type' in doc:
-                            doc = {**doc, 'type': doc.pop('document_type')}
-                        if 'content' in doc and 'url' not in doc:
-                            content_type = doc.get('content_type', 'application/octet-stream')
-                            doc['url'] = f"data:{content_type};base64,{doc['content']}"
-                            doc.pop('content', None)
-                            doc.pop('content_type', None)
-                        if 'type' not in doc:
-                            doc['type'] = doc.get('document_type', 'Other')
-                        normalized_docs.append(doc)
-                    else:
-                        normalized_docs.append(doc)
-                party_dict['documents'] = normalized_docs
-            else:
-                party_dict['documents'] = []
-    else:
-        party_dict['documents'] = []
-    
-    # Parse frame_requirements and door_requirements
-    if hasattr(party, 'frame_requirements') and party.frame_requirements:
-        if isinstance(party.frame_requirements, str):
-            try:
-                party_dict['frame_requirements'] = json.loads(party.frame_requirements)
-            except (json.JSONDecodeError, TypeError):
-                party_dict['frame_requirements'] = []
-        else:
-            party_dict['frame_requirements'] = party.frame_requirements
-    else:
-        party_dict['frame_requirements'] = []
-    
-    if hasattr(party, 'door_requirements') and party.door_requirements:
-        if isinstance(party.door_requirements, str):
-            try:
-                party_dict['door_requirements'] = json.loads(party.door_requirements)
-            except (json.JSONDecodeError, TypeError):
-                party_dict['door_requirements'] = []
-        else:
-            party_dict['door_requirements'] = party.door_requirements
-    else:
-        party_dict['door_requirements'] = []
+    # Parsed JSON fields (cached per party version)
+    party_dict.update(party_documents(party))
     
     return party_dict
 
@@ -379,34 +252,68 @@ def get_next_serial_number(
 ) -> Any:
     """Get the next user-specific serial number for measurement item rows (e.g., A00001, A00002, etc.)
     
+    Leases a single number; to number a whole sheet use POST /measurements/serial-numbers/lease.
     Available for: production_manager, measurement_captain, production_scheduler, raw_material_checker, admin
     """
+    lease = _lease_serial_numbers(db, current_user, 1)
+    return {"serial_number": lease.serial_numbers[0]}
+
+
+@router.post("/measurements/serial-numbers/lease", response_model=SerialNumberLease)
+def lease_measurement_serial_numbers(
+    lease_in: SerialNumberLeaseRequest,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_production_access)
+) -> Any:
+    """Lease a block of consecutive serial numbers for the rows of a measurement sheet
+    
+    Numbers follow the user's counter (wrapping from 99999 to 1); numbers leased more than a day
+    ago and never saved on a measurement are handed out again first.
+    """
+    return _lease_serial_numbers(db, current_user, lease_in.count)
+
+
+@router.get("/measurements/serial-numbers/leases", response_model=List[SerialNumberLease])
+def get_measurement_serial_number_leases(
+    status_filter: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_production_access)
+) -> Any:
+    """Get the current user's leased and free serial number blocks (status_filter: leased, free, closed)"""
+    release_unused_serials(db, current_user.id)
+    db.commit()
+    query = db.query(DBSerialNumberLease).filter(DBSerialNumberLease.user_id == current_user.id)
+    if status_filter:
+        query = query.filter(DBSerialNumberLease.status == status_filter)
+    else:
+        query = query.filter(DBSerialNumberLease.status.in_(["leased", "free"]))
+    leases = query.order_by(DBSerialNumberLease.id.desc()).limit(100).all()
+    return [
+        SerialNumberLease(
+            id=lease.id, prefix=lease.prefix, first_counter=lease.first_counter, count=lease.count,
+            status=lease.status, serial_numbers=lease_serials(lease), created_at=lease.created_at,
+        )
+        for lease in leases
+    ]
+
+
+def _lease_serial_numbers(db: Session, current_user, count: int) -> SerialNumberLease:
     # Check if user has serial number prefix assigned
     if not current_user.serial_number_prefix:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Serial number prefix not assigned. Please contact an administrator to assign a prefix (A, B, C, etc.)."
         )
-    
-    # Get current counter
-    counter = current_user.serial_number_counter or 0
-    
-    # Increment counter
-    counter += 1
-    
-    # Wrap around at 99999
-    if counter > 99999:
-        counter = 1
-    
-    # Update user's counter in database
-    current_user.serial_number_counter = counter
-    db.commit()
-    db.refresh(current_user)
-    
-    # Format: A00001, A00002, ..., A99999
-    serial_number = f"{current_user.serial_number_prefix}{counter:05d}"
-    
-    return {"serial_number": serial_number}
+    try:
+        lease, reused = lease_serial_numbers(db, current_user.id, count)
+        db.commit()
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return SerialNumberLease(
+        id=lease.id, prefix=lease.prefix, first_counter=lease.first_counter, count=lease.count,
+        status=lease.status, serial_numbers=lease_serials(lease), reused=reused, created_at=lease.created_at,
+    )
 
 
 @router.post("/measurements", response_model=Measurement, status_code=status.HTTP_201_CREATED)
@@ -491,16 +398,7 @@ def create_measurement(
             else:
                 metadata_data = db_measurement.metadata_json
         
-        # Get username from created_by_user relationship
-        username = None
-        if hasattr(db_measurement, 'created_by_user') and db_measurement.created_by_user:
-            username = db_measurement.created_by_user.username
-        else:
-            # Fallback: query user directly
-            from app.db.models.user import User as DBUser
-            user = db.query(DBUser).filter(DBUser.id == db_measurement.created_by).first()
-            if user:
-                username = user.username
+        username = username_for(db, db_measurement.created_by)
         
         # Create response with all fields including new ones
         measurement_dict = {
@@ -543,6 +441,89 @@ def create_measurement(
         )
 
 
+@router.post("/measurements/import", response_model=MeasurementImportResult)
+def import_measurement(
+    *,
+    db: Session = Depends(get_db),
+    file: UploadFile = File(...),
+    measurement_type: str = Form(..., pattern='^(frame_sample|shutter_sample|regular_frame|regular_shutter)$'),
+    party_id: Optional[int] = Form(None),
+    party_name: Optional[str] = Form(None),
+    thickness: Optional[str] = Form(None),
+    measurement_date: Optional[datetime] = Form(None),
+    site_location: Optional[str] = Form(None),
+    notes: Optional[str] = Form(None),
+    skip_invalid: bool = Form(False),
+    dry_run: bool = Form(False),
+    current_user = Depends(get_production_manager_or_scheduler)
+) -> Any:
+    """
+    Create a measurement from a site measurement sheet (.xlsx or .csv, one item per row).
+    Every invalid row is reported; the measurement is only created when all rows are
+    valid, or with skip_invalid=true from the valid rows.
+    """
+    try:
+        sheet = read_measurement_items(file.file, file.filename)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV file must be UTF-8 encoded"
+        )
+    except MeasurementImportError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if not sheet["rows"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No measurement items to import"
+        )
+
+    importable = not sheet["invalid"] or skip_invalid
+    result = {
+        'dry_run': dry_run,
+        'rows': sheet["rows"],
+        'imported': len(sheet["items"]) if importable else 0,
+        'invalid': sheet["invalid"],
+        'errors': sheet["errors"],
+    }
+    if dry_run or not importable or not sheet["items"]:
+        return MeasurementImportResult(**result)
+
+    # Rows without a serial number get leased ones, in the same transaction as the measurement
+    try:
+        number_items(db, current_user.id, sheet["items"])
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Rows without a serial number need one leased: {e}"
+        )
+    db_measurement = DBMeasurement(
+        measurement_type=measurement_type,
+        measurement_number=generate_next_measurement_number(db),
+        party_id=party_id,
+        party_name=party_name,
+        thickness=thickness,
+        measurement_date=measurement_date,
+        site_location=site_location,
+        items=json.dumps(sheet["items"]),
+        notes=notes,
+        # Same rule as create_measurement: captains' measurements wait for approval
+        approval_status='pending_approval' if current_user.role == 'measurement_captain' else 'approved',
+        created_by=current_user.id
+    )
+    db.add(db_measurement)
+    db.commit()
+    return MeasurementImportResult(
+        **result,
+        measurement_id=db_measurement.id,
+        measurement_number=db_measurement.measurement_number,
+        approval_status=db_measurement.approval_status,
+    )
+
+
 @router.get("/measurements", response_model=List[Measurement])
 def get_measurements(
     db: Session = Depends(get_db),
@@ -552,8 +533,7 @@ def get_measurements(
     include_deleted: bool = False
 ) -> Any:
     """Get all measurements"""
-    # Use joinedload to eagerly load the created_by_user relationship for better performance
-    query = db.query(DBMeasurement).options(joinedload(DBMeasurement.created_by_user))
+    query = db.query(DBMeasurement)
     
     # If user is measurement_captain, only show measurements they created
     if current_user.role == 'measurement_captain':
@@ -563,6 +543,7 @@ def get_measurements(
         # Filter out deleted measurements
         query = query.filter(DBMeasurement.is_deleted == False)
     measurements = query.offset(skip).limit(limit).all()
+    usernames = resolve_usernames(db, [measurement.created_by for measurement in measurements])
     
     # Convert items JSON string to list for each measurement
     result = []
@@ -575,10 +556,7 @@ def get_measurements(
                 except (json.JSONDecodeError, TypeError):
                     measurement.items = []
         
-        # Get username from created_by_user relationship (eagerly loaded)
-        username = None
-        if measurement.created_by_user:
-            username = measurement.created_by_user.username
+        username = usernames.get(measurement.created_by)
         
         # Parse metadata JSON if exists
         metadata_data = None
@@ -624,6 +602,22 @@ def get_measurements(
     return result
 
 
+@router.get("/measurements/export")
+def export_measurements(
+    current_user = Depends(get_production_access),
+    include_deleted: bool = False,
+    export_format: str = Query("csv", alias="format", pattern=EXPORT_FORMAT_PATTERN)
+) -> Any:
+    """Download all measurements visible in the list as CSV or XLSX (streamed, items and metadata left out)"""
+    stmt = select(*export_columns(DBMeasurement, exclude=("items", "metadata_json"))).order_by(DBMeasurement.id)
+    # Measurement captains only see measurements they created
+    if current_user.role == 'measurement_captain':
+        stmt = stmt.where(DBMeasurement.created_by == current_user.id)
+    if not include_deleted:
+        stmt = stmt.where(DBMeasurement.is_deleted == False)
+    return export_response(stmt, "measurements", export_format)
+
+
 @router.delete("/measurements/{measurement_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_measurement(
     *,
@@ -661,8 +655,7 @@ def get_measurement(
     current_user = Depends(get_production_access)  # Allow production_manager, scheduler, measurement_captain, and raw_material_checker to access
 ) -> Any:
     """Get a specific measurement"""
-    # Use joinedload to eagerly load the created_by_user relationship
-    query = db.query(DBMeasurement).options(joinedload(DBMeasurement.created_by_user)).filter(DBMeasurement.id == measurement_id)
+    query = db.query(DBMeasurement).filter(DBMeasurement.id == measurement_id)
     
     # If user is measurement_captain, only allow access to measurements they created
     if current_user.role == 'measurement_captain':
@@ -682,10 +675,7 @@ def get_measurement(
                 items_data = []
         # If it's already a list/dict, keep it as is
     
-    # Get username from created_by_user relationship
-    username = None
-    if measurement.created_by_user:
-        username = measurement.created_by_user.username
+    username = username_for(db, measurement.created_by)
     
     # Parse metadata JSON if exists
     metadata_data = None
@@ -731,42 +721,8 @@ def get_measurement(
 
 
 def is_measurement_used_in_production_papers(measurement_id: int, db: Session) -> bool:
-    """Check if a measurement is used in any production paper"""
-    # Check direct reference: production_papers.measurement_id
-    direct_ref = db.query(DBProductionPaper).filter(
-        DBProductionPaper.measurement_id == measurement_id,
-        DBProductionPaper.is_deleted == False
-    ).first()
-    
-    if direct_ref:
-        return True
-    
-    # Check indirect reference: parse selected_measurement_items JSON
-    all_papers = db.query(DBProductionPaper).filter(
-        DBProductionPaper.is_deleted == False,
-        DBProductionPaper.selected_measurement_items.isnot(None)
-    ).all()
-    
-    for paper in all_papers:
-        if not paper.selected_measurement_items:
-            continue
-        
-        try:
-            selected_items = json.loads(paper.selected_measurement_items) if isinstance(paper.selected_measurement_items, str) else paper.selected_measurement_items
-            if not isinstance(selected_items, list):
-                continue
-            
-            # Check if any item references this measurement
-            for item in selected_items:
-                if isinstance(item, dict) and item.get('measurement_id') == measurement_id:
-                    return True
-                # Also check old format where measurement_id might be in the paper itself
-                if paper.measurement_id == measurement_id:
-                    return True
-        except (json.JSONDecodeError, TypeError):
-            continue
-    
-    return False
+    """Check if a measurement is used in any production paper (directly or through selected items)"""
+    return is_measurement_used(db, measurement_id)
 
 
 @router.put("/measurements/{measurement_id}", response_model=Measurement)
@@ -828,10 +784,7 @@ def update_measurement(
             except (json.JSONDecodeError, TypeError):
                 items_data = []
     
-    # Get username from created_by_user relationship
-    username = None
-    if measurement.created_by_user:
-        username = measurement.created_by_user.username
+    username = username_for(db, measurement.created_by)
     
     # Parse metadata JSON if exists
     metadata_data = None
@@ -926,15 +879,7 @@ def approve_measurement(
         else:
             metadata_data = measurement.metadata_json
     
-    # Get username
-    username = None
-    if measurement.created_by_user:
-        username = measurement.created_by_user.username
-    else:
-        from app.db.models.user import User as DBUser
-        user = db.query(DBUser).filter(DBUser.id == measurement.created_by).first()
-        if user:
-            username = user.username
+    username = username_for(db, measurement.created_by)
     
     measurement_dict = {
         'id': measurement.id,
@@ -975,12 +920,11 @@ def get_pending_measurements(
     limit: int = 100
 ) -> Any:
     """Get all pending approval measurements"""
-    measurements = db.query(DBMeasurement).options(
-        joinedload(DBMeasurement.created_by_user)
-    ).filter(
+    measurements = db.query(DBMeasurement).filter(
         DBMeasurement.approval_status == 'pending_approval',
         DBMeasurement.is_deleted == False
     ).order_by(DBMeasurement.created_at.desc()).offset(skip).limit(limit).all()
+    usernames = resolve_usernames(db, [measurement.created_by for measurement in measurements])
     
     result = []
     for measurement in measurements:
@@ -1004,7 +948,7 @@ def get_pending_measurements(
             else:
                 metadata_data = measurement.metadata_json
         
-        username = measurement.created_by_user.username if measurement.created_by_user else None
+        username = usernames.get(measurement.created_by)
         
         measurement_dict = {
             'id': measurement.id,
@@ -1047,9 +991,7 @@ def reject_measurement(
     """Reject a pending measurement with reason"""
     from datetime import datetime
     
-    measurement = db.query(DBMeasurement).options(
-        joinedload(DBMeasurement.created_by_user)
-    ).filter(DBMeasurement.id == measurement_id).first()
+    measurement = db.query(DBMeasurement).filter(DBMeasurement.id == measurement_id).first()
     
     if not measurement:
         raise HTTPException(status_code=404, detail="Measurement not found")
@@ -1089,7 +1031,7 @@ def reject_measurement(
         else:
             metadata_data = measurement.metadata_json
     
-    username = measurement.created_by_user.username if measurement.created_by_user else None
+    username = username_for(db, measurement.created_by)
     
     measurement_dict = {
         'id': measurement.id,
@@ -1231,6 +1173,7 @@ def get_parties(
 ) -> Any:
     """Get all parties"""
     parties = db.query(DBParty).offset(skip).limit(limit).all()
+    resolve_usernames(db, [party.created_by for party in parties])  # Creators of the page in one query
     
     # Convert parties to dictionaries and parse JSON fields
     result = []
@@ -1419,49 +1362,44 @@ def get_client_requirements_status(
     current_user = Depends(get_production_access)
 ) -> Any:
     """Get status of which client requirements have production papers"""
-    party = db.query(DBParty).filter(DBParty.id == party_id).first()
+    party = db.query(DBParty).options(
+        load_only(DBParty.id, DBParty.updated_at, DBParty.frame_requirements, DBParty.door_requirements)
+    ).filter(DBParty.id == party_id).first()
     if not party:
         raise HTTPException(status_code=404, detail="Party not found")
     
-    # Get all production papers for this party that reference client requirements
-    production_papers = db.query(DBProductionPaper).filter(
-        DBProductionPaper.client_requirement_party_id == party_id,
-        DBProductionPaper.is_deleted == False
-    ).all()
-    
-    # Build a dictionary of processed requirements with paper details
+    # Papers made for the party's client requirements, read from the covering index
+    # ix_production_papers_client_requirement only
     # Format: {(requirement_type, requirement_index): [paper1, paper2, ...]}
     processed_requirements = {}
-    for paper in production_papers:
-        if paper.client_requirement_type and paper.client_requirement_index is not None:
-            key = (paper.client_requirement_type, paper.client_requirement_index)
-            if key not in processed_requirements:
-                processed_requirements[key] = []
-            processed_requirements[key].append({
-                'id': paper.id,
-                'paper_number': paper.paper_number,
-                'status': paper.status
-            })
-    
-    # Parse party's requirements to get the count
-    frame_requirements = []
-    door_requirements = []
-    
-    if party.frame_requirements:
-        try:
-            frame_requirements = json.loads(party.frame_requirements) if isinstance(party.frame_requirements, str) else party.frame_requirements
-            if not isinstance(frame_requirements, list):
-                frame_requirements = []
-        except (json.JSONDecodeError, TypeError):
-            frame_requirements = []
-    
-    if party.door_requirements:
-        try:
-            door_requirements = json.loads(party.door_requirements) if isinstance(party.door_requirements, str) else party.door_requirements
-            if not isinstance(door_requirements, list):
-                door_requirements = []
-        except (json.JSONDecodeError, TypeError):
-            door_requirements = []
+    covered = db.query(
+        DBProductionPaper.client_requirement_type,
+        DBProductionPaper.client_requirement_index,
+        DBProductionPaper.id,
+        DBProductionPaper.paper_number,
+        DBProductionPaper.status,
+    ).filter(
+        DBProductionPaper.client_requirement_party_id == party_id,
+        DBProductionPaper.is_deleted == False,
+        DBProductionPaper.client_requirement_type.isnot(None),
+        DBProductionPaper.client_requirement_index.isnot(None),
+    ).all()
+    # Sorted here: ORDER BY id in SQL would make SQLite leave the covering index
+    for requirement_type, requirement_index, paper_id, paper_number, paper_status in sorted(covered, key=lambda row: row[2]):
+        processed_requirements.setdefault((requirement_type, requirement_index), []).append({
+            'id': paper_id,
+            'paper_number': paper_number,
+            'status': paper_status
+        })
+    
+    # Party's requirements, to get the count
+    requirements = party_documents(party, ("frame_requirements", "door_requirements"))
+    frame_requirements = requirements["frame_requirements"]
+    door_requirements = requirements["door_requirements"]
+    if not isinstance(frame_requirements, list):
+        frame_requirements = []
+    if not isinstance(door_requirements, list):
+        door_requirements = []
     
     # Build response with status for each requirement
     result = {
@@ -1492,25 +1430,29 @@ def get_party_history(
     *,
     db: Session = Depends(get_db),
     party_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
     current_user = Depends(get_production_manager_or_scheduler)
 ) -> Any:
-    """Get history of changes for a party"""
+    """Get history of changes for a party, newest first (total number of entries in X-Total-Count)"""
     # Verify party exists
     party = db.query(DBParty).filter(DBParty.id == party_id).first()
     if not party:
         raise HTTPException(status_code=404, detail="Party not found")
     
-    # Get history entries
-    history_entries = db.query(DBPartyHistory).filter(
-        DBPartyHistory.party_id == party_id
-    ).order_by(DBPartyHistory.changed_at.desc()).all()
+    # Get one page of history entries
+    history_query = db.query(DBPartyHistory).filter(DBPartyHistory.party_id == party_id)
+    response.headers["X-Total-Count"] = str(history_query.count())
+    history_entries = history_query.order_by(
+        DBPartyHistory.changed_at.desc(), DBPartyHistory.id.desc()
+    ).offset(skip).limit(limit).all()
     
-    # Convert to response format with usernames
+    # Convert to response format with usernames (one lookup for the whole page)
+    usernames = resolve_usernames(db, [entry.changed_by for entry in history_entries])
     result = []
     for entry in history_entries:
-        # Get username
-        user = db.query(DBUser).filter(DBUser.id == entry.changed_by).first()
-        username = user.username if user else None
+        username = usernames.get(entry.changed_by)
         
         entry_dict = {
             'id': entry.id,
@@ -1731,170 +1673,29 @@ def create_production_paper(
             created_by=current_user.id
         )
         db.add(db_paper)
+        db.flush()
+        sync_paper_measurement_items(db, db_paper)
         db.commit()
         db.refresh(db_paper)
 
         # Automation: Populate production_shutter_items
         try:
             if db_paper.product_category == 'Shutter' and db_paper.selected_measurement_items:
-                selected_items_list = json.loads(db_paper.selected_measurement_items)
-                
-                # Fetch all relevant measurements in one go
-                meas_ids = set()
-                if isinstance(selected_items_list, list) and len(selected_items_list) > 0:
-                    if isinstance(selected_items_list[0], dict) and 'measurement_id' in selected_items_list[0]:
-                        meas_ids = {item.get('measurement_id') for item in selected_items_list if item.get('measurement_id')}
-                    elif db_paper.measurement_id:
-                        meas_ids = {db_paper.measurement_id}
-                
-                measurements_map = {}
-                for m_id in meas_ids:
-                    m = db.query(DBMeasurement).filter(DBMeasurement.id == m_id).first()
-                    if m:
-                        measurements_map[m_id] = json.loads(m.items) if isinstance(m.items, str) else m.items
-
-                items_to_save = []
-                for i, selected_item in enumerate(selected_items_list):
-                    item_data = None
-                    if isinstance(selected_item, dict) and 'measurement_id' in selected_item:
-                        m_items = measurements_map.get(selected_item['measurement_id'])
-                        idx = selected_item.get('item_index')
-                        if m_items and idx is not None and 0 <= idx < len(m_items):
-                            item_data = m_items[idx]
-                    elif db_paper.measurement_id:
-                        m_items = measurements_map.get(db_paper.measurement_id)
-                        if m_items and isinstance(selected_item, int) and 0 <= selected_item < len(m_items):
-                            item_data = m_items[selected_item]
-                    
-                    if item_data:
-                        # Dimensions
-                        w = item_data.get('act_width') or item_data.get('width') or item_data.get('w') or '-'
-                        h = item_data.get('act_height') or item_data.get('height') or item_data.get('h') or '-'
-                        
-                        # Calculation Logic (Mirroring frontend logic for 1:1 match)
-                        def get_dim_num(val):
-                            if not val or val == '-': return 0.0
-                            try:
-                                return float(str(val).replace('"', '').strip())
-                            except: return 0.0
-                            
-                        w_val = get_dim_num(w)
-                        h_val = get_dim_num(h)
-                        
-                        # Threshold for mm vs inch (e.g. 150mm is small, so < 150 likely means inch)
-                        is_inch = w_val < 150 
-                        
-                        w_inch = w_val if is_inch else w_val / 25.4
-                        h_inch = h_val if is_inch else h_val / 25.4
-                        
-                        qty_val = item_data.get('qty') or item_data.get('quantity')
-                        try:
-                            qty = int(qty_val) if qty_val is not None else 1
-                        except:
-                            qty = 1
-                            
-                        sq_ft = (w_inch * h_inch / 144.0) * qty
-                        sq_meter = sq_ft * 0.09290304
-                        laminate_sheets = sq_ft / 32.0 # 8x4 sheet is 32 sqft
-                        
-                        psi = ProductionShutterItem(
-                            production_paper_id=db_paper.id,
-                            item_no=str(i + 1),
-                            ro_width=str(item_data.get('ro_width') or '-'),
-                            ro_height=str(item_data.get('ro_height') or '-'),
-                            thickness=str(db_paper.thickness or '-'),
-                            quantity=qty,
-                            sq_ft=round(sq_ft, 3),
-                            sq_meter=round(sq_meter, 3),
-                            laminate_sheets=round(laminate_sheets, 2)
-                        )
-                        items_to_save.append(psi)
-                
-                if items_to_save:
-                    db.add_all(items_to_save)
+                if populate_shutter_items(db, db_paper):
                     db.commit()
-                    db.refresh(db_paper)
         except Exception as e:
+            db.rollback()
             print(f"Failed to populate production_shutter_items: {e}")
             traceback.print_exc()
         
-        # Convert selected_measurement_items from JSON string to list for response
-        selected_items = None
-        if db_paper.selected_measurement_items:
-            try:
-                selected_items = json.loads(db_paper.selected_measurement_items)
-            except (json.JSONDecodeError, TypeError):
-                selected_items = None
-        
-        # Create response dict with parsed fields
-        # Use getattr to safely access fields that may not exist in the model yet
-        paper_dict = {
-            'id': db_paper.id,
-            'paper_number': db_paper.paper_number,
-            'party_id': db_paper.party_id,
-            'party_name': db_paper.party_name,
-            'measurement_id': db_paper.measurement_id,
-            'project_site_name': db_paper.project_site_name,
-            'order_type': db_paper.order_type,
-            'product_category': db_paper.product_category,
-            'product_type': db_paper.product_type,
-            'product_sub_type': db_paper.product_sub_type,
-            'expected_dispatch_date': db_paper.expected_dispatch_date,
-            'production_start_date': db_paper.production_start_date,
-            'status': db_paper.status,
-            'title': db_paper.title,
-            'description': db_paper.description,
-            'remarks': db_paper.remarks,
-            'site_name': db_paper.site_name,
-            'site_location': db_paper.site_location,
-            'area': db_paper.area,
-            'concept': db_paper.concept,
-            'thickness': db_paper.thickness,
-            'design': db_paper.design,
-            'frontside_design': getattr(db_paper, 'frontside_design', None),
-            'backside_design': getattr(db_paper, 'backside_design', None),
-            'gel_colour': db_paper.gel_colour,
-            'laminate': db_paper.laminate,
-            'remark': db_paper.remark,
-            'selected_measurement_items': selected_items,
-            # Frame-specific fields
-            'total_quantity': getattr(db_paper, 'total_quantity', None),
-            'wall_type': getattr(db_paper, 'wall_type', None),
-            'rebate': getattr(db_paper, 'rebate', None),
-            'sub_frame': getattr(db_paper, 'sub_frame', None),
-            'construction': getattr(db_paper, 'construction', None),
-            'cover_moulding': getattr(db_paper, 'cover_moulding', None),
-            # Shutter-specific fields
-            'frontside_laminate': getattr(db_paper, 'frontside_laminate', None),
-            'backside_laminate': getattr(db_paper, 'backside_laminate', None),
-            'grade': getattr(db_paper, 'grade', None),
-            'side_frame': getattr(db_paper, 'side_frame', None),
-            'filler': getattr(db_paper, 'filler', None),
-            'foam_bottom': getattr(db_paper, 'foam_bottom', None),
-            'frp_coating': getattr(db_paper, 'frp_coating', None),
-            'shutter_items': db_paper.shutter_items,
-            'rm_shutter_items': db_paper.rm_shutter_items,
-            'created_by': db_paper.created_by,
-            'foam_bottom': getattr(db_paper, 'foam_bottom', None),
-            'frp_coating': getattr(db_paper, 'frp_coating', None),
-            'shutter_items': db_paper.shutter_items,
-            'rm_shutter_items': db_paper.rm_shutter_items,
-            'created_by': db_paper.created_by,
-            'created_at': db_paper.created_at,
-            'updated_at': db_paper.updated_at,
-        }
-
         # Auto-generate Raw Material Paper for shutters if enabled in settings.
         # This is a best-effort operation and must NOT block production paper creation.
         try:
             settings_obj = _get_or_create_production_docs_settings(db)
             if paper_in.product_category == "Shutter" and settings_obj.auto_generate_rm_shutter:
-                # Reuse existing generation logic; ignore user-facing response.
-                generate_raw_material_paper(
-                    db=db,
-                    paper_id=db_paper.id,
-                    current_user=current_user,  # production_manager role
-                )
+                # Same mirroring as generate_raw_material_paper
+                if mirror_rm_shutter_items(db, db_paper.id):
+                    db.commit()
         except Exception as auto_rm_err:
             # Log but do not fail the API
             import logging
@@ -1902,7 +1703,7 @@ def create_production_paper(
                 f"Auto-generate RM paper failed for production_paper_id={db_paper.id}: {auto_rm_err}"
             )
         
-        return ProductionPaper(**paper_dict)
+        return production_paper_response(db, db_paper, items=True)
         
     except HTTPException:
         raise
@@ -1920,38 +1721,22 @@ def generate_raw_material_paper(
     *,
     db: Session = Depends(get_db),
     paper_id: int,
-    current_user = Depends(get_production_manager)
+    current_user = Depends(get_production_manager),
+    background: bool = False
 ):
     """Generate Raw Material Paper by mirroring Production Paper items"""
     paper = db.query(DBProductionPaper).filter(DBProductionPaper.id == paper_id).first()
     if not paper:
         raise HTTPException(status_code=404, detail="Production paper not found")
+    if background:
+        job = enqueue_job(db, "production.generate_rm", {"paper_id": paper_id}, created_by=current_user.id)
+        db.commit()
+        return job_accepted(job)
     
-    # Check if shutter items exist
-    shutter_items = db.query(ProductionShutterItem).filter(ProductionShutterItem.production_paper_id == paper_id).all()
-    if not shutter_items:
+    # Regenerate: replace existing RM items with a copy of the shutter items
+    if not mirror_rm_shutter_items(db, paper_id):
+        db.rollback()
         raise HTTPException(status_code=400, detail="No production shutter items found to mirror")
-    
-    # Delete existing RM items if any (Regenerate logic)
-    db.query(RawMaterialShutterItem).filter(RawMaterialShutterItem.production_paper_id == paper_id).delete()
-    
-    # Copy items directly
-    rm_items = []
-    for item in shutter_items:
-        rm_item = RawMaterialShutterItem(
-            production_paper_id=item.production_paper_id,
-            item_no=item.item_no,
-            ro_width=item.ro_width,
-            ro_height=item.ro_height,
-            thickness=item.thickness,
-            quantity=item.quantity,
-            sq_ft=item.sq_ft,
-            sq_meter=item.sq_meter,
-            laminate_sheets=item.laminate_sheets
-        )
-        rm_items.append(rm_item)
-    
-    db.add_all(rm_items)
     db.commit()
     
     return RMGenerationResponse(message="Raw Material Paper generated successfully", paper_number=f"{paper.paper_number}-RM")
@@ -2028,7 +1813,6 @@ def get_production_papers(
     try:
         from sqlalchemy import select, inspect
         from sqlalchemy.exc import ProgrammingError, OperationalError
-        from app.schemas.user import ProductionPaperParty, ProductionPaperMeasurement
         
         # Check if is_deleted column exists in the database
         try:
@@ -2098,136 +1882,7 @@ def get_production_papers(
                 # Re-raise if it's a different error
                 raise
         
-        # Get unique party IDs and measurement IDs
-        party_ids = [p.party_id for p in papers if p.party_id]
-        measurement_ids = [p.measurement_id for p in papers if p.measurement_id]
-        
-        # Manually query parties and measurements with only the columns we need
-        parties_dict = {}
-        if party_ids:
-            parties = db.query(DBParty.id, DBParty.name).filter(DBParty.id.in_(party_ids)).all()
-            parties_dict = {p.id: p for p in parties}
-        
-        measurements_dict = {}
-        if measurement_ids:
-            measurements = db.query(
-                DBMeasurement.id, 
-                DBMeasurement.measurement_number, 
-                DBMeasurement.party_name
-            ).filter(DBMeasurement.id.in_(measurement_ids)).all()
-            measurements_dict = {m.id: m for m in measurements}
-        
-        # Batch compute items_total_quantity: sum of quantity from rm_shutter_items or shutter_items per paper
-        paper_ids = [p.id for p in papers]
-        rm_totals = {}
-        shutter_totals = {}
-        if paper_ids:
-            try:
-                rm_rows = db.query(
-                    RawMaterialShutterItem.production_paper_id,
-                    func.coalesce(func.sum(RawMaterialShutterItem.quantity), 0).label("total")
-                ).filter(
-                    RawMaterialShutterItem.production_paper_id.in_(paper_ids)
-                ).group_by(RawMaterialShutterItem.production_paper_id).all()
-                rm_totals = {row.production_paper_id: int(row.total) for row in rm_rows}
-            except Exception:
-                pass
-            try:
-                shutter_rows = db.query(
-                    ProductionShutterItem.production_paper_id,
-                    func.coalesce(func.sum(ProductionShutterItem.quantity), 0).label("total")
-                ).filter(
-                    ProductionShutterItem.production_paper_id.in_(paper_ids)
-                ).group_by(ProductionShutterItem.production_paper_id).all()
-                shutter_totals = {row.production_paper_id: int(row.total) for row in shutter_rows}
-            except Exception:
-                pass
-        
-        # Convert to Pydantic models with nested party and measurement data
-        result = []
-        for paper in papers:
-            # Parse selected_measurement_items from JSON string to list
-            selected_items = None
-            if paper.selected_measurement_items:
-                try:
-                    selected_items = json.loads(paper.selected_measurement_items)
-                except (json.JSONDecodeError, TypeError):
-                    selected_items = None
-            
-            paper_data = {
-                "id": paper.id,
-                "paper_number": paper.paper_number,
-                "party_id": paper.party_id,
-                "party_name": paper.party_name,
-                "measurement_id": paper.measurement_id,
-                "project_site_name": paper.project_site_name,
-                "order_type": paper.order_type,
-                "product_category": paper.product_category,
-                "product_type": paper.product_type,
-                "product_sub_type": paper.product_sub_type,
-                "expected_dispatch_date": paper.expected_dispatch_date,
-                "production_start_date": paper.production_start_date,
-                "status": paper.status,
-                "title": paper.title,
-                "description": paper.description,
-                "remarks": paper.remarks,
-                "site_name": paper.site_name,
-                "site_location": paper.site_location,
-                "area": paper.area,
-                "concept": paper.concept,
-                "thickness": paper.thickness,
-                "design": paper.design,
-                "frontside_design": getattr(paper, 'frontside_design', None),
-                "backside_design": getattr(paper, 'backside_design', None),
-                "gel_colour": paper.gel_colour,
-                "laminate": paper.laminate,
-                "remark": paper.remark,
-                "selected_measurement_items": selected_items,
-                # Frame-specific fields
-                "total_quantity": getattr(paper, 'total_quantity', None),
-                "wall_type": getattr(paper, 'wall_type', None),
-                "rebate": getattr(paper, 'rebate', None),
-                "sub_frame": getattr(paper, 'sub_frame', None),
-                "construction": getattr(paper, 'construction', None),
-                "cover_moulding": getattr(paper, 'cover_moulding', None),
-                # Shutter-specific fields
-                "frontside_laminate": getattr(paper, 'frontside_laminate', None),
-                "backside_laminate": getattr(paper, 'backside_laminate', None),
-                "grade": getattr(paper, 'grade', None),
-                "side_frame": getattr(paper, 'side_frame', None),
-                "filler": getattr(paper, 'filler', None),
-                "foam_bottom": getattr(paper, 'foam_bottom', None),
-                "frp_coating": getattr(paper, 'frp_coating', None),
-                "created_by": paper.created_by,
-                "created_at": paper.created_at,
-                "updated_at": paper.updated_at,
-                "is_deleted": getattr(paper, 'is_deleted', False),
-                "deleted_at": getattr(paper, 'deleted_at', None),
-                "deletion_reason": getattr(paper, 'deletion_reason', None),
-                "raw_material_order_status": (getattr(paper, 'raw_material_order_status', None) or 'pending'),
-                "items_total_quantity": rm_totals.get(paper.id, shutter_totals.get(paper.id)),
-            }
-            
-            # Add party data if exists
-            if paper.party_id and paper.party_id in parties_dict:
-                party = parties_dict[paper.party_id]
-                paper_data["party"] = ProductionPaperParty(
-                    id=party.id,
-                    name=party.name
-                )
-            
-            # Add measurement data if exists
-            if paper.measurement_id and paper.measurement_id in measurements_dict:
-                measurement = measurements_dict[paper.measurement_id]
-                paper_data["measurement"] = ProductionPaperMeasurement(
-                    id=measurement.id,
-                    measurement_number=measurement.measurement_number,
-                    party_name=measurement.party_name
-                )
-            
-            result.append(ProductionPaper(**paper_data))
-        
-        return result
+        return production_paper_responses(db, papers)
     except HTTPException:
         raise
     except Exception as e:
@@ -2287,153 +1942,7 @@ def get_production_paper(
     if not paper:
         raise HTTPException(status_code=404, detail="Production paper not found")
     
-    # Load party and measurement relationships
-    party_data = None
-    if paper.party_id:
-        party = db.query(DBParty.id, DBParty.name).filter(DBParty.id == paper.party_id).first()
-        if party:
-            party_data = {'id': party.id, 'name': party.name}
-    
-    measurement_data = None
-    if paper.measurement_id:
-        measurement = db.query(
-            DBMeasurement.id,
-            DBMeasurement.measurement_number,
-            DBMeasurement.party_name
-        ).filter(DBMeasurement.id == paper.measurement_id).first()
-        if measurement:
-            measurement_data = {
-                'id': measurement.id,
-                'measurement_number': measurement.measurement_number,
-                'party_name': measurement.party_name
-            }
-    
-    # Parse selected_measurement_items from JSON string to list
-    selected_items = None
-    if paper.selected_measurement_items:
-        try:
-            selected_items = json.loads(paper.selected_measurement_items)
-        except (json.JSONDecodeError, TypeError):
-            selected_items = None
-
-    # Resolve selected_measurement_items to full item list for frontend (selected_items_data)
-    selected_items_data = []
-    if selected_items and isinstance(selected_items, list) and len(selected_items) > 0:
-        first_item = selected_items[0]
-        if isinstance(first_item, dict) and 'measurement_id' in first_item:
-            measurement_ids = set(item['measurement_id'] for item in selected_items if isinstance(item, dict))
-            measurements_map = {}
-            for meas_id in measurement_ids:
-                meas = db.query(DBMeasurement).filter(DBMeasurement.id == meas_id).first()
-                if meas:
-                    items = []
-                    if isinstance(meas.items, str):
-                        try:
-                            items = json.loads(meas.items)
-                        except (json.JSONDecodeError, TypeError):
-                            items = []
-                    elif isinstance(meas.items, list):
-                        items = meas.items
-                    measurements_map[meas_id] = items
-            for item in selected_items:
-                if isinstance(item, dict) and 'measurement_id' in item and 'item_index' in item:
-                    meas_id = item['measurement_id']
-                    item_idx = item['item_index']
-                    if meas_id in measurements_map and item_idx < len(measurements_map[meas_id]):
-                        selected_items_data.append(measurements_map[meas_id][item_idx].copy())
-        elif isinstance(first_item, int) and paper.measurement_id:
-            meas = db.query(DBMeasurement).filter(DBMeasurement.id == paper.measurement_id).first()
-            if meas:
-                items = []
-                if isinstance(meas.items, str):
-                    try:
-                        items = json.loads(meas.items)
-                    except (json.JSONDecodeError, TypeError):
-                        items = []
-                elif isinstance(meas.items, list):
-                    items = meas.items
-                for idx in selected_items:
-                    if isinstance(idx, int) and 0 <= idx < len(items):
-                        selected_items_data.append(items[idx].copy())
-    elif paper.measurement_id and (not selected_items or len(selected_items) == 0):
-        # No selection: return all items from linked measurement
-        meas = db.query(DBMeasurement).filter(DBMeasurement.id == paper.measurement_id).first()
-        if meas:
-            items = []
-            if isinstance(meas.items, str):
-                try:
-                    items = json.loads(meas.items)
-                except (json.JSONDecodeError, TypeError):
-                    items = []
-            elif isinstance(meas.items, list):
-                items = meas.items
-            selected_items_data = [it.copy() for it in items] if isinstance(items, list) else []
-
-    # Create response dict with parsed fields
-    # Use getattr to safely access fields that may not exist in the model yet
-    paper_dict = {
-        'id': paper.id,
-        'paper_number': paper.paper_number,
-        'party_id': paper.party_id,
-        'party_name': paper.party_name,
-        'measurement_id': paper.measurement_id,
-        'project_site_name': paper.project_site_name,
-        'order_type': paper.order_type,
-        'product_category': paper.product_category,
-        'product_type': paper.product_type,
-        'product_sub_type': paper.product_sub_type,
-        'expected_dispatch_date': paper.expected_dispatch_date,
-        'production_start_date': paper.production_start_date,
-        'status': paper.status,
-        'title': paper.title,
-        'description': paper.description,
-        'remarks': paper.remarks,
-        'site_name': paper.site_name,
-        'site_location': paper.site_location,
-        'area': paper.area,
-        'concept': paper.concept,
-        'thickness': paper.thickness,
-        'design': paper.design,
-        'frontside_design': getattr(paper, 'frontside_design', None),
-        'backside_design': getattr(paper, 'backside_design', None),
-        'gel_colour': paper.gel_colour,
-        'laminate': paper.laminate,
-        'remark': paper.remark,
-        'selected_measurement_items': selected_items,
-        'selected_items_data': selected_items_data,
-        # Frame-specific fields
-        'total_quantity': getattr(paper, 'total_quantity', None),
-        'wall_type': getattr(paper, 'wall_type', None),
-        'rebate': getattr(paper, 'rebate', None),
-        'sub_frame': getattr(paper, 'sub_frame', None),
-        'construction': getattr(paper, 'construction', None),
-        'cover_moulding': getattr(paper, 'cover_moulding', None),
-        # Shutter-specific fields
-        'frontside_laminate': getattr(paper, 'frontside_laminate', None),
-        'backside_laminate': getattr(paper, 'backside_laminate', None),
-        'grade': getattr(paper, 'grade', None),
-        'side_frame': getattr(paper, 'side_frame', None),
-        'filler': getattr(paper, 'filler', None),
-        'foam_bottom': getattr(paper, 'foam_bottom', None),
-        'frp_coating': getattr(paper, 'frp_coating', None),
-        'shutter_items': paper.shutter_items,
-        'rm_shutter_items': paper.rm_shutter_items,
-        'created_by': paper.created_by,
-        'foam_bottom': getattr(paper, 'foam_bottom', None),
-        'frp_coating': getattr(paper, 'frp_coating', None),
-        'created_by': paper.created_by,
-        'created_at': paper.created_at,
-        'updated_at': paper.updated_at,
-        'is_deleted': getattr(paper, 'is_deleted', False),
-        'deleted_at': getattr(paper, 'deleted_at', None),
-        'deletion_reason': getattr(paper, 'deletion_reason', None),
-        'raw_material_order_status': (getattr(paper, 'raw_material_order_status', None) or 'pending'),
-        # Include nested party and measurement data
-        'party': party_data,
-        'measurement': measurement_data,
-    }
-    
-    return ProductionPaper(**paper_dict)
+    return production_paper_response(db, paper, items=True, selected_items=True)
 
 
 @router.patch("/production-papers/{paper_id}/raw-material-status", response_model=ProductionPaper)
@@ -2462,72 +1971,19 @@ def update_raw_material_order_status(
     db_paper.raw_material_order_status = status_value
     db.commit()
     db.refresh(db_paper)
-    # Return full paper using get logic (reuse paper_dict building or call get_production_paper)
-    paper_dict = {
-        'id': db_paper.id,
-        'paper_number': db_paper.paper_number,
-        'party_id': db_paper.party_id,
-        'party_name': db_paper.party_name,
-        'measurement_id': db_paper.measurement_id,
-        'project_site_name': db_paper.project_site_name,
-        'order_type': db_paper.order_type,
-        'product_category': db_paper.product_category,
-        'product_type': db_paper.product_type,
-        'product_sub_type': db_paper.product_sub_type,
-        'expected_dispatch_date': db_paper.expected_dispatch_date,
-        'production_start_date': db_paper.production_start_date,
-        'status': db_paper.status,
-        'raw_material_order_status': (db_paper.raw_material_order_status or 'pending'),
-        'title': db_paper.title,
-        'description': db_paper.description,
-        'remarks': db_paper.remarks,
-        'site_name': db_paper.site_name,
-        'site_location': db_paper.site_location,
-        'area': db_paper.area,
-        'concept': db_paper.concept,
-        'thickness': db_paper.thickness,
-        'design': db_paper.design,
-        'frontside_design': getattr(db_paper, 'frontside_design', None),
-        'backside_design': getattr(db_paper, 'backside_design', None),
-        'gel_colour': db_paper.gel_colour,
-        'laminate': db_paper.laminate,
-        'remark': db_paper.remark,
-        'selected_measurement_items': json.loads(db_paper.selected_measurement_items) if db_paper.selected_measurement_items else None,
-        'total_quantity': getattr(db_paper, 'total_quantity', None),
-        'wall_type': getattr(db_paper, 'wall_type', None),
-        'rebate': getattr(db_paper, 'rebate', None),
-        'sub_frame': getattr(db_paper, 'sub_frame', None),
-        'construction': getattr(db_paper, 'construction', None),
-        'cover_moulding': getattr(db_paper, 'cover_moulding', None),
-        'frontside_laminate': getattr(db_paper, 'frontside_laminate', None),
-        'backside_laminate': getattr(db_paper, 'backside_laminate', None),
-        'grade': getattr(db_paper, 'grade', None),
-        'side_frame': getattr(db_paper, 'side_frame', None),
-        'filler': getattr(db_paper, 'filler', None),
-        'foam_bottom': getattr(db_paper, 'foam_bottom', None),
-        'frp_coating': getattr(db_paper, 'frp_coating', None),
-        'created_by': db_paper.created_by,
-        'created_at': db_paper.created_at,
-        'updated_at': db_paper.updated_at,
-        'is_deleted': getattr(db_paper, 'is_deleted', False),
-        'deleted_at': getattr(db_paper, 'deleted_at', None),
-        'deletion_reason': getattr(db_paper, 'deletion_reason', None),
-        'party': None,
-        'measurement': None,
-    }
-    if db_paper.party_id:
-        party = db.query(DBParty.id, DBParty.name).filter(DBParty.id == db_paper.party_id).first()
-        if party:
-            paper_dict['party'] = {'id': party.id, 'name': party.name}
-    if db_paper.measurement_id:
-        m = db.query(DBMeasurement.id, DBMeasurement.measurement_number, DBMeasurement.party_name).filter(DBMeasurement.id == db_paper.measurement_id).first()
-        if m:
-            paper_dict['measurement'] = {'id': m.id, 'measurement_number': m.measurement_number, 'party_name': m.party_name}
-    return ProductionPaper(**paper_dict)
+    return production_paper_response(db, db_paper)
 
 
 def generate_production_paper_pdf(paper_data: dict, measurement_items: List[dict] = None) -> BytesIO:
     """Generate a professional PDF for a production paper"""
+    # ReportLab is imported here rather than at module level: it is only needed for PDF downloads
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.lib import colors
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, 
                            rightMargin=10*mm, leftMargin=10*mm,
@@ -3133,52 +2589,13 @@ def update_production_paper(
     # Update fields
     for field, value in update_data.items():
         setattr(db_paper, field, value)
+    if 'selected_measurement_items' in update_data or 'measurement_id' in update_data:
+        sync_paper_measurement_items(db, db_paper)
     
     db.commit()
     db.refresh(db_paper)
     
-    # Parse selected_measurement_items from JSON string to list for response
-    selected_items = None
-    if db_paper.selected_measurement_items:
-        try:
-            selected_items = json.loads(db_paper.selected_measurement_items)
-        except (json.JSONDecodeError, TypeError):
-            selected_items = None
-    
-    # Create response dict with parsed fields
-    paper_dict = {
-        'id': db_paper.id,
-        'paper_number': db_paper.paper_number,
-        'party_id': db_paper.party_id,
-        'party_name': db_paper.party_name,
-        'measurement_id': db_paper.measurement_id,
-        'project_site_name': db_paper.project_site_name,
-        'order_type': db_paper.order_type,
-        'product_category': db_paper.product_category,
-        'product_type': db_paper.product_type,
-        'product_sub_type': db_paper.product_sub_type,
-        'expected_dispatch_date': db_paper.expected_dispatch_date,
-        'production_start_date': db_paper.production_start_date,
-        'status': db_paper.status,
-        'title': db_paper.title,
-        'description': db_paper.description,
-        'remarks': db_paper.remarks,
-        'site_name': db_paper.site_name,
-        'site_location': db_paper.site_location,
-        'area': db_paper.area,
-        'concept': db_paper.concept,
-        'thickness': db_paper.thickness,
-        'design': db_paper.design,
-        'gel_colour': db_paper.gel_colour,
-        'laminate': db_paper.laminate,
-        'remark': db_paper.remark,
-        'selected_measurement_items': selected_items,
-        'created_by': db_paper.created_by,
-        'created_at': db_paper.created_at,
-        'updated_at': db_paper.updated_at,
-    }
-    
-    return ProductionPaper(**paper_dict)
+    return production_paper_response(db, db_paper)
 
 
 @router.delete("/production-papers/{paper_id}", status_code=status.HTTP_204_NO_CONTENT)
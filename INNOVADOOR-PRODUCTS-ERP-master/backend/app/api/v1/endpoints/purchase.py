@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, select
 from typing import List, Any, Optional
 import json
 import re
@@ -10,16 +10,19 @@ from decimal import Decimal
 from app.schemas.purchase import (
     Vendor, VendorCreate, BOM, BOMCreate, PurchaseRequisition, PurchaseRequisitionCreate,
     PurchaseOrder, PurchaseOrderCreate, GRN, GRNCreate, PurchaseReturn, PurchaseReturnCreate,
-    VendorBill, VendorBillCreate, PurchaseDashboardKPIs, POLineItem
+    VendorBill, VendorBillCreate, PurchaseDashboardKPIs, POLineItem, MaterialStock
 )
 from app.db.models.purchase import (
     Vendor as DBVendor, BOM as DBBOM, PurchaseRequisition as DBPurchaseRequisition,
     PurchaseOrder as DBPurchaseOrder, GRN as DBGRN, PurchaseReturn as DBPurchaseReturn,
-    VendorBill as DBVendorBill
+    VendorBill as DBVendorBill, MaterialStock as DBMaterialStock
 )
 from app.db.models.user import ProductionPaper as DBProductionPaper
 from app.api.deps import get_db, get_purchase_executive, get_purchase_manager, get_store_incharge, get_purchase_user
 from app.db.models.user import User as DBUser
+from app.utils.material_stock import post_grn_receipt, post_purchase_return, rebuild_material_stock
+from app.utils.exports import EXPORT_FORMAT_PATTERN, export_columns, export_response
+from app.utils.ledger_posting import sync_vendor_bill_ledger
 
 router = APIRouter()
 
@@ -394,6 +397,19 @@ def get_purchase_orders(
     return pos
 
 
+@router.get("/purchase-orders/export")
+def export_purchase_orders(
+    current_user = Depends(get_purchase_user),
+    status: Optional[str] = None,
+    export_format: str = Query("csv", alias="format", pattern=EXPORT_FORMAT_PATTERN)
+) -> Any:
+    """Download all Purchase Orders matching the list filters as CSV or XLSX (streamed, line items left out)"""
+    stmt = select(*export_columns(DBPurchaseOrder, exclude=("line_items",))).order_by(DBPurchaseOrder.id)
+    if status:
+        stmt = stmt.where(DBPurchaseOrder.status == status)
+    return export_response(stmt, "purchase_orders", export_format)
+
+
 @router.get("/purchase-orders/{po_id}", response_model=PurchaseOrder)
 def get_purchase_order(
     *,
@@ -550,6 +566,19 @@ def get_grns(
     return grns
 
 
+@router.get("/grns/export")
+def export_grns(
+    current_user = Depends(get_purchase_user),
+    status: Optional[str] = None,
+    export_format: str = Query("csv", alias="format", pattern=EXPORT_FORMAT_PATTERN)
+) -> Any:
+    """Download all GRNs matching the list filters as CSV or XLSX (streamed, QC parameters left out)"""
+    stmt = select(*export_columns(DBGRN, exclude=("qc_parameters",))).order_by(DBGRN.id)
+    if status:
+        stmt = stmt.where(DBGRN.status == status)
+    return export_response(stmt, "grns", export_format)
+
+
 @router.get("/grns/{grn_id}", response_model=GRN)
 def get_grn(
     *,
@@ -587,6 +616,9 @@ def approve_grn(
     grn.status = "Approved"
     grn.approved_by = current_user.id
     grn.approved_at = datetime.now()
+    
+    # Accepted material enters stock on approval
+    post_grn_receipt(db, grn)
     db.commit()
     db.refresh(grn)
     
@@ -621,13 +653,17 @@ def create_purchase_return(
     
     db_return = DBPurchaseReturn(**return_data, created_by=current_user.id)
     db.add(db_return)
+    db.flush()
     
     # Link to GRN if provided
+    grn = None
     if return_data.get('grn_id'):
         grn = db.query(DBGRN).filter(DBGRN.id == return_data['grn_id']).first()
         if grn:
             grn.purchase_return_id = db_return.id
     
+    # Remove returned material from stock
+    post_purchase_return(db, db_return, grn)
     db.commit()
     db.refresh(db_return)
     return db_return
@@ -645,6 +681,35 @@ def get_purchase_returns(
     return returns
 
 
+# ==================== MATERIAL STOCK ====================
+@router.get("/material-stock", response_model=List[MaterialStock])
+def get_material_stock(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_purchase_user),
+    material_category: Optional[str] = None
+) -> Any:
+    """Get running stock balances per material"""
+    query = db.query(DBMaterialStock)
+    if material_category:
+        query = query.filter(DBMaterialStock.category_key == material_category.strip().lower())
+    return query.order_by(DBMaterialStock.material_category, DBMaterialStock.material_name).all()
+
+
+@router.post("/material-stock/rebuild", response_model=dict)
+def rebuild_stock(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_purchase_manager)
+) -> Any:
+    """Recompute stock balances from GRNs, purchase returns and scheduled production papers"""
+    try:
+        count = rebuild_material_stock(db)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to rebuild material stock: {str(e)}")
+    return {"message": "Material stock rebuilt", "materials": count}
+
+
 # ==================== VENDOR BILL ====================
 @router.post("/vendor-bills", response_model=VendorBill, status_code=status.HTTP_201_CREATED)
 def create_vendor_bill(
@@ -685,6 +750,8 @@ def create_vendor_bill(
     
     db_bill = DBVendorBill(**bill_data, created_by=current_user.id)
     db.add(db_bill)
+    db.flush()
+    sync_vendor_bill_ledger(db, db_bill, current_user.id)
     db.commit()
     db.refresh(db_bill)
     
@@ -4,7 +4,6 @@ from typing import List, Any
 from datetime import datetime
 import json
 import re
-import math
 
 from app.schemas.user import (
     Supplier, SupplierCreate,
@@ -28,7 +27,8 @@ from app.db.models.user import (
     RawMaterialShutterItem as DBRawMaterialShutterItem
 )
 from app.api.deps import get_db, get_raw_material_checker, get_production_access
-from app.utils.raw_material_parser import parse_raw_material_table
+from app.utils.raw_material_parser import parse_raw_material_table, raw_material_paper_rows
+from app.utils.paper_measurement_items import selected_measurement_items
 from app.utils.pdf_generator import generate_raw_material_pdf
 
 router = APIRouter()
@@ -644,153 +644,9 @@ def get_raw_material_data(
     if not measurement:
         raise HTTPException(status_code=404, detail="Associated Measurement not found")
 
-    # Parse measurement items
-    try:
-        all_items = []
-        if measurement.items:
-            all_items = json.loads(measurement.items) if isinstance(measurement.items, str) else measurement.items
-        if not isinstance(all_items, list):
-            all_items = []
-    except:
-        all_items = []
-
-    # Parse selected indices/items - handle both single measurement and multiple measurements
-    selected_items = []
-    try:
-        selection = json.loads(paper.selected_measurement_items) if isinstance(paper.selected_measurement_items, str) else paper.selected_measurement_items
-        if isinstance(selection, list):
-            # Build a map of all measurements that might be referenced
-            measurements_map = {measurement.id: all_items}
-            
-            for s in selection:
-                item_to_add = None
-                if isinstance(s, int):
-                    # Simple index format - use current measurement
-                    if 0 <= s < len(all_items):
-                        item_to_add = all_items[s]
-                elif isinstance(s, dict):
-                    # Handle multiple measurements format
-                    m_id = s.get('measurement_id')
-                    idx = s.get('item_index')
-                    
-                    # Get items for this measurement
-                    if m_id in measurements_map:
-                        m_items = measurements_map[m_id]
-                    else:
-                        # Fetch measurement if not in map
-                        other_m = db.query(DBMeasurement).filter(DBMeasurement.id == m_id).first()
-                        if other_m:
-                            other_items = json.loads(other_m.items) if isinstance(other_m.items, str) else other_m.items
-                            if not isinstance(other_items, list):
-                                other_items = []
-                            measurements_map[m_id] = other_items
-                            m_items = other_items
-                        else:
-                            m_items = []
-                    
-                    # Get item by index
-                    if m_items and idx is not None and 0 <= idx < len(m_items):
-                        item_to_add = m_items[idx]
-                
-                if item_to_add:
-                    selected_items.append(item_to_add)
-    except Exception as e:
-        print(f"Error parsing selected items: {e}")
-        import traceback
-        traceback.print_exc()
+    # Selected items - single measurement (indices) and multiple measurements formats
+    selected_items = [item for _, item in selected_measurement_items(db, paper.id)]
 
-    def get_num(val):
-        if not val or val == '-': return 0.0
-        try:
-            return float(str(val).replace('"', '').strip())
-        except: return 0.0
-    
-    def convert_to_inches_string(val):
-        """Convert dimension to inches format string, EXACTLY matching Production Paper frontend convertToInches logic"""
-        if not val or val == '-' or val == '': return ''
-        try:
-            # Remove quotes and clean the string
-            clean_val = str(val).replace('"', '').strip()
-            if not clean_val:
-                return ''
-            num = float(clean_val)
-            if num == 0:
-                return ''
-            # If value is > 100, it's likely MM. Else it's likely already inches.
-            if num > 100:
-                return f"{(num / 25.4):.2f}\""
-            return f"{num:.2f}\""
-        except:
-            return str(val) if val else ''
-
-    # Group items by ro_width and ro_height in inches, summing quantities (matching Production Paper grouping logic EXACTLY)
-    grouped_items = {}
-    for item in selected_items:
-        # Use EXACT same field priority as frontend DoorProductionPaper: ro_width || width || w
-        raw_width = item.get('ro_width') or item.get('width') or item.get('w') or ''
-        raw_height = item.get('ro_height') or item.get('height') or item.get('h') or ''
-        
-        # Skip items with missing or invalid dimensions
-        if not raw_width or not raw_height or raw_width == '-' or raw_height == '-':
-            continue
-        
-        # Validate that dimensions are numeric (not text codes like "10478")
-        width_num_test = get_num(raw_width)
-        height_num_test = get_num(raw_height)
-        
-        # Skip if dimensions are clearly wrong (e.g., > 10000 is likely a code, not a dimension)
-        if width_num_test > 10000 or height_num_test > 10000:
-            continue
-        
-        # Skip if dimensions are 0 or invalid
-        if width_num_test == 0 or height_num_test == 0:
-            continue
-        
-        # Convert to inches string format (matching frontend convertToInches EXACTLY)
-        width_inches_str = convert_to_inches_string(raw_width)
-        height_inches_str = convert_to_inches_string(raw_height)
-        
-        # Skip if conversion failed or returned empty
-        if not width_inches_str or not height_inches_str or width_inches_str == '' or height_inches_str == '':
-            continue
-        
-        # Create grouping key using string format (matching frontend key format)
-        key = f"{width_inches_str}-{height_inches_str}"
-        
-        # Extract numeric values for calculations (parse from the inches string)
-        try:
-            width_num = float(width_inches_str.replace('"', ''))
-            height_num = float(height_inches_str.replace('"', ''))
-        except:
-            # Fallback: use the test values we already calculated
-            width_num = width_num_test
-            height_num = height_num_test
-            if width_num > 100:
-                width_num = width_num / 25.4
-            if height_num > 100:
-                height_num = height_num / 25.4
-        
-        # Get quantity (matching frontend: parseInt(item.qty || item.quantity) || 1)
-        qty_val = item.get('qty') or item.get('quantity')
-        try:
-            qty = int(float(qty_val)) if qty_val is not None and qty_val != '' else 1
-        except:
-            qty = 1
-        
-        if key in grouped_items:
-            # If this dimension combination already exists, add to quantity (matching frontend logic)
-            grouped_items[key]['quantity'] += qty
-        else:
-            # First occurrence of this dimension combination
-            grouped_items[key] = {
-                'item': item,
-                'ro_width': width_num,  # Store numeric value for calculations
-                'ro_height': height_num,  # Store numeric value for calculations
-                'ro_width_display': width_inches_str,  # Store formatted string for display
-                'ro_height_display': height_inches_str,  # Store formatted string for display
-                'quantity': qty
-            }
-    
     rm_items = []
     total_qty = 0
     total_sq_ft = 0.0
@@ -798,27 +654,14 @@ def get_raw_material_data(
     total_laminate_sq_ft = 0.0
     total_laminate_sheets = 0
 
-    # Sort grouped items by width then height (matching Production Paper sorting)
-    sorted_groups = sorted(grouped_items.items(), key=lambda x: (x[1]['ro_width'], x[1]['ro_height']))
-    
-    for i, (key, grouped) in enumerate(sorted_groups):
-        item = grouped['item']
-        ro_w = grouped['ro_width']
-        ro_h = grouped['ro_height']
-        ro_w_display = grouped.get('ro_width_display', '')
-        ro_h_display = grouped.get('ro_height_display', '')
-        qty = grouped['quantity']
-        
-        # Calculation logic: (RO_WIDTH × RO_HEIGHT × QTY) / 144 (single side only - unchanged)
-        sq_ft = (ro_w * ro_h * qty) / 144.0
-        sq_meter = sq_ft * 0.092903
-        
-        # New laminate calculation: Both sides + 20% wastage
-        # Laminate SQ.FT = SQ.FT × 2 × 1.20
-        laminate_sq_ft = sq_ft * 2.0 * 1.20
-        
-        # Laminate Sheets = CEILING(Laminate SQ.FT ÷ 32) - rounded up, no decimals
-        laminate_sheets = math.ceil(laminate_sq_ft / 32.0)
+    # Grouped by RO size in inches, smallest first (matching Production Paper grouping and sorting)
+    for i, row in enumerate(raw_material_paper_rows(selected_items)):
+        item = row['item']
+        qty = row['quantity']
+        sq_ft = row['sq_ft']
+        sq_meter = row['sq_meter']
+        laminate_sq_ft = row['laminate_sq_ft']  # Both sides + 20% wastage
+        laminate_sheets = row['laminate_sheets']  # Rounded up to whole 8x4 sheets
 
         thickness = item.get('thickness') or paper.thickness or '-'
         laminate_code = paper.frontside_laminate or paper.laminate or '-'
@@ -826,10 +669,6 @@ def get_raw_material_data(
         side_frame = paper.side_frame or '-'
         filler = paper.filler or '-'
         
-        # Format dimensions for display (remove quotes, show as number)
-        ro_w_display_clean = ro_w_display.replace('"', '') if isinstance(ro_w_display, str) and ro_w_display else str(ro_w)
-        ro_h_display_clean = ro_h_display.replace('"', '') if isinstance(ro_h_display, str) and ro_h_display else str(ro_h)
-        
         rm_items.append({
             "sr_no": i + 1,
             "thickness": thickness,
@@ -838,8 +677,8 @@ def get_raw_material_data(
             "filler": filler,
             "production_code": paper.paper_number,
             "laminate_code": laminate_code,
-            "ro_width": float(ro_w_display_clean) if ro_w_display_clean else ro_w,
-            "ro_height": float(ro_h_display_clean) if ro_h_display_clean else ro_h,
+            "ro_width": row['ro_width'],
+            "ro_height": row['ro_height'],
             "quantity": qty,
             "sq_ft": round(sq_ft, 3),
             "sq_meter": round(sq_meter, 4),
@@ -891,158 +730,27 @@ def get_raw_material_pdf(
         if not measurement:
             raise HTTPException(status_code=404, detail="Associated Measurement not found")
 
-        # Parse measurement items (reuse logic from get_raw_material_data)
-        try:
-            all_items = []
-            if measurement.items:
-                all_items = json.loads(measurement.items) if isinstance(measurement.items, str) else measurement.items
-            if not isinstance(all_items, list):
-                all_items = []
-        except:
-            all_items = []
-
-        # Parse selected indices/items
-        selected_items = []
-        try:
-            selection = json.loads(paper.selected_measurement_items) if isinstance(paper.selected_measurement_items, str) else paper.selected_measurement_items
-            if isinstance(selection, list):
-                measurements_map = {measurement.id: all_items}
-                
-                for s in selection:
-                    item_to_add = None
-                    if isinstance(s, int):
-                        if 0 <= s < len(all_items):
-                            item_to_add = all_items[s]
-                    elif isinstance(s, dict):
-                        m_id = s.get('measurement_id')
-                        idx = s.get('item_index')
-                        
-                        if m_id in measurements_map:
-                            m_items = measurements_map[m_id]
-                        else:
-                            other_m = db.query(DBMeasurement).filter(DBMeasurement.id == m_id).first()
-                            if other_m:
-                                other_items = json.loads(other_m.items) if isinstance(other_m.items, str) else other_m.items
-                                if not isinstance(other_items, list):
-                                    other_items = []
-                                measurements_map[m_id] = other_items
-                                m_items = other_items
-                            else:
-                                m_items = []
-                        
-                        if m_items and idx is not None and 0 <= idx < len(m_items):
-                            item_to_add = m_items[idx]
-                    
-                    if item_to_add:
-                        selected_items.append(item_to_add)
-        except Exception as e:
-            print(f"Error parsing selected items: {e}")
-
-        def get_num(val):
-            if not val or val == '-': return 0.0
-            try:
-                return float(str(val).replace('"', '').strip())
-            except: return 0.0
-        
-        def convert_to_inches_string(val):
-            if not val or val == '-' or val == '': return ''
-            try:
-                clean_val = str(val).replace('"', '').strip()
-                if not clean_val:
-                    return ''
-                num = float(clean_val)
-                if num == 0:
-                    return ''
-                if num > 100:
-                    return f"{(num / 25.4):.2f}\""
-                return f"{num:.2f}\""
-            except:
-                return str(val) if val else ''
-
-        # Group items by ro_width and ro_height
-        grouped_items = {}
-        for item in selected_items:
-            raw_width = item.get('ro_width') or item.get('width') or item.get('w') or ''
-            raw_height = item.get('ro_height') or item.get('height') or item.get('h') or ''
-            
-            if not raw_width or not raw_height or raw_width == '-' or raw_height == '-':
-                continue
-            
-            width_num_test = get_num(raw_width)
-            height_num_test = get_num(raw_height)
-            
-            if width_num_test > 10000 or height_num_test > 10000:
-                continue
-            
-            if width_num_test == 0 or height_num_test == 0:
-                continue
-            
-            width_inches_str = convert_to_inches_string(raw_width)
-            height_inches_str = convert_to_inches_string(raw_height)
-            
-            if not width_inches_str or not height_inches_str or width_inches_str == '' or height_inches_str == '':
-                continue
-            
-            key = f"{width_inches_str}-{height_inches_str}"
-            
-            try:
-                width_num = float(width_inches_str.replace('"', ''))
-                height_num = float(height_inches_str.replace('"', ''))
-            except:
-                width_num = width_num_test
-                height_num = height_num_test
-                if width_num > 100:
-                    width_num = width_num / 25.4
-                if height_num > 100:
-                    height_num = height_num / 25.4
-            
-            qty_val = item.get('qty') or item.get('quantity')
-            try:
-                qty = int(float(qty_val)) if qty_val is not None and qty_val != '' else 1
-            except:
-                qty = 1
-            
-            if key in grouped_items:
-                grouped_items[key]['quantity'] += qty
-            else:
-                grouped_items[key] = {
-                    'item': item,
-                    'ro_width': width_num,
-                    'ro_height': height_num,
-                    'ro_width_display': width_inches_str,
-                    'ro_height_display': height_inches_str,
-                    'quantity': qty
-                }
-        
-        # Prepare items for PDF
+        # Selected items (same as get_raw_material_data)
+        selected_items = [item for _, item in selected_measurement_items(db, paper.id)]
+
+        # Prepare items for PDF (grouped by RO size, as get_raw_material_data)
         pdf_items = []
         total_qty = 0
         total_sq_ft = 0.0
         total_sq_meter = 0.0
         total_laminate_sheets = 0
 
-        sorted_groups = sorted(grouped_items.items(), key=lambda x: (x[1]['ro_width'], x[1]['ro_height']))
-        
-        for i, (key, grouped) in enumerate(sorted_groups):
-            item = grouped['item']
-            ro_w = grouped['ro_width']
-            ro_h = grouped['ro_height']
-            ro_w_display = grouped.get('ro_width_display', '')
-            ro_h_display = grouped.get('ro_height_display', '')
-            qty = grouped['quantity']
-            
-            sq_ft = (ro_w * ro_h * qty) / 144.0
-            sq_meter = sq_ft * 0.092903
-            laminate_sq_ft = sq_ft * 2.0 * 1.20
-            laminate_sheets = math.ceil(laminate_sq_ft / 32.0)
+        for i, row in enumerate(raw_material_paper_rows(selected_items)):
+            item = row['item']
+            qty = row['quantity']
+            sq_ft = row['sq_ft']
+            sq_meter = row['sq_meter']
+            laminate_sheets = row['laminate_sheets']
 
-            ro_w_display_clean = ro_w_display.replace('"', '') if isinstance(ro_w_display, str) and ro_w_display else str(ro_w)
-            ro_h_display_clean = ro_h_display.replace('"', '') if isinstance(ro_h_display, str) and ro_h_display else str(ro_h)
-            
             pdf_items.append({
                 "sr_no": i + 1,
-                "ro_width": float(ro_w_display_clean) if ro_w_display_clean else ro_w,
-                "ro_height": float(ro_h_display_clean) if ro_h_display_clean else ro_h,
+                "ro_width": row['ro_width'],
+                "ro_height": row['ro_height'],
                 "thickness": item.get('thickness') or paper.thickness or '-',
                 "quantity": qty,
                 "sq_ft": round(sq_ft, 3),
@@ -1126,43 +834,7 @@ def extract_and_store_raw_material_table(
             )
         
         # Get measurement items
-        measurement_items = []
-        if paper.selected_measurement_items:
-            try:
-                selected_items = json.loads(paper.selected_measurement_items) if isinstance(paper.selected_measurement_items, str) else paper.selected_measurement_items
-                
-                # Handle new format: array of objects with measurement_id, item_index
-                if selected_items and isinstance(selected_items[0], dict) and 'measurement_id' in selected_items[0]:
-                    measurement_ids = list(set([item['measurement_id'] for item in selected_items]))
-                    
-                    for measurement_id in measurement_ids:
-                        measurement = db.query(DBMeasurement).filter(DBMeasurement.id == measurement_id).first()
-                        if measurement and measurement.items:
-                            items = json.loads(measurement.items) if isinstance(measurement.items, str) else measurement.items
-                            
-                            # Get items for this measurement
-                            for selected_item in selected_items:
-                                if selected_item['measurement_id'] == measurement_id:
-                                    item_index = selected_item.get('item_index', 0)
-                                    if isinstance(items, list) and 0 <= item_index < len(items):
-                                        measurement_items.append(items[item_index])
-                
-                # Handle old format: array of indices
-                elif selected_items and isinstance(selected_items[0], (int, str)):
-                    if paper.measurement_id:
-                        measurement = db.query(DBMeasurement).filter(DBMeasurement.id == paper.measurement_id).first()
-                        if measurement and measurement.items:
-                            items = json.loads(measurement.items) if isinstance(measurement.items, str) else measurement.items
-                            if isinstance(items, list):
-                                for index in selected_items:
-                                    idx = int(index) if isinstance(index, str) else index
-                                    if 0 <= idx < len(items):
-                                        measurement_items.append(items[idx])
-            except (json.JSONDecodeError, TypeError, KeyError, IndexError) as e:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Error parsing measurement items: {str(e)}"
-                )
+        measurement_items = [item for _, item in selected_measurement_items(db, paper.id)]
         
         if not measurement_items:
             raise HTTPException(
@@ -1268,42 +940,7 @@ def get_raw_material_table(
     
     if not db_items:
         # If no stored items, extract from production paper on-the-fly
-        measurement_items = []
-        if paper.selected_measurement_items:
-            try:
-                selected_items = json.loads(paper.selected_measurement_items) if isinstance(paper.selected_measurement_items, str) else paper.selected_measurement_items
-                
-                # Handle new format: array of objects with measurement_id, item_index
-                if selected_items and isinstance(selected_items[0], dict) and 'measurement_id' in selected_items[0]:
-                    measurement_ids = list(set([item['measurement_id'] for item in selected_items]))
-                    
-                    for measurement_id in measurement_ids:
-                        measurement = db.query(DBMeasurement).filter(DBMeasurement.id == measurement_id).first()
-                        if measurement and measurement.items:
-                            items = json.loads(measurement.items) if isinstance(measurement.items, str) else measurement.items
-                            
-                            for selected_item in selected_items:
-                                if selected_item['measurement_id'] == measurement_id:
-                                    item_index = selected_item.get('item_index', 0)
-                                    if isinstance(items, list) and 0 <= item_index < len(items):
-                                        measurement_items.append(items[item_index])
-                
-                # Handle old format: array of indices
-                elif selected_items and isinstance(selected_items[0], (int, str)):
-                    if paper.measurement_id:
-                        measurement = db.query(DBMeasurement).filter(DBMeasurement.id == paper.measurement_id).first()
-                        if measurement and measurement.items:
-                            items = json.loads(measurement.items) if isinstance(measurement.items, str) else measurement.items
-                            if isinstance(items, list):
-                                for index in selected_items:
-                                    idx = int(index) if isinstance(index, str) else index
-                                    if 0 <= idx < len(items):
-                                        measurement_items.append(items[idx])
-            except (json.JSONDecodeError, TypeError, KeyError, IndexError) as e:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Error parsing measurement items: {str(e)}"
-                )
+        measurement_items = [item for _, item in selected_measurement_items(db, paper.id)]
         
         if not measurement_items:
             raise HTTPException(
@@ -10,6 +10,7 @@ from app.schemas.sales import (
     Lead, LeadCreate, LeadUpdate,
     SiteProject, SiteProjectCreate, SiteProjectUpdate,
     Quotation, QuotationCreate, QuotationUpdate, QuotationLineItem,
+    QuotationRepriceRequest, QuotationRepriceResult,
     SalesOrder, SalesOrderCreate, SalesOrderUpdate,
     MeasurementRequest, MeasurementRequestCreate, MeasurementRequestUpdate,
     FollowUp, FollowUpCreate, FollowUpUpdate,
@@ -25,6 +26,7 @@ from app.db.models.sales import (
 )
 from app.db.models.user import Party as DBParty, Measurement as DBMeasurement, ProductionPaper as DBProductionPaper
 from app.api.deps import get_db, get_marketing_executive, get_sales_executive, get_sales_manager, get_sales_user
+from app.utils.pricing import price_documents, price_line_items
 
 router = APIRouter()
 
@@ -101,31 +103,13 @@ def generate_measurement_request_number(db: Session) -> str:
 
 
 def calculate_quotation_totals(line_items: List[dict], discount_amount: Decimal = Decimal("0.00"), discount_percentage: Optional[Decimal] = None) -> dict:
-    """Calculate quotation totals including GST"""
-    subtotal = Decimal("0.00")
-    for item in line_items:
-        quantity = Decimal(str(item.get('quantity', 0)))
-        rate = Decimal(str(item.get('rate', 0)))
-        item_discount = Decimal(str(item.get('discount', 0)))
-        amount = (quantity * rate) - item_discount
-        subtotal += amount
-    
-    # Apply discount
-    if discount_percentage:
-        discount_amount = subtotal * (discount_percentage / Decimal("100"))
-    
-    taxable_amount = subtotal - discount_amount
-    
-    # GST calculation (assuming 18% GST)
-    gst_rate = Decimal("18.00")
-    tax_amount = taxable_amount * (gst_rate / Decimal("100"))
-    total_amount = taxable_amount + tax_amount
-    
+    """Calculate quotation totals including GST (per-item gst_rate, default settings.DEFAULT_GST_RATE)"""
+    totals = price_line_items(line_items, discount_amount, discount_percentage)
     return {
-        "subtotal": subtotal,
-        "discount_amount": discount_amount,
-        "tax_amount": tax_amount,
-        "total_amount": total_amount
+        "subtotal": totals["subtotal"],
+        "discount_amount": totals["discount_amount"],
+        "tax_amount": totals["tax_amount"],
+        "total_amount": totals["total_amount"]
     }
 
 
@@ -631,6 +615,64 @@ def approve_discount(
     return Quotation(**qt_dict)
 
 
+@router.post("/quotations/reprice", response_model=QuotationRepriceResult)
+def reprice_quotations(
+    *,
+    db: Session = Depends(get_db),
+    reprice_in: QuotationRepriceRequest,
+    current_user = Depends(get_sales_manager)
+) -> Any:
+    """Re-price quotations in bulk, e.g. after a GST rate change (Sales Manager only)"""
+    query = db.query(
+        DBQuotation.id,
+        DBQuotation.line_items,
+        DBQuotation.discount_amount,
+        DBQuotation.discount_percentage,
+        DBQuotation.total_amount
+    )
+    if reprice_in.quotation_ids:
+        query = query.filter(DBQuotation.id.in_(reprice_in.quotation_ids))
+    else:
+        query = query.filter(DBQuotation.status.in_(reprice_in.statuses))
+    rows = query.all()
+
+    documents = []
+    for row in rows:
+        line_items = json.loads(row.line_items) if isinstance(row.line_items, str) else (row.line_items or [])
+        if reprice_in.gst_rate is not None:
+            for item in line_items:
+                item['gst_rate'] = str(reprice_in.gst_rate)
+        documents.append({
+            'line_items': line_items,
+            'discount_amount': row.discount_amount,
+            'discount_percentage': row.discount_percentage
+        })
+
+    # All quotations are priced in one call and written back with a single bulk UPDATE
+    mappings = []
+    total_before = Decimal("0.00")
+    total_after = Decimal("0.00")
+    for row, document, totals in zip(rows, documents, price_documents(documents)):
+        mapping = {
+            'id': row.id,
+            'subtotal': totals['subtotal'],
+            'discount_amount': totals['discount_amount'],
+            'tax_amount': totals['tax_amount'],
+            'total_amount': totals['total_amount']
+        }
+        if reprice_in.gst_rate is not None:
+            mapping['line_items'] = json.dumps(document['line_items'])
+        mappings.append(mapping)
+        total_before += row.total_amount or Decimal("0.00")
+        total_after += totals['total_amount']
+
+    if mappings:
+        db.bulk_update_mappings(DBQuotation, mappings)
+        db.commit()
+
+    return QuotationRepriceResult(repriced=len(mappings), total_before=total_before, total_after=total_after)
+
+
 # Sales Order Endpoints
 @router.post("/sales-orders", response_model=SalesOrder, status_code=status.HTTP_201_CREATED)
 def create_sales_order(
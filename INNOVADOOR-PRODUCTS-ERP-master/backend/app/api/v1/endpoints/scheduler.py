@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List, Any, Optional
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import json
 
 from app.schemas.user import (
@@ -17,6 +17,9 @@ from app.db.models.user import (
     Party as DBParty
 )
 from app.api.deps import get_db, get_production_scheduler
+from app.utils.capacity_planner import build_capacity_calendar, department_stage_hours, get_paper_stages
+from app.utils.material_stock import check_availability_bulk, post_paper_consumption
+from app.utils.jobs import enqueue_job, job_accepted
 
 router = APIRouter()
 
@@ -42,33 +45,55 @@ def serialize_department_schedule(department_schedule: List[DepartmentScheduleIt
     return json.dumps(dept_schedule_list)
 
 
+def check_department_capacity(capacity_calendar, entries: list, schedule_ref: Any = "new",
+                              stages: Optional[list] = None) -> None:
+    """Reject department schedule entries that would overload a department
+
+    Entries without planned_hours count the hours of the paper's ``stages`` in their department.
+    """
+    overloads = capacity_calendar.overloads_caused_by(
+        entries, schedule_ref, department_stage_hours(stages or [])
+    )
+    if overloads:
+        details = ", ".join(
+            f"{o['department']} on {o['date'].isoformat()} ({o['booked_hours']}/{o['capacity_hours']} hrs)"
+            for o in overloads[:10]
+        )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Department capacity exceeded: {details}"
+        )
+
+
+def check_material_availability_bulk(papers: List[DBProductionPaper], db: Session, measurement_ids: Optional[set] = None) -> dict:
+    """Check measurement, approval and stock availability for a list of production papers"""
+    if measurement_ids is None:
+        wanted = {p.measurement_id for p in papers if p.measurement_id}
+        measurement_ids = set()
+        if wanted:
+            measurement_ids = {
+                row[0] for row in db.query(DBMeasurement.id).filter(DBMeasurement.id.in_(wanted)).all()
+            }
+    
+    stock_checks = check_availability_bulk(db, papers)
+    
+    result = {}
+    for paper in papers:
+        stock = stock_checks[paper.id]
+        result[paper.id] = {
+            "measurement_received": bool(paper.measurement_id and paper.measurement_id in measurement_ids),
+            "production_paper_approved": paper.status == "active" or paper.status == "approved",
+            "shutter_available": stock["shutter_available"],
+            "laminate_available": stock["laminate_available"],
+            "frame_material_available": stock["frame_material_available"],
+            "material_requirements": stock["requirements"]
+        }
+    return result
+
+
 def check_material_availability(production_paper: DBProductionPaper, db: Session) -> dict:
     """Check material availability for a production paper"""
-    checks = {
-        "measurement_received": False,
-        "production_paper_approved": False,
-        "shutter_available": False,
-        "laminate_available": False,
-        "frame_material_available": False
-    }
-    
-    # Check if measurement exists
-    if production_paper.measurement_id:
-        measurement = db.query(DBMeasurement).filter(DBMeasurement.id == production_paper.measurement_id).first()
-        if measurement:
-            checks["measurement_received"] = True
-    
-    # Check if production paper is approved
-    if production_paper.status == "active" or production_paper.status == "approved":
-        checks["production_paper_approved"] = True
-    
-    # TODO: Add actual material availability checks from inventory/purchase system
-    # For now, we'll set defaults
-    checks["shutter_available"] = True  # Placeholder
-    checks["laminate_available"] = True  # Placeholder
-    checks["frame_material_available"] = True  # Placeholder
-    
-    return checks
+    return check_material_availability_bulk([production_paper], db)[production_paper.id]
 
 
 @router.get("/pending-for-scheduling", response_model=List[Any])
@@ -90,34 +115,43 @@ def get_pending_for_scheduling(
     if scheduled_ids:
         query = query.filter(~DBProductionPaper.id.in_(scheduled_ids))
     
-    papers = query.offset(skip).limit(limit).all()
+    papers = query.order_by(DBProductionPaper.id).offset(skip).limit(limit).all()
+    
+    # Load parties and measurements for the whole page at once
+    party_ids = {p.party_id for p in papers if p.party_id}
+    parties = {}
+    if party_ids:
+        parties = dict(db.query(DBParty.id, DBParty.name).filter(DBParty.id.in_(party_ids)).all())
+    measurement_ids = {p.measurement_id for p in papers if p.measurement_id}
+    measurement_types = {}
+    if measurement_ids:
+        measurement_types = dict(
+            db.query(DBMeasurement.id, DBMeasurement.measurement_type).filter(DBMeasurement.id.in_(measurement_ids)).all()
+        )
+    
+    # Check material availability for all papers in one pass (stock is allocated in list order)
+    availability = check_material_availability_bulk(papers, db, set(measurement_types))
     
     result = []
     for paper in papers:
         # Get party info
-        party_name = None
-        if paper.party_id:
-            party = db.query(DBParty).filter(DBParty.id == paper.party_id).first()
-            if party:
-                party_name = party.name
+        party_name = parties.get(paper.party_id)
         
         # Get measurement info to determine product type
         product_type = "Unknown"
-        if paper.measurement_id:
-            measurement = db.query(DBMeasurement).filter(DBMeasurement.id == paper.measurement_id).first()
-            if measurement:
-                if "shutter" in measurement.measurement_type.lower():
-                    product_type = "Door"
-                elif "frame" in measurement.measurement_type.lower():
-                    product_type = "Frame"
+        measurement_type = measurement_types.get(paper.measurement_id)
+        if measurement_type:
+            if "shutter" in measurement_type.lower():
+                product_type = "Door"
+            elif "frame" in measurement_type.lower():
+                product_type = "Frame"
         
         # Determine order type (can be enhanced based on priority/urgency)
         order_type = "Regular"
         if paper.status == "active":
             order_type = "Urgent"
         
-        # Check material availability
-        material_checks = check_material_availability(paper, db)
+        material_checks = availability[paper.id]
         
         result.append({
             "production_paper_id": paper.id,
@@ -143,9 +177,14 @@ def create_schedule(
     *,
     db: Session = Depends(get_db),
     schedule_in: ProductionScheduleCreate,
-    current_user = Depends(get_production_scheduler)
+    current_user = Depends(get_production_scheduler),
+    background: bool = False
 ) -> Any:
     """Create a new production schedule"""
+    if background:
+        job = enqueue_job(db, "scheduler.create_schedule", schedule_in.model_dump(mode="json"), created_by=current_user.id)
+        db.commit()
+        return job_accepted(job)
     try:
         # Check if production paper exists
         production_paper = db.query(DBProductionPaper).filter(
@@ -183,6 +222,19 @@ def create_schedule(
                     detail=f"Invalid department schedule format: {str(e)}"
                 )
         
+        # Check department capacity (or plan department slots when none were given)
+        capacity_calendar = build_capacity_calendar(db)
+        stages = get_paper_stages(db, production_paper)
+        if department_schedule_json:
+            check_department_capacity(capacity_calendar, json.loads(department_schedule_json), stages=stages)
+        else:
+            if stages:
+                start_day = schedule_in.production_start_date
+                start_day = start_day.date() if isinstance(start_day, datetime) else start_day
+                plan = capacity_calendar.plan(stages, start_day)
+                if plan["feasible"] and plan["department_schedule"]:
+                    department_schedule_json = json.dumps(plan["department_schedule"])
+        
         # Handle date conversion
         try:
             if isinstance(schedule_in.production_start_date, datetime):
@@ -224,6 +276,9 @@ def create_schedule(
         )
         
         db.add(db_schedule)
+        
+        # Commit the paper's material to production
+        post_paper_consumption(db, production_paper)
         db.commit()
         db.refresh(db_schedule)
     except HTTPException:
@@ -431,11 +486,27 @@ def update_schedule(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid department schedule format: {str(e)}"
             )
+        if db_schedule.department_schedule:
+            capacity_calendar = build_capacity_calendar(db, exclude_schedule_id=db_schedule.id)
+            schedule_paper = db.query(DBProductionPaper).filter(
+                DBProductionPaper.id == db_schedule.production_paper_id
+            ).first()
+            check_department_capacity(
+                capacity_calendar, json.loads(db_schedule.department_schedule), db_schedule.id,
+                stages=get_paper_stages(db, schedule_paper) if schedule_paper else None,
+            )
     if schedule_in.primary_supervisor is not None:
         db_schedule.primary_supervisor = schedule_in.primary_supervisor
     if schedule_in.backup_supervisor is not None:
         db_schedule.backup_supervisor = schedule_in.backup_supervisor
     if schedule_in.status is not None:
+        # Release material when cancelled, consume it again when reinstated
+        if schedule_in.status != db_schedule.status and "Cancelled" in (schedule_in.status, db_schedule.status):
+            production_paper = db.query(DBProductionPaper).filter(
+                DBProductionPaper.id == db_schedule.production_paper_id
+            ).first()
+            if production_paper:
+                post_paper_consumption(db, production_paper, release=schedule_in.status == "Cancelled")
         db_schedule.status = schedule_in.status
     if schedule_in.remarks is not None:
         # Append reason to remarks if provided
@@ -480,6 +551,65 @@ def update_schedule(
     return ProductionSchedule(**schedule_dict)
 
 
+@router.get("/capacity/calendar", response_model=List[Any])
+def get_capacity_calendar(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_production_scheduler),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Any:
+    """Get per-department daily capacity and booked hours across open schedules"""
+    start_date = start_date or date.today()
+    end_date = end_date or start_date + timedelta(days=13)
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be on or after start_date")
+    if (end_date - start_date).days > 366:
+        raise HTTPException(status_code=400, detail="Date range cannot exceed one year")
+    
+    capacity_calendar = build_capacity_calendar(db)
+    return capacity_calendar.summary(start_date, end_date)
+
+
+@router.get("/capacity/overloads", response_model=List[Any])
+def get_capacity_overloads(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_production_scheduler),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Any:
+    """Get overloaded department-days across all open schedules"""
+    capacity_calendar = build_capacity_calendar(db)
+    return capacity_calendar.overloads(start_date, end_date)
+
+
+@router.get("/capacity/plan/{production_paper_id}", response_model=dict)
+def plan_production_paper(
+    *,
+    db: Session = Depends(get_db),
+    production_paper_id: int,
+    earliest_start: Optional[date] = None,
+    current_user = Depends(get_production_scheduler)
+) -> Any:
+    """Propose department start/finish slots for a production paper (nothing is saved)"""
+    production_paper = db.query(DBProductionPaper).filter(
+        DBProductionPaper.id == production_paper_id
+    ).first()
+    if not production_paper:
+        raise HTTPException(status_code=404, detail="Production paper not found")
+    
+    stages = get_paper_stages(db, production_paper)
+    if not stages:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No manufacturing process found for this production paper's product"
+        )
+    
+    capacity_calendar = build_capacity_calendar(db)
+    plan = capacity_calendar.plan(stages, earliest_start or date.today())
+    plan["production_paper_id"] = production_paper_id
+    return plan
+
+
 @router.get("/dashboard/stats", response_model=dict)
 def get_dashboard_stats(
     db: Session = Depends(get_db),
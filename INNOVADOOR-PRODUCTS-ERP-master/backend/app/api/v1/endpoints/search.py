@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Any, Optional
+
+from app.schemas.search import SearchResponse
+from app.db.models.search import SEARCH_ENTITIES
+from app.api.deps import get_db, get_current_user, get_production_access, get_sales_user
+from app.utils.search_index import search
+
+router = APIRouter()
+
+# Each type is searchable by the roles that may list it (same dependency as its list endpoint)
+SEARCH_ACCESS = {
+    "party": get_production_access,
+    "production_paper": get_production_access,
+    "measurement": get_production_access,
+    "lead": get_sales_user,
+    "quotation": get_sales_user,
+}
+
+
+@router.get("", response_model=SearchResponse)
+def search_records(
+    q: str = Query(..., min_length=1, max_length=100, description="Name, number, code, GSTIN or site"),
+    types: Optional[str] = Query(None, description="Comma separated: party, production_paper, measurement, lead, quotation"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+) -> Any:
+    """Search parties, production papers, measurements, leads and quotations (ranked, prefix and typo tolerant)"""
+    allowed = [
+        entity_type for entity_type in SEARCH_ENTITIES
+        if current_user.role in SEARCH_ACCESS[entity_type].allowed_roles
+    ]
+    entity_types = allowed
+    if types:
+        entity_types = [entity_type.strip() for entity_type in types.split(",") if entity_type.strip()]
+        unknown = [entity_type for entity_type in entity_types if entity_type not in SEARCH_ENTITIES]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown search types: {', '.join(unknown)}"
+            )
+        denied = [entity_type for entity_type in entity_types if entity_type not in allowed]
+        if denied:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Access denied to search types: {', '.join(denied)}. Your role: {current_user.role}"
+            )
+    if not entity_types:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Access denied. Your role cannot search any records: {current_user.role}"
+        )
+    return {"query": q, "results": search(db, q, entity_types, limit)}
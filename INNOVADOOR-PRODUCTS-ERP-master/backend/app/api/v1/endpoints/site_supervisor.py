@@ -8,6 +8,7 @@ import json
 from app.schemas.site_supervisor import (
     Site, SiteCreate, SiteUpdate,
     Flat, FlatCreate, FlatUpdate,
+    FlatBulkImport, FlatBulkImportResponse,
     SiteMeasurement, SiteMeasurementCreate, SiteMeasurementUpdate,
     FrameFixing, FrameFixingCreate, FrameFixingUpdate,
     DoorFixing, DoorFixingCreate, DoorFixingUpdate,
@@ -23,8 +24,13 @@ from app.db.models.site_supervisor import (
     SitePhoto as DBSitePhoto
 )
 from app.db.models.sales import SiteProject
-from app.api.deps import get_db, get_site_supervisor
+from app.api.deps import get_db, get_site_supervisor, get_site_progress_viewer
 from app.db.models.user import User as DBUser
+from app.utils.flat_import import DOOR_FLAGS, expand_flat_matrix, import_flats, parse_flats_csv
+from app.utils.site_progress import (
+    flat_progress_state, post_flat_change, get_wing_progress, get_site_progress_totals,
+    sum_counters, completion_percent, rebuild_site_progress, check_site_progress
+)
 
 router = APIRouter()
 
@@ -42,23 +48,10 @@ def get_dashboard_stats(
         DBSite.site_status == "Active"
     ).count()
     
-    # Doors pending fixing
-    doors_pending = db.query(DBFlat).filter(
-        and_(
-            or_(
-                DBFlat.main_door_required == True,
-                DBFlat.bedroom_door_required == True,
-                DBFlat.bathroom_door_required == True,
-                DBFlat.kitchen_door_required == True
-            ),
-            DBFlat.door_fixed == False
-        )
-    ).count()
-    
-    # Frames pending fixing
-    frames_pending = db.query(DBFlat).filter(
-        DBFlat.frame_fixed == False
-    ).count()
+    # Doors / frames pending fixing (from the wing progress counters)
+    totals = sum_counters(get_site_progress_totals(db))
+    doors_pending = totals["doors_pending"]
+    frames_pending = totals["total_flats"] - totals["frames_fixed"]
     
     # Open site issues
     site_issues_open = db.query(DBSiteIssue).filter(
@@ -175,13 +168,110 @@ def create_flat(
             detail="Flat already exists"
         )
     
-    flat = DBFlat(**flat_in.model_dump(), site_id=site_id, created_by=current_user.id)
+    flat = DBFlat(**flat_in.model_dump(exclude={"site_id"}), site_id=site_id, created_by=current_user.id)
     db.add(flat)
+    db.flush()
+    post_flat_change(db, flat, None)
     db.commit()
     db.refresh(flat)
     return flat
 
 
+def get_site_or_404(db: Session, site_id: int) -> DBSite:
+    site = db.query(DBSite).filter(DBSite.id == site_id).first()
+    if not site:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Site not found"
+        )
+    return site
+
+
+@router.post("/sites/{site_id}/flats/bulk", response_model=FlatBulkImportResponse)
+def bulk_import_flats(
+    site_id: int,
+    import_in: FlatBulkImport,
+    db: Session = Depends(get_db),
+    current_user: DBUser = Depends(get_site_supervisor)
+) -> Any:
+    """
+    Create many flats at once from a list of rows and/or a wing x floor x flat matrix.
+    Existing (wing, flat_number) pairs are skipped; every row gets a result.
+    """
+    site = get_site_or_404(db, site_id)
+
+    rows = [row.model_dump() for row in import_in.flats]
+    if import_in.matrix:
+        matrix = import_in.matrix
+        if matrix.floor_to < matrix.floor_from:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="floor_to must not be below floor_from"
+            )
+        try:
+            rows.extend(expand_flat_matrix(
+                wings=matrix.wings,
+                floor_from=matrix.floor_from,
+                floor_to=matrix.floor_to,
+                flats_per_floor=matrix.flats_per_floor,
+                flat_number_format=matrix.flat_number_format,
+                door_requirements={flag: getattr(matrix, flag) for flag in DOOR_FLAGS},
+                remarks=matrix.remarks,
+            ))
+        except (KeyError, IndexError, ValueError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid flat_number_format: {str(e)}"
+            )
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No flats to import"
+        )
+
+    result = import_flats(db, site, rows, current_user.id, dry_run=import_in.dry_run)
+    if import_in.dry_run:
+        db.rollback()
+    else:
+        db.commit()
+    return result
+
+
+@router.post("/sites/{site_id}/flats/bulk/csv", response_model=FlatBulkImportResponse)
+def bulk_import_flats_csv(
+    site_id: int,
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+    current_user: DBUser = Depends(get_site_supervisor)
+) -> Any:
+    """
+    Create flats from a CSV with columns wing, floor, flat_number, main_door,
+    bedroom_door, bathroom_door, kitchen_door (yes/no, 1/0) and remarks.
+    """
+    site = get_site_or_404(db, site_id)
+    content = file.file.read()
+    try:
+        rows = parse_flats_csv(content)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV file must be UTF-8 encoded"
+        )
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No flats to import"
+        )
+
+    result = import_flats(db, site, rows, current_user.id, dry_run=dry_run)
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+    return result
+
+
 @router.put("/flats/{flat_id}", response_model=Flat)
 def update_flat(
     flat_id: int,
@@ -197,9 +287,11 @@ def update_flat(
             detail="Flat not found"
         )
     
+    before = flat_progress_state(flat)
     update_data = flat_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(flat, field, value)
+    post_flat_change(db, flat, before)
     
     db.commit()
     db.refresh(flat)
@@ -318,7 +410,9 @@ def create_frame_fixing(
     
     # Update flat frame_fixed status if completed
     if fixing_in.fixing_status == "Completed":
+        before = flat_progress_state(flat)
         flat.frame_fixed = True
+        post_flat_change(db, flat, before)
     
     db.commit()
     db.refresh(fixing)
@@ -372,7 +466,9 @@ def update_frame_fixing(
     if "fixing_status" in update_data:
         flat = db.query(DBFlat).filter(DBFlat.id == fixing.flat_id).first()
         if flat:
+            before = flat_progress_state(flat)
             flat.frame_fixed = (update_data["fixing_status"] == "Completed")
+            post_flat_change(db, flat, before)
     
     db.commit()
     db.refresh(fixing)
@@ -403,7 +499,9 @@ def create_door_fixing(
     
     # Update flat door_fixed status if completed
     if fixing_in.fixing_status == "Completed":
+        before = flat_progress_state(flat)
         flat.door_fixed = True
+        post_flat_change(db, flat, before)
     
     db.commit()
     db.refresh(fixing)
@@ -457,7 +555,9 @@ def update_door_fixing(
     if "fixing_status" in update_data:
         flat = db.query(DBFlat).filter(DBFlat.id == fixing.flat_id).first()
         if flat:
+            before = flat_progress_state(flat)
             flat.door_fixed = (update_data["fixing_status"] == "Completed")
+            post_flat_change(db, flat, before)
     
     db.commit()
     db.refresh(fixing)
@@ -716,7 +816,11 @@ def get_flat_pending_report(
     site_id: Optional[int] = None
 ) -> Any:
     """Get flat-wise pending doors report"""
-    query = db.query(DBFlat).filter(
+    query = db.query(
+        DBFlat.id, DBFlat.site_id, DBFlat.wing, DBFlat.floor, DBFlat.flat_number,
+        DBFlat.main_door_required, DBFlat.bedroom_door_required,
+        DBFlat.bathroom_door_required, DBFlat.kitchen_door_required, DBFlat.remarks
+    ).filter(
         and_(
             or_(
                 DBFlat.main_door_required == True,
@@ -731,24 +835,22 @@ def get_flat_pending_report(
     if site_id:
         query = query.filter(DBFlat.site_id == site_id)
     
-    flats = query.all()
-    
-    result = []
-    for flat in flats:
-        result.append({
+    # Only flats with door_fixed == False are selected, so a required door is a pending door
+    return [
+        {
             "flat_id": flat.id,
             "site_id": flat.site_id,
             "wing": flat.wing,
             "floor": flat.floor,
             "flat_number": flat.flat_number,
-            "main_door": flat.main_door_required and not flat.door_fixed,
-            "bedroom_door": flat.bedroom_door_required and not flat.door_fixed,
-            "bathroom_door": flat.bathroom_door_required and not flat.door_fixed,
-            "kitchen_door": flat.kitchen_door_required and not flat.door_fixed,
+            "main_door": bool(flat.main_door_required),
+            "bedroom_door": bool(flat.bedroom_door_required),
+            "bathroom_door": bool(flat.bathroom_door_required),
+            "kitchen_door": bool(flat.kitchen_door_required),
             "remarks": flat.remarks
-        })
-    
-    return result
+        }
+        for flat in query.all()
+    ]
 
 
 @router.get("/reports/fixing-gap")
@@ -758,34 +860,17 @@ def get_fixing_gap_report(
     site_id: Optional[int] = None
 ) -> Any:
     """Get frame vs door fixing gap report"""
-    query = db.query(DBFlat)
-    
     if site_id:
-        query = query.filter(DBFlat.site_id == site_id)
-    
-    flats = query.all()
-    
-    frame_fixed_doors_pending = 0
-    doors_fixed_frames_pending = 0
-    both_pending = 0
-    both_fixed = 0
-    
-    for flat in flats:
-        if flat.frame_fixed and not flat.door_fixed:
-            frame_fixed_doors_pending += 1
-        elif flat.door_fixed and not flat.frame_fixed:
-            doors_fixed_frames_pending += 1
-        elif not flat.frame_fixed and not flat.door_fixed:
-            both_pending += 1
-        elif flat.frame_fixed and flat.door_fixed:
-            both_fixed += 1
+        totals = sum_counters(get_wing_progress(db, site_id).values())
+    else:
+        totals = sum_counters(get_site_progress_totals(db))
     
     return {
-        "frame_fixed_doors_pending": frame_fixed_doors_pending,
-        "doors_fixed_frames_pending": doors_fixed_frames_pending,
-        "both_pending": both_pending,
-        "both_fixed": both_fixed,
-        "total_flats": len(flats)
+        "frame_fixed_doors_pending": totals["frame_fixed_doors_pending"],
+        "doors_fixed_frames_pending": totals["doors_fixed_frames_pending"],
+        "both_pending": totals["both_pending"],
+        "both_fixed": totals["both_fixed"],
+        "total_flats": totals["total_flats"]
     }
 
 
@@ -804,28 +889,61 @@ def get_wing_completion_report(
         )
     
     wings = json.loads(site.wings) if site.wings else []
+    progress = get_wing_progress(db, site_id)
     result = []
     
-    for wing in wings:
-        flats = db.query(DBFlat).filter(
-            and_(
-                DBFlat.site_id == site_id,
-                DBFlat.wing == wing
-            )
-        ).all()
-        
-        total = len(flats)
-        frames_fixed = sum(1 for f in flats if f.frame_fixed)
-        doors_fixed = sum(1 for f in flats if f.door_fixed)
+    # Listed wings first (in site order), then any other wing that has flats
+    for wing in wings + sorted(w for w in progress if w not in wings):
+        counters = progress.get(wing, {})
+        total = counters.get("total_flats", 0)
+        frames_fixed = counters.get("frames_fixed", 0)
+        doors_fixed = counters.get("doors_fixed", 0)
         
         result.append({
             "wing": wing,
             "total_flats": total,
             "frames_fixed": frames_fixed,
             "doors_fixed": doors_fixed,
-            "frame_completion_percent": round((frames_fixed / total * 100) if total > 0 else 0, 2),
-            "door_completion_percent": round((doors_fixed / total * 100) if total > 0 else 0, 2)
+            "frame_completion_percent": completion_percent(frames_fixed, total),
+            "door_completion_percent": completion_percent(doors_fixed, total)
         })
     
     return result
 
+
+@router.get("/reports/project-progress")
+def get_project_progress_report(
+    db: Session = Depends(get_db),
+    current_user: DBUser = Depends(get_site_progress_viewer)
+) -> Any:
+    """Get fixing progress for every site plus project-wide totals (management view)"""
+    sites = get_site_progress_totals(db)
+    for site in sites:
+        site["frame_completion_percent"] = completion_percent(site["frames_fixed"], site["total_flats"])
+        site["door_completion_percent"] = completion_percent(site["doors_fixed"], site["total_flats"])
+    
+    totals = sum_counters(sites)
+    totals["frame_completion_percent"] = completion_percent(totals["frames_fixed"], totals["total_flats"])
+    totals["door_completion_percent"] = completion_percent(totals["doors_fixed"], totals["total_flats"])
+    return {"sites": sites, "totals": totals}
+
+
+@router.get("/reports/progress/check")
+def check_site_progress_consistency(
+    db: Session = Depends(get_db),
+    current_user: DBUser = Depends(get_site_supervisor)
+) -> Any:
+    """Compare stored wing progress counters with a full recount (empty list = consistent)"""
+    return check_site_progress(db)
+
+
+@router.post("/reports/progress/rebuild")
+def rebuild_site_progress_counters(
+    db: Session = Depends(get_db),
+    current_user: DBUser = Depends(get_site_supervisor)
+) -> Any:
+    """Rebuild wing progress counters for all sites from the flats table"""
+    count = rebuild_site_progress(db)
+    db.commit()
+    return {"message": "Site progress rebuilt", "wings": count}
+
@@ -0,0 +1,249 @@
+"""
+Response compression middleware.
+
+Compresses JSON/text responses with Brotli (when the client accepts it and the
+``brotli`` package is installed) or gzip. Small bodies and content types outside
+the allowlist are passed through untouched.
+"""
+import gzip
+import io
+from typing import Iterable, List, Optional
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional - fall back to gzip only
+    brotli = None
+
+
+def parse_accept_encoding(header_value: str) -> dict:
+    """Parse an Accept-Encoding header into {encoding: q-value}"""
+    encodings = {}
+    for part in header_value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[name.strip().lower()] = q
+    return encodings
+
+
+def choose_encoding(header_value: str, brotli_enabled: bool = True) -> Optional[str]:
+    """Pick the best supported encoding ("br", "gzip") for an Accept-Encoding header"""
+    if not header_value:
+        return None
+    encodings = parse_accept_encoding(header_value)
+    wildcard = encodings.get("*", 0.0)
+    if brotli is not None and brotli_enabled and encodings.get("br", wildcard) > 0:
+        return "br"
+    if encodings.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def content_type_allowed(content_type: str, allowed_types: Iterable[str]) -> bool:
+    """Check a Content-Type header against the allowlist (prefix match, parameters ignored)"""
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    for allowed in allowed_types:
+        allowed = allowed.strip().lower()
+        if allowed.endswith("/*"):
+            if media_type.startswith(allowed[:-1]):
+                return True
+        elif media_type == allowed:
+            return True
+    return False
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self.buffer = io.BytesIO()
+        self.file = gzip.GzipFile(mode="wb", fileobj=self.buffer, compresslevel=level)
+
+    def _drain(self) -> bytes:
+        data = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+    def compress(self, data: bytes) -> bytes:
+        self.file.write(data)
+        return self._drain()
+
+    def flush(self) -> bytes:
+        self.file.flush()
+        return self._drain()
+
+    def finish(self) -> bytes:
+        self.file.close()
+        return self._drain()
+
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush()
+
+    def finish(self) -> bytes:
+        return self.compressor.finish()
+
+
+def compress_bytes(data: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    """One-shot compression helper (also used by the compression benchmark)"""
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=gzip_level)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with Brotli or gzip.
+
+    - Responses smaller than ``minimum_size`` are sent as-is.
+    - Only content types in ``content_types`` are compressed (``text/event-stream``
+      and binary downloads such as PDFs should not be listed).
+    - Responses that already carry a Content-Encoding are never re-compressed.
+    - Streaming responses are compressed chunk by chunk.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        content_types: Optional[List[str]] = None,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        brotli_enabled: bool = True,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = content_types or ["application/json", "text/*"]
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.brotli_enabled = brotli_enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for key, value in scope.get("headers", []):
+            if key == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+
+        encoding = choose_encoding(accept_encoding, self.brotli_enabled)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream_send = send
+        self.start_message = None
+        self.started = False
+        self.passthrough = False
+        self.stream = None
+
+    def _new_stream(self):
+        if self.encoding == "br":
+            return _BrotliStream(self.middleware.brotli_quality)
+        return _GzipStream(self.middleware.gzip_level)
+
+    def _headers_for_compressed(self, content_length: Optional[int]) -> list:
+        headers = [
+            (k, v) for k, v in self.start_message.get("headers", [])
+            if k not in (b"content-length", b"content-encoding")
+        ]
+        headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode("latin-1")))
+
+        vary = [v for k, v in headers if k == b"vary"]
+        if not vary:
+            headers.append((b"vary", b"Accept-Encoding"))
+        elif b"accept-encoding" not in vary[0].lower():
+            headers = [(k, v) for k, v in headers if k != b"vary"]
+            headers.append((b"vary", vary[0] + b", Accept-Encoding"))
+        return headers
+
+    async def send(self, message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            headers = {k.lower(): v for k, v in message.get("headers", [])}
+            content_type = headers.get(b"content-type", b"").decode("latin-1")
+            if b"content-encoding" in headers or not content_type_allowed(
+                content_type, self.middleware.content_types
+            ):
+                self.passthrough = True
+            return
+
+        if message_type != "http.response.body":
+            await self.downstream_send(message)
+            return
+
+        if self.passthrough:
+            if not self.started:
+                self.started = True
+                await self.downstream_send(self.start_message)
+            await self.downstream_send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            if not more_body:
+                # Whole body available - compress in one shot if it is worth it
+                if len(body) < self.middleware.minimum_size:
+                    await self.downstream_send(self.start_message)
+                    await self.downstream_send(message)
+                    return
+                compressed = compress_bytes(
+                    body, self.encoding,
+                    gzip_level=self.middleware.gzip_level,
+                    brotli_quality=self.middleware.brotli_quality,
+                )
+                self.start_message["headers"] = self._headers_for_compressed(len(compressed))
+                await self.downstream_send(self.start_message)
+                await self.downstream_send({"type": "http.response.body", "body": compressed})
+                return
+
+            # Streaming body - length unknown, compress chunk by chunk
+            self.stream = self._new_stream()
+            self.start_message["headers"] = self._headers_for_compressed(None)
+            await self.downstream_send(self.start_message)
+
+        if self.stream is None:
+            # A previous single-shot message was already sent in full
+            await self.downstream_send(message)
+            return
+
+        if more_body:
+            chunk = self.stream.compress(body) + self.stream.flush()
+            await self.downstream_send({"type": "http.response.body", "body": chunk, "more_body": True})
+        else:
+            chunk = self.stream.compress(body) + self.stream.finish()
+            await self.downstream_send({"type": "http.response.body", "body": chunk, "more_body": False})
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from decimal import Decimal
 from typing import List, Union
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
@@ -15,15 +16,43 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Pricing
+    DEFAULT_GST_RATE: Decimal = Decimal("18.00")  # Percent; used for line items without their own gst_rate
+
+    # Response compression
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Bytes; smaller responses are sent uncompressed
+    COMPRESSION_CONTENT_TYPES: Union[str, List[str]] = ["application/json", "text/html", "text/plain", "text/csv"]
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_ENABLED: bool = True  # Used only when the brotli package is installed
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Run "alembic upgrade head" at startup when the schema is behind. Off by default: every worker
+    # would race to upgrade; run it once at deploy time instead (alembic upgrade head / init_db.py)
+    MIGRATE_ON_STARTUP: bool = False
+
+    # Import each endpoint module on its first request instead of at worker start
+    LAZY_ROUTERS: bool = True
+
+    # Receivables aging refresh (in-process; 0 disables, e.g. when run from cron with refresh_receivables.py)
+    RECEIVABLES_REFRESH_INTERVAL_MINUTES: int = 60
+
+    # Background jobs (app.utils.jobs): worker threads per process (0 disables, e.g. when run_jobs.py runs them)
+    JOB_WORKERS: int = 2
+    JOB_POLL_SECONDS: float = 2.0  # Idle workers look for due jobs this often (new jobs wake them at once)
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: int = 30  # Doubled after each failed attempt
+    JOB_STALE_MINUTES: int = 30  # A running job without progress for this long is retried (its worker died)
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False
     )
 
-    @field_validator("BACKEND_CORS_ORIGINS", mode="before")
+    @field_validator("BACKEND_CORS_ORIGINS", "COMPRESSION_CONTENT_TYPES", mode="before")
     @classmethod
-    def parse_cors_origins(cls, v):
+    def parse_list_values(cls, v):
         if isinstance(v, str):
             try:
                 return json.loads(v)
@@ -0,0 +1,83 @@
+"""
+In-process publish/subscribe bus for pushing live updates to connected clients.
+
+Endpoints publish small event dicts on a topic after committing; Server-Sent
+Events streams subscribe to a topic and forward what they receive. Publishing is
+safe from the threadpool that runs sync endpoints: events are handed to each
+subscriber's event loop with ``call_soon_threadsafe``.
+
+The bus is per process - with several workers each process only sees the
+changes it made itself, so clients should still reload the snapshot they get
+on (re)connect.
+"""
+import asyncio
+import itertools
+import threading
+from typing import Any, Dict, Optional
+
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+class Subscription:
+    def __init__(self, bus: "EventBus", topic: str, loop: asyncio.AbstractEventLoop):
+        self.bus = bus
+        self.topic = topic
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer - tell it to reload instead of buffering without bound
+            self.overflowed = True
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next event, or None on timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, set] = {}
+        self._sequence = itertools.count(1)
+
+    def subscribe(self, topic: str) -> Subscription:
+        """Subscribe the running event loop to a topic (call from async code)"""
+        subscription = Subscription(self, topic, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.get(subscription.topic, set()).discard(subscription)
+
+    def subscriber_count(self, topic: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(topic, ()))
+
+    def publish(self, topic: str, event: Dict[str, Any]) -> None:
+        """Publish an event to every subscriber of a topic (callable from any thread)"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        if not subscribers:
+            return
+        event = {**event, "sequence": next(self._sequence)}
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # Loop already closed - the stream is gone
+                self.unsubscribe(subscription)
+
+
+event_bus = EventBus()
@@ -0,0 +1,75 @@
+"""
+Routers that are imported on their first request.
+
+Importing an endpoint module builds its Pydantic schemas, SQLAlchemy models and
+FastAPI dependency graphs, which is most of a worker's start-up time. A
+``LazyRouter`` stands in the application's route list at the position the real
+router would have been included: it matches every path under its prefix, and
+on the first such request imports the module, includes its router exactly as
+``app.include_router`` would (same prefix, tags and dependency overrides),
+puts the resulting routes in its own place and dispatches the request again.
+Route order, and so route precedence, is the same as with eager inclusion.
+
+The import runs on the event loop, like it would have at start-up; the
+OpenAPI schema loads every pending router first so ``/docs`` stays complete.
+"""
+from importlib import import_module
+from typing import List, Optional
+
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound, get_route_path
+from starlette.types import Receive, Scope, Send
+
+
+class LazyRouter(BaseRoute):
+    def __init__(self, app: FastAPI, module: str, prefix: str, tags: Optional[List[str]] = None):
+        self.app = app
+        self.module = module
+        self.prefix = prefix.rstrip("/")
+        self.tags = tags
+        self.loaded = False
+
+    def matches(self, scope: Scope):
+        if scope["type"] in ("http", "websocket"):
+            path = get_route_path(scope)
+            if path == self.prefix or path.startswith(self.prefix + "/"):
+                return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params):
+        raise NoMatchFound(name, path_params)
+
+    def load(self) -> None:
+        """Import the module and replace this placeholder with its routes"""
+        if self.loaded:
+            return
+        router = import_module(self.module).router
+        routes = self.app.router.routes
+        count = len(routes)
+        self.app.include_router(router, prefix=self.prefix, tags=self.tags)
+        included = routes[count:]
+        del routes[count:]
+        index = routes.index(self)
+        routes[index:index + 1] = included
+        self.loaded = True
+        self.app.openapi_schema = None
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.load()
+        await self.app.router(scope, receive, send)
+
+    def __repr__(self) -> str:
+        return f"LazyRouter(module={self.module!r}, prefix={self.prefix!r})"
+
+
+def include_lazy_router(app: FastAPI, module: str, prefix: str, tags: Optional[List[str]] = None) -> None:
+    """``app.include_router(module.router, ...)`` deferred to the first request under ``prefix``"""
+    app.router.routes.append(LazyRouter(app, module, prefix, tags))
+
+
+def load_lazy_routers(app: FastAPI) -> int:
+    """Import every router still pending (returns how many were loaded)"""
+    pending = [route for route in app.router.routes if isinstance(route, LazyRouter)]
+    for route in pending:
+        route.load()
+    return len(pending)
@@ -23,8 +23,8 @@ def init_db():
             Product, Department, ProductionSupervisor, ProductionTask,
             ProductionIssue, TaskProgress, ProductionTracking,
             MeasurementTask, MeasurementEntry, ManufacturingStage, Design,
-            ProductionShutterItem, RawMaterialShutterItem,
-            ProductionDocsSettings
+            ProductionShutterItem, RawMaterialShutterItem, ProductionPaperMeasurementItem,
+            ProductionDocsSettings, SerialNumberLease
         )
         from app.db.models.raw_material import Supplier, RawMaterialCheck, Order, ProductSupplierMapping
         from app.db.models.quality_check import QualityCheck, ReworkJob, QCCertificate
@@ -35,20 +35,23 @@ def init_db():
             PaymentReceipt, PaymentAllocation, AccountReceivable, AccountReconciliation,
             VendorPayable, VendorPayment, Ledger, LedgerEntry,
             Contractor, ContractorWorkOrder, ContractorOutput, ContractorPayment,
-            OrderCosting, CreditControl
+            OrderCosting, CreditControl, PartyCreditExposure, LedgerBalanceSnapshot,
+            BankStatement, BankStatementLine
         )
         from app.db.models.sales import Lead, SiteProject, Quotation, SalesOrder, MeasurementRequest, FollowUp
         from app.db.models.site_supervisor import (
             Site, Flat, SiteMeasurement, FrameFixing, DoorFixing, 
-            DailySiteProgress, SiteIssue, SitePhoto
+            DailySiteProgress, SiteIssue, SitePhoto, SiteWingProgress
         )
         from app.db.models.carpenter import (
             CarpenterCaptain, WorkAllocation, CarpenterFrameFixing,
             CarpenterDoorFixing, CarpenterAttendance, CarpenterIssue, WorkCompletion
         )
         from app.db.models.purchase import (
-            Vendor, BOM, PurchaseRequisition, PurchaseOrder, GRN, PurchaseReturn, VendorBill
+            Vendor, BOM, PurchaseRequisition, PurchaseOrder, GRN, PurchaseReturn, VendorBill, MaterialStock
         )
+        from app.db.models.search import SearchDocument
+        from app.db.models.job import Job, PeriodicTask
         
         # Create all tables
         Base.metadata.create_all(bind=engine)
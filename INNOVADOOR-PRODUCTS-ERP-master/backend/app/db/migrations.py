@@ -0,0 +1,107 @@
+"""
+Alembic schema version checks used at startup and by the maintenance scripts.
+
+The schema is owned by the Alembic chain in ``backend/alembic/versions``. At
+boot the application only compares ``alembic_version`` (a single row read)
+with the head revision, which is read from the version files' ``revision`` /
+``down_revision`` lines without importing Alembic or any model. Only a
+database that is behind (or empty) pays for Alembic and the model imports,
+and only when ``MIGRATE_ON_STARTUP`` is enabled (it is off by default: the
+upgrade runs once at deploy time, not in every worker at boot).
+
+Databases created before the chain existed (``init_db`` plus the one-off
+``migrate_*.py`` scripts) have tables but no ``alembic_version``; they are
+brought to the current schema and stamped by ``adopt_alembic.py``.
+"""
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+import re
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+ALEMBIC_INI = BACKEND_DIR / "alembic.ini"
+VERSIONS_DIR = BACKEND_DIR / "alembic" / "versions"
+
+REVISION_PATTERN = re.compile(r"^revision\s*=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+DOWN_REVISION_PATTERN = re.compile(r"^down_revision\s*=\s*(.+)$", re.MULTILINE)
+
+
+@lru_cache(maxsize=1)
+def head_revision() -> Optional[str]:
+    """The single head of the version chain (None if there are no versions)"""
+    revisions = set()
+    parents = set()
+    for path in VERSIONS_DIR.glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        revision = REVISION_PATTERN.search(source)
+        if not revision:
+            continue
+        revisions.add(revision.group(1))
+        down_revision = DOWN_REVISION_PATTERN.search(source)
+        if down_revision:
+            parents.update(re.findall(r"['\"]([^'\"]+)['\"]", down_revision.group(1)))
+    heads = revisions - parents
+    if len(heads) > 1:
+        raise RuntimeError(f"Alembic version chain has several heads: {sorted(heads)}")
+    return heads.pop() if heads else None
+
+
+def current_revision(engine: Engine) -> Optional[str]:
+    """Revision stamped in the database (None if it has no alembic_version table)"""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except SQLAlchemyError:
+        return None
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    return config
+
+
+def upgrade_to_head() -> None:
+    from alembic import command
+
+    command.upgrade(alembic_config(), "head")
+
+
+def stamp_head() -> None:
+    from alembic import command
+
+    command.stamp(alembic_config(), "head")
+
+
+def check_schema(engine: Engine, migrate: bool = False) -> str:
+    """
+    Compare the database with the head revision; returns "current",
+    "upgraded", "behind", "empty" or "unversioned" (pre-Alembic tables).
+    """
+    head = head_revision()
+    current = current_revision(engine)
+    if current == head:
+        return "current"
+
+    if current is None:
+        from sqlalchemy import inspect
+
+        if inspect(engine).has_table("users"):
+            print("Database has tables but no Alembic version - run 'python adopt_alembic.py' once.")
+            return "unversioned"
+        if not migrate:
+            print("Database is empty - run 'alembic upgrade head'.")
+            return "empty"
+    elif not migrate:
+        print(f"Database schema is at {current}, code expects {head} - run 'alembic upgrade head'.")
+        return "behind"
+
+    print(f"Upgrading database schema from {current or 'empty'} to {head}...")
+    upgrade_to_head()
+    return "upgraded"
@@ -1,4 +1,7 @@
-from app.db.models.user import User, Measurement, Party, ProductionPaper, ProductionSchedule, MeasurementTask, MeasurementEntry, ManufacturingStage
+from app.db.models.user import (
+    User, Measurement, Party, ProductionPaper, ProductionSchedule, MeasurementTask, MeasurementEntry, ManufacturingStage,
+    ProductionPaperMeasurementItem, SerialNumberLease
+)
 from app.db.models.raw_material import Supplier, RawMaterialCheck, Order, ProductSupplierMapping, RawMaterialCategory
 from app.db.models.quality_check import QualityCheck, ReworkJob, QCCertificate
 from app.db.models.billing import BillingRequest, DeliveryChallan, TaxInvoice, TallySync
@@ -8,24 +11,28 @@ from app.db.models.accounts import (
     PaymentReceipt, PaymentAllocation, AccountReceivable, AccountReconciliation,
     VendorPayable, VendorPayment, Ledger, LedgerEntry,
     Contractor, ContractorWorkOrder, ContractorOutput, ContractorPayment,
-    OrderCosting, CreditControl
+    OrderCosting, CreditControl, PartyCreditExposure, LedgerBalanceSnapshot,
+    BankStatement, BankStatementLine
 )
 from app.db.models.sales import (
     Lead, SiteProject, Quotation, SalesOrder, MeasurementRequest, FollowUp
 )
 from app.db.models.site_supervisor import (
-    Site, Flat, SiteMeasurement, FrameFixing, DoorFixing, DailySiteProgress, SiteIssue, SitePhoto
+    Site, Flat, SiteMeasurement, FrameFixing, DoorFixing, DailySiteProgress, SiteIssue, SitePhoto, SiteWingProgress
 )
 from app.db.models.carpenter import (
     CarpenterCaptain, WorkAllocation, CarpenterFrameFixing, 
     CarpenterDoorFixing, CarpenterAttendance, CarpenterIssue, WorkCompletion
 )
 from app.db.models.purchase import (
-    Vendor, BOM, PurchaseRequisition, PurchaseOrder, GRN, PurchaseReturn, VendorBill
+    Vendor, BOM, PurchaseRequisition, PurchaseOrder, GRN, PurchaseReturn, VendorBill, MaterialStock
 )
+from app.db.models.search import SearchDocument
+from app.db.models.job import Job, PeriodicTask
 
 __all__ = [
     "User", "Measurement", "Party", "ProductionPaper", "ProductionSchedule", "MeasurementTask", "MeasurementEntry",
+    "ProductionPaperMeasurementItem", "SerialNumberLease",
     "Supplier", "RawMaterialCheck", "Order", "ProductSupplierMapping", "RawMaterialCategory",
     "QualityCheck", "ReworkJob", "QCCertificate",
     "BillingRequest", "DeliveryChallan", "TaxInvoice", "TallySync",
@@ -34,11 +41,13 @@ __all__ = [
     "PaymentReceipt", "PaymentAllocation", "AccountReceivable", "AccountReconciliation",
     "VendorPayable", "VendorPayment", "Ledger", "LedgerEntry",
     "Contractor", "ContractorWorkOrder", "ContractorOutput", "ContractorPayment",
-    "OrderCosting", "CreditControl",
+    "OrderCosting", "CreditControl", "PartyCreditExposure", "LedgerBalanceSnapshot",
+    "BankStatement", "BankStatementLine",
     "Lead", "SiteProject", "Quotation", "SalesOrder", "MeasurementRequest", "FollowUp",
-    "Site", "Flat", "SiteMeasurement", "FrameFixing", "DoorFixing", "DailySiteProgress", "SiteIssue", "SitePhoto",
+    "Site", "Flat", "SiteMeasurement", "FrameFixing", "DoorFixing", "DailySiteProgress", "SiteIssue", "SitePhoto", "SiteWingProgress",
     "CarpenterCaptain", "WorkAllocation", "CarpenterFrameFixing", "CarpenterDoorFixing", 
     "CarpenterAttendance", "CarpenterIssue", "WorkCompletion",
-    "Vendor", "BOM", "PurchaseRequisition", "PurchaseOrder", "GRN", "PurchaseReturn", "VendorBill"
+    "Vendor", "BOM", "PurchaseRequisition", "PurchaseOrder", "GRN", "PurchaseReturn", "VendorBill", "MaterialStock",
+    "SearchDocument", "Job", "PeriodicTask"
 ]
 
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Numeric, Date, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Numeric, Date, Enum as SQLEnum, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -260,7 +260,7 @@ class Ledger(Base):
     id = Column(Integer, primary_key=True, index=True)
     ledger_code = Column(String, unique=True, index=True, nullable=False)
     ledger_name = Column(String, nullable=False)
-    ledger_type = Column(String, nullable=False)  # customer, vendor, expense, asset, income
+    ledger_type = Column(String, nullable=False)  # customer, vendor, expense, asset, income, liability
     
     # Party/Entity Reference
     party_id = Column(Integer, ForeignKey("parties.id"), nullable=True, index=True)
@@ -288,6 +288,10 @@ class Ledger(Base):
 class LedgerEntry(Base):
     """Ledger Entries - Transactions posted to ledgers"""
     __tablename__ = "ledger_entries"
+    __table_args__ = (
+        Index("ix_ledger_entries_reference", "reference_type", "reference_id"),
+        Index("ix_ledger_entries_ledger_date", "ledger_id", "entry_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     entry_number = Column(String, unique=True, index=True, nullable=False)  # LE-0001
@@ -319,6 +323,30 @@ class LedgerEntry(Base):
     created_by_user = relationship("User")
 
 
+class LedgerBalanceSnapshot(Base):
+    """Month-end closing balance per ledger (entries only, opening balance excluded)"""
+    __tablename__ = "ledger_balance_snapshots"
+    __table_args__ = (
+        UniqueConstraint("ledger_id", "period_end", name="uq_ledger_balance_snapshots_ledger_period"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    ledger_id = Column(Integer, ForeignKey("ledgers.id"), nullable=False, index=True)
+    period_end = Column(Date, nullable=False, index=True)  # Last day of the month
+    
+    # Balances
+    closing_balance = Column(Numeric(15, 2), nullable=False, default=0)  # Debits - credits up to period_end
+    period_debit = Column(Numeric(15, 2), nullable=False, default=0)  # Debits within the month
+    period_credit = Column(Numeric(15, 2), nullable=False, default=0)  # Credits within the month
+    
+    # Audit
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Relationships
+    ledger = relationship("Ledger")
+
+
 class Contractor(Base):
     """Contractor Master"""
     __tablename__ = "contractors"
@@ -555,3 +583,74 @@ class CreditControl(Base):
     blocked_by_user = relationship("User", foreign_keys=[blocked_by])
     last_override_by_user = relationship("User", foreign_keys=[last_override_by])
 
+
+
+class PartyCreditExposure(Base):
+    """Running credit exposure per party (one row per party, maintained on posting)"""
+    __tablename__ = "party_credit_exposures"
+
+    id = Column(Integer, primary_key=True, index=True)
+    party_id = Column(Integer, ForeignKey("parties.id"), nullable=False, unique=True, index=True)
+    
+    # Running Balances
+    invoiced_amount = Column(Numeric(15, 2), nullable=False, default=0)  # Grand total of approved invoices
+    paid_amount = Column(Numeric(15, 2), nullable=False, default=0)  # Allocations from received/cleared receipts
+    uncleared_amount = Column(Numeric(15, 2), nullable=False, default=0)  # Allocations from pending receipts (e.g. cheques)
+    outstanding_amount = Column(Numeric(15, 2), nullable=False, default=0)  # invoiced_amount - paid_amount
+    
+    # Audit
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Relationships
+    party = relationship("Party")
+
+
+class BankStatement(Base):
+    """Imported bank statement (CSV/OFX) whose credit lines are matched to payment receipts"""
+    __tablename__ = "bank_statements"
+
+    id = Column(Integer, primary_key=True, index=True)
+    bank_account = Column(String, nullable=True)  # Account number / name as given at import
+    file_name = Column(String, nullable=True)
+    file_format = Column(String, nullable=False)  # csv, ofx
+    
+    # Statement Period (first/last transaction date)
+    period_start = Column(Date, nullable=True)
+    period_end = Column(Date, nullable=True)
+    line_count = Column(Integer, nullable=False, default=0)
+    
+    # Audit
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    lines = relationship("BankStatementLine", back_populates="statement")
+    created_by_user = relationship("User")
+
+
+class BankStatementLine(Base):
+    """One bank statement transaction and its (proposed or confirmed) payment receipt match"""
+    __tablename__ = "bank_statement_lines"
+
+    id = Column(Integer, primary_key=True, index=True)
+    statement_id = Column(Integer, ForeignKey("bank_statements.id"), nullable=False, index=True)
+    line_number = Column(Integer, nullable=False)
+    
+    # Transaction
+    transaction_date = Column(Date, nullable=False)
+    amount = Column(Numeric(15, 2), nullable=False)  # Credits positive, debits negative
+    description = Column(Text, nullable=True)
+    reference = Column(String, nullable=True)  # Cheque / UTR / bank reference
+    
+    # Match
+    status = Column(String, nullable=False, default="unmatched")  # unmatched, proposed, matched, ignored
+    payment_receipt_id = Column(Integer, ForeignKey("payment_receipts.id"), nullable=True, index=True)
+    match_type = Column(String, nullable=True)  # reference, amount_date, tolerance, tolerance_date, manual
+    match_score = Column(Numeric(5, 2), nullable=True)  # 0-1
+    reconciliation_id = Column(Integer, ForeignKey("account_reconciliations.id"), nullable=True, index=True)
+    
+    # Relationships
+    statement = relationship("BankStatement", back_populates="lines")
+    payment_receipt = relationship("PaymentReceipt")
+    reconciliation = relationship("AccountReconciliation")
@@ -0,0 +1,51 @@
+"""
+Background jobs: one ``jobs`` row per long-running operation queued by an
+endpoint (see ``app.utils.jobs``).
+
+The table is the queue: workers claim the oldest ``queued`` row whose
+``run_after`` has passed (``SELECT ... FOR UPDATE SKIP LOCKED`` on
+PostgreSQL), run it and store the result or error on the same row, which
+``GET /jobs/{id}`` reads.
+
+Periodic tasks run by every API process (the receivables refresh) keep one
+``periodic_tasks`` row each: a process runs the task only after claiming the
+row, so one process runs it per interval.
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(50), nullable=False)  # Registered handler, e.g. receivables.refresh
+    status = Column(String(20), default="queued", nullable=False)  # queued, running, succeeded, failed
+    payload = Column(Text, nullable=True)  # JSON arguments of the handler
+    result = Column(Text, nullable=True)  # JSON returned by the handler
+    error = Column(Text, nullable=True)  # Last error (kept when a retry succeeds)
+    progress = Column(Integer, default=0, nullable=False)  # 0..100
+    progress_message = Column(String, nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    run_after = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Not claimed before (backoff)
+    locked_by = Column(String, nullable=True)  # Worker running it (host:pid:thread)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Last sign of life of the running worker
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class PeriodicTask(Base):
+    __tablename__ = "periodic_tasks"
+
+    name = Column(String(50), primary_key=True)  # e.g. receivables.refresh
+    last_started_at = Column(DateTime(timezone=True), nullable=True)  # Last claim; the next one waits for the interval
+    last_finished_at = Column(DateTime(timezone=True), nullable=True)
+    locked_by = Column(String, nullable=True)  # Process that claimed it last (host:pid)
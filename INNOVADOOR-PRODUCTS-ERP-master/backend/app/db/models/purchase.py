@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, Date, Numeric
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, Date, Numeric, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -368,3 +368,30 @@ class VendorBill(Base):
     created_by_user = relationship("User", foreign_keys=[created_by])
     payment_approver = relationship("User", foreign_keys=[payment_approved_by])
 
+
+
+class MaterialStock(Base):
+    """Running stock balance per material - GRN receipts minus purchase returns and production consumption"""
+    __tablename__ = "material_stock"
+    __table_args__ = (
+        UniqueConstraint("category_key", "name_key", name="uq_material_stock_material"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Material Identity (keys are lower-cased/trimmed for matching)
+    material_category = Column(String, nullable=False)  # Laminate, Plywood, Frame, etc.
+    material_name = Column(String, nullable=False)  # "*" for category-level consumption
+    category_key = Column(String, nullable=False, index=True)
+    name_key = Column(String, nullable=False)
+    unit = Column(String, nullable=True)  # sq_ft, sheets, pcs
+    
+    # Running Totals
+    received_quantity = Column(Float, nullable=False, default=0)  # Accepted quantity of approved GRNs
+    returned_quantity = Column(Float, nullable=False, default=0)  # Purchase returns of accepted material
+    consumed_quantity = Column(Float, nullable=False, default=0)  # Committed to scheduled production papers
+    balance_quantity = Column(Float, nullable=False, default=0)  # received - returned - consumed
+    
+    # Audit
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,172 @@
+"""
+Unified search index: one ``search_documents`` row per party, production
+paper, measurement, lead and quotation, holding the text the record is found
+by (names, numbers, codes, GSTIN, site names).
+
+Rows are written in the same flush as the record itself by mapper events
+registered below (only when a searched field changes; soft-deleted records are
+removed). Bulk ``update()`` statements bypass the events - run
+``rebuild_search_index.py`` after those.
+
+The full-text / fuzzy indexes are not model objects (they are dialect
+specific) and are created with the table:
+
+- PostgreSQL: GIN over ``to_tsvector('simple', search_text)`` (ranked word and
+  prefix matches) and a ``pg_trgm`` GIN over ``search_text`` (typo-tolerant
+  word similarity),
+- SQLite (development): an external-content FTS5 table with the trigram
+  tokenizer (substring and trigram matches), kept current by triggers.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import Column, DDL, DateTime, Integer, String, Text, UniqueConstraint, event, inspect
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+from app.db.models.sales import Lead, Quotation
+from app.db.models.user import Measurement, Party, ProductionPaper
+
+
+class SearchDocument(Base):
+    __tablename__ = "search_documents"
+    __table_args__ = (
+        UniqueConstraint("entity_type", "entity_id", name="uq_search_documents_entity"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity_type = Column(String(20), nullable=False)  # party, production_paper, measurement, lead, quotation
+    entity_id = Column(Integer, nullable=False)
+    title = Column(String, nullable=False)  # Shown in results (name / document number)
+    subtitle = Column(String, nullable=True)
+    search_text = Column(Text, nullable=False)  # Space separated searched fields
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class SearchEntity(NamedTuple):
+    model: Any
+    title: str  # Attribute shown as the result title
+    subtitle: List[str]  # Attributes joined with " · "
+    fields: List[str]  # Attributes searched (title first)
+    deleted: Optional[str] = None  # Soft delete flag; flagged records are not indexed
+
+
+SEARCH_ENTITIES: Dict[str, SearchEntity] = {
+    "party": SearchEntity(
+        Party, "name", ["customer_code", "gstin_number"],
+        ["name", "display_name", "customer_code", "gstin_number"],
+    ),
+    "production_paper": SearchEntity(
+        ProductionPaper, "paper_number", ["party_name", "site_name"],
+        ["paper_number", "party_name", "site_name", "project_site_name"], deleted="is_deleted",
+    ),
+    "measurement": SearchEntity(
+        Measurement, "measurement_number", ["party_name", "site_location"],
+        ["measurement_number", "party_name", "site_location"], deleted="is_deleted",
+    ),
+    "lead": SearchEntity(
+        Lead, "lead_number", ["customer_name", "contact_person"],
+        ["lead_number", "customer_name", "contact_person", "mobile"],
+    ),
+    "quotation": SearchEntity(
+        Quotation, "quotation_number", ["party_name"],
+        ["quotation_number", "party_name"],
+    ),
+}
+
+# Index objects created outside the model (skipped by Alembic autogenerate).
+# Revision 0002 keeps a frozen copy of this DDL: changes here need a new revision.
+FTS_TABLE = "search_documents_fts"
+POSTGRES_INDEXES = ["ix_search_documents_tsv", "ix_search_documents_trgm"]
+
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_tsv ON search_documents USING gin (to_tsvector('simple', search_text))",
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_trgm ON search_documents USING gin (search_text gin_trgm_ops)",
+]
+SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "search_text, entity_type UNINDEXED, content='search_documents', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, search_text, entity_type) VALUES (new.id, new.search_text, new.entity_type); END",
+    f"CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text, entity_type) VALUES ('delete', old.id, old.search_text, old.entity_type); END",
+    f"CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text, entity_type) VALUES ('delete', old.id, old.search_text, old.entity_type); "
+    f"INSERT INTO {FTS_TABLE}(rowid, search_text, entity_type) VALUES (new.id, new.search_text, new.entity_type); END",
+]
+
+for statement in POSTGRES_DDL:
+    event.listen(SearchDocument.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SQLITE_DDL:
+    event.listen(SearchDocument.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    SearchDocument.__table__, "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite"),
+)
+
+
+def join_values(values) -> str:
+    return " ".join(str(value).strip() for value in values if value is not None and str(value).strip())
+
+
+def document_values(entity_type: str, record) -> Optional[Dict[str, Any]]:
+    """search_documents column values for a record (None if it should not be indexed)"""
+    entity = SEARCH_ENTITIES[entity_type]
+    if entity.deleted and getattr(record, entity.deleted, False):
+        return None
+    return {
+        "entity_type": entity_type,
+        "entity_id": record.id,
+        "title": str(getattr(record, entity.title) or ""),
+        "subtitle": " · ".join(
+            str(value) for value in (getattr(record, name) for name in entity.subtitle) if value
+        ) or None,
+        "search_text": join_values(getattr(record, name) for name in entity.fields),
+    }
+
+
+def upsert_documents(connection, rows: List[Dict[str, Any]]) -> None:
+    if not rows:
+        return
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    statement = dialect_insert(SearchDocument.__table__).values(rows)
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=["entity_type", "entity_id"],
+        set_={
+            "title": statement.excluded.title,
+            "subtitle": statement.excluded.subtitle,
+            "search_text": statement.excluded.search_text,
+            "updated_at": func.now(),
+        },
+    ))
+
+
+def delete_document(connection, entity_type: str, entity_id: int) -> None:
+    table = SearchDocument.__table__
+    connection.execute(table.delete().where(table.c.entity_type == entity_type, table.c.entity_id == entity_id))
+
+
+def register_search_events(entity_type: str, entity: SearchEntity) -> None:
+    watched = set(entity.fields) | set(entity.subtitle) | ({entity.deleted} if entity.deleted else set())
+
+    def after_write(mapper, connection, target, check_changes: bool = False):
+        if check_changes:
+            state = inspect(target)
+            if not any(state.attrs[name].history.has_changes() for name in watched):
+                return
+        values = document_values(entity_type, target)
+        if values is None:
+            delete_document(connection, entity_type, target.id)
+        else:
+            upsert_documents(connection, [values])
+
+    event.listen(entity.model, "after_insert", after_write)
+    event.listen(entity.model, "after_update", lambda mapper, connection, target: after_write(mapper, connection, target, True))
+    event.listen(entity.model, "after_delete", lambda mapper, connection, target: delete_document(connection, entity_type, target.id))
+
+
+for entity_type, entity in SEARCH_ENTITIES.items():
+    register_search_events(entity_type, entity)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, Date, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, Date, JSON, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -43,6 +43,9 @@ class Site(Base):
 class Flat(Base):
     """Flat-wise Door & Frame Register"""
     __tablename__ = "flats"
+    __table_args__ = (
+        UniqueConstraint("site_id", "wing", "flat_number", name="uq_flats_site_wing_flat_number"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     site_id = Column(Integer, ForeignKey("sites.id"), nullable=False, index=True)
@@ -244,3 +247,33 @@ class SitePhoto(Base):
     site = relationship("Site")
     flat = relationship("Flat", back_populates="photos")
 
+
+
+class SiteWingProgress(Base):
+    """Flat fixing progress counters per site wing (maintained on flat / fixing updates)"""
+    __tablename__ = "site_wing_progress"
+    __table_args__ = (
+        UniqueConstraint("site_id", "wing", name="uq_site_wing_progress_site_wing"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    site_id = Column(Integer, ForeignKey("sites.id"), nullable=False, index=True)
+    wing = Column(String, nullable=False)
+    
+    # Counters (number of flats)
+    total_flats = Column(Integer, nullable=False, default=0)
+    frames_fixed = Column(Integer, nullable=False, default=0)
+    doors_fixed = Column(Integer, nullable=False, default=0)
+    both_fixed = Column(Integer, nullable=False, default=0)
+    frame_fixed_doors_pending = Column(Integer, nullable=False, default=0)
+    doors_fixed_frames_pending = Column(Integer, nullable=False, default=0)
+    both_pending = Column(Integer, nullable=False, default=0)
+    doors_required = Column(Integer, nullable=False, default=0)  # Flats needing at least one door
+    doors_pending = Column(Integer, nullable=False, default=0)  # Flats needing doors, door not fixed
+    
+    # Audit
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Relationships
+    site = relationship("Site")
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, Date
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, Date, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -35,6 +35,23 @@ class User(Base):
     measurement_entries = relationship("MeasurementEntry", back_populates="created_by_user")
 
 
+class SerialNumberLease(Base):
+    """A block of consecutive serial numbers reserved by a user (see app.utils.serial_numbers)"""
+    __tablename__ = "serial_number_leases"
+    __table_args__ = (
+        Index("ix_serial_number_leases_user_status", "user_id", "status"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    prefix = Column(String, nullable=False)  # User's prefix when leased (A, B, C, etc.)
+    first_counter = Column(Integer, nullable=False)  # 1..99999, the block may wrap around to 1
+    count = Column(Integer, nullable=False)
+    status = Column(String, default="leased", nullable=False)  # leased, free (unused, can be leased again), closed
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
 class Measurement(Base):
     __tablename__ = "measurements"
 
@@ -230,13 +247,21 @@ class Design(Base):
 
 class ProductionPaper(Base):
     __tablename__ = "production_papers"
+    __table_args__ = (
+        # Covers the client requirements status query: a party's papers per requirement
+        Index(
+            "ix_production_papers_client_requirement",
+            "client_requirement_party_id", "is_deleted", "client_requirement_type", "client_requirement_index",
+            "paper_number", "status",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     paper_number = Column(String, unique=True, index=True, nullable=False)  # Auto-generated
     # po_number = Column(String, nullable=True, index=True)  # Purchase Order Number - Temporarily commented out
     party_id = Column(Integer, ForeignKey("parties.id"), nullable=True)
     party_name = Column(String, nullable=True)  # Store party name for reference
-    measurement_id = Column(Integer, ForeignKey("measurements.id"), nullable=True)
+    measurement_id = Column(Integer, ForeignKey("measurements.id"), nullable=True, index=True)
     project_site_name = Column(String, nullable=True)
     
     # Order Details
@@ -297,6 +322,7 @@ class ProductionPaper(Base):
     frp_coating = Column(String, nullable=True)
     
     selected_measurement_items = Column(Text, nullable=True)  # JSON array of selected item indices [0, 2, 5]
+    # One row per selected item in production_paper_measurement_items (kept in sync by app.utils.paper_measurement_items)
     
     # Client Requirement Reference (to track which requirement was used)
     client_requirement_party_id = Column(Integer, ForeignKey("parties.id"), nullable=True, index=True)
@@ -343,6 +369,22 @@ class ProductionShutterItem(Base):
     production_paper = relationship("ProductionPaper", back_populates="shutter_items")
 
 
+class ProductionPaperMeasurementItem(Base):
+    """A measurement item selected on a production paper (normalized selected_measurement_items)"""
+    __tablename__ = "production_paper_measurement_items"
+    __table_args__ = (
+        UniqueConstraint("production_paper_id", "position", name="uq_paper_measurement_items_position"),
+        Index("ix_paper_measurement_items_measurement", "measurement_id", "production_paper_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    production_paper_id = Column(Integer, ForeignKey("production_papers.id"), nullable=False)
+    measurement_id = Column(Integer, ForeignKey("measurements.id"), nullable=False)
+    item_index = Column(Integer, nullable=False)  # Index in the measurement's items
+    item_type = Column(String, nullable=True)  # "frame" / "shutter" when given by the selection
+    position = Column(Integer, nullable=False)  # Index in selected_measurement_items
+
+
 class RawMaterialShutterItem(Base):
     __tablename__ = "raw_material_shutter_items"
 
@@ -1,8 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.v1.api import api_router
+from app.api.v1.api import include_api_routers
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.lazy_router import load_lazy_routers
 
 app = FastAPI()
 
@@ -15,53 +17,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include API router
-app.include_router(api_router, prefix=settings.API_V1_STR)
+# Compress large JSON/text responses (measurement items, party records, quotations)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        content_types=settings.COMPRESSION_CONTENT_TYPES,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        brotli_enabled=settings.COMPRESSION_BROTLI_ENABLED,
+    )
+
+# Include API routers (with LAZY_ROUTERS each endpoint module is imported on its first request)
+include_api_routers(app, settings.API_V1_STR, lazy=settings.LAZY_ROUTERS)
+
+
+def openapi():
+    """OpenAPI schema of every router, including those not requested yet"""
+    load_lazy_routers(app)
+    return FastAPI.openapi(app)
+
+
+app.openapi = openapi
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup if needed"""
-    # Auto-fix missing columns
+    """Check the database schema is at the Alembic head (one row read; migrates only if behind)"""
     try:
-        from app.auto_migrate import fix_missing_columns
+        from app.db.database import engine
+        from app.db.migrations import check_schema
 
-        fix_missing_columns()
+        check_schema(engine, migrate=settings.MIGRATE_ON_STARTUP)
     except Exception as e:
-        print(f"Auto-migrate failed: {e}")
+        print(f"Warning: Could not check database schema: {e}")
+        print("Please run 'alembic upgrade head' manually.")
 
-    try:
-        from app.db.database import init_db
-        from sqlalchemy import inspect
-        from app.db.database import engine
+    # Keep receivable days overdue / aging buckets current
+    if settings.RECEIVABLES_REFRESH_INTERVAL_MINUTES > 0:
+        import asyncio
+        from app.utils.receivables import run_receivables_refresh_loop
 
-        # Check if users table exists
-        try:
-            inspector = inspect(engine)
-            tables = inspector.get_table_names()
-
-            if "users" not in tables:
-                print("Database tables not found. Initializing database...")
-                init_db()
-                print("Database initialized successfully!")
-            else:
-                print("Database tables already exist.")
-        except Exception as db_error:
-            print(f"Error checking database: {db_error}")
-            print("Attempting to initialize database...")
-            try:
-                init_db()
-                print("Database initialized successfully!")
-            except Exception as init_error:
-                print(
-                    f"Error initializing database: {init_error}"
-                )
-                print(
-                    "Please run 'python init_db.py' manually to create the database tables."
-                )
-    except Exception as e:
-        print(f"Warning: Could not initialize database: {e}")
-        print("Please run 'python init_db.py' manually to create the database tables.")
+        app.state.receivables_refresh_task = asyncio.create_task(
+            run_receivables_refresh_loop(settings.RECEIVABLES_REFRESH_INTERVAL_MINUTES)
+        )
+
+    # Background job workers (jobs queued by endpoints called with background=true)
+    if settings.JOB_WORKERS > 0:
+        from app.utils.jobs import start_job_workers
+
+        start_job_workers()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks"""
+    task = getattr(app.state, "receivables_refresh_task", None)
+    if task is not None:
+        task.cancel()
+
+    from app.utils.jobs import stop_job_workers
+
+    stop_job_workers()
 
 
 @app.get("/")
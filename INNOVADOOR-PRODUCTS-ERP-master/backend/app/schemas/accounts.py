@@ -147,6 +147,135 @@ class AccountReconciliation(AccountReconciliationBase):
         from_attributes = True
 
 
+# Credit Exposure Schemas
+class PartyCreditExposure(BaseModel):
+    party_id: int
+    invoiced_amount: Decimal
+    paid_amount: Decimal
+    uncleared_amount: Decimal
+    outstanding_amount: Decimal
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CreditExposureMismatch(BaseModel):
+    party_id: int
+    differences: Dict[str, Dict[str, Decimal]]  # { field: { "stored": amount, "expected": amount } }
+
+
+# Ledger Schemas
+class Ledger(BaseModel):
+    id: int
+    ledger_code: str
+    ledger_name: str
+    ledger_type: str
+    party_id: Optional[int] = None
+    supplier_id: Optional[int] = None
+    opening_balance: Decimal
+    opening_balance_type: str
+    is_active: bool
+
+    class Config:
+        from_attributes = True
+
+
+class TrialBalanceRow(BaseModel):
+    ledger_id: int
+    ledger_code: str
+    ledger_name: str
+    ledger_type: str
+    debit: Decimal
+    credit: Decimal
+
+
+class TrialBalance(BaseModel):
+    as_of: date
+    rows: List[TrialBalanceRow]
+    total_debit: Decimal
+    total_credit: Decimal
+    balanced: bool
+
+
+class LedgerStatementLine(BaseModel):
+    entry_number: str
+    entry_date: date
+    entry_type: str  # debit, credit
+    amount: Decimal
+    reference_type: Optional[str] = None
+    reference_number: Optional[str] = None
+    description: Optional[str] = None
+    balance: Decimal  # Running balance, debit positive
+
+
+class LedgerStatement(BaseModel):
+    ledger_id: int
+    ledger_code: str
+    ledger_name: str
+    from_date: date
+    to_date: date
+    opening_balance: Decimal
+    closing_balance: Decimal
+    entries: List[LedgerStatementLine]
+
+
+# Bank Statement Schemas
+class BankStatement(BaseModel):
+    id: int
+    bank_account: Optional[str] = None
+    file_name: Optional[str] = None
+    file_format: str
+    period_start: Optional[date] = None
+    period_end: Optional[date] = None
+    line_count: int
+    created_by: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class BankStatementLine(BaseModel):
+    id: int
+    statement_id: int
+    line_number: int
+    transaction_date: date
+    amount: Decimal
+    description: Optional[str] = None
+    reference: Optional[str] = None
+    status: str  # unmatched, proposed, matched, ignored
+    payment_receipt_id: Optional[int] = None
+    match_type: Optional[str] = None  # reference, amount_date, tolerance, tolerance_date (low confidence), manual
+    match_score: Optional[Decimal] = None
+    reconciliation_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class BankStatementMatchSummary(BaseModel):
+    statement_id: int
+    file_format: str
+    period_start: Optional[date] = None
+    period_end: Optional[date] = None
+    line_count: int
+    credit_lines: int
+    proposed: int
+    unmatched: int
+    by_match_type: Dict[str, int]  # { "reference": n, "amount_date": n, "tolerance": n, "tolerance_date": n }
+
+
+class BankLineMatch(BaseModel):
+    line_id: int
+    payment_receipt_id: int
+
+
+class BankMatchConfirm(BaseModel):
+    line_ids: Optional[List[int]] = None  # Proposed lines to confirm; None = all proposed lines except low-confidence (tolerance_date) ones
+    matches: List[BankLineMatch] = []  # Manual matches (override or add to the proposals)
+
+
 # Dashboard and Reports Schemas
 class AccountsDashboardStats(BaseModel):
     total_outstanding: Decimal
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Any, Optional
+from datetime import datetime
+
+
+class Job(BaseModel):
+    id: int
+    job_type: str
+    status: str  # queued, running, succeeded, failed
+    progress: int  # 0..100
+    progress_message: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    result: Optional[Any] = None  # What the operation returns inline, once succeeded
+    error: Optional[str] = None
+    run_after: Optional[datetime] = None  # Next attempt not before (queued jobs)
+    created_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
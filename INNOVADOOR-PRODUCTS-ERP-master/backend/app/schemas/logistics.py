@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime, date
 
 
@@ -114,6 +114,56 @@ class LogisticsAssignment(LogisticsAssignmentBase):
         from_attributes = True
 
 
+# Load Planning Schemas
+class LoadPlanRequest(BaseModel):
+    plan_date: date
+    dispatch_ids: Optional[List[int]] = None  # Omit to plan every approved, unassigned dispatch of the day
+    route_areas: Optional[Dict[int, str]] = None  # Override derived route area per dispatch id
+
+
+class LoadPlanTrip(BaseModel):
+    vehicle_id: int
+    vehicle_no: str
+    driver_id: Optional[int] = None
+    driver_name: Optional[str] = None
+    route_area: str
+    dispatch_ids: List[int]
+    dispatch_numbers: List[str]
+    total_weight_kg: float
+    total_volume_m3: float
+    weight_utilization: Optional[float] = None
+    volume_utilization: Optional[float] = None
+
+
+class LoadPlanUnplaced(BaseModel):
+    dispatch_id: int
+    dispatch_number: str
+    route_area: str
+    weight_kg: float
+    volume_m3: float
+    reason: str
+
+
+class LoadPlan(BaseModel):
+    plan_date: date
+    trips: List[LoadPlanTrip]
+    unplaced: List[LoadPlanUnplaced]
+    trips_without_driver: int
+
+
+class LoadPlanCommitTrip(BaseModel):
+    vehicle_id: int
+    driver_id: int
+    route_area: Optional[str] = None
+    dispatch_ids: List[int]
+
+
+class LoadPlanCommit(BaseModel):
+    plan_date: date
+    trips: List[LoadPlanCommitTrip]
+    assignment_notes: Optional[str] = None
+
+
 # Delivery Issue Schemas
 class DeliveryIssueBase(BaseModel):
     dispatch_id: int
@@ -303,3 +303,18 @@ class PurchaseDashboardKPIs(BaseModel):
     payables_due: int
     payables_amount: Decimal
 
+
+# Material Stock Schemas
+class MaterialStock(BaseModel):
+    id: int
+    material_category: str
+    material_name: str
+    unit: Optional[str] = None
+    received_quantity: float
+    returned_quantity: float
+    consumed_quantity: float
+    balance_quantity: float
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -118,6 +118,7 @@ class QuotationLineItem(BaseModel):
     quantity: int
     rate: Decimal
     discount: Optional[Decimal] = Decimal("0.00")
+    gst_rate: Optional[Decimal] = None  # Percent; defaults to settings.DEFAULT_GST_RATE
     amount: Decimal
 
 
@@ -169,6 +170,18 @@ class Quotation(QuotationBase):
         from_attributes = True
 
 
+class QuotationRepriceRequest(BaseModel):
+    gst_rate: Optional[Decimal] = None  # New GST rate applied to every line item; omit to re-price at current rates
+    quotation_ids: Optional[List[int]] = None  # Omit to re-price every quotation in the given statuses
+    statuses: List[str] = ["Draft", "Sent"]
+
+
+class QuotationRepriceResult(BaseModel):
+    repriced: int
+    total_before: Decimal
+    total_after: Decimal
+
+
 # Sales Order Schemas
 class SalesOrderBase(BaseModel):
     quotation_id: Optional[int] = None
@@ -77,6 +77,58 @@ class Flat(FlatBase):
         from_attributes = True
 
 
+# Bulk Flat Import Schemas
+class FlatImportRow(BaseModel):
+    wing: str
+    floor: int
+    flat_number: str
+    main_door_required: bool = False
+    bedroom_door_required: bool = False
+    bathroom_door_required: bool = False
+    kitchen_door_required: bool = False
+    remarks: Optional[str] = None
+
+
+class FlatMatrix(BaseModel):
+    """Wing x floor x flat grid; flat numbers from flat_number_format ({wing}, {floor}, {unit})"""
+    wings: List[str]
+    floor_from: int = 1
+    floor_to: int
+    flats_per_floor: int = Field(..., ge=1)
+    flat_number_format: str = "{floor}{unit:02d}"
+    main_door_required: bool = False
+    bedroom_door_required: bool = False
+    bathroom_door_required: bool = False
+    kitchen_door_required: bool = False
+    remarks: Optional[str] = None
+
+
+class FlatBulkImport(BaseModel):
+    flats: List[FlatImportRow] = []
+    matrix: Optional[FlatMatrix] = None
+    dry_run: bool = False
+
+
+class FlatImportResult(BaseModel):
+    row: int
+    wing: Optional[str] = None
+    floor: Optional[int] = None
+    flat_number: Optional[str] = None
+    status: str  # created, exists, duplicate, invalid
+    flat_id: Optional[int] = None
+    message: Optional[str] = None
+
+
+class FlatBulkImportResponse(BaseModel):
+    site_id: int
+    dry_run: bool
+    created: int
+    exists: int
+    duplicate: int
+    invalid: int
+    results: List[FlatImportResult]
+
+
 # Site Measurement Schemas
 class SiteMeasurementBase(BaseModel):
     flat_id: int
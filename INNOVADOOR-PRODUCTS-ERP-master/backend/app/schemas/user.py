@@ -130,6 +130,36 @@ class Measurement(MeasurementBase):
 class MeasurementDeleteRequest(BaseModel):
     deletion_reason: str = Field(..., min_length=1, max_length=1000)
 
+class MeasurementImportRowError(BaseModel):
+    row: int  # Row number on the sheet
+    column: Optional[str] = None
+    message: str
+
+class MeasurementImportResult(BaseModel):
+    """Outcome of a measurement sheet import; measurement_id is None when nothing was created"""
+    measurement_id: Optional[int] = None
+    measurement_number: Optional[str] = None
+    approval_status: Optional[str] = None
+    dry_run: bool = False
+    rows: int  # Data rows read (blank rows skipped)
+    imported: int
+    invalid: int
+    errors: List[MeasurementImportRowError] = []  # First 500 errors
+
+class SerialNumberLeaseRequest(BaseModel):
+    count: int = Field(..., ge=1, le=1000)  # Consecutive serial numbers needed (rows on the sheet)
+
+class SerialNumberLease(BaseModel):
+    """A block of consecutive serial numbers leased by the current user"""
+    id: int
+    prefix: str
+    first_counter: int
+    count: int
+    status: str  # leased, free, closed
+    serial_numbers: List[str]  # In order, may wrap from A99999 to A00001
+    reused: bool = False  # Numbers from an earlier lease that were never saved
+    created_at: Optional[datetime] = None
+
 
 # Measurement Captain Schemas
 class MeasurementTaskBase(BaseModel):
@@ -782,6 +812,7 @@ class DepartmentScheduleItem(BaseModel):
     supervisor: Optional[str] = None
     planned_start: Optional[datetime] = None
     planned_end: Optional[datetime] = None
+    planned_hours: Optional[float] = None  # Department hours booked; one shift per day when not set
 
 class ProductionScheduleBase(BaseModel):
     production_paper_id: int
@@ -0,0 +1,656 @@
+"""
+Bank statement import and automatic matching of statement credits to payment receipts.
+
+Statements are read as a stream (CSV with the usual Indian bank column names,
+or OFX/QFX ``<STMTTRN>`` blocks), one line at a time. Open receipts (pending
+or received, not already matched) in the statement's date range are loaded
+once as plain rows and indexed by:
+
+- reference token - cheque numbers and UTR / UPI / NEFT references,
+  upper-cased, leading zeros dropped,
+- amount (in paise) - exact lookups, plus a sorted list of amounts for
+  tolerance ranges.
+
+Credit lines are then matched in passes, each receipt used at most once:
+
+1. ``reference``   - a reference token in common and the same amount,
+2. ``amount_date`` - the same amount within ``EXACT_DATE_WINDOW_DAYS``,
+3. ``tolerance``   - amount within ``AMOUNT_TOLERANCE`` (bank charges), a
+   reference token in common and within ``TOLERANCE_DATE_WINDOW_DAYS``; without
+   a common token the amount and ``EXACT_DATE_WINDOW_DAYS`` alone give a
+   ``tolerance_date`` match, which is low confidence (``LOW_CONFIDENCE_MATCH_TYPES``).
+
+Passes 2 and 3 score every candidate pair first and assign best-first, so an
+early line cannot take the receipt that fits a later line better.
+
+Matches are only proposals. Confirming them writes all lines in one
+executemany, clears the receipts and records one ``AccountReconciliation``
+for the batch; confirming "all proposals" leaves low-confidence ones for
+review (they are confirmed only when listed by line id). Helpers only flush;
+the caller commits.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+import csv
+import io
+import re
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from app.db.models.accounts import (
+    AccountReconciliation as DBAccountReconciliation,
+    BankStatement as DBBankStatement,
+    BankStatementLine as DBBankStatementLine,
+    PaymentReceipt as DBPaymentReceipt,
+)
+from app.utils.credit_exposure import post_receipt_status_change, to_decimal
+from app.utils.ledger_posting import sync_receipt_ledger
+
+OPEN_RECEIPT_STATUSES = ["pending", "received"]
+RESERVED_LINE_STATUSES = ["proposed", "matched"]  # Lines holding a receipt
+
+EXACT_DATE_WINDOW_DAYS = 3
+TOLERANCE_DATE_WINDOW_DAYS = 7
+AMOUNT_TOLERANCE = Decimal("25.00")  # Rupees; covers NEFT/RTGS/cheque collection charges
+MIN_TOKEN_LENGTH = 4
+INSERT_BATCH_SIZE = 1000
+MATCH_TYPES = ["reference", "amount_date", "tolerance", "tolerance_date"]
+# Amount off by up to AMOUNT_TOLERANCE with nothing but a close date to go on:
+# too often another receipt or an unrelated credit to confirm unseen
+LOW_CONFIDENCE_MATCH_TYPES = ["tolerance_date"]
+
+# CSV header aliases (lower-case, spaces/dots collapsed) -> field
+CSV_COLUMNS = {
+    "date": "date",
+    "txn_date": "date",
+    "transaction_date": "date",
+    "tran_date": "date",
+    "value_date": "value_date",
+    "description": "description",
+    "narration": "description",
+    "particulars": "description",
+    "remarks": "description",
+    "transaction_remarks": "description",
+    "reference": "reference",
+    "ref_no": "reference",
+    "reference_no": "reference",
+    "chq_ref_no": "reference",
+    "chq_no": "reference",
+    "cheque_no": "reference",
+    "cheque_number": "reference",
+    "utr": "reference",
+    "utr_no": "reference",
+    "credit": "credit",
+    "deposit": "credit",
+    "deposit_amt": "credit",
+    "deposits": "credit",
+    "credit_amount": "credit",
+    "cr": "credit",
+    "debit": "debit",
+    "withdrawal": "debit",
+    "withdrawal_amt": "debit",
+    "withdrawals": "debit",
+    "debit_amount": "debit",
+    "dr": "debit",
+    "amount": "amount",
+    "transaction_amount": "amount",
+}
+CSV_DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y", "%d-%m-%y", "%d-%b-%Y", "%d %b %Y", "%d-%b-%y", "%d.%m.%Y"]
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+")
+OFX_FIELD_PATTERN = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+
+# ==================== PARSING ====================
+
+def parse_statement_date(value: Optional[str]) -> Optional[date]:
+    value = (value or "").strip()
+    if not value:
+        return None
+    for fmt in CSV_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_statement_amount(value: Optional[str]) -> Optional[Decimal]:
+    """"1,25,000.00", "1250 CR", "(500.00)", "500 DR" -> signed Decimal (None if blank)"""
+    text = (value or "").strip().upper().replace(",", "")
+    if not text or text in ("-", "0", "0.00"):
+        return None
+    sign = 1
+    if text.endswith("DR") or (text.startswith("(") and text.endswith(")")):
+        sign = -1
+    text = text.rstrip("CRD ").strip("()").strip()
+    try:
+        return Decimal(text) * sign
+    except InvalidOperation:
+        return None
+
+
+def csv_column_key(header: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", header.strip().lower()).strip("_")
+
+
+def iter_csv_statement(stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """
+    Statement lines from a CSV. Rows before the header (bank name, account
+    details) and rows without a valid date or amount (totals, footers) are skipped.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        columns: Optional[Dict[int, str]] = None
+        for row_number, row in enumerate(csv.reader(text), start=1):
+            if columns is None:
+                mapped = {index: CSV_COLUMNS.get(csv_column_key(cell)) for index, cell in enumerate(row)}
+                fields = set(mapped.values())
+                if "date" in fields and fields & {"credit", "amount"}:
+                    columns = {index: field for index, field in mapped.items() if field}
+                continue
+            values: Dict[str, str] = {}
+            for index, field in columns.items():
+                if index < len(row) and field not in values:
+                    values[field] = row[index]
+            transaction_date = parse_statement_date(values.get("date")) or parse_statement_date(values.get("value_date"))
+            if transaction_date is None:
+                continue
+            if "amount" in values:
+                amount = parse_statement_amount(values.get("amount"))
+            else:
+                credit = parse_statement_amount(values.get("credit"))
+                debit = parse_statement_amount(values.get("debit"))
+                amount = credit if credit else (-abs(debit) if debit else None)
+            if amount is None:
+                continue
+            yield {
+                "line_number": row_number,
+                "transaction_date": transaction_date,
+                "amount": amount,
+                "description": (values.get("description") or "").strip() or None,
+                "reference": (values.get("reference") or "").strip() or None,
+            }
+    finally:
+        text.detach()
+
+
+def iter_ofx_statement(stream: BinaryIO, chunk_size: int = 65536) -> Iterator[Dict[str, Any]]:
+    """Statement lines from OFX/QFX (SGML or XML), read in chunks"""
+    buffer = ""
+    line_number = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if chunk:
+            buffer += chunk.decode("utf-8", errors="replace")
+        while True:
+            start = buffer.upper().find("<STMTTRN>")
+            end = buffer.upper().find("</STMTTRN>", start)
+            if start < 0 or end < 0:
+                break
+            block = buffer[start + len("<STMTTRN>"):end]
+            buffer = buffer[end + len("</STMTTRN>"):]
+            fields = {tag.upper(): value.strip() for tag, value in OFX_FIELD_PATTERN.findall(block)}
+            line_number += 1
+            posted = fields.get("DTPOSTED", "")[:8]
+            try:
+                transaction_date = datetime.strptime(posted, "%Y%m%d").date()
+                amount = Decimal(fields.get("TRNAMT", "").replace(",", ""))
+            except (ValueError, InvalidOperation):
+                continue
+            description = " ".join(value for value in (fields.get("NAME"), fields.get("MEMO")) if value)
+            yield {
+                "line_number": line_number,
+                "transaction_date": transaction_date,
+                "amount": amount,
+                "description": description or None,
+                "reference": fields.get("CHECKNUM") or fields.get("REFNUM") or fields.get("FITID") or None,
+            }
+        if not chunk:
+            break
+        # Keep only what may still be the start of a transaction block
+        start = buffer.upper().find("<STMTTRN>")
+        buffer = buffer[start:] if start >= 0 else buffer[-len("<STMTTRN>"):]
+
+
+def statement_format(file_name: Optional[str], head: bytes) -> str:
+    name = (file_name or "").lower()
+    if name.endswith((".ofx", ".qfx")) or b"OFXHEADER" in head.upper() or b"<OFX>" in head.upper():
+        return "ofx"
+    return "csv"
+
+
+# ==================== MATCHING ====================
+
+def reference_tokens(*texts: Optional[str]) -> set:
+    """Cheque / UTR-like tokens (contain a digit, leading zeros dropped) of the given texts"""
+    tokens = set()
+    for text in texts:
+        if not text:
+            continue
+        for token in TOKEN_PATTERN.findall(text.upper()):
+            if not any(char.isdigit() for char in token):
+                continue
+            if token.isdigit():
+                token = token.lstrip("0")
+            if len(token) >= MIN_TOKEN_LENGTH:
+                tokens.add(token)
+    return tokens
+
+
+def to_paise(amount: Decimal) -> int:
+    return int((to_decimal(amount) * 100).to_integral_value())
+
+
+class ReceiptIndex:
+    """Open receipts indexed by reference token and amount"""
+
+    def __init__(self, receipts: Iterable[Dict[str, Any]]):
+        self.receipts: Dict[int, Dict[str, Any]] = {}
+        self.by_token: Dict[str, List[int]] = {}
+        self.by_amount: Dict[int, List[int]] = {}
+        for receipt in receipts:
+            receipt_id = receipt["id"]
+            self.receipts[receipt_id] = receipt
+            receipt["paise"] = to_paise(receipt["amount"])
+            receipt["tokens"] = reference_tokens(receipt.get("cheque_number"), receipt.get("transaction_reference"))
+            for token in receipt["tokens"]:
+                self.by_token.setdefault(token, []).append(receipt_id)
+            self.by_amount.setdefault(receipt["paise"], []).append(receipt_id)
+        self.amounts = sorted(self.by_amount)
+        self.used: set = set()
+
+    def available(self, receipt_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self.receipts[receipt_id] for receipt_id in receipt_ids if receipt_id not in self.used]
+
+    def by_reference(self, tokens: Iterable[str]) -> List[Dict[str, Any]]:
+        ids = set()
+        for token in tokens:
+            ids.update(self.by_token.get(token, ()))
+        return self.available(ids)
+
+    def in_amount_range(self, low: int, high: int) -> List[Dict[str, Any]]:
+        candidates = []
+        for paise in self.amounts[bisect_left(self.amounts, low):bisect_right(self.amounts, high)]:
+            candidates.extend(self.available(self.by_amount[paise]))
+        return candidates
+
+
+def days_apart(line: Dict[str, Any], receipt: Dict[str, Any]) -> int:
+    return abs((line["transaction_date"] - receipt["payment_date"]).days)
+
+
+def propose(line: Dict[str, Any], index: ReceiptIndex, receipt: Dict[str, Any], match_type: str, score: float) -> None:
+    index.used.add(receipt["id"])
+    line.update({
+        "status": "proposed",
+        "payment_receipt_id": receipt["id"],
+        "match_type": match_type,
+        "match_score": Decimal(str(round(max(score, 0.05), 2))),
+    })
+
+
+def assign_best_first(
+    lines: List[Dict[str, Any]],
+    index: ReceiptIndex,
+    pairs: List[Tuple[float, int, Dict[str, Any]]],
+    match_type: str,
+) -> int:
+    """Propose (score, line position, receipt) pairs highest score first, each line and receipt once"""
+    assigned = 0
+    for score, position, receipt in sorted(pairs, key=lambda pair: (-pair[0], pair[1], pair[2]["id"])):
+        line = lines[position]
+        if line.get("payment_receipt_id") or receipt["id"] in index.used:
+            continue
+        propose(line, index, receipt, match_type, score)
+        assigned += 1
+    return assigned
+
+
+def match_statement_lines(lines: List[Dict[str, Any]], receipts: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Propose a receipt for each credit line (dicts with transaction_date,
+    amount, description, reference); receipts are dicts with id, amount,
+    payment_date, cheque_number and transaction_reference. Lines are updated
+    in place; returns counts per match type.
+    """
+    index = ReceiptIndex(receipts)
+    credits = sorted(
+        (line for line in lines if line["amount"] > 0 and line.get("status", "unmatched") == "unmatched"),
+        key=lambda line: (line["transaction_date"], line["line_number"]),
+    )
+    for line in credits:
+        line["paise"] = to_paise(line["amount"])
+        line["tokens"] = reference_tokens(line.get("reference"), line.get("description"))
+    counts = dict.fromkeys(MATCH_TYPES, 0)
+
+    # 1. Reference token and exact amount
+    for line in credits:
+        candidates = [
+            receipt for receipt in index.by_reference(line["tokens"]) if receipt["paise"] == line["paise"]
+        ]
+        if candidates:
+            propose(line, index, min(candidates, key=lambda receipt: days_apart(line, receipt)), "reference", 1.0)
+            counts["reference"] += 1
+
+    # 2. Exact amount, close date
+    pairs = []
+    for position, line in enumerate(credits):
+        if line.get("payment_receipt_id"):
+            continue
+        candidates = [
+            receipt for receipt in index.available(index.by_amount.get(line["paise"], ()))
+            if days_apart(line, receipt) <= EXACT_DATE_WINDOW_DAYS
+        ]
+        for receipt in candidates:
+            ambiguous = len(candidates) > 1
+            pairs.append((0.9 - 0.05 * days_apart(line, receipt) - (0.2 if ambiguous else 0), position, receipt))
+    counts["amount_date"] = assign_best_first(credits, index, pairs, "amount_date")
+
+    # 3. Amount within tolerance (bank charges): a common reference token over
+    # the wider date window, else the exact-match date window (low confidence)
+    tolerance = to_paise(AMOUNT_TOLERANCE)
+    pairs = {"tolerance": [], "tolerance_date": []}
+    for position, line in enumerate(credits):
+        if line.get("payment_receipt_id"):
+            continue
+        for receipt in index.in_amount_range(line["paise"] - tolerance, line["paise"] + tolerance):
+            days = days_apart(line, receipt)
+            shared = bool(line["tokens"] & receipt["tokens"])
+            if days > (TOLERANCE_DATE_WINDOW_DAYS if shared else EXACT_DATE_WINDOW_DAYS):
+                continue
+            amount_penalty = abs(receipt["paise"] - line["paise"]) / max(tolerance, 1) * 0.2
+            if shared:
+                pairs["tolerance"].append((0.85 - 0.03 * days - amount_penalty, position, receipt))
+            else:
+                pairs["tolerance_date"].append((0.5 - 0.05 * days - amount_penalty, position, receipt))
+    for match_type in ("tolerance", "tolerance_date"):
+        counts[match_type] = assign_best_first(credits, index, pairs[match_type], match_type)
+
+    for line in credits:
+        line.pop("paise", None)
+        line.pop("tokens", None)
+    return counts
+
+
+def confirmable_in_bulk(line: Any) -> bool:
+    """Whether a proposal is confirmed by "confirm all" (low-confidence ones need their line id)"""
+    match_type = line["match_type"] if isinstance(line, dict) else line.match_type
+    return match_type not in LOW_CONFIDENCE_MATCH_TYPES
+
+
+def load_open_receipts(
+    db: Session,
+    date_from: date,
+    date_to: date,
+    exclude_statement_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Pending/received receipts dated in the range that no statement line holds (one query)"""
+    reserved = db.query(DBBankStatementLine.payment_receipt_id).filter(
+        DBBankStatementLine.payment_receipt_id.isnot(None),
+        DBBankStatementLine.status.in_(RESERVED_LINE_STATUSES),
+    )
+    if exclude_statement_id is not None:
+        reserved = reserved.filter(DBBankStatementLine.statement_id != exclude_statement_id)
+    rows = db.query(
+        DBPaymentReceipt.id,
+        DBPaymentReceipt.payment_amount,
+        DBPaymentReceipt.payment_date,
+        DBPaymentReceipt.cheque_number,
+        DBPaymentReceipt.transaction_reference,
+    ).filter(
+        DBPaymentReceipt.status.in_(OPEN_RECEIPT_STATUSES),
+        DBPaymentReceipt.payment_date >= date_from,
+        DBPaymentReceipt.payment_date <= date_to,
+        DBPaymentReceipt.id.notin_(reserved),
+    ).all()
+    return [
+        {
+            "id": row.id,
+            "amount": to_decimal(row.payment_amount),
+            "payment_date": row.payment_date,
+            "cheque_number": row.cheque_number,
+            "transaction_reference": row.transaction_reference,
+        }
+        for row in rows
+    ]
+
+
+def receipt_window(lines: List[Dict[str, Any]]) -> Tuple[date, date]:
+    dates = [line["transaction_date"] for line in lines]
+    pad = max(EXACT_DATE_WINDOW_DAYS, TOLERANCE_DATE_WINDOW_DAYS)
+    return (
+        date.fromordinal(min(dates).toordinal() - pad),
+        date.fromordinal(max(dates).toordinal() + pad),
+    )
+
+
+# ==================== IMPORT / CONFIRM ====================
+
+def import_bank_statement(
+    db: Session,
+    stream: BinaryIO,
+    file_name: Optional[str],
+    bank_account: Optional[str],
+    user_id: int,
+) -> Dict[str, Any]:
+    """Read a statement, propose matches and insert its lines; returns the summary"""
+    head = stream.read(512)
+    stream.seek(0)
+    file_format = statement_format(file_name, head)
+    reader = iter_ofx_statement(stream) if file_format == "ofx" else iter_csv_statement(stream)
+    lines = [{**line, "status": "unmatched"} for line in reader]
+    if not lines:
+        raise ValueError("No transactions found in the statement")
+
+    counts = match_statement_lines(lines, load_open_receipts(db, *receipt_window(lines)))
+    statement = DBBankStatement(
+        bank_account=bank_account,
+        file_name=file_name,
+        file_format=file_format,
+        period_start=min(line["transaction_date"] for line in lines),
+        period_end=max(line["transaction_date"] for line in lines),
+        line_count=len(lines),
+        created_by=user_id,
+    )
+    db.add(statement)
+    db.flush()
+    for start in range(0, len(lines), INSERT_BATCH_SIZE):
+        db.execute(insert(DBBankStatementLine), [
+            {
+                "statement_id": statement.id,
+                "line_number": line["line_number"],
+                "transaction_date": line["transaction_date"],
+                "amount": line["amount"],
+                "description": line["description"],
+                "reference": line["reference"],
+                "status": line["status"],
+                "payment_receipt_id": line.get("payment_receipt_id"),
+                "match_type": line.get("match_type"),
+                "match_score": line.get("match_score"),
+            }
+            for line in lines[start:start + INSERT_BATCH_SIZE]
+        ])
+    db.flush()
+    return statement_summary(statement, lines, counts)
+
+
+def statement_summary(statement: DBBankStatement, lines: List[Dict[str, Any]], counts: Dict[str, int]) -> Dict[str, Any]:
+    credits = [line for line in lines if line["amount"] > 0]
+    return {
+        "statement_id": statement.id,
+        "file_format": statement.file_format,
+        "period_start": statement.period_start,
+        "period_end": statement.period_end,
+        "line_count": len(lines),
+        "credit_lines": len(credits),
+        "proposed": sum(counts.values()),
+        "unmatched": sum(1 for line in credits if line["status"] == "unmatched"),
+        "by_match_type": counts,
+    }
+
+
+def rematch_statement(db: Session, statement: DBBankStatement) -> Dict[str, Any]:
+    """Drop the statement's proposals and match its open lines again"""
+    db.query(DBBankStatementLine).filter(
+        DBBankStatementLine.statement_id == statement.id,
+        DBBankStatementLine.status == "proposed",
+    ).update({
+        "status": "unmatched", "payment_receipt_id": None, "match_type": None, "match_score": None,
+    }, synchronize_session=False)
+    lines = [
+        {
+            "id": row.id,
+            "line_number": row.line_number,
+            "transaction_date": row.transaction_date,
+            "amount": to_decimal(row.amount),
+            "description": row.description,
+            "reference": row.reference,
+            "status": row.status,
+        }
+        for row in db.query(
+            DBBankStatementLine.id, DBBankStatementLine.line_number, DBBankStatementLine.transaction_date,
+            DBBankStatementLine.amount, DBBankStatementLine.description, DBBankStatementLine.reference,
+            DBBankStatementLine.status,
+        ).filter(DBBankStatementLine.statement_id == statement.id).all()
+    ]
+    open_lines = [line for line in lines if line["status"] == "unmatched"]
+    counts = dict.fromkeys(MATCH_TYPES, 0)
+    if open_lines:
+        receipts = load_open_receipts(db, *receipt_window(open_lines), exclude_statement_id=statement.id)
+        counts = match_statement_lines(open_lines, receipts)
+        proposed = [line for line in open_lines if line.get("payment_receipt_id")]
+        if proposed:
+            db.execute(update(DBBankStatementLine), [
+                {
+                    "id": line["id"],
+                    "status": "proposed",
+                    "payment_receipt_id": line["payment_receipt_id"],
+                    "match_type": line["match_type"],
+                    "match_score": line["match_score"],
+                }
+                for line in proposed
+            ])
+    db.flush()
+    db.expire_all()
+    return statement_summary(statement, lines, counts)
+
+
+def confirm_matches(
+    db: Session,
+    statement: DBBankStatement,
+    reconciliation_number: str,
+    user_id: int,
+    line_ids: Optional[List[int]] = None,
+    manual_matches: Optional[Dict[int, int]] = None,
+) -> DBAccountReconciliation:
+    """
+    Confirm proposed matches (all but low-confidence ones, or ``line_ids``)
+    plus manual line -> receipt matches: lines become ``matched``, receipts
+    ``cleared`` on the statement date, and one reconciliation records the
+    batch. Raises ValueError for lines or receipts that cannot be matched.
+    """
+    manual_matches = manual_matches or {}
+    query = db.query(DBBankStatementLine).filter(DBBankStatementLine.statement_id == statement.id)
+    if line_ids is not None:
+        query = query.filter(DBBankStatementLine.id.in_(set(line_ids) | set(manual_matches)))
+    else:
+        query = query.filter(
+            (DBBankStatementLine.status == "proposed") | DBBankStatementLine.id.in_(list(manual_matches))
+        )
+    lines = query.all()
+    if line_ids is None:
+        lines = [line for line in lines if line.id in manual_matches or confirmable_in_bulk(line)]
+    found = {line.id for line in lines}
+    missing = (set(line_ids or []) | set(manual_matches)) - found
+    if missing:
+        raise ValueError(f"Lines not in this statement: {sorted(missing)}")
+
+    matches: List[Tuple[DBBankStatementLine, int, str]] = []
+    for line in lines:
+        if line.status == "matched":
+            raise ValueError(f"Line {line.line_number} is already matched")
+        if line.id in manual_matches:
+            matches.append((line, manual_matches[line.id], "manual"))
+        elif line.status == "proposed":
+            matches.append((line, line.payment_receipt_id, line.match_type))
+        else:
+            raise ValueError(f"Line {line.line_number} has no proposed match")
+    if not matches:
+        raise ValueError("No matches to confirm")
+
+    receipt_ids = [receipt_id for _, receipt_id, _ in matches]
+    if len(set(receipt_ids)) != len(receipt_ids):
+        raise ValueError("A receipt can be matched to only one statement line")
+    receipts = {
+        receipt.id: receipt
+        for receipt in db.query(DBPaymentReceipt).filter(DBPaymentReceipt.id.in_(receipt_ids)).all()
+    }
+    held_elsewhere = {
+        receipt_id for (receipt_id,) in db.query(DBBankStatementLine.payment_receipt_id).filter(
+            DBBankStatementLine.payment_receipt_id.in_(receipt_ids),
+            DBBankStatementLine.id.notin_(found),
+            DBBankStatementLine.status.in_(RESERVED_LINE_STATUSES),
+        ).all()
+    }
+    for line, receipt_id, _ in matches:
+        receipt = receipts.get(receipt_id)
+        if receipt is None:
+            raise ValueError(f"Payment receipt {receipt_id} not found")
+        if receipt.status not in OPEN_RECEIPT_STATUSES and receipt.status != "cleared":
+            raise ValueError(f"Payment receipt {receipt.receipt_number} is {receipt.status}")
+        if receipt_id in held_elsewhere:
+            raise ValueError(f"Payment receipt {receipt.receipt_number} is matched to another statement line")
+
+    statement_total = sum((to_decimal(line.amount) for line, _, _ in matches), Decimal("0.00"))
+    receipts_total = sum((to_decimal(receipts[receipt_id].payment_amount) for receipt_id in receipt_ids), Decimal("0.00"))
+    reconciliation = DBAccountReconciliation(
+        reconciliation_number=reconciliation_number,
+        reconciliation_date=date.today(),
+        period_start=min(line.transaction_date for line, _, _ in matches),
+        period_end=max(line.transaction_date for line, _, _ in matches),
+        opening_balance=Decimal("0.00"),
+        invoices_issued=Decimal("0.00"),
+        payments_received=receipts_total,
+        closing_balance=statement_total,
+        discrepancies=statement_total - receipts_total,
+        status="draft",
+        remarks=f"Bank statement {statement.file_name or statement.id}: {len(matches)} lines matched",
+        created_by=user_id,
+    )
+    db.add(reconciliation)
+    db.flush()
+
+    db.execute(update(DBBankStatementLine), [
+        {
+            "id": line.id,
+            "status": "matched",
+            "payment_receipt_id": receipt_id,
+            "match_type": match_type,
+            "match_score": Decimal("1.00") if match_type == "manual" else line.match_score,
+            "reconciliation_id": reconciliation.id,
+        }
+        for line, receipt_id, match_type in matches
+    ])
+
+    # Received -> cleared changes no balances: one executemany. Pending receipts
+    # become paid, so they go through the credit exposure and ledger postings.
+    cleared_dates = {receipt_id: line.transaction_date for line, receipt_id, _ in matches}
+    received = [receipt for receipt in receipts.values() if receipt.status == "received"]
+    if received:
+        db.execute(update(DBPaymentReceipt), [
+            {"id": receipt.id, "status": "cleared", "cleared_date": cleared_dates[receipt.id]}
+            for receipt in received
+        ])
+    for receipt in receipts.values():
+        if receipt.status == "pending":
+            receipt.status = "cleared"
+            receipt.cleared_date = cleared_dates[receipt.id]
+            post_receipt_status_change(db, receipt, "pending")
+            sync_receipt_ledger(db, receipt, user_id)
+    db.flush()
+    db.expire_all()
+    return reconciliation
@@ -0,0 +1,475 @@
+"""
+Department capacity planning for production scheduling.
+
+Builds an in-memory load calendar per Department from the department
+schedule entries of all open production schedules (one query), where daily
+capacity is the number of active ProductionSupervisors in the department
+times HOURS_PER_SHIFT. Stage durations come from
+``Product.manufacturing_process`` (``time_hours`` + ``duration_unit``), and
+stages are mapped to departments by name. An entry books its
+``planned_hours``; the scheduling screen does not send them, so an entry
+without them books the hours of its paper's stages in that department (one
+query for the products of all papers), and is skipped only when no stage
+duration is known.
+
+The calendar is used to
+- propose feasible start/finish slots for a new production paper (greedy,
+  earliest-fit, stages in sequence), and
+- detect overloaded department-days across all open schedules, with an
+  interval tree resolving which schedules contribute to each overload.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import json
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models.user import (
+    Department as DBDepartment,
+    Product as DBProduct,
+    ProductionPaper as DBProductionPaper,
+    ProductionSchedule as DBProductionSchedule,
+    ProductionSupervisor as DBProductionSupervisor,
+)
+
+HOURS_PER_SHIFT = 8.0
+NON_WORKING_WEEKDAYS = {6}  # Sunday
+OPEN_SCHEDULE_STATUSES = ["Scheduled", "In Production", "On Hold"]
+PLANNING_HORIZON_DAYS = 365
+
+
+class IntervalTree:
+    """
+    Static centered interval tree over closed integer intervals [start, end].
+
+    Built once from all bookings of a department; answers "which intervals
+    overlap [lo, hi]" in O(log n + k).
+    """
+
+    def __init__(self, intervals: List[Tuple[int, int, Any]]):
+        self.root = self._build(list(intervals))
+
+    def _build(self, intervals):
+        if not intervals:
+            return None
+        points = sorted(p for start, end, _ in intervals for p in (start, end))
+        center = points[len(points) // 2]
+        left, right, overlapping = [], [], []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                overlapping.append(interval)
+        return {
+            "center": center,
+            "by_start": sorted(overlapping, key=lambda i: i[0]),
+            "by_end": sorted(overlapping, key=lambda i: i[1], reverse=True),
+            "left": self._build(left),
+            "right": self._build(right),
+        }
+
+    def query(self, lo: int, hi: int) -> List[Any]:
+        """Return payloads of all intervals overlapping [lo, hi]"""
+        result = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if hi < node["center"]:
+                for start, end, data in node["by_start"]:
+                    if start > hi:
+                        break
+                    result.append(data)
+                stack.append(node["left"])
+            elif lo > node["center"]:
+                for start, end, data in node["by_end"]:
+                    if end < lo:
+                        break
+                    result.append(data)
+                stack.append(node["right"])
+            else:
+                result.extend(data for _, _, data in node["by_start"])
+                stack.append(node["left"])
+                stack.append(node["right"])
+        return result
+
+
+def is_working_day(day: date) -> bool:
+    return day.weekday() not in NON_WORKING_WEEKDAYS
+
+
+def working_days(start: date, end: date) -> List[date]:
+    """Working days in [start, end]; falls back to the start day if the range has none"""
+    days = []
+    current = start
+    while current <= end:
+        if is_working_day(current):
+            days.append(current)
+        current += timedelta(days=1)
+    return days or [start]
+
+
+def parse_schedule_date(value: Any) -> Optional[date]:
+    """Parse planned_start/planned_end values stored in department_schedule JSON"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).date()
+    except ValueError:
+        return None
+
+
+def stage_hours(step: Any) -> float:
+    """Working hours required by one manufacturing process step"""
+    if not isinstance(step, dict):
+        return 0.0
+    try:
+        duration = float(step.get("time_hours") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+    if (step.get("duration_unit") or "hours").lower() == "days":
+        duration *= HOURS_PER_SHIFT
+    return max(duration, 0.0)
+
+
+def parse_manufacturing_process(raw: Any) -> List[Dict[str, Any]]:
+    """Normalize Product.manufacturing_process into steps ordered by sequence"""
+    if not raw:
+        return []
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            return []
+    if not isinstance(raw, list):
+        return []
+
+    steps = []
+    for idx, step in enumerate(raw):
+        if isinstance(step, str):
+            step = {"step_name": step, "time_hours": None, "duration_unit": "hours", "sequence": idx + 1}
+        if isinstance(step, dict) and step.get("step_name"):
+            steps.append(step)
+    return sorted(steps, key=lambda s: (s.get("sequence") is None, s.get("sequence") or 0))
+
+
+class DepartmentCalendar:
+    """Daily booked hours for one department"""
+
+    def __init__(self, department_id: Optional[int], name: str, supervisors: int):
+        self.department_id = department_id
+        self.name = name
+        self.supervisors = supervisors
+        # Departments without supervisors are treated as unconstrained
+        self.capacity_per_day = supervisors * HOURS_PER_SHIFT if supervisors > 0 else None
+        self.load: Dict[int, float] = {}
+        self.bookings: List[Tuple[int, int, Any]] = []
+        self._tree = None
+
+    def remaining(self, day: date) -> Optional[float]:
+        if self.capacity_per_day is None:
+            return None
+        return self.capacity_per_day - self.load.get(day.toordinal(), 0.0)
+
+    def book(self, start: date, end: date, hours: float, ref: Any) -> None:
+        """Book hours spread evenly over the working days of [start, end]"""
+        if end < start:
+            start, end = end, start
+        days = working_days(start, end)
+        per_day = hours / len(days)
+        for day in days:
+            key = day.toordinal()
+            self.load[key] = self.load.get(key, 0.0) + per_day
+        self.bookings.append((start.toordinal(), end.toordinal(), ref))
+        self._tree = None
+
+    def overloads(self, start: Optional[date] = None, end: Optional[date] = None) -> List[Dict[str, Any]]:
+        if self.capacity_per_day is None:
+            return []
+        lo = start.toordinal() if start else None
+        hi = end.toordinal() if end else None
+        result = []
+        for key in sorted(self.load):
+            if (lo is not None and key < lo) or (hi is not None and key > hi):
+                continue
+            booked = self.load[key]
+            if booked > self.capacity_per_day + 1e-9:
+                result.append({
+                    "department": self.name,
+                    "department_id": self.department_id,
+                    "date": date.fromordinal(key),
+                    "booked_hours": round(booked, 2),
+                    "capacity_hours": self.capacity_per_day,
+                    # Schedule ids first, then "new"/"planned" refs of unsaved entries
+                    "schedule_ids": sorted(
+                        set(self.contributors(key, key)), key=lambda ref: (isinstance(ref, str), ref)
+                    ),
+                })
+        return result
+
+    def contributors(self, lo: int, hi: int) -> List[Any]:
+        if self._tree is None:
+            self._tree = IntervalTree(self.bookings)
+        return self._tree.query(lo, hi)
+
+
+class CapacityCalendar:
+    """Load calendar across all departments"""
+
+    def __init__(self):
+        self.departments: Dict[str, DepartmentCalendar] = {}
+
+    def add_department(self, department_id: Optional[int], name: str, supervisors: int) -> DepartmentCalendar:
+        calendar = DepartmentCalendar(department_id, name, supervisors)
+        self.departments[name.strip().lower()] = calendar
+        return calendar
+
+    def get(self, name: Optional[str]) -> Optional[DepartmentCalendar]:
+        if not name:
+            return None
+        return self.departments.get(str(name).strip().lower())
+
+    def get_or_create(self, name: str) -> DepartmentCalendar:
+        calendar = self.get(name)
+        if calendar is None:
+            calendar = self.add_department(None, name, 0)
+        return calendar
+
+    def book_entries(self, entries: List[Dict[str, Any]], ref: Any, default_start: Optional[date] = None,
+                     default_end: Optional[date] = None,
+                     stage_hours_by_department: Optional[Dict[str, float]] = None) -> None:
+        """
+        Book department_schedule entries of one schedule.
+
+        An entry without ``planned_hours`` books the stage hours of its
+        department (``department_stage_hours`` of the schedule's paper); one
+        with neither is skipped, as nothing says how much capacity it uses.
+        """
+        stage_hours_by_department = stage_hours_by_department or {}
+        for entry in entries or []:
+            if not isinstance(entry, dict) or not entry.get("department"):
+                continue
+            start = parse_schedule_date(entry.get("planned_start")) or default_start
+            end = parse_schedule_date(entry.get("planned_end")) or default_end or start
+            if start is None:
+                continue
+            hours = entry.get("planned_hours")
+            try:
+                hours = float(hours) if hours is not None else None
+            except (TypeError, ValueError):
+                hours = None
+            if hours is None:
+                hours = stage_hours_by_department.get(str(entry["department"]).strip().lower())
+            if hours is None:
+                continue
+            self.get_or_create(entry["department"]).book(start, end, hours, ref)
+
+    def overloads(self, start: Optional[date] = None, end: Optional[date] = None) -> List[Dict[str, Any]]:
+        result = []
+        for calendar in self.departments.values():
+            result.extend(calendar.overloads(start, end))
+        return sorted(result, key=lambda o: (o["date"], o["department"]))
+
+    def overloads_caused_by(self, entries: List[Dict[str, Any]], ref: Any = "new",
+                            stage_hours_by_department: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+        """Overloaded days that exist only after booking ``entries`` on top of the current load"""
+        before = {(o["department"], o["date"]) for o in self.overloads()}
+        self.book_entries(entries, ref, stage_hours_by_department=stage_hours_by_department)
+        return [o for o in self.overloads() if (o["department"], o["date"]) not in before]
+
+    def plan(self, stages: List[Tuple[str, float]], earliest_start: date) -> Dict[str, Any]:
+        """
+        Greedy earliest-fit placement of sequential stages.
+
+        Each stage fills remaining department capacity day by day starting from
+        the day the previous stage finished. The plan is booked on the calendar
+        so several papers can be planned one after another.
+        """
+        entries = []
+        unplaced = []
+        unmapped = [name for name, _ in stages if self.get(name) is None or self.get(name).department_id is None]
+        cursor = earliest_start
+        horizon = earliest_start + timedelta(days=PLANNING_HORIZON_DAYS)
+
+        for department_name, hours in stages:
+            calendar = self.get_or_create(department_name)
+            hours = hours if hours > 0 else HOURS_PER_SHIFT
+            remaining_hours = hours
+            day = cursor
+            stage_start = None
+            stage_end = None
+            allocations = []
+            while remaining_hours > 1e-9 and day <= horizon:
+                if is_working_day(day):
+                    free = calendar.remaining(day)
+                    if free is None:
+                        free = HOURS_PER_SHIFT
+                    if free > 1e-9:
+                        take = min(free, remaining_hours)
+                        allocations.append((day, take))
+                        remaining_hours -= take
+                        stage_start = stage_start or day
+                        stage_end = day
+                day += timedelta(days=1)
+
+            if remaining_hours > 1e-9:
+                unplaced.append(department_name)
+                continue
+
+            for alloc_day, alloc_hours in allocations:
+                key = alloc_day.toordinal()
+                calendar.load[key] = calendar.load.get(key, 0.0) + alloc_hours
+            calendar.bookings.append((stage_start.toordinal(), stage_end.toordinal(), "planned"))
+            calendar._tree = None
+
+            entries.append({
+                "department": calendar.name,
+                "supervisor": None,
+                "planned_start": datetime.combine(stage_start, time.min).isoformat(),
+                "planned_end": datetime.combine(stage_end, time.min).isoformat(),
+                "planned_hours": round(hours, 2),
+            })
+            cursor = stage_end
+
+        return {
+            "feasible": not unplaced,
+            "production_start_date": parse_schedule_date(entries[0]["planned_start"]) if entries else None,
+            "target_completion_date": parse_schedule_date(entries[-1]["planned_end"]) if entries else None,
+            "department_schedule": entries,
+            "unplaced_stages": unplaced,
+            "unmapped_stages": unmapped,
+        }
+
+    def summary(self, start: date, end: date) -> List[Dict[str, Any]]:
+        """Per-department daily capacity/load for [start, end]"""
+        result = []
+        for calendar in self.departments.values():
+            days = []
+            current = start
+            while current <= end:
+                booked = calendar.load.get(current.toordinal(), 0.0)
+                days.append({
+                    "date": current,
+                    "booked_hours": round(booked, 2),
+                    "capacity_hours": calendar.capacity_per_day if is_working_day(current) else 0.0,
+                })
+                current += timedelta(days=1)
+            result.append({
+                "department_id": calendar.department_id,
+                "department": calendar.name,
+                "supervisors": calendar.supervisors,
+                "capacity_per_day": calendar.capacity_per_day,
+                "days": days,
+            })
+        return sorted(result, key=lambda d: d["department"])
+
+
+def build_capacity_calendar(db: Session, exclude_schedule_id: Optional[int] = None) -> CapacityCalendar:
+    """Load departments, supervisor counts, all open schedules (with their papers) and products in four queries"""
+    calendar = CapacityCalendar()
+
+    supervisor_counts = dict(
+        db.query(DBProductionSupervisor.department_id, func.count(DBProductionSupervisor.id))
+        .filter(DBProductionSupervisor.is_active == True)
+        .group_by(DBProductionSupervisor.department_id)
+        .all()
+    )
+    for department in db.query(DBDepartment).filter(DBDepartment.is_active == True).all():
+        calendar.add_department(department.id, department.name, supervisor_counts.get(department.id, 0))
+
+    query = db.query(
+        DBProductionSchedule.id,
+        DBProductionSchedule.production_start_date,
+        DBProductionSchedule.target_completion_date,
+        DBProductionSchedule.department_schedule,
+        DBProductionPaper.product_type,
+        DBProductionPaper.product_sub_type,
+        DBProductionPaper.product_category,
+    ).outerjoin(
+        DBProductionPaper, DBProductionPaper.id == DBProductionSchedule.production_paper_id
+    ).filter(DBProductionSchedule.status.in_(OPEN_SCHEDULE_STATUSES))
+    if exclude_schedule_id is not None:
+        query = query.filter(DBProductionSchedule.id != exclude_schedule_id)
+
+    products = None
+    stage_hours_by_product: Dict[int, Dict[str, float]] = {}
+    for schedule_id, start, end, department_schedule, product_type, sub_type, category in query.all():
+        if not department_schedule:
+            continue
+        try:
+            entries = json.loads(department_schedule)
+        except (json.JSONDecodeError, TypeError):
+            continue
+        stage_hours_by_department = None
+        if any(isinstance(entry, dict) and entry.get("planned_hours") is None for entry in entries or []):
+            if products is None:
+                products = active_products(db)
+            product = match_product(products, product_type, sub_type, category)
+            if product is not None:
+                if product.id not in stage_hours_by_product:
+                    stage_hours_by_product[product.id] = department_stage_hours(product_stages(product))
+                stage_hours_by_department = stage_hours_by_product[product.id]
+        calendar.book_entries(entries, schedule_id, default_start=start, default_end=end,
+                              stage_hours_by_department=stage_hours_by_department)
+
+    return calendar
+
+
+def active_products(db: Session) -> List[DBProduct]:
+    return db.query(DBProduct).filter(DBProduct.is_active == True).order_by(DBProduct.id).all()
+
+
+def match_product(products: List[DBProduct], product_type: Optional[str], sub_type: Optional[str],
+                  category: Optional[str]) -> Optional[DBProduct]:
+    """Best matching product (type + sub type, then type, then category)"""
+    if product_type:
+        candidates = [product for product in products if product.product_type == product_type]
+        if sub_type:
+            for product in candidates:
+                if product.sub_type == sub_type:
+                    return product
+        if candidates:
+            return candidates[0]
+    if category:
+        for product in products:
+            if product.product_category == category:
+                return product
+    return None
+
+
+def find_product_for_paper(db: Session, paper: DBProductionPaper) -> Optional[DBProduct]:
+    """Best matching active Product (type + sub type, then type, then category)"""
+    return match_product(active_products(db), paper.product_type, paper.product_sub_type, paper.product_category)
+
+
+def product_stages(product: DBProduct) -> List[Tuple[str, float]]:
+    return [
+        (step["step_name"], stage_hours(step))
+        for step in parse_manufacturing_process(product.manufacturing_process)
+    ]
+
+
+def get_paper_stages(db: Session, paper: DBProductionPaper) -> List[Tuple[str, float]]:
+    """(department/stage name, hours) for each manufacturing stage of the paper's product"""
+    product = find_product_for_paper(db, paper)
+    if not product:
+        return []
+    return product_stages(product)
+
+
+def department_stage_hours(stages: List[Tuple[str, float]]) -> Dict[str, float]:
+    """Hours per department (normalized name) of stages with a known duration, summed per department"""
+    hours: Dict[str, float] = {}
+    for name, duration in stages:
+        if duration > 0:
+            key = name.strip().lower()
+            hours[key] = hours.get(key, 0.0) + duration
+    return hours
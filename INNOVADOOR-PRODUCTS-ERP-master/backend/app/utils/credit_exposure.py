@@ -0,0 +1,205 @@
+"""
+Per-party credit exposure kept as running balances in ``party_credit_exposures``.
+
+- approving a tax invoice adds its grand total to ``invoiced_amount``
+  (later freight/round-off edits post the difference),
+- allocating a payment adds to ``paid_amount`` when the receipt is received or
+  cleared, or to ``uncleared_amount`` while it is pending (e.g. a cheque),
+- a receipt status change moves its allocations between the two buckets
+  (bounced/cancelled receipts count in neither).
+
+``outstanding_amount`` is ``invoiced_amount - paid_amount``, so a credit check is
+a single-row read. Posting helpers only flush; the caller commits, keeping the
+balance change in the same transaction as the document that caused it.
+"""
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models.accounts import (
+    PartyCreditExposure as DBPartyCreditExposure,
+    PaymentAllocation as DBPaymentAllocation,
+    PaymentReceipt as DBPaymentReceipt,
+)
+from app.db.models.billing import TaxInvoice as DBTaxInvoice
+
+# Invoice statuses that count towards exposure (everything after approval)
+EXPOSURE_INVOICE_STATUSES = ["approved", "sent_to_dispatch", "tally_synced"]
+PAID_RECEIPT_STATUSES = ["received", "cleared"]
+UNCLEARED_RECEIPT_STATUSES = ["pending"]
+
+ZERO = Decimal("0.00")
+BALANCE_FIELDS = ["invoiced_amount", "paid_amount", "uncleared_amount", "outstanding_amount"]
+
+
+def to_decimal(value) -> Decimal:
+    if value is None:
+        return ZERO
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def receipt_bucket(receipt_status: Optional[str]) -> Optional[str]:
+    """Balance ("paid" / "uncleared") a receipt's allocations count in, if any"""
+    if receipt_status in PAID_RECEIPT_STATUSES:
+        return "paid"
+    if receipt_status in UNCLEARED_RECEIPT_STATUSES:
+        return "uncleared"
+    return None
+
+
+def post_exposure(
+    db: Session,
+    party_id: int,
+    invoiced: Decimal = ZERO,
+    paid: Decimal = ZERO,
+    uncleared: Decimal = ZERO,
+) -> None:
+    """Apply a change to a party's running balances (row created if missing)"""
+    if not (invoiced or paid or uncleared):
+        return
+    row = db.query(DBPartyCreditExposure).filter(DBPartyCreditExposure.party_id == party_id).first()
+    if row is None:
+        db.add(DBPartyCreditExposure(
+            party_id=party_id,
+            invoiced_amount=invoiced,
+            paid_amount=paid,
+            uncleared_amount=uncleared,
+            outstanding_amount=invoiced - paid,
+        ))
+        db.flush()
+        return
+
+    # Update with SQL expressions so concurrent postings cannot lose increments
+    row.invoiced_amount = DBPartyCreditExposure.invoiced_amount + invoiced
+    row.paid_amount = DBPartyCreditExposure.paid_amount + paid
+    row.uncleared_amount = DBPartyCreditExposure.uncleared_amount + uncleared
+    row.outstanding_amount = DBPartyCreditExposure.outstanding_amount + (invoiced - paid)
+    db.flush()
+
+
+def post_invoice_status_change(db: Session, invoice: DBTaxInvoice, old_status: Optional[str], old_grand_total=None) -> None:
+    """
+    Post an invoice status change: entering the exposure statuses adds its grand
+    total, leaving them removes the total it was counted with.
+    """
+    was_counted = old_status in EXPOSURE_INVOICE_STATUSES
+    is_counted = invoice.status in EXPOSURE_INVOICE_STATUSES
+    if was_counted and is_counted:
+        post_invoice_total_change(db, invoice, old_grand_total if old_grand_total is not None else invoice.grand_total)
+    elif is_counted:
+        post_exposure(db, invoice.party_id, invoiced=to_decimal(invoice.grand_total))
+    elif was_counted:
+        counted_total = old_grand_total if old_grand_total is not None else invoice.grand_total
+        post_exposure(db, invoice.party_id, invoiced=-to_decimal(counted_total))
+
+
+def post_invoice_total_change(db: Session, invoice: DBTaxInvoice, old_grand_total) -> None:
+    """Post the difference when an already-counted invoice's grand total is edited"""
+    if invoice.status not in EXPOSURE_INVOICE_STATUSES:
+        return
+    post_exposure(db, invoice.party_id, invoiced=to_decimal(invoice.grand_total) - to_decimal(old_grand_total))
+
+
+def post_payment_allocation(db: Session, allocation: DBPaymentAllocation, receipt: DBPaymentReceipt, invoice: DBTaxInvoice) -> None:
+    """Count a new allocation against the invoice's party"""
+    bucket = receipt_bucket(receipt.status)
+    if bucket is None:
+        return
+    amount = to_decimal(allocation.allocated_amount)
+    post_exposure(db, invoice.party_id, **{bucket: amount})
+
+
+def post_receipt_status_change(db: Session, receipt: DBPaymentReceipt, old_status: Optional[str]) -> None:
+    """Move a receipt's allocations between paid / uncleared when its status changes"""
+    old_bucket = receipt_bucket(old_status)
+    new_bucket = receipt_bucket(receipt.status)
+    if old_bucket == new_bucket:
+        return
+    # Allocations may span invoices of different parties, so group them by invoice party
+    rows = db.query(DBTaxInvoice.party_id, func.sum(DBPaymentAllocation.allocated_amount)).join(
+        DBTaxInvoice, DBTaxInvoice.id == DBPaymentAllocation.tax_invoice_id
+    ).filter(
+        DBPaymentAllocation.payment_receipt_id == receipt.id
+    ).group_by(DBTaxInvoice.party_id).all()
+    for party_id, amount in rows:
+        changes = {"paid": ZERO, "uncleared": ZERO}
+        if old_bucket:
+            changes[old_bucket] -= to_decimal(amount)
+        if new_bucket:
+            changes[new_bucket] += to_decimal(amount)
+        post_exposure(db, party_id, **changes)
+
+
+def get_party_exposure(db: Session, party_id: int) -> Decimal:
+    """Outstanding exposure for credit checks (single-row read)"""
+    outstanding = db.query(DBPartyCreditExposure.outstanding_amount).filter(
+        DBPartyCreditExposure.party_id == party_id
+    ).scalar()
+    return to_decimal(outstanding)
+
+
+def compute_credit_exposures(db: Session) -> Dict[int, Dict[str, Decimal]]:
+    """Full recomputation from invoices, allocations and receipts (three grouped queries)"""
+    exposures: Dict[int, Dict[str, Decimal]] = {}
+
+    def row_for(party_id: int) -> Dict[str, Decimal]:
+        if party_id not in exposures:
+            exposures[party_id] = {field: ZERO for field in BALANCE_FIELDS}
+        return exposures[party_id]
+
+    invoiced = db.query(DBTaxInvoice.party_id, func.sum(DBTaxInvoice.grand_total)).filter(
+        DBTaxInvoice.status.in_(EXPOSURE_INVOICE_STATUSES)
+    ).group_by(DBTaxInvoice.party_id).all()
+    for party_id, amount in invoiced:
+        row_for(party_id)["invoiced_amount"] += to_decimal(amount)
+
+    for statuses, field in ((PAID_RECEIPT_STATUSES, "paid_amount"), (UNCLEARED_RECEIPT_STATUSES, "uncleared_amount")):
+        allocated = db.query(DBTaxInvoice.party_id, func.sum(DBPaymentAllocation.allocated_amount)).join(
+            DBTaxInvoice, DBTaxInvoice.id == DBPaymentAllocation.tax_invoice_id
+        ).join(
+            DBPaymentReceipt, DBPaymentReceipt.id == DBPaymentAllocation.payment_receipt_id
+        ).filter(
+            DBPaymentReceipt.status.in_(statuses)
+        ).group_by(DBTaxInvoice.party_id).all()
+        for party_id, amount in allocated:
+            row_for(party_id)[field] += to_decimal(amount)
+
+    for balances in exposures.values():
+        balances["outstanding_amount"] = balances["invoiced_amount"] - balances["paid_amount"]
+    return exposures
+
+
+def rebuild_credit_exposure(db: Session) -> int:
+    """Replace all running balances with a full recomputation"""
+    db.query(DBPartyCreditExposure).delete(synchronize_session=False)
+    db.flush()
+    exposures = compute_credit_exposures(db)
+    db.bulk_insert_mappings(DBPartyCreditExposure, [
+        {"party_id": party_id, **balances} for party_id, balances in exposures.items()
+    ])
+    db.flush()
+    return len(exposures)
+
+
+def check_credit_exposure(db: Session, tolerance: Decimal = Decimal("0.01")) -> List[Dict]:
+    """Compare the stored balances with a full recomputation; returns the mismatching parties"""
+    expected = compute_credit_exposures(db)
+    stored = {
+        row.party_id: {field: to_decimal(getattr(row, field)) for field in BALANCE_FIELDS}
+        for row in db.query(DBPartyCreditExposure).all()
+    }
+    mismatches = []
+    for party_id in sorted(set(expected) | set(stored)):
+        empty = {field: ZERO for field in BALANCE_FIELDS}
+        want = expected.get(party_id, empty)
+        have = stored.get(party_id, empty)
+        differences = {
+            field: {"stored": have[field], "expected": want[field]}
+            for field in BALANCE_FIELDS
+            if abs(have[field] - want[field]) > tolerance
+        }
+        if differences:
+            mismatches.append({"party_id": party_id, "differences": differences})
+    return mismatches
@@ -0,0 +1,186 @@
+"""
+Width / height / quantity to area arithmetic shared by the production paper
+shutter items, the raw material paper (screen and PDF) and the raw material
+requirements table.
+
+The functions work on whole columns - a list of widths, a list of heights, a
+list of quantities - and return lists, so a paper's items are converted in a
+few comprehensions instead of per-item closures. Measurement items are entered
+in inches or millimetres without saying which; the unit rule is explicit:
+
+- ``UNITS_INCH``: values are inches (requirements table),
+- ``UNITS_BY_WIDTH``: an item whose width is MM_WIDTH_FROM or more is in mm,
+  both its dimensions are converted (shutter items),
+- ``UNITS_BY_VALUE``: each value above MM_VALUE_ABOVE is in mm, and inches are
+  rounded to 2 decimals as printed (raw material paper, same as the frontend's
+  ``convertToInches``).
+
+Rounding of the results stays with the callers (each paper prints its own
+precision). ``shutter_item_areas`` is the shutter item calculation; the raw
+material paper and table build on these functions in
+``app.utils.raw_material_parser``. ``benchmark_dimensions.py --check`` compares
+all three with a golden file.
+"""
+from typing import Any, Dict, List, NamedTuple, Sequence
+import math
+import re
+
+MM_PER_INCH = 25.4
+SQ_IN_PER_SQ_FT = 144.0
+SQ_M_PER_SQ_FT = 0.09290304
+RM_SQ_M_PER_SQ_FT = 0.092903  # Factor printed on raw material papers
+LAMINATE_SHEET_SQ_FT = 32.0  # 8 x 4 ft sheet
+LAMINATE_SIDES = 2.0
+LAMINATE_WASTAGE = 1.20
+MAX_DIMENSION = 10000  # Larger "dimensions" are codes typed into the wrong column
+
+UNITS_INCH = "inch"
+UNITS_BY_WIDTH = "width"
+UNITS_BY_VALUE = "value"
+MM_WIDTH_FROM = 150
+MM_VALUE_ABOVE = 100
+
+NUMBER = re.compile(r"[\d.]+")
+
+
+class Areas(NamedTuple):
+    width: List[float]  # Inches
+    height: List[float]  # Inches
+    sq_ft: List[float]
+    sq_meter: List[float]
+
+
+def parse_number(value: Any) -> float:
+    """A dimension typed as 34, "34.00" or '34.00"' (0.0 when blank or not a number)"""
+    if not value or value == '-':
+        return 0.0
+    try:
+        return float(str(value).replace('"', '').strip())
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def extract_number(value: Any) -> float:
+    """First number found in a value ("34.00 in" -> 34.0); 0.0 when there is none"""
+    if value is None or value == '-' or value == '':
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = NUMBER.search(str(value).strip().replace('"', '').replace("'", ''))
+    if not match:
+        return 0.0
+    try:
+        return float(match.group())
+    except ValueError:
+        return 0.0
+
+
+def parse_numbers(values: Sequence[Any], lenient: bool = False) -> List[float]:
+    """``parse_number`` (or ``extract_number`` when ``lenient``) of each value
+
+    A paper repeats a handful of sizes, so each distinct value is parsed once.
+    """
+    parse = extract_number if lenient else parse_number
+    parsed: Dict[Any, float] = {}
+    numbers = []
+    for value in values:
+        if type(value) is str:
+            number = parsed.get(value)
+            if number is None:
+                number = parsed[value] = parse(value)
+        else:
+            number = parse(value)
+        numbers.append(number)
+    return numbers
+
+
+def parse_quantity(value: Any, integer_strings_only: bool = False) -> int:
+    """Whole quantity (1 when blank or not a number); "2.5" is 2, or 1 with ``integer_strings_only``"""
+    if value is None or value == '':
+        return 1
+    try:
+        return int(value) if integer_strings_only else int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return 1
+
+
+def parse_quantities(values: Sequence[Any], integer_strings_only: bool = False) -> List[int]:
+    return [parse_quantity(value, integer_strings_only) for value in values]
+
+
+def to_inches(widths: Sequence[float], heights: Sequence[float], units: str = UNITS_INCH):
+    """(widths, heights) in inches under a unit rule (see module docstring)"""
+    if units == UNITS_INCH:
+        return list(widths), list(heights)
+    if units == UNITS_BY_WIDTH:
+        factors = [1.0 if width < MM_WIDTH_FROM else MM_PER_INCH for width in widths]
+        return (
+            [width if factor == 1.0 else width / factor for width, factor in zip(widths, factors)],
+            [height if factor == 1.0 else height / factor for height, factor in zip(heights, factors)],
+        )
+    if units == UNITS_BY_VALUE:
+        inches: Dict[float, float] = {}
+
+        def convert(value: float) -> float:
+            converted = inches.get(value)
+            if converted is None:
+                converted = inches[value] = round(value / MM_PER_INCH if value > MM_VALUE_ABOVE else value, 2)
+            return converted
+
+        return [convert(value) for value in widths], [convert(value) for value in heights]
+    raise ValueError(f"Unknown unit rule {units!r}")
+
+
+def compute_areas(
+    widths: Sequence[float],
+    heights: Sequence[float],
+    quantities: Sequence[float],
+    units: str = UNITS_INCH,
+    sq_meter_factor: float = SQ_M_PER_SQ_FT,
+    per_piece: bool = False,
+) -> Areas:
+    """Inches, square feet and square metres of each item
+
+    Square feet are width x height x qty / 144, or with ``per_piece`` the area
+    of one piece (width x height / 144) times qty - the order shutter items
+    have always been computed in, which can differ in the last decimal.
+    """
+    width_in, height_in = to_inches(widths, heights, units)
+    if per_piece:
+        sq_ft = [width * height / SQ_IN_PER_SQ_FT * qty for width, height, qty in zip(width_in, height_in, quantities)]
+    else:
+        sq_ft = [width * height * qty / SQ_IN_PER_SQ_FT for width, height, qty in zip(width_in, height_in, quantities)]
+    return Areas(width_in, height_in, sq_ft, [value * sq_meter_factor for value in sq_ft])
+
+
+def laminate_sq_ft(sq_ft: Sequence[float]) -> List[float]:
+    """Laminate needed for both sides with wastage"""
+    return [value * LAMINATE_SIDES * LAMINATE_WASTAGE for value in sq_ft]
+
+
+def laminate_sheets(sq_ft: Sequence[float], whole: bool = False) -> List[float]:
+    """8 x 4 sheets covering each area (rounded up to whole sheets with ``whole``)"""
+    if whole:
+        return [math.ceil(value / LAMINATE_SHEET_SQ_FT) for value in sq_ft]
+    return [value / LAMINATE_SHEET_SQ_FT for value in sq_ft]
+
+
+def shutter_item_areas(items: Sequence[dict]) -> List[dict]:
+    """quantity, sq_ft, sq_meter and laminate_sheets of production shutter items, rounded as stored"""
+    widths = parse_numbers([item.get('act_width') or item.get('width') or item.get('w') for item in items])
+    heights = parse_numbers([item.get('act_height') or item.get('height') or item.get('h') for item in items])
+    quantities = parse_quantities(
+        [item.get('qty') or item.get('quantity') for item in items], integer_strings_only=True,
+    )
+    areas = compute_areas(widths, heights, quantities, UNITS_BY_WIDTH, per_piece=True)
+    return [
+        {
+            "quantity": quantity,
+            "sq_ft": round(sq_ft, 3),
+            "sq_meter": round(sq_meter, 3),
+            "laminate_sheets": round(sheets, 2),
+        }
+        for quantity, sq_ft, sq_meter, sheets in zip(
+            quantities, areas.sq_ft, areas.sq_meter, laminate_sheets(areas.sq_ft),
+        )
+    ]
@@ -0,0 +1,205 @@
+"""
+CSV / XLSX exports of registers, streamed in constant memory.
+
+``export_response`` turns a ``select()`` of columns into a ``StreamingResponse``:
+
+- rows come from a server-side cursor (``yield_per``: ``stream_results`` on
+  PostgreSQL) ``EXPORT_CHUNK_ROWS`` at a time, as plain rows - no ORM objects
+  and no identity map, so memory does not grow with the register,
+- each chunk is written as CSV text, or as rows of an XLSX sheet, and sent
+  before the next one is fetched.
+
+CSV text cells starting with ``=``, ``+``, ``-``, ``@``, a tab or a carriage
+return (a remark typed as ``=HYPERLINK(...)``) get a leading ``'`` so a
+spreadsheet shows them as text instead of running them as formulas. Numbers
+are written as they are. XLSX cells are inline strings, never formulas.
+
+The XLSX file is a minimal workbook (one sheet, inline strings, no styles)
+written with ``zipfile`` into the response as it goes: the sheet entry is
+deflated in a stream and closed with a data descriptor, so neither the sheet
+nor the file is ever held whole. Dates and times are written as ISO text,
+numbers as numbers.
+
+The rows are read in a session of their own, opened when the response starts
+streaming and closed when it ends (the request's session may be closed first).
+Endpoints build the statement with the same filters as their list endpoint.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, List, Sequence
+from xml.sax.saxutils import escape
+import csv
+import io
+import re
+import zipfile
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+
+from app.db.database import SessionLocal
+
+EXPORT_CHUNK_ROWS = 2000
+EXPORT_FORMATS = ("csv", "xlsx")
+EXPORT_FORMAT_PATTERN = "^(csv|xlsx)$"
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Characters XML 1.0 does not allow (they would make the sheet unreadable)
+XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+# First characters that make a spreadsheet read a CSV cell as a formula
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+XLSX_SHEET_END = '</sheetData></worksheet>'
+
+
+def iter_row_chunks(
+    stmt: Select, chunk_rows: int = EXPORT_CHUNK_ROWS, session_factory=SessionLocal,
+) -> Iterator[Sequence[Sequence[Any]]]:
+    """Rows of the statement in lists of ``chunk_rows``, from a server-side cursor in a session of its own"""
+    db = session_factory()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=chunk_rows))
+        for rows in result.partitions():
+            yield rows
+    finally:
+        db.close()
+
+
+def csv_cell(value: Any) -> Any:
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_chunks(header: List[str], chunks: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    """UTF-8 CSV (with a BOM so Excel reads it as UTF-8), one piece per chunk of rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(header)
+    for rows in chunks:
+        writer.writerows([csv_cell(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def xlsx_cell(value: Any) -> str:
+    if value is None:
+        return '<c/>'
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c><v>{value}</v></c>'
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat(sep=" ") if isinstance(value, datetime) else value.isoformat()
+    text = escape(XML_ILLEGAL.sub("", str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def xlsx_rows(rows: Iterable[Sequence[Any]]) -> str:
+    return "".join(f'<row>{"".join(xlsx_cell(value) for value in row)}</row>' for row in rows)
+
+
+class _ChunkSink:
+    """Write-only file for ``zipfile``: collects what is written until taken (no tell/seek, so entries stream)"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def xlsx_chunks(header: List[str], chunks: Iterable[Sequence[Sequence[Any]]], sheet_name: str = "Export") -> Iterator[bytes]:
+    """A one-sheet XLSX workbook, one piece per chunk of rows"""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as workbook:
+        for name, content in XLSX_PARTS.items():
+            workbook.writestr(name, content)
+        workbook.writestr("xl/workbook.xml", XLSX_WORKBOOK.format(name=escape(sheet_name[:31], {'"': "&quot;"})))
+        with workbook.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write((XLSX_SHEET_START + xlsx_rows([header])).encode("utf-8"))
+            for rows in chunks:
+                sheet.write(xlsx_rows(rows).encode("utf-8"))
+                data = sink.take()
+                if data:
+                    yield data
+            sheet.write(XLSX_SHEET_END.encode("utf-8"))
+    yield sink.take()
+
+
+def export_response(stmt: Select, file_name: str, export_format: str = "csv") -> StreamingResponse:
+    """Stream the statement's rows as ``file_name``.csv / .xlsx, with its column names as the header"""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Export format must be one of {EXPORT_FORMATS}")
+    header = [column.name for column in stmt.selected_columns]
+    chunks = iter_row_chunks(stmt)
+    if export_format == "xlsx":
+        body, media_type = xlsx_chunks(header, chunks, sheet_name=file_name), XLSX_MEDIA_TYPE
+    else:
+        body, media_type = csv_chunks(header, chunks), CSV_MEDIA_TYPE
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{file_name}.{export_format}"'},
+    )
+
+
+def export_columns(model, exclude: Iterable[str] = ()) -> list:
+    """Columns of the model's table to export (JSON blobs and the like excluded)"""
+    excluded = set(exclude)
+    return [column for column in model.__table__.columns if column.name not in excluded]
@@ -0,0 +1,259 @@
+"""
+Bulk flat (wing x floor x flat) import for the site supervisor flat register.
+
+Rows come either from an explicit list / CSV (one row per flat) or from a
+matrix description (wings, floor range, flats per floor and a flat number
+format) that is expanded here. An import then:
+
+- validates each row (wing, floor and flat number present, floor an integer),
+- drops rows repeated within the upload (first one wins),
+- checks ``(site_id, wing, flat_number)`` against the existing flats with one
+  set query for the whole upload,
+- inserts the remaining flats in a single executemany. On PostgreSQL and
+  SQLite the insert is ``ON CONFLICT DO NOTHING RETURNING`` against the
+  ``uq_flats_site_wing_flat_number`` index, so a flat created concurrently is
+  reported as existing instead of failing the whole batch.
+
+Every input row gets a result (created / exists / duplicate / invalid). New
+flats are posted to the wing progress counters; the caller commits.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import csv
+import io
+import json
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.db.models.site_supervisor import Flat as DBFlat, Site as DBSite
+from app.utils.site_progress import post_new_flats
+
+DOOR_FLAGS = ["main_door_required", "bedroom_door_required", "bathroom_door_required", "kitchen_door_required"]
+DEFAULT_FLAT_NUMBER_FORMAT = "{floor}{unit:02d}"
+TRUE_VALUES = {"1", "true", "yes", "y", "x", "required"}
+
+# CSV header aliases -> Flat column
+CSV_COLUMNS = {
+    "wing": "wing",
+    "floor": "floor",
+    "flat_number": "flat_number",
+    "flat_no": "flat_number",
+    "flat": "flat_number",
+    "main_door": "main_door_required",
+    "main_door_required": "main_door_required",
+    "bedroom_door": "bedroom_door_required",
+    "bedroom_door_required": "bedroom_door_required",
+    "bathroom_door": "bathroom_door_required",
+    "bathroom_door_required": "bathroom_door_required",
+    "kitchen_door": "kitchen_door_required",
+    "kitchen_door_required": "kitchen_door_required",
+    "remarks": "remarks",
+}
+
+
+def parse_flag(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def expand_flat_matrix(
+    wings: List[str],
+    floor_from: int,
+    floor_to: int,
+    flats_per_floor: int,
+    flat_number_format: str = DEFAULT_FLAT_NUMBER_FORMAT,
+    door_requirements: Optional[Dict[str, bool]] = None,
+    remarks: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    One row per wing x floor x unit; the flat number is ``flat_number_format``
+    filled with wing, floor and unit (1-based), e.g. "{floor}{unit:02d}" -> "1803".
+    """
+    doors = {flag: bool((door_requirements or {}).get(flag, False)) for flag in DOOR_FLAGS}
+    rows = []
+    for wing in wings:
+        for floor in range(floor_from, floor_to + 1):
+            for unit in range(1, flats_per_floor + 1):
+                rows.append({
+                    "wing": wing,
+                    "floor": floor,
+                    "flat_number": flat_number_format.format(wing=wing, floor=floor, unit=unit),
+                    **doors,
+                    "remarks": remarks,
+                })
+    return rows
+
+
+def parse_flats_csv(content: bytes) -> List[Dict[str, Any]]:
+    """Rows from a CSV with a header (wing, floor, flat_number, door columns, remarks)"""
+    text = content.decode("utf-8-sig")
+    reader = csv.DictReader(io.StringIO(text))
+    rows = []
+    for record in reader:
+        row: Dict[str, Any] = {}
+        for header, value in record.items():
+            if header is None:
+                continue
+            column = CSV_COLUMNS.get(header.strip().lower().replace(" ", "_"))
+            if column:
+                row[column] = value.strip() if isinstance(value, str) else value
+        rows.append(row)
+    return rows
+
+
+def normalize_flat_row(row: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Clean one input row; returns (values, None) or (None, error message)"""
+    wing = str(row.get("wing") or "").strip()
+    flat_number = str(row.get("flat_number") or "").strip()
+    floor = row.get("floor")
+    if not wing:
+        return None, "Wing is required"
+    if not flat_number:
+        return None, "Flat number is required"
+    try:
+        floor = int(str(floor).strip())
+    except (TypeError, ValueError):
+        return None, f"Invalid floor: {floor!r}"
+    values = {
+        "wing": wing,
+        "floor": floor,
+        "flat_number": flat_number,
+        "remarks": row.get("remarks") or None,
+    }
+    for flag in DOOR_FLAGS:
+        values[flag] = parse_flag(row.get(flag))
+    return values, None
+
+
+def existing_flat_keys(db: Session, site_id: int, wings: Iterable[str]) -> Dict[Tuple[str, str], int]:
+    """(wing, flat_number) -> flat id for the given wings of a site (one query)"""
+    wings = list(set(wings))
+    if not wings:
+        return {}
+    return {
+        (wing, flat_number): flat_id
+        for flat_id, wing, flat_number in db.query(DBFlat.id, DBFlat.wing, DBFlat.flat_number).filter(
+            DBFlat.site_id == site_id,
+            DBFlat.wing.in_(wings)
+        ).all()
+    }
+
+
+def insert_flats(db: Session, rows: List[Dict[str, Any]]) -> Dict[Tuple[str, str], int]:
+    """
+    Insert rows in one executemany; returns (wing, flat_number) -> new id for
+    the rows actually inserted.
+    """
+    if not rows:
+        return {}
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+
+    if dialect_insert is not None:
+        statement = dialect_insert(DBFlat).on_conflict_do_nothing(
+            index_elements=["site_id", "wing", "flat_number"]
+        ).returning(DBFlat.id, DBFlat.wing, DBFlat.flat_number)
+        result = db.execute(statement, rows)
+        return {(wing, flat_number): flat_id for flat_id, wing, flat_number in result.all()}
+
+    # Other databases: the set check above already excluded existing flats
+    result = db.execute(insert(DBFlat).returning(DBFlat.id, DBFlat.wing, DBFlat.flat_number), rows)
+    return {(wing, flat_number): flat_id for flat_id, wing, flat_number in result.all()}
+
+
+def add_site_wings(site: DBSite, wings: Iterable[str]) -> None:
+    """Append wings not yet listed on the site (reports iterate ``Site.wings``)"""
+    current = json.loads(site.wings) if site.wings else []
+    added = [wing for wing in dict.fromkeys(wings) if wing not in current]
+    if added:
+        site.wings = json.dumps(current + added)
+
+
+def import_flats(
+    db: Session,
+    site: DBSite,
+    rows: List[Dict[str, Any]],
+    created_by: int,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """Validate and insert flats for a site; returns counts and one result per input row"""
+    results: List[Dict[str, Any]] = []
+    pending: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    seen = set()
+    for index, row in enumerate(rows, start=1):
+        values, error = normalize_flat_row(row)
+        if error:
+            results.append({
+                "row": index,
+                "wing": row.get("wing"),
+                "floor": None,
+                "flat_number": row.get("flat_number"),
+                "status": "invalid",
+                "flat_id": None,
+                "message": error,
+            })
+            continue
+        result = {
+            "row": index,
+            "wing": values["wing"],
+            "floor": values["floor"],
+            "flat_number": values["flat_number"],
+            "status": None,
+            "flat_id": None,
+            "message": None,
+        }
+        results.append(result)
+        key = (values["wing"], values["flat_number"])
+        if key in seen:
+            result["status"] = "duplicate"
+            result["message"] = "Repeated in this import"
+            continue
+        seen.add(key)
+        pending.append((result, values))
+
+    existing = existing_flat_keys(db, site.id, (values["wing"] for _, values in pending))
+    to_insert = []
+    for result, values in pending:
+        key = (values["wing"], values["flat_number"])
+        if key in existing:
+            result["status"] = "exists"
+            result["flat_id"] = existing[key]
+            result["message"] = "Flat already exists"
+        else:
+            to_insert.append((result, values))
+
+    if dry_run:
+        for result, _ in to_insert:
+            result["status"] = "created"
+    else:
+        new_flats = [
+            {**values, "site_id": site.id, "created_by": created_by, "frame_fixed": False, "door_fixed": False}
+            for _, values in to_insert
+        ]
+        inserted = insert_flats(db, new_flats)
+        post_new_flats(db, site.id, (
+            flat for flat in new_flats if (flat["wing"], flat["flat_number"]) in inserted
+        ))
+        for result, values in to_insert:
+            key = (values["wing"], values["flat_number"])
+            if key in inserted:
+                result["status"] = "created"
+                result["flat_id"] = inserted[key]
+            else:
+                result["status"] = "exists"
+                result["message"] = "Flat already exists"
+        add_site_wings(site, (values["wing"] for _, values in to_insert))
+        db.flush()
+
+    counts = {status: 0 for status in ("created", "exists", "duplicate", "invalid")}
+    for result in results:
+        counts[result["status"]] += 1
+    return {"site_id": site.id, "dry_run": dry_run, **counts, "results": results}
@@ -0,0 +1,66 @@
+"""
+Handlers of the background job types (see ``app.utils.jobs``).
+
+Each handler runs the same code as the inline endpoint, in the worker's
+session and as the user who queued the job, and returns what the endpoint
+would have answered (stored as the job result). HTTP 4xx errors raised by
+the endpoint code fail the job without retries.
+"""
+from datetime import date
+from typing import Any, Dict
+
+from sqlalchemy.orm import Session
+
+from app.db.models.accounts import AccountReceivable as DBAccountReceivable
+from app.db.models.user import User as DBUser
+from app.utils.jobs import JobContext, JobFailed, job_handler
+from app.utils.receivables import refresh_invoice_receivable, refresh_receivables
+
+
+def job_user(db: Session, job: JobContext) -> DBUser:
+    """The user who queued the job (endpoint code checks roles and records who did it)"""
+    user = db.get(DBUser, job.created_by) if job.created_by else None
+    if user is None or not user.is_active:
+        raise JobFailed("The user who queued the job no longer exists or is inactive")
+    return user
+
+
+@job_handler("receivables.sync_invoice")
+def sync_invoice_receivable(db: Session, payload: Dict[str, Any], job: JobContext) -> Dict[str, Any]:
+    invoice_id = payload["invoice_id"]
+    refresh_invoice_receivable(db, invoice_id)
+    db.flush()
+    receivable = db.query(DBAccountReceivable).filter(DBAccountReceivable.tax_invoice_id == invoice_id).first()
+    return {"message": "Invoice synced to receivables", "receivable_id": receivable.id if receivable else None}
+
+
+@job_handler("receivables.refresh")
+def refresh_all_receivables(db: Session, payload: Dict[str, Any], job: JobContext) -> Dict[str, Any]:
+    as_of = date.fromisoformat(payload["as_of"]) if payload.get("as_of") else None
+    job.progress(10, "Refreshing receivables")
+    return {"message": "Receivables refreshed", **refresh_receivables(db, as_of)}
+
+
+@job_handler("production.generate_rm")
+def generate_rm_paper(db: Session, payload: Dict[str, Any], job: JobContext) -> Any:
+    from app.api.v1.endpoints.production import generate_raw_material_paper
+
+    return generate_raw_material_paper(db=db, paper_id=payload["paper_id"], current_user=job_user(db, job))
+
+
+@job_handler("production.fix_db_schema")
+def fix_db_schema(db: Session, payload: Dict[str, Any], job: JobContext) -> Any:
+    from app.api.v1.endpoints.production import trigger_db_fix
+
+    return trigger_db_fix(current_user=job_user(db, job), db=db)
+
+
+@job_handler("scheduler.create_schedule")
+def create_production_schedule(db: Session, payload: Dict[str, Any], job: JobContext) -> Any:
+    from app.api.v1.endpoints.scheduler import create_schedule
+    from app.schemas.user import ProductionScheduleCreate
+
+    job.progress(10, "Checking material availability and department capacity")
+    return create_schedule(
+        db=db, schedule_in=ProductionScheduleCreate(**payload), current_user=job_user(db, job),
+    )
@@ -0,0 +1,383 @@
+"""
+Background jobs run by in-process workers, with the database as the queue.
+
+Heavy endpoints (receivables sync and refresh, RM generation, schedule
+creation, DB schema fix) take ``background=true``: they store a ``jobs`` row
+with ``enqueue_job`` and answer ``202 Accepted`` at once (``job_accepted``);
+the client polls ``GET /jobs/{id}`` for progress and the result.
+
+Workers (``JOB_WORKERS`` threads per API process, started at startup, or
+``run_jobs.py``) loop over:
+
+- claim: the oldest ``queued`` job whose ``run_after`` has passed, selected
+  ``FOR UPDATE SKIP LOCKED`` (PostgreSQL: concurrent workers skip each
+  other's rows instead of waiting) and marked ``running`` with a conditional
+  ``UPDATE ... WHERE status = 'queued'`` (the only guard on SQLite, where it
+  serializes the claim),
+- run: the handler registered for the job type (``job_handler``) gets its
+  own session and commits its work; the job row is updated in separate short
+  transactions so a failing handler cannot lose its status,
+- retry: an error re-queues the job with ``run_after`` pushed back
+  ``JOB_RETRY_BACKOFF_SECONDS`` x 2^(attempt - 1), until ``max_attempts``;
+  ``JobFailed`` and HTTP 4xx errors (bad input) fail at once,
+- recover: a ``running`` job whose heartbeat (claim or last ``progress``) is
+  older than ``JOB_STALE_MINUTES`` lost its worker and is retried the same way.
+
+A committed ``enqueue_job`` wakes this process's idle workers at once; other
+processes pick the job up within ``JOB_POLL_SECONDS``. Handlers live in
+``app.utils.job_handlers`` (imported on first use).
+
+Periodic tasks that every API process schedules (the receivables refresh)
+are made single-runner the same way: ``claim_periodic_task`` is a conditional
+``UPDATE`` of the task's ``periodic_tasks`` row that succeeds for one process
+per interval.
+"""
+from datetime import datetime, timedelta, timezone
+from importlib import import_module
+from threading import Event, Thread
+from typing import Any, Callable, Dict, List, Optional
+import json
+import os
+import socket
+import time
+import traceback
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import event, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models.job import Job as DBJob, PeriodicTask as DBPeriodicTask
+from app.schemas.job import Job
+
+HANDLERS_MODULE = "app.utils.job_handlers"
+MAX_BACKOFF = timedelta(hours=1)
+RECOVERY_INTERVAL_SECONDS = 60  # How often a pool looks for stale jobs
+
+JobHandler = Callable[[Session, Dict[str, Any], "JobContext"], Any]
+_handlers: Dict[str, JobHandler] = {}
+_wake = Event()
+
+
+class JobFailed(Exception):
+    """Raised by a handler for an error retrying will not fix"""
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def job_handler(job_type: str) -> Callable[[JobHandler], JobHandler]:
+    """Register ``handler(db, payload, job)`` for a job type; its return value (JSON-able) is the job result"""
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[job_type] = handler
+        return handler
+    return register
+
+
+def get_handler(job_type: str) -> Optional[JobHandler]:
+    if job_type not in _handlers:
+        import_module(HANDLERS_MODULE)
+    return _handlers.get(job_type)
+
+
+def enqueue_job(
+    db: Session,
+    job_type: str,
+    payload: Optional[Dict[str, Any]] = None,
+    created_by: Optional[int] = None,
+    max_attempts: Optional[int] = None,
+    run_after: Optional[datetime] = None,
+) -> DBJob:
+    """Add a job (flushed; the caller commits, which wakes the workers of this process)"""
+    if get_handler(job_type) is None:
+        raise ValueError(f"Unknown job type: {job_type}")
+    job = DBJob(
+        job_type=job_type,
+        status="queued",
+        payload=json.dumps(jsonable_encoder(payload or {})),
+        progress=0,
+        attempts=0,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_after=run_after or utcnow(),
+        created_by=created_by,
+    )
+    db.add(job)
+    db.flush()
+    db.info["jobs_enqueued"] = True
+    return job
+
+
+@event.listens_for(Session, "after_commit")
+def _jobs_committed(session: Session) -> None:
+    if session.info.pop("jobs_enqueued", False):
+        _wake.set()
+
+
+def job_response(job: DBJob) -> Job:
+    result = None
+    if job.result:
+        try:
+            result = json.loads(job.result)
+        except (json.JSONDecodeError, TypeError):
+            result = job.result
+    return Job(
+        id=job.id, job_type=job.job_type, status=job.status, progress=job.progress,
+        progress_message=job.progress_message, attempts=job.attempts, max_attempts=job.max_attempts,
+        result=result, error=job.error, run_after=job.run_after if job.status == "queued" else None,
+        created_by=job.created_by, created_at=job.created_at, started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+def job_accepted(job: DBJob) -> JSONResponse:
+    """``202 Accepted`` with the job, and its status URL in ``Location``"""
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=jsonable_encoder(job_response(job)),
+        headers={"Location": f"{settings.API_V1_STR}/jobs/{job.id}"},
+    )
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return min(timedelta(seconds=settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0)), MAX_BACKOFF)
+
+
+def is_permanent(error: Exception) -> bool:
+    if isinstance(error, JobFailed):
+        return True
+    return isinstance(error, HTTPException) and error.status_code < 500
+
+
+def error_text(error: Exception) -> str:
+    if isinstance(error, HTTPException):
+        return str(error.detail)
+    return f"{type(error).__name__}: {error}"
+
+
+class JobContext:
+    """What a handler knows about its job, and how it reports progress"""
+
+    def __init__(self, job_id: int, job_type: str, created_by: Optional[int], attempt: int, worker_id: str,
+                 session_factory=SessionLocal):
+        self.id = job_id
+        self.job_type = job_type
+        self.created_by = created_by
+        self.attempt = attempt
+        self.worker_id = worker_id
+        self.session_factory = session_factory
+
+    def progress(self, percent: int, message: Optional[str] = None) -> None:
+        """Store progress (0..100) and refresh the heartbeat (call at least every JOB_STALE_MINUTES)"""
+        with self.session_factory() as db:
+            db.execute(
+                update(DBJob)
+                .where(DBJob.id == self.id, DBJob.status == "running", DBJob.locked_by == self.worker_id)
+                .values(progress=max(0, min(int(percent), 100)), progress_message=message, heartbeat_at=utcnow())
+            )
+            db.commit()
+
+
+def claim_job(db: Session, worker_id: str) -> Optional[DBJob]:
+    """Take the next due job (None when there is none, or another worker took it first)"""
+    now = utcnow()
+    job_id = db.execute(
+        select(DBJob.id)
+        .where(DBJob.status == "queued", DBJob.run_after <= now)
+        .order_by(DBJob.run_after, DBJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).scalar()
+    if job_id is None:
+        db.rollback()
+        return None
+    claimed = db.execute(
+        update(DBJob)
+        .where(DBJob.id == job_id, DBJob.status == "queued")
+        .values(
+            status="running", attempts=DBJob.attempts + 1, locked_by=worker_id,
+            started_at=now, heartbeat_at=now, progress=0, progress_message=None,
+        )
+    ).rowcount
+    db.commit()
+    return db.get(DBJob, job_id) if claimed else None
+
+
+def finish_job(db: Session, job: DBJob, worker_id: str, result: Any = None, error: Optional[Exception] = None) -> str:
+    """Record the outcome of an attempt; returns the job's new status"""
+    now = utcnow()
+    if error is None:
+        values = {
+            "status": "succeeded", "result": json.dumps(jsonable_encoder(result)),
+            "progress": 100, "finished_at": now, "locked_by": None,
+        }
+    elif job.attempts < job.max_attempts and not is_permanent(error):
+        values = {
+            "status": "queued", "error": error_text(error), "locked_by": None,
+            "run_after": now + retry_delay(job.attempts),
+        }
+    else:
+        values = {"status": "failed", "error": error_text(error), "finished_at": now, "locked_by": None}
+    db.execute(
+        update(DBJob)
+        .where(DBJob.id == job.id, DBJob.status == "running", DBJob.locked_by == worker_id)
+        .values(**values)
+    )
+    db.commit()
+    return values["status"]
+
+
+def run_job(job: DBJob, worker_id: str, session_factory=SessionLocal) -> str:
+    """Run a claimed job's handler in a session of its own; returns the job's new status"""
+    handler = get_handler(job.job_type)
+    context = JobContext(job.id, job.job_type, job.created_by, job.attempts, worker_id, session_factory)
+    result, error = None, None
+    if handler is None:
+        error = JobFailed(f"No handler for job type {job.job_type}")
+    else:
+        db = session_factory()
+        try:
+            result = handler(db, json.loads(job.payload or "{}"), context)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            if not is_permanent(e):
+                traceback.print_exc()
+            error = e
+        finally:
+            db.close()
+    with session_factory() as db:
+        return finish_job(db, job, worker_id, result, error)
+
+
+def process_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_periodic_task(db: Session, name: str, interval: timedelta, owner: Optional[str] = None) -> bool:
+    """Whether this process should run the task now (no process claimed it within ``interval``); commits"""
+    if db.get(DBPeriodicTask, name) is None:
+        try:
+            db.add(DBPeriodicTask(name=name))
+            db.commit()
+        except IntegrityError:
+            db.rollback()  # Another process added it first
+    now = utcnow()
+    claimed = db.execute(
+        update(DBPeriodicTask)
+        .where(
+            DBPeriodicTask.name == name,
+            or_(DBPeriodicTask.last_started_at.is_(None), DBPeriodicTask.last_started_at <= now - interval),
+        )
+        .values(last_started_at=now, locked_by=owner or process_id())
+    ).rowcount
+    db.commit()
+    return bool(claimed)
+
+
+def finish_periodic_task(db: Session, name: str) -> None:
+    db.execute(update(DBPeriodicTask).where(DBPeriodicTask.name == name).values(last_finished_at=utcnow()))
+    db.commit()
+
+
+def requeue_stale_jobs(db: Session, stale_after: Optional[timedelta] = None) -> int:
+    """Retry (or fail, after max_attempts) running jobs whose worker stopped sending heartbeats"""
+    stale_after = stale_after or timedelta(minutes=settings.JOB_STALE_MINUTES)
+    now = utcnow()
+    stale = (
+        DBJob.status == "running",
+        or_(DBJob.heartbeat_at < now - stale_after, DBJob.heartbeat_at.is_(None)),
+    )
+    message = "The worker running the job stopped responding"
+    requeued = db.execute(
+        update(DBJob).where(*stale, DBJob.attempts < DBJob.max_attempts)
+        .values(status="queued", locked_by=None, run_after=now, error=message)
+    ).rowcount
+    failed = db.execute(
+        update(DBJob).where(*stale, DBJob.attempts >= DBJob.max_attempts)
+        .values(status="failed", locked_by=None, finished_at=now, error=message)
+    ).rowcount
+    db.commit()
+    return requeued + failed
+
+
+def run_pending_jobs(worker_id: str, session_factory=SessionLocal, limit: Optional[int] = None) -> int:
+    """Run due jobs one after the other until there are none (or ``limit`` ran); returns how many ran"""
+    count = 0
+    while limit is None or count < limit:
+        with session_factory() as db:
+            job = claim_job(db, worker_id)
+            if job is not None:
+                db.expunge(job)
+        if job is None:
+            break
+        run_job(job, worker_id, session_factory)
+        count += 1
+    return count
+
+
+class JobWorkerPool:
+    """``workers`` threads running due jobs; idle ones wait for a new job or ``poll_seconds``"""
+
+    def __init__(self, workers: int, poll_seconds: float, session_factory=SessionLocal):
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.session_factory = session_factory
+        self.stopping = Event()
+        self.threads: List[Thread] = []
+        self.recovered_at = 0.0
+
+    def start(self) -> None:
+        for index in range(self.workers):
+            worker_id = f"{process_id()}:{index}"
+            thread = Thread(target=self.run, args=(worker_id,), name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, timeout: float = 10) -> None:
+        """Stop after the running jobs finish (unfinished ones are retried once stale)"""
+        self.stopping.set()
+        _wake.set()
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+
+    def run(self, worker_id: str) -> None:
+        while not self.stopping.is_set():
+            try:
+                ran = run_pending_jobs(worker_id, self.session_factory, limit=1)
+                if not ran and time.monotonic() - self.recovered_at > RECOVERY_INTERVAL_SECONDS:
+                    self.recovered_at = time.monotonic()
+                    with self.session_factory() as db:
+                        requeue_stale_jobs(db)
+            except Exception as e:
+                ran = 0
+                print(f"Job worker {worker_id} error: {e}")
+            if not ran and not self.stopping.is_set():
+                _wake.wait(self.poll_seconds)
+                _wake.clear()
+
+
+_pool: Optional[JobWorkerPool] = None
+
+
+def start_job_workers(workers: Optional[int] = None, poll_seconds: Optional[float] = None) -> Optional[JobWorkerPool]:
+    """Start this process's worker pool (from app startup; JOB_WORKERS=0 disables it)"""
+    global _pool
+    workers = settings.JOB_WORKERS if workers is None else workers
+    if workers <= 0 or _pool is not None:
+        return _pool
+    _pool = JobWorkerPool(workers, poll_seconds or settings.JOB_POLL_SECONDS)
+    _pool.start()
+    return _pool
+
+
+def stop_job_workers() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.stop()
+        _pool = None
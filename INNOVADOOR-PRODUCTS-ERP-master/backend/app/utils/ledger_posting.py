@@ -0,0 +1,589 @@
+"""
+Double-entry posting of business documents into ``ledgers`` / ``ledger_entries``.
+
+Each document maps to a balanced set of ledger amounts (debit positive):
+
+- approved tax invoice: Dr customer (grand total) / Cr GST output (CGST+SGST+IGST)
+  / Cr sales (the rest - taxable value, freight and round-off),
+- received or cleared payment receipt: Dr bank (cash for cash receipts)
+  / Cr unallocated receipts,
+- payment allocation of a received/cleared receipt: Dr unallocated receipts
+  / Cr customer of the invoice,
+- vendor bill (purchase module) and vendor payable (accounts module): Dr purchases
+  / Dr GST input / Cr vendor,
+- paid vendor payment: Dr vendor / Cr bank.
+
+``sync_document`` compares those amounts with what is already posted for the
+document and posts only the difference, so the same call handles the first
+posting, edits and reversals (e.g. a bounced cheque). Entries are never updated
+or deleted. Posting helpers only flush; the caller commits, so the entries are
+part of the same transaction as the document.
+
+Month-end closing balances per ledger are kept in ``ledger_balance_snapshots``.
+A balance as of any date is the nearest snapshot at or before it plus the
+entries after the snapshot, so trial balances and statements never scan the
+whole entry history. Back-dated postings into closed months update the
+affected snapshots in the same transaction.
+"""
+from calendar import monthrange
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.db.models.accounts import (
+    Ledger as DBLedger,
+    LedgerBalanceSnapshot as DBLedgerBalanceSnapshot,
+    LedgerEntry as DBLedgerEntry,
+    PaymentAllocation as DBPaymentAllocation,
+    PaymentReceipt as DBPaymentReceipt,
+    VendorPayable as DBVendorPayable,
+    VendorPayment as DBVendorPayment,
+)
+from app.db.models.billing import TaxInvoice as DBTaxInvoice
+from app.db.models.purchase import VendorBill as DBVendorBill
+from app.utils.credit_exposure import EXPOSURE_INVOICE_STATUSES, PAID_RECEIPT_STATUSES, to_decimal
+
+ZERO = Decimal("0.00")
+CENT = Decimal("0.01")
+
+# code: (name, ledger_type)
+SYSTEM_LEDGERS = {
+    "SALES": ("Sales", "income"),
+    "GST-OUTPUT": ("GST Output", "liability"),
+    "GST-INPUT": ("GST Input Credit", "asset"),
+    "PURCHASES": ("Purchases", "expense"),
+    "BANK": ("Bank", "asset"),
+    "CASH": ("Cash", "asset"),
+    "UNALLOCATED-RECEIPTS": ("Unallocated Receipts", "liability"),
+}
+CASH_PAYMENT_METHODS = ["cash"]
+EXCLUDED_VENDOR_BILL_STATUSES = ["Rejected"]
+EXCLUDED_VENDOR_PAYABLE_STATUSES = ["cancelled"]
+PAID_VENDOR_PAYMENT_STATUSES = ["paid"]
+
+
+def money(value) -> Decimal:
+    return to_decimal(value).quantize(CENT)
+
+
+def month_end(day: date) -> date:
+    return date(day.year, day.month, monthrange(day.year, day.month)[1])
+
+
+def signed_amount():
+    """SQL expression: entry amount, negative for credits"""
+    return case((DBLedgerEntry.entry_type == "debit", DBLedgerEntry.amount), else_=-DBLedgerEntry.amount)
+
+
+def opening_signed(ledger) -> Decimal:
+    amount = to_decimal(ledger.opening_balance)
+    return -amount if ledger.opening_balance_type == "credit" else amount
+
+
+# ==================== LEDGERS ====================
+
+def get_ledger_id(
+    db: Session,
+    code: str,
+    name: str,
+    ledger_type: str,
+    user_id: int,
+    party_id: Optional[int] = None,
+    supplier_id: Optional[int] = None,
+) -> int:
+    """Id of the ledger with this code, created on first use (cached per session)"""
+    cache = db.info.setdefault("ledger_ids", {})
+    if code in cache:
+        return cache[code]
+    ledger_id = db.query(DBLedger.id).filter(DBLedger.ledger_code == code).scalar()
+    if ledger_id is None:
+        ledger = DBLedger(
+            ledger_code=code,
+            ledger_name=name,
+            ledger_type=ledger_type,
+            party_id=party_id,
+            supplier_id=supplier_id,
+            opening_balance=ZERO,
+            opening_balance_type="debit",
+            created_by=user_id,
+        )
+        db.add(ledger)
+        db.flush()
+        ledger_id = ledger.id
+    cache[code] = ledger_id
+    return ledger_id
+
+
+def system_ledger(db: Session, code: str, user_id: int) -> int:
+    name, ledger_type = SYSTEM_LEDGERS[code]
+    return get_ledger_id(db, code, name, ledger_type, user_id)
+
+
+def customer_ledger(db: Session, party_id: int, party_name: Optional[str], user_id: int) -> int:
+    return get_ledger_id(db, f"CUST-{party_id:05d}", party_name or f"Party {party_id}", "customer", user_id, party_id=party_id)
+
+
+def supplier_ledger(db: Session, supplier_id: int, name: Optional[str], user_id: int) -> int:
+    """Ledger for a ``suppliers`` row (accounts vendor payables)"""
+    return get_ledger_id(db, f"SUP-{supplier_id:05d}", name or f"Supplier {supplier_id}", "vendor", user_id, supplier_id=supplier_id)
+
+
+def vendor_ledger(db: Session, vendor_id: int, name: Optional[str], user_id: int) -> int:
+    """Ledger for a ``vendors`` row (purchase module vendor bills)"""
+    return get_ledger_id(db, f"VEND-{vendor_id:05d}", name or f"Vendor {vendor_id}", "vendor", user_id)
+
+
+def bank_or_cash(db: Session, payment_method: Optional[str], user_id: int) -> int:
+    code = "CASH" if payment_method in CASH_PAYMENT_METHODS else "BANK"
+    return system_ledger(db, code, user_id)
+
+
+def combine(lines: List[Tuple[int, Decimal]]) -> Dict[int, Decimal]:
+    """Sum signed amounts per ledger, dropping zeros"""
+    amounts: Dict[int, Decimal] = {}
+    for ledger_id, amount in lines:
+        amounts[ledger_id] = amounts.get(ledger_id, ZERO) + money(amount)
+    return {ledger_id: amount for ledger_id, amount in amounts.items() if amount}
+
+
+# ==================== POSTING ====================
+
+def next_entry_numbers(db: Session, count: int) -> List[str]:
+    last = db.query(DBLedgerEntry.entry_number).order_by(DBLedgerEntry.id.desc()).first()
+    next_num = 1
+    if last:
+        match = re.search(r'LE-(\d+)', last[0])
+        if match:
+            next_num = int(match.group(1)) + 1
+    return [f"LE-{next_num + i:04d}" for i in range(count)]
+
+
+def posted_amounts(db: Session, reference_type: str, reference_id: int) -> Dict[int, Decimal]:
+    """Net signed amount per ledger already posted for a document"""
+    rows = db.query(DBLedgerEntry.ledger_id, func.sum(signed_amount())).filter(
+        DBLedgerEntry.reference_type == reference_type,
+        DBLedgerEntry.reference_id == reference_id
+    ).group_by(DBLedgerEntry.ledger_id).all()
+    return {ledger_id: money(amount) for ledger_id, amount in rows}
+
+
+def adjust_snapshots(db: Session, entry_date: date, changes: Dict[int, Decimal]) -> None:
+    """Carry a back-dated posting into the month-end snapshots it falls before"""
+    periods = [
+        period_end for (period_end,) in db.query(DBLedgerBalanceSnapshot.period_end).filter(
+            DBLedgerBalanceSnapshot.period_end >= entry_date
+        ).distinct().all()
+    ]
+    if not periods:
+        return
+    entry_period = month_end(entry_date)
+    for ledger_id, amount in changes.items():
+        rows = {
+            row.period_end: row
+            for row in db.query(DBLedgerBalanceSnapshot).filter(
+                DBLedgerBalanceSnapshot.ledger_id == ledger_id,
+                DBLedgerBalanceSnapshot.period_end.in_(periods)
+            ).all()
+        }
+        for period_end in periods:
+            debit = amount if amount > 0 and period_end == entry_period else ZERO
+            credit = -amount if amount < 0 and period_end == entry_period else ZERO
+            row = rows.get(period_end)
+            if row is None:
+                # No row means the ledger had a zero balance at that month end
+                db.add(DBLedgerBalanceSnapshot(
+                    ledger_id=ledger_id,
+                    period_end=period_end,
+                    closing_balance=amount,
+                    period_debit=debit,
+                    period_credit=credit,
+                ))
+            else:
+                # Update with SQL expressions so concurrent postings cannot lose increments
+                row.closing_balance = DBLedgerBalanceSnapshot.closing_balance + amount
+                row.period_debit = DBLedgerBalanceSnapshot.period_debit + debit
+                row.period_credit = DBLedgerBalanceSnapshot.period_credit + credit
+    db.flush()
+
+
+def sync_document(
+    db: Session,
+    reference_type: str,
+    reference_id: int,
+    reference_number: Optional[str],
+    entry_date: date,
+    desired: Dict[int, Decimal],
+    user_id: int,
+    description: Optional[str] = None,
+) -> int:
+    """
+    Post the difference between a document's desired ledger amounts and what
+    is already posted for it; returns the number of entries written.
+    """
+    if sum(desired.values(), ZERO) != ZERO:
+        raise ValueError(f"Unbalanced posting for {reference_type} {reference_number or reference_id}")
+    posted = posted_amounts(db, reference_type, reference_id)
+    changes = {
+        ledger_id: desired.get(ledger_id, ZERO) - posted.get(ledger_id, ZERO)
+        for ledger_id in set(desired) | set(posted)
+    }
+    changes = {ledger_id: amount for ledger_id, amount in changes.items() if amount}
+    if not changes:
+        return 0
+
+    # Back-dated into a closed month: bring the snapshots along first
+    adjust_snapshots(db, entry_date, changes)
+
+    numbers = next_entry_numbers(db, len(changes))
+    for entry_number, (ledger_id, amount) in zip(numbers, sorted(changes.items())):
+        db.add(DBLedgerEntry(
+            entry_number=entry_number,
+            ledger_id=ledger_id,
+            entry_date=entry_date,
+            entry_type="debit" if amount > 0 else "credit",
+            amount=abs(amount),
+            reference_type=reference_type,
+            reference_id=reference_id,
+            reference_number=reference_number,
+            description=description if posted == {} else f"Adjustment: {description or reference_type}",
+            created_by=user_id,
+        ))
+    db.flush()
+    return len(changes)
+
+
+def sync_invoice_ledger(db: Session, invoice: DBTaxInvoice, user_id: int) -> int:
+    desired: Dict[int, Decimal] = {}
+    if invoice.status in EXPOSURE_INVOICE_STATUSES:
+        total = money(invoice.grand_total)
+        tax = money(invoice.cgst_total) + money(invoice.sgst_total) + money(invoice.igst_total)
+        desired = combine([
+            (customer_ledger(db, invoice.party_id, invoice.party_name, user_id), total),
+            (system_ledger(db, "GST-OUTPUT", user_id), -tax),
+            (system_ledger(db, "SALES", user_id), -(total - tax)),
+        ])
+    return sync_document(
+        db, "invoice", invoice.id, invoice.invoice_number, invoice.invoice_date, desired, user_id,
+        f"Sales invoice {invoice.invoice_number} - {invoice.party_name}"
+    )
+
+
+def sync_allocation_ledger(
+    db: Session,
+    allocation: DBPaymentAllocation,
+    receipt: DBPaymentReceipt,
+    invoice: DBTaxInvoice,
+    user_id: int,
+) -> int:
+    desired: Dict[int, Decimal] = {}
+    if receipt.status in PAID_RECEIPT_STATUSES:
+        amount = money(allocation.allocated_amount)
+        desired = combine([
+            (system_ledger(db, "UNALLOCATED-RECEIPTS", user_id), amount),
+            (customer_ledger(db, invoice.party_id, invoice.party_name, user_id), -amount),
+        ])
+    return sync_document(
+        db, "allocation", allocation.id, receipt.receipt_number, allocation.allocation_date, desired, user_id,
+        f"Receipt {receipt.receipt_number} allocated to {invoice.invoice_number}"
+    )
+
+
+def sync_receipt_ledger(db: Session, receipt: DBPaymentReceipt, user_id: int, include_allocations: bool = True) -> int:
+    """Post a receipt (and, after a status change, its allocations)"""
+    desired: Dict[int, Decimal] = {}
+    if receipt.status in PAID_RECEIPT_STATUSES:
+        amount = money(receipt.payment_amount)
+        desired = combine([
+            (bank_or_cash(db, receipt.payment_method, user_id), amount),
+            (system_ledger(db, "UNALLOCATED-RECEIPTS", user_id), -amount),
+        ])
+    count = sync_document(
+        db, "receipt", receipt.id, receipt.receipt_number, receipt.payment_date, desired, user_id,
+        f"Payment receipt {receipt.receipt_number} - {receipt.party_name}"
+    )
+    if include_allocations:
+        rows = db.query(DBPaymentAllocation, DBTaxInvoice).join(
+            DBTaxInvoice, DBTaxInvoice.id == DBPaymentAllocation.tax_invoice_id
+        ).filter(DBPaymentAllocation.payment_receipt_id == receipt.id).all()
+        for allocation, invoice in rows:
+            count += sync_allocation_ledger(db, allocation, receipt, invoice, user_id)
+    return count
+
+
+def purchase_lines(db: Session, vendor_ledger_id: int, total, tax, user_id: int) -> Dict[int, Decimal]:
+    total = money(total)
+    tax = money(tax)
+    return combine([
+        (system_ledger(db, "PURCHASES", user_id), total - tax),
+        (system_ledger(db, "GST-INPUT", user_id), tax),
+        (vendor_ledger_id, -total),
+    ])
+
+
+def sync_vendor_bill_ledger(db: Session, bill: DBVendorBill, user_id: int) -> int:
+    desired: Dict[int, Decimal] = {}
+    if bill.status not in EXCLUDED_VENDOR_BILL_STATUSES:
+        desired = purchase_lines(
+            db, vendor_ledger(db, bill.vendor_id, bill.vendor_name, user_id), bill.total_amount, bill.tax_amount, user_id
+        )
+    return sync_document(
+        db, "vendor_bill", bill.id, bill.bill_number, bill.vendor_bill_date, desired, user_id,
+        f"Vendor bill {bill.vendor_bill_no} - {bill.vendor_name}"
+    )
+
+
+def sync_vendor_payable_ledger(db: Session, payable: DBVendorPayable, user_id: int) -> int:
+    desired: Dict[int, Decimal] = {}
+    if payable.status not in EXCLUDED_VENDOR_PAYABLE_STATUSES:
+        desired = purchase_lines(
+            db, supplier_ledger(db, payable.vendor_id, payable.vendor_name, user_id), payable.bill_amount, ZERO, user_id
+        )
+    return sync_document(
+        db, "vendor_payable", payable.id, payable.bill_number, payable.bill_date, desired, user_id,
+        f"Vendor payable {payable.bill_number} - {payable.vendor_name}"
+    )
+
+
+def sync_vendor_payment_ledger(db: Session, payment: DBVendorPayment, user_id: int) -> int:
+    desired: Dict[int, Decimal] = {}
+    payable = payment.vendor_payable
+    if payment.status in PAID_VENDOR_PAYMENT_STATUSES and payable is not None:
+        amount = money(payment.payment_amount)
+        desired = combine([
+            (supplier_ledger(db, payable.vendor_id, payable.vendor_name, user_id), amount),
+            (bank_or_cash(db, payment.payment_method, user_id), -amount),
+        ])
+    return sync_document(
+        db, "vendor_payment", payment.id, payment.payment_number, payment.payment_date, desired, user_id,
+        f"Vendor payment {payment.payment_number}"
+    )
+
+
+def repost_all_documents(db: Session, user_id: int) -> int:
+    """Sync every document (idempotent - only differences are posted); returns entries written"""
+    count = 0
+    for invoice in db.query(DBTaxInvoice).all():
+        count += sync_invoice_ledger(db, invoice, user_id)
+    for receipt in db.query(DBPaymentReceipt).all():
+        count += sync_receipt_ledger(db, receipt, user_id)
+    for bill in db.query(DBVendorBill).all():
+        count += sync_vendor_bill_ledger(db, bill, user_id)
+    for payable in db.query(DBVendorPayable).all():
+        count += sync_vendor_payable_ledger(db, payable, user_id)
+    for payment in db.query(DBVendorPayment).all():
+        count += sync_vendor_payment_ledger(db, payment, user_id)
+    return count
+
+
+# ==================== SNAPSHOTS & BALANCES ====================
+
+def close_periods(db: Session, through: Optional[date] = None) -> int:
+    """
+    Write month-end snapshots for every month after the last snapshot up to the
+    last month ending on or before ``through`` (default: last month); returns
+    the number of months closed.
+    """
+    if through is None:
+        through = date.today().replace(day=1) - timedelta(days=1)
+    last_period = db.query(func.max(DBLedgerBalanceSnapshot.period_end)).scalar()
+    if last_period is not None:
+        start = last_period + timedelta(days=1)
+    else:
+        first_entry = db.query(func.min(DBLedgerEntry.entry_date)).scalar()
+        if first_entry is None:
+            return 0
+        start = first_entry.replace(day=1)
+
+    closing: Dict[int, Decimal] = {}
+    if last_period is not None:
+        closing = {
+            ledger_id: to_decimal(balance)
+            for ledger_id, balance in db.query(
+                DBLedgerBalanceSnapshot.ledger_id, DBLedgerBalanceSnapshot.closing_balance
+            ).filter(DBLedgerBalanceSnapshot.period_end == last_period).all()
+        }
+
+    closed = 0
+    period_start = start
+    while month_end(period_start) <= through:
+        period_end = month_end(period_start)
+        movements = db.query(
+            DBLedgerEntry.ledger_id,
+            func.sum(case((DBLedgerEntry.entry_type == "debit", DBLedgerEntry.amount), else_=0)),
+            func.sum(case((DBLedgerEntry.entry_type == "credit", DBLedgerEntry.amount), else_=0)),
+        ).filter(
+            DBLedgerEntry.entry_date >= period_start,
+            DBLedgerEntry.entry_date <= period_end
+        ).group_by(DBLedgerEntry.ledger_id).all()
+        movement = {ledger_id: (money(debit), money(credit)) for ledger_id, debit, credit in movements}
+        rows = []
+        for ledger_id in set(closing) | set(movement):
+            debit, credit = movement.get(ledger_id, (ZERO, ZERO))
+            closing[ledger_id] = closing.get(ledger_id, ZERO) + debit - credit
+            if closing[ledger_id] or debit or credit:
+                rows.append({
+                    "ledger_id": ledger_id,
+                    "period_end": period_end,
+                    "closing_balance": closing[ledger_id],
+                    "period_debit": debit,
+                    "period_credit": credit,
+                })
+        db.bulk_insert_mappings(DBLedgerBalanceSnapshot, rows)
+        closed += 1
+        period_start = period_end + timedelta(days=1)
+    db.flush()
+    return closed
+
+
+def rebuild_snapshots(db: Session, through: Optional[date] = None) -> int:
+    db.query(DBLedgerBalanceSnapshot).delete(synchronize_session=False)
+    db.flush()
+    return close_periods(db, through)
+
+
+def entry_balances_as_of(db: Session, as_of: date, ledger_id: Optional[int] = None) -> Dict[int, Decimal]:
+    """
+    ledger id -> debits minus credits of entries dated on or before ``as_of``:
+    nearest snapshot plus the entries after it (two queries).
+    """
+    snapshot_query = db.query(func.max(DBLedgerBalanceSnapshot.period_end)).filter(
+        DBLedgerBalanceSnapshot.period_end <= as_of
+    )
+    snapshot_end = snapshot_query.scalar()
+
+    balances: Dict[int, Decimal] = {}
+    if snapshot_end is not None:
+        query = db.query(DBLedgerBalanceSnapshot.ledger_id, DBLedgerBalanceSnapshot.closing_balance).filter(
+            DBLedgerBalanceSnapshot.period_end == snapshot_end
+        )
+        if ledger_id is not None:
+            query = query.filter(DBLedgerBalanceSnapshot.ledger_id == ledger_id)
+        balances = {row_ledger_id: to_decimal(balance) for row_ledger_id, balance in query.all()}
+
+    query = db.query(DBLedgerEntry.ledger_id, func.sum(signed_amount())).filter(DBLedgerEntry.entry_date <= as_of)
+    if snapshot_end is not None:
+        query = query.filter(DBLedgerEntry.entry_date > snapshot_end)
+    if ledger_id is not None:
+        query = query.filter(DBLedgerEntry.ledger_id == ledger_id)
+    for row_ledger_id, amount in query.group_by(DBLedgerEntry.ledger_id).all():
+        balances[row_ledger_id] = balances.get(row_ledger_id, ZERO) + to_decimal(amount)
+    return balances
+
+
+def ledger_balance_as_of(db: Session, ledger_id: int, as_of: date, include_opening: bool = True) -> Decimal:
+    balance = entry_balances_as_of(db, as_of, ledger_id).get(ledger_id, ZERO)
+    if include_opening:
+        ledger = db.query(DBLedger.opening_balance, DBLedger.opening_balance_type).filter(DBLedger.id == ledger_id).first()
+        if ledger:
+            balance += opening_signed(ledger)
+    return money(balance)
+
+
+def trial_balance(db: Session, as_of: date) -> Dict[str, Any]:
+    balances = entry_balances_as_of(db, as_of)
+    rows = []
+    total_debit = ZERO
+    total_credit = ZERO
+    for ledger in db.query(
+        DBLedger.id, DBLedger.ledger_code, DBLedger.ledger_name, DBLedger.ledger_type,
+        DBLedger.opening_balance, DBLedger.opening_balance_type
+    ).order_by(DBLedger.ledger_code).all():
+        balance = money(opening_signed(ledger) + balances.get(ledger.id, ZERO))
+        if not balance:
+            continue
+        debit = balance if balance > 0 else ZERO
+        credit = -balance if balance < 0 else ZERO
+        total_debit += debit
+        total_credit += credit
+        rows.append({
+            "ledger_id": ledger.id,
+            "ledger_code": ledger.ledger_code,
+            "ledger_name": ledger.ledger_name,
+            "ledger_type": ledger.ledger_type,
+            "debit": debit,
+            "credit": credit,
+        })
+    return {
+        "as_of": as_of,
+        "rows": rows,
+        "total_debit": total_debit,
+        "total_credit": total_credit,
+        "balanced": total_debit == total_credit,
+    }
+
+
+def ledger_statement(db: Session, ledger: DBLedger, from_date: date, to_date: date) -> Dict[str, Any]:
+    """Opening balance at ``from_date`` (snapshot + delta) and the entries in the range with a running balance"""
+    opening = ledger_balance_as_of(db, ledger.id, from_date - timedelta(days=1))
+    entries = db.query(DBLedgerEntry).filter(
+        DBLedgerEntry.ledger_id == ledger.id,
+        DBLedgerEntry.entry_date >= from_date,
+        DBLedgerEntry.entry_date <= to_date
+    ).order_by(DBLedgerEntry.entry_date, DBLedgerEntry.id).all()
+
+    balance = opening
+    lines = []
+    for entry in entries:
+        amount = money(entry.amount)
+        balance += amount if entry.entry_type == "debit" else -amount
+        lines.append({
+            "entry_number": entry.entry_number,
+            "entry_date": entry.entry_date,
+            "entry_type": entry.entry_type,
+            "amount": amount,
+            "reference_type": entry.reference_type,
+            "reference_number": entry.reference_number,
+            "description": entry.description,
+            "balance": balance,
+        })
+    return {
+        "ledger_id": ledger.id,
+        "ledger_code": ledger.ledger_code,
+        "ledger_name": ledger.ledger_name,
+        "from_date": from_date,
+        "to_date": to_date,
+        "opening_balance": opening,
+        "closing_balance": balance,
+        "entries": lines,
+    }
+
+
+def check_ledger(db: Session) -> Dict[str, Any]:
+    """Unbalanced documents and snapshots that differ from the entries they summarise"""
+    unbalanced = [
+        {"reference_type": reference_type, "reference_id": reference_id, "difference": money(amount)}
+        for reference_type, reference_id, amount in db.query(
+            DBLedgerEntry.reference_type, DBLedgerEntry.reference_id, func.sum(signed_amount())
+        ).group_by(DBLedgerEntry.reference_type, DBLedgerEntry.reference_id).having(
+            func.sum(signed_amount()) != 0
+        ).all()
+    ]
+
+    snapshot_mismatches = []
+    periods = [p for (p,) in db.query(DBLedgerBalanceSnapshot.period_end).distinct().order_by(DBLedgerBalanceSnapshot.period_end).all()]
+    for period_end in periods:
+        expected = {
+            ledger_id: money(amount)
+            for ledger_id, amount in db.query(DBLedgerEntry.ledger_id, func.sum(signed_amount())).filter(
+                DBLedgerEntry.entry_date <= period_end
+            ).group_by(DBLedgerEntry.ledger_id).all()
+        }
+        stored = {
+            ledger_id: money(balance)
+            for ledger_id, balance in db.query(
+                DBLedgerBalanceSnapshot.ledger_id, DBLedgerBalanceSnapshot.closing_balance
+            ).filter(DBLedgerBalanceSnapshot.period_end == period_end).all()
+        }
+        for ledger_id in sorted(set(expected) | set(stored)):
+            if expected.get(ledger_id, ZERO) != stored.get(ledger_id, ZERO):
+                snapshot_mismatches.append({
+                    "ledger_id": ledger_id,
+                    "period_end": period_end,
+                    "stored": stored.get(ledger_id, ZERO),
+                    "expected": expected.get(ledger_id, ZERO),
+                })
+    return {"unbalanced_documents": unbalanced, "snapshot_mismatches": snapshot_mismatches}
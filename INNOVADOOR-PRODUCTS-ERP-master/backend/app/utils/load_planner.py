@@ -0,0 +1,280 @@
+"""
+Vehicle load planning and route batching for logistics assignment.
+
+Takes the approved, unassigned dispatches for a day and the available vehicles
+and proposes multi-drop trips:
+
+- dispatches are grouped by route area (given explicitly, or derived from the
+  delivery address PIN code / last address part),
+- within an area they are packed first-fit decreasing by weight and volume
+  (``DispatchItem.weight`` in kg, ``DispatchItem.volume`` in cubic metres,
+  both per dispatch line) onto vehicles dedicated to that area,
+- a new vehicle is the smallest one that takes the area's whole remaining load,
+  else the largest one that takes the dispatch; areas with the largest load get
+  vehicles first,
+- active drivers without an open assignment are paired with the planned trips.
+
+Vehicles without a capacity figure are treated as unconstrained in that
+dimension; dispatches without weights/volumes count as zero.
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, Optional
+import re
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models.dispatch import Dispatch as DBDispatch, DispatchItem as DBDispatchItem
+from app.db.models.logistics import (
+    Driver as DBDriver,
+    LogisticsAssignment as DBLogisticsAssignment,
+    Vehicle as DBVehicle,
+)
+
+KG_PER_TONNE = 1000.0
+OPEN_ASSIGNMENT_STATUSES = ["assigned", "in_transit", "delayed"]
+UNKNOWN_ROUTE_AREA = "Unassigned Area"
+EPSILON = 1e-9
+
+PIN_CODE_PATTERN = re.compile(r"\b(\d{3})\s?(\d{3})\b")
+
+
+def derive_route_area(address: Optional[str]) -> str:
+    """Route area from a delivery address: PIN code sorting district, else the last text part"""
+    if not address:
+        return UNKNOWN_ROUTE_AREA
+    match = PIN_CODE_PATTERN.search(address)
+    if match:
+        return f"PIN {match.group(1)}xxx"
+    parts = [p.strip() for p in re.split(r"[,\n]", address) if p.strip() and not p.strip().isdigit()]
+    return parts[-1].title() if parts else UNKNOWN_ROUTE_AREA
+
+
+def fits_capacity(vehicle: Dict[str, Any], weight: float, volume: float) -> bool:
+    if vehicle["max_weight"] is not None and weight > vehicle["max_weight"] + EPSILON:
+        return False
+    if vehicle["max_volume"] is not None and volume > vehicle["max_volume"] + EPSILON:
+        return False
+    return True
+
+
+class Trip:
+    """One vehicle's multi-drop load for a route area"""
+
+    def __init__(self, vehicle: Dict[str, Any], route_area: str):
+        self.vehicle = vehicle
+        self.route_area = route_area
+        self.weight = 0.0
+        self.volume = 0.0
+        self.dispatches: List[Dict[str, Any]] = []
+
+    def fits(self, load: Dict[str, Any]) -> bool:
+        return fits_capacity(self.vehicle, self.weight + load["weight"], self.volume + load["volume"])
+
+    def add(self, load: Dict[str, Any]) -> None:
+        self.weight += load["weight"]
+        self.volume += load["volume"]
+        self.dispatches.append(load)
+
+    def as_dict(self) -> Dict[str, Any]:
+        max_weight = self.vehicle["max_weight"]
+        max_volume = self.vehicle["max_volume"]
+        return {
+            "vehicle_id": self.vehicle["id"],
+            "vehicle_no": self.vehicle["vehicle_no"],
+            "route_area": self.route_area,
+            "dispatch_ids": [d["dispatch_id"] for d in self.dispatches],
+            "dispatch_numbers": [d["dispatch_number"] for d in self.dispatches],
+            "total_weight_kg": round(self.weight, 2),
+            "total_volume_m3": round(self.volume, 3),
+            "weight_utilization": round(self.weight / max_weight, 3) if max_weight else None,
+            "volume_utilization": round(self.volume / max_volume, 3) if max_volume else None,
+        }
+
+
+def vehicle_capacity(vehicle: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalise a vehicle row to kg / m3 limits (None = unconstrained)"""
+    tonnes = vehicle.get("capacity_tonnes")
+    cubic_meters = vehicle.get("capacity_cubic_meters")
+    return {
+        **vehicle,
+        "max_weight": tonnes * KG_PER_TONNE if tonnes else None,
+        "max_volume": cubic_meters if cubic_meters else None,
+    }
+
+
+def pick_vehicle(free_vehicles: List[Dict[str, Any]], load: Dict[str, Any], remaining_weight: float,
+                 remaining_volume: float) -> Optional[int]:
+    """
+    Index of the vehicle to open for ``load`` (``free_vehicles`` sorted smallest first):
+    the smallest one that takes the area's whole remaining load, else the largest that
+    takes this load, so an area uses as few vehicles as possible.
+    """
+    largest_fitting = None
+    for index, vehicle in enumerate(free_vehicles):
+        if fits_capacity(vehicle, remaining_weight, remaining_volume):
+            return index
+        if fits_capacity(vehicle, load["weight"], load["volume"]):
+            largest_fitting = index
+    return largest_fitting
+
+
+def plan_loads(loads: List[Dict[str, Any]], vehicles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Pack dispatch loads onto vehicles by route area.
+
+    ``loads``: dicts with dispatch_id, dispatch_number, route_area, weight (kg), volume (m3).
+    ``vehicles``: dicts with id, vehicle_no, capacity_tonnes, capacity_cubic_meters.
+    Returns {"trips": [...Trip], "unplaced": [...]}.
+    """
+    free_vehicles = [vehicle_capacity(v) for v in vehicles]
+    # Best fit when opening a vehicle: try the smallest first (unconstrained vehicles last)
+    free_vehicles.sort(key=lambda v: (
+        v["max_weight"] if v["max_weight"] is not None else float("inf"),
+        v["max_volume"] if v["max_volume"] is not None else float("inf"),
+    ))
+    largest_weight = max((v["max_weight"] or 0.0 for v in free_vehicles), default=0.0) or 1.0
+    largest_volume = max((v["max_volume"] or 0.0 for v in free_vehicles), default=0.0) or 1.0
+
+    def size(load: Dict[str, Any]) -> float:
+        return max(load["weight"] / largest_weight, load["volume"] / largest_volume)
+
+    by_area: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for load in loads:
+        by_area[load["route_area"]].append(load)
+
+    trips: List[Trip] = []
+    unplaced: List[Dict[str, Any]] = []
+    area_order = sorted(by_area, key=lambda area: -sum(size(load) for load in by_area[area]))
+    for area in area_order:
+        area_trips: List[Trip] = []
+        remaining_weight = sum(load["weight"] for load in by_area[area])
+        remaining_volume = sum(load["volume"] for load in by_area[area])
+        for load in sorted(by_area[area], key=size, reverse=True):
+            trip = next((t for t in area_trips if t.fits(load)), None)
+            if trip is None:
+                vehicle_index = pick_vehicle(free_vehicles, load, remaining_weight, remaining_volume)
+                if vehicle_index is None:
+                    reason = "No available vehicle can carry this load" if free_vehicles else "No vehicles left"
+                    unplaced.append({**load, "reason": reason})
+                    remaining_weight -= load["weight"]
+                    remaining_volume -= load["volume"]
+                    continue
+                trip = Trip(free_vehicles.pop(vehicle_index), area)
+                area_trips.append(trip)
+            trip.add(load)
+            remaining_weight -= load["weight"]
+            remaining_volume -= load["volume"]
+        trips.extend(area_trips)
+
+    return {"trips": trips, "unplaced": unplaced}
+
+
+def load_unassigned_dispatches(db: Session, plan_date: date, dispatch_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+    """Approved dispatches for the day without an assignment, with summed item weight/volume"""
+    query = db.query(
+        DBDispatch.id,
+        DBDispatch.dispatch_number,
+        DBDispatch.party_name,
+        DBDispatch.delivery_address,
+    ).outerjoin(
+        DBLogisticsAssignment, DBLogisticsAssignment.dispatch_id == DBDispatch.id
+    ).filter(
+        DBDispatch.status == "approved",
+        DBLogisticsAssignment.id.is_(None)
+    )
+    if dispatch_ids:
+        query = query.filter(DBDispatch.id.in_(dispatch_ids))
+    else:
+        query = query.filter(DBDispatch.dispatch_date == plan_date)
+    dispatches = query.order_by(DBDispatch.id).all()
+
+    totals = {}
+    ids = [d.id for d in dispatches]
+    if ids:
+        totals = {
+            dispatch_id: (float(weight or 0), float(volume or 0))
+            for dispatch_id, weight, volume in db.query(
+                DBDispatchItem.dispatch_id,
+                func.sum(DBDispatchItem.weight),
+                func.sum(DBDispatchItem.volume),
+            ).filter(DBDispatchItem.dispatch_id.in_(ids)).group_by(DBDispatchItem.dispatch_id).all()
+        }
+
+    loads = []
+    for dispatch in dispatches:
+        weight, volume = totals.get(dispatch.id, (0.0, 0.0))
+        loads.append({
+            "dispatch_id": dispatch.id,
+            "dispatch_number": dispatch.dispatch_number,
+            "party_name": dispatch.party_name,
+            "route_area": derive_route_area(dispatch.delivery_address),
+            "weight": weight,
+            "volume": volume,
+        })
+    return loads
+
+
+def load_available_vehicles(db: Session) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": v.id,
+            "vehicle_no": v.vehicle_no,
+            "capacity_tonnes": v.capacity_tonnes,
+            "capacity_cubic_meters": v.capacity_cubic_meters,
+        }
+        for v in db.query(
+            DBVehicle.id, DBVehicle.vehicle_no, DBVehicle.capacity_tonnes, DBVehicle.capacity_cubic_meters
+        ).filter(DBVehicle.is_available == True).all()
+    ]
+
+
+def load_free_drivers(db: Session) -> List[DBDriver]:
+    """Active drivers without an open assignment"""
+    busy = db.query(DBLogisticsAssignment.driver_id).filter(
+        DBLogisticsAssignment.status.in_(OPEN_ASSIGNMENT_STATUSES)
+    )
+    return db.query(DBDriver).filter(
+        DBDriver.is_active == True,
+        ~DBDriver.id.in_(busy)
+    ).order_by(DBDriver.id).all()
+
+
+def build_load_plan(
+    db: Session,
+    plan_date: date,
+    dispatch_ids: Optional[List[int]] = None,
+    route_areas: Optional[Dict[int, str]] = None,
+) -> Dict[str, Any]:
+    """Dry-run plan for a day (nothing is written)"""
+    loads = load_unassigned_dispatches(db, plan_date, dispatch_ids)
+    for load in loads:
+        if route_areas and load["dispatch_id"] in route_areas:
+            load["route_area"] = route_areas[load["dispatch_id"]]
+    result = plan_loads(loads, load_available_vehicles(db))
+
+    drivers = load_free_drivers(db)
+    trips = []
+    for trip, driver in zip(result["trips"], drivers + [None] * len(result["trips"])):
+        trips.append({
+            **trip.as_dict(),
+            "driver_id": driver.id if driver else None,
+            "driver_name": driver.name if driver else None,
+        })
+    return {
+        "plan_date": plan_date,
+        "trips": trips,
+        "unplaced": [
+            {
+                "dispatch_id": u["dispatch_id"],
+                "dispatch_number": u["dispatch_number"],
+                "route_area": u["route_area"],
+                "weight_kg": u["weight"],
+                "volume_m3": u["volume"],
+                "reason": u["reason"],
+            }
+            for u in result["unplaced"]
+        ],
+        "trips_without_driver": sum(1 for t in trips if t["driver_id"] is None),
+    }
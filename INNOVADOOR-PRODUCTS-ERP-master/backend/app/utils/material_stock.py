@@ -0,0 +1,283 @@
+"""
+Inventory-backed material availability for production scheduling.
+
+Stock is kept as running balances per material in ``material_stock``:
+- approved GRNs add their accepted quantity,
+- purchase returns remove returned quantity that had been accepted into stock,
+- scheduling a production paper consumes the material implied by its
+  RawMaterialShutterItem rows (sq_ft for shutter core, laminate_sheets for
+  laminate) or its total quantity for frames.
+
+Posting helpers only add to the session; the caller commits, so every stock
+movement is part of the same transaction as the document that caused it.
+
+Availability for a whole list of papers is computed from one balances query and
+one grouped requirements query; each per-paper check is then a dict lookup.
+"""
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import re
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models.purchase import GRN as DBGRN, PurchaseReturn as DBPurchaseReturn, MaterialStock as DBMaterialStock
+from app.db.models.user import (
+    ProductionPaper as DBProductionPaper,
+    ProductionSchedule as DBProductionSchedule,
+    RawMaterialShutterItem as DBRawMaterialShutterItem,
+)
+
+# Material groups checked by the scheduler. GRN/return categories are matched
+# (case-insensitively) against these lists; consumption is posted to the first.
+MATERIAL_GROUPS = {
+    "shutter": {"categories": ["shutter", "plywood", "board", "core"], "unit": "sq_ft"},
+    "laminate": {"categories": ["laminate", "veneer"], "unit": "sheets"},
+    "frame": {"categories": ["frame", "wood", "timber"], "unit": "pcs"},
+}
+GENERIC_MATERIAL = "*"
+
+
+def normalize_key(value: Optional[str]) -> str:
+    return " ".join(str(value or "").strip().lower().split())
+
+
+def material_group(category: Optional[str]) -> Optional[str]:
+    """Map a material category to its scheduler group (shutter / laminate / frame)"""
+    key = normalize_key(category)
+    for group, config in MATERIAL_GROUPS.items():
+        if key in config["categories"]:
+            return group
+    return None
+
+
+def post_stock_movement(
+    db: Session,
+    material_category: str,
+    material_name: Optional[str],
+    received: float = 0.0,
+    returned: float = 0.0,
+    consumed: float = 0.0,
+    unit: Optional[str] = None,
+) -> None:
+    """Apply a stock movement to the running balance row (created if missing)"""
+    if not (received or returned or consumed):
+        return
+    category_key = normalize_key(material_category)
+    name_key = normalize_key(material_name) or GENERIC_MATERIAL
+    delta = received - returned - consumed
+
+    row = db.query(DBMaterialStock).filter(
+        DBMaterialStock.category_key == category_key,
+        DBMaterialStock.name_key == name_key
+    ).first()
+    if row is None:
+        group = material_group(material_category)
+        db.add(DBMaterialStock(
+            material_category=material_category,
+            material_name=material_name or GENERIC_MATERIAL,
+            category_key=category_key,
+            name_key=name_key,
+            unit=unit or (MATERIAL_GROUPS[group]["unit"] if group else None),
+            received_quantity=received,
+            returned_quantity=returned,
+            consumed_quantity=consumed,
+            balance_quantity=delta,
+        ))
+        db.flush()
+        return
+
+    # Update with SQL expressions so concurrent postings cannot lose increments
+    row.received_quantity = DBMaterialStock.received_quantity + received
+    row.returned_quantity = DBMaterialStock.returned_quantity + returned
+    row.consumed_quantity = DBMaterialStock.consumed_quantity + consumed
+    row.balance_quantity = DBMaterialStock.balance_quantity + delta
+    db.flush()
+
+
+def post_grn_receipt(db: Session, grn: DBGRN) -> None:
+    """Add the accepted quantity of an approved GRN to stock"""
+    post_stock_movement(db, grn.material_category, grn.material_name, received=grn.accepted_quantity or 0.0)
+
+
+def returnable_stock_quantity(purchase_return: DBPurchaseReturn, grn: Optional[DBGRN]) -> float:
+    """Quantity of a return that had been accepted into stock (rejected material never was)"""
+    quantity = purchase_return.return_quantity or 0.0
+    if grn is not None:
+        quantity -= grn.rejected_quantity or 0.0
+    return max(quantity, 0.0)
+
+
+def post_purchase_return(db: Session, purchase_return: DBPurchaseReturn, grn: Optional[DBGRN] = None) -> None:
+    """Remove returned material from stock and mark the return as posted"""
+    if purchase_return.stock_updated:
+        return
+    post_stock_movement(
+        db,
+        purchase_return.material_category,
+        purchase_return.material_name,
+        returned=returnable_stock_quantity(purchase_return, grn),
+        unit=purchase_return.unit,
+    )
+    purchase_return.stock_updated = True
+    purchase_return.stock_updated_at = func.now()
+
+
+def parse_quantity(value: Any) -> float:
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.search(r"[\d.]+", str(value))
+    try:
+        return float(match.group()) if match else 0.0
+    except ValueError:
+        return 0.0
+
+
+def is_frame_paper(paper: DBProductionPaper) -> bool:
+    return "frame" in normalize_key(paper.product_category)
+
+
+def get_paper_requirements(db: Session, papers: List[DBProductionPaper]) -> Dict[int, Dict[str, float]]:
+    """Material requirements per paper, from one grouped query over RM shutter items"""
+    paper_ids = [p.id for p in papers]
+    totals = {}
+    if paper_ids:
+        rows = db.query(
+            DBRawMaterialShutterItem.production_paper_id,
+            func.coalesce(func.sum(DBRawMaterialShutterItem.sq_ft), 0),
+            func.coalesce(func.sum(DBRawMaterialShutterItem.laminate_sheets), 0),
+        ).filter(
+            DBRawMaterialShutterItem.production_paper_id.in_(paper_ids)
+        ).group_by(DBRawMaterialShutterItem.production_paper_id).all()
+        totals = {paper_id: (float(sq_ft), float(sheets)) for paper_id, sq_ft, sheets in rows}
+
+    requirements = {}
+    for paper in papers:
+        if is_frame_paper(paper):
+            requirements[paper.id] = {"shutter": 0.0, "laminate": 0.0, "frame": parse_quantity(paper.total_quantity)}
+        else:
+            sq_ft, sheets = totals.get(paper.id, (0.0, 0.0))
+            requirements[paper.id] = {"shutter": sq_ft, "laminate": sheets, "frame": 0.0}
+    return requirements
+
+
+def paper_laminate_name(paper: DBProductionPaper) -> Optional[str]:
+    return paper.frontside_laminate or paper.laminate
+
+
+def post_paper_consumption(
+    db: Session,
+    paper: DBProductionPaper,
+    release: bool = False,
+    requirements: Optional[Dict[str, float]] = None,
+) -> None:
+    """Consume (or release, when a schedule is cancelled) the material a paper needs"""
+    if requirements is None:
+        requirements = get_paper_requirements(db, [paper])[paper.id]
+    sign = -1.0 if release else 1.0
+    names = {"shutter": paper.core, "laminate": paper_laminate_name(paper), "frame": None}
+    for group, quantity in requirements.items():
+        if not quantity:
+            continue
+        # Consume from the named material when it is stocked, else from the group as a whole
+        category, name = MATERIAL_GROUPS[group]["categories"][0].title(), None
+        if names[group]:
+            stocked = db.query(DBMaterialStock.material_category).filter(
+                DBMaterialStock.category_key.in_(MATERIAL_GROUPS[group]["categories"]),
+                DBMaterialStock.name_key == normalize_key(names[group])
+            ).first()
+            if stocked:
+                category, name = stocked[0], names[group]
+        post_stock_movement(db, category, name, consumed=sign * quantity)
+
+
+class StockIndex:
+    """In-memory balances by group and by (group, material name)"""
+
+    def __init__(self, rows: Iterable[Tuple[str, str, float]]):
+        self.by_group: Dict[str, float] = defaultdict(float)
+        self.by_name: Dict[Tuple[str, str], float] = defaultdict(float)
+        for category_key, name_key, balance in rows:
+            group = material_group(category_key)
+            if group is None:
+                continue
+            self.by_group[group] += balance or 0.0
+            if name_key != GENERIC_MATERIAL:
+                self.by_name[(group, name_key)] += balance or 0.0
+
+    def allocate(self, group: str, name: Optional[str], quantity: float) -> bool:
+        """Reserve quantity against the named material when stocked, else the group total"""
+        if quantity <= 0:
+            return True
+        name_key = (group, normalize_key(name)) if name else None
+        if name_key in self.by_name:
+            if self.by_name[name_key] + 1e-9 < quantity:
+                return False
+            self.by_name[name_key] -= quantity
+            self.by_group[group] -= quantity
+            return True
+        if self.by_group[group] + 1e-9 < quantity:
+            return False
+        self.by_group[group] -= quantity
+        return True
+
+
+def load_stock_index(db: Session) -> StockIndex:
+    return StockIndex(db.query(
+        DBMaterialStock.category_key, DBMaterialStock.name_key, DBMaterialStock.balance_quantity
+    ).all())
+
+
+def check_availability_bulk(db: Session, papers: List[DBProductionPaper]) -> Dict[int, Dict[str, Any]]:
+    """
+    Material availability for a list of papers, allocated in list order so two
+    papers cannot both be promised the same stock.
+    """
+    index = load_stock_index(db)
+    requirements = get_paper_requirements(db, papers)
+    result = {}
+    for paper in papers:
+        needs = requirements[paper.id]
+        result[paper.id] = {
+            "shutter_available": index.allocate("shutter", paper.core, needs["shutter"]),
+            "laminate_available": index.allocate("laminate", paper_laminate_name(paper), needs["laminate"]),
+            "frame_material_available": index.allocate("frame", None, needs["frame"]),
+            "requirements": needs,
+        }
+    return result
+
+
+def rebuild_material_stock(db: Session) -> int:
+    """Recompute all balances from approved GRNs, posted returns and open schedules"""
+    db.query(DBMaterialStock).delete(synchronize_session=False)
+    db.flush()
+
+    grn_rows = db.query(
+        DBGRN.material_category, DBGRN.material_name, func.sum(DBGRN.accepted_quantity)
+    ).filter(DBGRN.status == "Approved").group_by(DBGRN.material_category, DBGRN.material_name).all()
+    for category, name, quantity in grn_rows:
+        post_stock_movement(db, category, name, received=float(quantity or 0))
+
+    returns = db.query(DBPurchaseReturn).filter(DBPurchaseReturn.stock_updated == True).all()
+    grn_ids = {r.grn_id for r in returns if r.grn_id}
+    grns = {g.id: g for g in db.query(DBGRN).filter(DBGRN.id.in_(grn_ids)).all()} if grn_ids else {}
+    for purchase_return in returns:
+        post_stock_movement(
+            db,
+            purchase_return.material_category,
+            purchase_return.material_name,
+            returned=returnable_stock_quantity(purchase_return, grns.get(purchase_return.grn_id)),
+            unit=purchase_return.unit,
+        )
+
+    papers = db.query(DBProductionPaper).join(
+        DBProductionSchedule, DBProductionSchedule.production_paper_id == DBProductionPaper.id
+    ).filter(DBProductionSchedule.status != "Cancelled").distinct().all()
+    requirements = get_paper_requirements(db, papers)
+    for paper in papers:
+        post_paper_consumption(db, paper, requirements=requirements[paper.id])
+
+    db.flush()
+    return db.query(DBMaterialStock).count()
@@ -0,0 +1,302 @@
+"""
+Measurement items from an uploaded site measurement sheet (XLSX or CSV).
+
+The sheet is read as a stream - CSV line by line, XLSX by parsing the first
+worksheet's XML with ``iterparse`` straight out of the zip, dropping each row
+once read (only the shared strings table is held whole). Then:
+
+- the header is the first row (within ``HEADER_SEARCH_ROWS``) naming a width
+  and a height column; titles and blank rows above it are skipped,
+- header names are mapped onto the item keys the measurement screens and
+  ``raw_material_parser`` use (``ITEM_COLUMNS``: "RO Width" -> ro_width,
+  "Bldg/Wing" -> bldg, "Flat No." -> flat_no, "Nos" -> qty ...); other named
+  columns are kept under their normalized name,
+- rows are validated ``CHUNK_ROWS`` at a time, each column of a chunk parsed
+  in one pass (``parse_numbers``): a width and a height between 0 and
+  ``MAX_DIMENSION``, and a positive quantity when one is given. Numbers are
+  parsed strictly ("34", "34.00", '34"'), so "0.8k" or "34 approx" is an
+  error, not a width of 0.8 or 34. Blank rows are skipped; rows without a
+  serial number are left without one (the caller leases numbers for them,
+  ``serial_numbers.number_items``).
+
+Every invalid row gets an error with its sheet row number (the first
+``MAX_REPORTED_ERRORS`` are returned, the count is always exact). Values are
+kept as the text typed, like items keyed on the measurement screen. Creating
+the measurement is left to the caller.
+"""
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+import csv
+import io
+import re
+import zipfile
+
+from app.utils.dimensions import MAX_DIMENSION, parse_numbers
+
+CHUNK_ROWS = 1000
+HEADER_SEARCH_ROWS = 20
+MAX_ROWS = 100000
+MAX_REPORTED_ERRORS = 500
+
+# Normalized header -> item key
+ITEM_COLUMNS = {
+    "sr_no": "sr_no", "s_no": "sr_no", "sno": "sr_no", "srno": "sr_no", "sr": "sr_no", "serial_no": "sr_no",
+    "ro_width": "ro_width", "r_o_width": "ro_width", "ro_w": "ro_width", "rough_opening_width": "ro_width",
+    "ro_height": "ro_height", "r_o_height": "ro_height", "ro_h": "ro_height", "rough_opening_height": "ro_height",
+    "act_width": "act_width", "actual_width": "act_width",
+    "act_height": "act_height", "actual_height": "act_height",
+    "width": "width", "w": "w",
+    "height": "height", "h": "h",
+    "bldg": "bldg", "building": "bldg", "bldg_wing": "bldg", "bldg_wings": "bldg", "wing": "bldg",
+    "flat_no": "flat_no", "flat": "flat_no", "flat_number": "flat_no",
+    "qty": "qty", "quantity": "qty", "nos": "qty",
+    "location": "location", "location_of_fitting": "location_of_fitting",
+    "area": "area", "wall": "wall", "hinges": "hinges",
+    "sub_frame": "sub_frame", "subframe": "sub_frame", "subframe_side": "subframe_side",
+}
+WIDTH_KEYS = ("ro_width", "width", "w", "act_width")
+HEIGHT_KEYS = ("ro_height", "height", "h", "act_height")
+
+SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+DOC_RELS_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+CELL_REF = re.compile(r"([A-Z]+)")
+
+
+class MeasurementImportError(ValueError):
+    """The upload cannot be read as a measurement sheet"""
+
+
+def normalize_header(header: Any) -> str:
+    """"R.O. Width" -> "r_o_width", "Sr. No." -> "sr_no\""""
+    return re.sub(r"[^a-z0-9]+", "_", str(header or "").strip().lower()).strip("_")
+
+
+def item_key(header: Any) -> Optional[str]:
+    name = normalize_header(header)
+    return ITEM_COLUMNS.get(name, name) or None
+
+
+def cell_text(value: Any) -> str:
+    """Cell value as the text typed (1200.0 -> "1200")"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def read_csv_rows(file: IO[bytes]) -> Iterator[List[str]]:
+    """Rows of a UTF-8 CSV (UnicodeDecodeError when it is not UTF-8)"""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.reader(text)
+    finally:
+        text.detach()
+
+
+def column_index(ref: str) -> int:
+    """Zero-based column of a cell reference ("C12" -> 2)"""
+    match = CELL_REF.match(ref)
+    index = 0
+    for letter in match.group(1) if match else "":
+        index = index * 26 + ord(letter) - 64
+    return index - 1
+
+
+def xlsx_first_sheet(workbook: zipfile.ZipFile) -> str:
+    """Path of the workbook's first worksheet"""
+    try:
+        sheet_id = None
+        for _, element in iterparse(workbook.open("xl/workbook.xml")):
+            if element.tag == f"{SHEET_NS}sheet":
+                sheet_id = element.get(f"{DOC_RELS_NS}id")
+                break
+        if sheet_id:
+            for _, element in iterparse(workbook.open("xl/_rels/workbook.xml.rels")):
+                if element.tag == f"{RELS_NS}Relationship" and element.get("Id") == sheet_id:
+                    target = element.get("Target", "").lstrip("/")
+                    return target if target.startswith("xl/") else f"xl/{target}"
+    except KeyError:
+        pass
+    return "xl/worksheets/sheet1.xml"
+
+
+def xlsx_shared_strings(workbook: zipfile.ZipFile) -> List[str]:
+    strings: List[str] = []
+    if "xl/sharedStrings.xml" not in workbook.namelist():
+        return strings
+    for _, element in iterparse(workbook.open("xl/sharedStrings.xml")):
+        if element.tag == f"{SHEET_NS}si":
+            # Plain text, or rich text runs (phonetic hints left out)
+            parts = []
+            for child in element:
+                if child.tag == f"{SHEET_NS}t":
+                    parts.append(child.text or "")
+                elif child.tag == f"{SHEET_NS}r":
+                    parts.append(child.findtext(f"{SHEET_NS}t") or "")
+            strings.append("".join(parts))
+            element.clear()
+    return strings
+
+
+def read_xlsx_rows(file: IO[bytes]) -> Iterator[List[str]]:
+    """Rows of the first worksheet of an XLSX, read as the sheet is unzipped"""
+    try:
+        workbook = zipfile.ZipFile(file)
+    except zipfile.BadZipFile:
+        raise MeasurementImportError("The file is not a valid .xlsx workbook")
+    with workbook:
+        strings = xlsx_shared_strings(workbook)
+        try:
+            sheet = workbook.open(xlsx_first_sheet(workbook))
+        except KeyError:
+            raise MeasurementImportError("The workbook has no worksheet")
+        parent = None
+        row_number = 0
+        for event, element in iterparse(sheet, events=("start", "end")):
+            if event == "start":
+                if element.tag == f"{SHEET_NS}sheetData":
+                    parent = element
+                continue
+            if element.tag != f"{SHEET_NS}row":
+                continue
+            number = int(element.get("r") or row_number + 1)
+            # Rows left out of the XML are empty
+            while row_number + 1 < number:
+                row_number += 1
+                yield []
+            row_number = number
+            row: List[str] = []
+            for position, cell in enumerate(element.iter(f"{SHEET_NS}c")):
+                ref = cell.get("r")
+                index = column_index(ref) if ref else position
+                kind = cell.get("t")
+                if kind == "inlineStr":
+                    value = "".join(node.text or "" for node in cell.iter(f"{SHEET_NS}t"))
+                else:
+                    raw = cell.findtext(f"{SHEET_NS}v")
+                    if raw is None:
+                        continue
+                    if kind == "s":
+                        value = strings[int(raw)] if int(raw) < len(strings) else ""
+                    elif kind in ("str", "e", "b"):
+                        value = raw
+                    else:
+                        try:
+                            value = cell_text(float(raw))
+                        except ValueError:
+                            value = raw
+                if index >= len(row):
+                    row.extend([""] * (index + 1 - len(row)))
+                row[index] = value.strip() if isinstance(value, str) else value
+            yield row
+            element.clear()
+            if parent is not None:
+                parent.clear()
+
+
+def read_sheet_rows(file: IO[bytes], filename: str) -> Iterator[List[str]]:
+    """Rows of an uploaded .xlsx or .csv"""
+    name = (filename or "").lower()
+    if name.endswith((".xlsx", ".xlsm")):
+        return read_xlsx_rows(file)
+    if name.endswith(".csv"):
+        return read_csv_rows(file)
+    raise MeasurementImportError("Upload a .xlsx or .csv file")
+
+
+def find_header(rows: Iterator[List[str]]) -> Tuple[int, List[Tuple[int, str]]]:
+    """(row number, [(column, item key)]) of the first row naming a width and a height column"""
+    for number, row in enumerate(rows, start=1):
+        if number > HEADER_SEARCH_ROWS:
+            break
+        columns = []
+        for index, header in enumerate(row):
+            key = item_key(header)
+            if key and key not in {column_key for _, column_key in columns}:
+                columns.append((index, key))
+        keys = {key for _, key in columns}
+        if keys & set(WIDTH_KEYS) and keys & set(HEIGHT_KEYS):
+            return number, columns
+    raise MeasurementImportError(
+        f"No header row with width and height columns in the first {HEADER_SEARCH_ROWS} rows"
+    )
+
+
+def first_value(item: Dict[str, str], keys: Tuple[str, ...]) -> Tuple[Optional[str], str]:
+    """(key, value) of the first key with a value, like group_measurement_items picks the dimension"""
+    for key in keys:
+        if item.get(key):
+            return key, item[key]
+    return None, ""
+
+
+def validate_chunk(chunk: List[Tuple[int, Dict[str, str]]]) -> List[Optional[List[Dict[str, Any]]]]:
+    """Errors of each row of the chunk (None for a valid row)"""
+    widths = [first_value(item, WIDTH_KEYS) for _, item in chunk]
+    heights = [first_value(item, HEIGHT_KEYS) for _, item in chunk]
+    width_numbers = parse_numbers([value for _, value in widths])
+    height_numbers = parse_numbers([value for _, value in heights])
+    quantities = parse_numbers([item.get("qty", "") for _, item in chunk])
+
+    results: List[Optional[List[Dict[str, Any]]]] = []
+    for position, (number, item) in enumerate(chunk):
+        errors = []
+        for label, (key, value), parsed in (
+            ("Width", widths[position], width_numbers[position]),
+            ("Height", heights[position], height_numbers[position]),
+        ):
+            if not value:
+                errors.append({"row": number, "column": label.lower(), "message": f"{label} is missing"})
+            elif parsed <= 0:
+                errors.append({"row": number, "column": key, "message": f"{label} {value!r} is not a positive number"})
+            elif parsed > MAX_DIMENSION:
+                errors.append({"row": number, "column": key, "message": f"{label} {value!r} is above {MAX_DIMENSION}"})
+        qty = item.get("qty")
+        if qty and (quantities[position] <= 0 or qty.startswith("-")):
+            errors.append({"row": number, "column": "qty", "message": f"Quantity {qty!r} is not a positive number"})
+        results.append(errors or None)
+    return results
+
+
+def read_measurement_items(file: IO[bytes], filename: str) -> Dict[str, Any]:
+    """
+    Items and per-row errors of an uploaded measurement sheet.
+
+    Returns ``items`` (valid rows, in sheet order), ``rows`` (data rows read),
+    ``invalid`` (rows with errors) and ``errors``. Raises
+    ``MeasurementImportError`` when the file cannot be read as a sheet.
+    """
+    rows = read_sheet_rows(file, filename)
+    header_number, columns = find_header(rows)
+    items: List[Dict[str, str]] = []
+    errors: List[Dict[str, Any]] = []
+    counts = {"rows": 0, "invalid": 0}
+
+    def flush(chunk: List[Tuple[int, Dict[str, str]]]) -> None:
+        for (number, item), row_errors in zip(chunk, validate_chunk(chunk)):
+            if row_errors:
+                counts["invalid"] += 1
+                errors.extend(row_errors[:MAX_REPORTED_ERRORS - len(errors)])
+                continue
+            items.append(item)
+
+    chunk: List[Tuple[int, Dict[str, str]]] = []
+    for number, row in enumerate(rows, start=header_number + 1):
+        item = {}
+        for index, key in columns:
+            value = cell_text(row[index]) if index < len(row) else ""
+            if value:
+                item[key] = value
+        if not item:
+            continue
+        counts["rows"] += 1
+        if counts["rows"] > MAX_ROWS:
+            raise MeasurementImportError(f"The sheet has more than {MAX_ROWS} rows")
+        chunk.append((number, item))
+        if len(chunk) >= CHUNK_ROWS:
+            flush(chunk)
+            chunk = []
+    flush(chunk)
+    return {"items": items, "errors": errors, **counts}
@@ -0,0 +1,149 @@
+"""
+Measurement items selected on production papers, kept as rows of
+``production_paper_measurement_items`` next to the paper's
+``selected_measurement_items`` JSON.
+
+The JSON stays the source for API responses (its format is what the frontend
+sends back); the rows answer the questions that used to parse the JSON of
+every paper: whether a measurement is used by any live paper (one indexed
+``EXISTS``) and which measurement items a paper selected (one ``IN`` query over
+the measurements, instead of one query per selected item).
+
+Both selection formats are stored the same way:
+
+- objects ``{"measurement_id", "item_index", "item_type"}`` (items from
+  several measurements),
+- plain indices ``[0, 2, 5]`` into the items of the paper's own
+  ``measurement_id``,
+
+with ``position`` the item's place in the JSON list (shutter item numbers and
+raw material rows follow it). Selections pointing at measurements that do not
+exist are skipped. Paper create and update call ``sync_paper_measurement_items``
+after changing the JSON; ``rebuild_paper_measurement_items`` rebuilds every
+paper's rows (adopt_alembic.py). Both only flush, the caller commits.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import json
+
+from sqlalchemy import delete, exists, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.db.models.user import (
+    Measurement as DBMeasurement,
+    ProductionPaper as DBProductionPaper,
+    ProductionPaperMeasurementItem as DBPaperMeasurementItem,
+)
+
+
+def parse_json_list(value: Any) -> List[Any]:
+    """A JSON array column as a list ([] when empty or malformed)"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return []
+    return value if isinstance(value, list) else []
+
+
+def selection_rows(selected_measurement_items: Any, paper_measurement_id: Optional[int]) -> List[Dict[str, Any]]:
+    """Link rows (without paper id) for a selected_measurement_items value"""
+    rows = []
+    for position, selected in enumerate(parse_json_list(selected_measurement_items)):
+        if isinstance(selected, dict):
+            measurement_id, item_index = selected.get("measurement_id"), selected.get("item_index")
+            item_type = selected.get("item_type")
+        else:
+            measurement_id, item_index, item_type = paper_measurement_id, selected, None
+        if isinstance(item_index, str) and item_index.strip().isdigit():
+            item_index = int(item_index)
+        if not isinstance(measurement_id, int) or not isinstance(item_index, int) or isinstance(item_index, bool):
+            continue
+        rows.append({
+            "measurement_id": measurement_id,
+            "item_index": item_index,
+            "item_type": str(item_type) if item_type is not None else None,
+            "position": position,
+        })
+    return rows
+
+
+def sync_paper_measurement_items(db: Session, paper: DBProductionPaper) -> int:
+    """Replace a paper's link rows with its current selection; returns rows written"""
+    if paper.id is None:
+        db.flush()
+    db.execute(delete(DBPaperMeasurementItem).where(DBPaperMeasurementItem.production_paper_id == paper.id))
+    rows = selection_rows(paper.selected_measurement_items, paper.measurement_id)
+    if rows:
+        existing = set(db.scalars(
+            select(DBMeasurement.id).where(DBMeasurement.id.in_({row["measurement_id"] for row in rows}))
+        ))
+        rows = [{**row, "production_paper_id": paper.id} for row in rows if row["measurement_id"] in existing]
+    if rows:
+        db.execute(insert(DBPaperMeasurementItem), rows)
+    db.flush()
+    return len(rows)
+
+
+def is_measurement_used(db: Session, measurement_id: int) -> bool:
+    """Whether a live (not soft-deleted) production paper uses the measurement or one of its items"""
+    live = DBProductionPaper.is_deleted == False  # noqa: E712
+    direct = exists().where(DBProductionPaper.measurement_id == measurement_id, live)
+    selected = exists().where(
+        DBPaperMeasurementItem.measurement_id == measurement_id,
+        DBPaperMeasurementItem.production_paper_id == DBProductionPaper.id,
+        live,
+    )
+    return bool(db.scalar(select(or_(direct, selected))))
+
+
+def selected_measurement_items(db: Session, paper_id: int) -> List[Tuple[int, Dict[str, Any]]]:
+    """(position, measurement item) for each item a paper selected, in selection order
+
+    Selections whose index is outside the measurement's items are left out.
+    """
+    links = db.execute(
+        select(DBPaperMeasurementItem.position, DBPaperMeasurementItem.measurement_id, DBPaperMeasurementItem.item_index)
+        .where(DBPaperMeasurementItem.production_paper_id == paper_id)
+        .order_by(DBPaperMeasurementItem.position)
+    ).all()
+    if not links:
+        return []
+    items_by_measurement = {
+        measurement_id: parse_json_list(items)
+        for measurement_id, items in db.execute(
+            select(DBMeasurement.id, DBMeasurement.items)
+            .where(DBMeasurement.id.in_({link.measurement_id for link in links}))
+        )
+    }
+    selected = []
+    for link in links:
+        items = items_by_measurement.get(link.measurement_id, [])
+        if 0 <= link.item_index < len(items) and items[link.item_index]:
+            selected.append((link.position, items[link.item_index]))
+    return selected
+
+
+def rebuild_paper_measurement_items(db: Session, batch_size: int = 1000) -> int:
+    """Rebuild every paper's link rows from selected_measurement_items; returns rows written"""
+    db.execute(delete(DBPaperMeasurementItem))
+    measurement_ids = set(db.scalars(select(DBMeasurement.id)))
+    papers = select(
+        DBProductionPaper.id, DBProductionPaper.measurement_id, DBProductionPaper.selected_measurement_items,
+    ).where(DBProductionPaper.selected_measurement_items.isnot(None))
+    count = 0
+    batch = []
+    for paper in db.execute(papers).all():
+        batch.extend(
+            {**row, "production_paper_id": paper.id}
+            for row in selection_rows(paper.selected_measurement_items, paper.measurement_id)
+            if row["measurement_id"] in measurement_ids
+        )
+        if len(batch) >= batch_size:
+            db.execute(insert(DBPaperMeasurementItem), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(DBPaperMeasurementItem), batch)
+        count += len(batch)
+    db.flush()
+    return count
@@ -0,0 +1,205 @@
+"""
+``ProductionPaper`` responses for any number of production papers.
+
+Every production paper endpoint (list, detail, create, update, raw material
+status) answers with the same model; ``production_paper_responses`` builds it
+for a list of ORM papers with a fixed number of queries, whatever the number
+of papers:
+
+- one query for the parties (id, name) and one for the measurements
+  (id, number, party name) of all papers,
+- one query for ``items_total_quantity`` (raw material items when the paper
+  has them, else its shutter items) - a ``UNION ALL`` of both sums,
+- with ``items``: one query each for the shutter items and raw material items
+  (instead of two lazy loads per paper),
+- with ``selected_items``: one query for the items of the measurements the
+  papers select from, to resolve ``selected_items_data``.
+
+``selected_measurement_items`` is decoded once per paper and each
+measurement's items once per call. Column values are copied with ``getattr``
+so papers rebuilt from raw rows (databases missing newer columns) work too.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+import json
+
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.db.models.user import (
+    Measurement as DBMeasurement,
+    Party as DBParty,
+    ProductionPaper as DBProductionPaper,
+    ProductionShutterItem as DBProductionShutterItem,
+    RawMaterialShutterItem as DBRawMaterialShutterItem,
+)
+from app.schemas.user import (
+    ProductionPaper,
+    ProductionPaperBase,
+    ProductionPaperMeasurement,
+    ProductionPaperParty,
+    RMShutterItem,
+)
+
+# Stored columns returned as they are (selected_measurement_items is decoded)
+PAPER_FIELDS = [name for name in ProductionPaperBase.model_fields if name != "selected_measurement_items"] + [
+    "id", "created_by", "created_at", "updated_at", "deleted_at", "deletion_reason",
+]
+
+
+def decode_json_list(value: Any) -> Optional[list]:
+    """selected_measurement_items as stored (JSON text) to a list; None when empty or malformed"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return None
+    return value
+
+
+def items_total_quantities(db: Session, paper_ids: Sequence[int]) -> Dict[int, int]:
+    """Sum of raw material item quantities per paper, or of its shutter items when it has no RM items"""
+    if not paper_ids:
+        return {}
+    sums = union_all(
+        select(
+            DBRawMaterialShutterItem.production_paper_id.label("paper_id"), literal(0).label("source"),
+            func.coalesce(func.sum(DBRawMaterialShutterItem.quantity), 0).label("total"),
+        ).where(DBRawMaterialShutterItem.production_paper_id.in_(paper_ids))
+        .group_by(DBRawMaterialShutterItem.production_paper_id),
+        select(
+            DBProductionShutterItem.production_paper_id, literal(1),
+            func.coalesce(func.sum(DBProductionShutterItem.quantity), 0),
+        ).where(DBProductionShutterItem.production_paper_id.in_(paper_ids))
+        .group_by(DBProductionShutterItem.production_paper_id),
+    )
+    totals: Dict[int, int] = {}
+    # RM sums (source 0) come last so they win
+    for paper_id, _, total in sorted(db.execute(sums).all(), key=lambda row: -row[1]):
+        totals[paper_id] = int(total)
+    return totals
+
+
+def paper_items(db: Session, model, paper_ids: Sequence[int]) -> Dict[int, List[RMShutterItem]]:
+    """Shutter / raw material items of each paper in id order"""
+    items: Dict[int, List[RMShutterItem]] = {paper_id: [] for paper_id in paper_ids}
+    if paper_ids:
+        rows = db.execute(select(model).where(model.production_paper_id.in_(paper_ids)).order_by(model.id)).scalars()
+        for row in rows:
+            items[row.production_paper_id].append(RMShutterItem.model_validate(row))
+    return items
+
+
+def measurement_items(db: Session, measurement_ids: set) -> Dict[int, list]:
+    """Decoded items of each measurement"""
+    if not measurement_ids:
+        return {}
+    decoded = {}
+    for measurement_id, items in db.execute(
+        select(DBMeasurement.id, DBMeasurement.items).where(DBMeasurement.id.in_(measurement_ids))
+    ).all():
+        items = decode_json_list(items)
+        decoded[measurement_id] = items if isinstance(items, list) else []
+    return decoded
+
+
+def selected_items_measurement_ids(paper: DBProductionPaper, selected: Optional[list]) -> set:
+    """Measurements whose items ``resolve_selected_items`` needs for the paper"""
+    if selected:
+        if isinstance(selected[0], dict) and "measurement_id" in selected[0]:
+            return {item["measurement_id"] for item in selected if isinstance(item, dict) and "measurement_id" in item}
+        if isinstance(selected[0], int) and paper.measurement_id:
+            return {paper.measurement_id}
+        return set()
+    return {paper.measurement_id} if paper.measurement_id else set()
+
+
+def resolve_selected_items(paper: DBProductionPaper, selected: Optional[list], items_by_measurement: Dict[int, list]) -> list:
+    """Copies of the measurement items the paper selected (all items of its measurement when none are)"""
+    if selected:
+        first = selected[0]
+        if isinstance(first, dict) and "measurement_id" in first:
+            resolved = []
+            for item in selected:
+                if isinstance(item, dict) and "measurement_id" in item and "item_index" in item:
+                    items = items_by_measurement.get(item["measurement_id"])
+                    if items is not None and item["item_index"] < len(items):
+                        resolved.append(items[item["item_index"]].copy())
+            return resolved
+        if isinstance(first, int) and paper.measurement_id:
+            items = items_by_measurement.get(paper.measurement_id, [])
+            return [items[index].copy() for index in selected if isinstance(index, int) and 0 <= index < len(items)]
+        return []
+    if paper.measurement_id:
+        return [item.copy() for item in items_by_measurement.get(paper.measurement_id, [])]
+    return []
+
+
+def production_paper_responses(
+    db: Session,
+    papers: Sequence[DBProductionPaper],
+    items: bool = False,
+    selected_items: bool = False,
+) -> List[ProductionPaper]:
+    """Response models for the papers, in order (``items``: shutter / RM items, ``selected_items``: selected_items_data)"""
+    if not papers:
+        return []
+    paper_ids = [paper.id for paper in papers]
+    party_ids = {paper.party_id for paper in papers if paper.party_id}
+    measurement_ids = {paper.measurement_id for paper in papers if paper.measurement_id}
+
+    parties = {}
+    if party_ids:
+        parties = {row.id: row for row in db.execute(select(DBParty.id, DBParty.name).where(DBParty.id.in_(party_ids)))}
+    measurements = {}
+    if measurement_ids:
+        measurements = {
+            row.id: row
+            for row in db.execute(
+                select(DBMeasurement.id, DBMeasurement.measurement_number, DBMeasurement.party_name)
+                .where(DBMeasurement.id.in_(measurement_ids))
+            )
+        }
+    totals = items_total_quantities(db, paper_ids)
+    shutter_items = paper_items(db, DBProductionShutterItem, paper_ids) if items else {}
+    rm_items = paper_items(db, DBRawMaterialShutterItem, paper_ids) if items else {}
+
+    selections = [decode_json_list(getattr(paper, "selected_measurement_items", None)) for paper in papers]
+    items_by_measurement = {}
+    if selected_items:
+        needed = set()
+        for paper, selected in zip(papers, selections):
+            needed |= selected_items_measurement_ids(paper, selected)
+        items_by_measurement = measurement_items(db, needed)
+
+    responses = []
+    for paper, selected in zip(papers, selections):
+        data = {name: getattr(paper, name, None) for name in PAPER_FIELDS}
+        data["order_type"] = data["order_type"] or "Regular"
+        data["raw_material_order_status"] = data["raw_material_order_status"] or "pending"
+        data["is_deleted"] = getattr(paper, "is_deleted", False) or False
+        data["selected_measurement_items"] = selected
+        data["items_total_quantity"] = totals.get(paper.id)
+
+        party = parties.get(paper.party_id)
+        if party is not None:
+            data["party"] = ProductionPaperParty(id=party.id, name=party.name)
+        measurement = measurements.get(paper.measurement_id)
+        if measurement is not None:
+            data["measurement"] = ProductionPaperMeasurement(
+                id=measurement.id, measurement_number=measurement.measurement_number,
+                party_name=measurement.party_name,
+            )
+        if items:
+            data["shutter_items"] = shutter_items[paper.id]
+            data["rm_shutter_items"] = rm_items[paper.id]
+        if selected_items:
+            data["selected_items_data"] = resolve_selected_items(paper, selected, items_by_measurement)
+        responses.append(ProductionPaper(**data))
+    return responses
+
+
+def production_paper_response(db: Session, paper: DBProductionPaper, **options) -> ProductionPaper:
+    """``production_paper_responses`` for one paper"""
+    return production_paper_responses(db, [paper], **options)[0]
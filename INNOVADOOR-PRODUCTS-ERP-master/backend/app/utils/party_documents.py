@@ -0,0 +1,115 @@
+"""
+Parsed JSON columns of parties, cached per party version.
+
+A party keeps contact persons, site addresses, product preferences, documents
+(base64 files included) and its frame / door client requirements as JSON text.
+Every party response decodes all of them, and the client requirement status
+decodes the requirements again on each call. ``party_documents`` returns the
+decoded values from a process-wide LRU (``CACHE_SIZE`` parties) keyed by
+``(party_id, updated_at)``:
+
+- a field is decoded the first time it is asked for, so callers that load
+  only some columns (``load_only``) do not pull the others,
+- each cached field also remembers the hash of its JSON text, so a party
+  written twice within the same ``updated_at`` tick, or with plain SQL, is
+  decoded again.
+
+The returned values are shared between requests and must be treated as
+read-only; the party endpoints only hand them to the response models, which
+copy them.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Iterable, Optional, Tuple
+import json
+
+from app.db.models.user import Party as DBParty
+
+CACHE_SIZE = 256
+
+PARTY_JSON_FIELDS = (
+    "contact_persons", "site_addresses", "product_preferences", "documents",
+    "frame_requirements", "door_requirements",
+)
+
+# party_id -> (updated_at, {field: (hash of JSON text, decoded value)})
+_parties: "OrderedDict[int, Tuple[Any, Dict[str, Tuple[int, Any]]]]" = OrderedDict()
+_lock = Lock()
+
+
+def normalize_documents(documents: list) -> list:
+    """Documents in the Document schema format (old uploads have document_type / content / content_type)"""
+    normalized = []
+    for doc in documents:
+        if isinstance(doc, dict):
+            doc = {**doc, 'type': doc['document_type']} if 'document_type' in doc else dict(doc)
+            if 'content' in doc and 'url' not in doc:
+                content_type = doc.get('content_type', 'application/octet-stream')
+                doc['url'] = f"data:{content_type};base64,{doc['content']}"
+                doc.pop('content', None)
+                doc.pop('content_type', None)
+            if 'type' not in doc:
+                doc['type'] = 'Other'
+        normalized.append(doc)
+    return normalized
+
+
+def decode_field(field: str, raw: Any) -> Any:
+    """One JSON column decoded the way party responses return it"""
+    if field == "product_preferences":
+        empty: Any = None
+    else:
+        empty = []
+    if not raw:
+        return empty
+    if isinstance(raw, str):
+        try:
+            value = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            return empty
+    else:
+        value = raw
+
+    if field == "site_addresses":
+        return value if isinstance(value, list) else []
+    if field == "documents":
+        if not isinstance(value, list):
+            return []
+        return normalize_documents(value)
+    return value
+
+
+def party_documents(party: DBParty, fields: Iterable[str] = PARTY_JSON_FIELDS) -> Dict[str, Any]:
+    """Decoded JSON columns of the party (read-only, shared)"""
+    decoded: Dict[str, Any] = {}
+    if party.id is None:
+        return {field: decode_field(field, getattr(party, field, None)) for field in fields}
+
+    updated_at = party.updated_at
+    with _lock:
+        entry = _parties.get(party.id)
+        if entry is None or entry[0] != updated_at:
+            entry = _parties[party.id] = (updated_at, {})
+        _parties.move_to_end(party.id)
+        while len(_parties) > CACHE_SIZE:
+            _parties.popitem(last=False)
+        cached = dict(entry[1])
+
+    new: Dict[str, Tuple[Optional[int], Any]] = {}
+    for field in fields:
+        raw = getattr(party, field, None)
+        fingerprint = hash(raw) if isinstance(raw, str) else None
+        hit = cached.get(field)
+        if hit is not None and fingerprint is not None and hit[0] == fingerprint:
+            decoded[field] = hit[1]
+            continue
+        decoded[field] = decode_field(field, raw)
+        if fingerprint is not None:
+            new[field] = (fingerprint, decoded[field])
+
+    if new:
+        with _lock:
+            entry = _parties.get(party.id)
+            if entry is not None and entry[0] == updated_at:
+                entry[1].update(new)
+    return decoded
@@ -3,12 +3,6 @@ PDF Generation Utility for Raw Material Papers
 """
 from io import BytesIO
 from typing import Dict, List, Any, Optional
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import mm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
 
 
 def generate_raw_material_pdf(
@@ -37,6 +31,14 @@ def generate_raw_material_pdf(
     Returns:
         BytesIO: PDF file as bytes
     """
+    # ReportLab is imported on first use so that importing this module stays cheap
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+
     if items is None:
         items = []
     if totals is None:
@@ -0,0 +1,199 @@
+"""
+Shared pricing engine for quotations and tax invoices.
+
+All money is handled as integer paise and GST rates as integer basis points
+(18% = 1800), so a whole batch of line items is priced in a single pass with
+exact, half-up rounding. Decimal is only used at the edges to parse input and
+to return rupee values.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Iterable, List
+
+from app.core.config import settings
+
+PAISE = Decimal("0.01")
+
+
+def to_paise(value: Any) -> int:
+    """Rupees (Decimal/str/float/int) -> integer paise, half-up"""
+    if value is None or value == "":
+        return 0
+    if isinstance(value, int):
+        return value * 100
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int((value * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def to_basis_points(rate: Any) -> int:
+    """Percentage (e.g. 18, "18.00", Decimal("12.5")) -> basis points"""
+    if rate is None or rate == "":
+        return 0
+    if isinstance(rate, int):
+        return rate * 100
+    if not isinstance(rate, Decimal):
+        rate = Decimal(str(rate))
+    return int((rate * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def from_paise(paise: int) -> Decimal:
+    return (Decimal(paise) / 100).quantize(PAISE)
+
+
+def div_round(numerator: int, denominator: int) -> int:
+    """Integer division rounding half away from zero"""
+    if numerator >= 0:
+        return (2 * numerator + denominator) // (2 * denominator)
+    return -((-2 * numerator + denominator) // (2 * denominator))
+
+
+def quantity_times_rate(quantity: Any, rate_paise: int) -> int:
+    if isinstance(quantity, int):
+        return quantity * rate_paise
+    if quantity is None or quantity == "":
+        return 0
+    if isinstance(quantity, float) and quantity.is_integer():
+        return int(quantity) * rate_paise
+    quantity = quantity if isinstance(quantity, Decimal) else Decimal(str(quantity))
+    return int((quantity * rate_paise).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def default_gst_basis_points() -> int:
+    return to_basis_points(settings.DEFAULT_GST_RATE)
+
+
+def tax_split(taxable_paise: int, rate_bp: int, interstate: bool) -> tuple:
+    """(cgst, sgst, igst) in paise for one line
+
+    Intra-state tax is rounded once and then halved (SGST takes the odd paisa),
+    so CGST + SGST always equals the IGST the same line would carry.
+    """
+    total = div_round(taxable_paise * rate_bp, 10000)
+    if interstate:
+        return 0, 0, total
+    cgst = total // 2
+    return cgst, total - cgst, 0
+
+
+def allocate(total: int, weights: List[int]) -> List[int]:
+    """Split ``total`` paise across lines proportionally to ``weights`` (largest remainder, exact sum)"""
+    weight_sum = sum(weights)
+    if not total or not weight_sum:
+        return [0] * len(weights)
+    shares = []
+    remainders = []
+    for idx, weight in enumerate(weights):
+        share, remainder = divmod(total * weight, weight_sum)
+        shares.append(share)
+        remainders.append((remainder, idx))
+    leftover = total - sum(shares)
+    for _, idx in sorted(remainders, reverse=True)[:leftover]:
+        shares[idx] += 1
+    return shares
+
+
+def price_line_items(
+    line_items: List[Dict[str, Any]],
+    discount_amount: Any = None,
+    discount_percentage: Any = None,
+    interstate: bool = False,
+    default_gst_rate: Any = None,
+) -> Dict[str, Any]:
+    """
+    Price a batch of line items in one pass.
+
+    Each item may carry ``quantity``, ``rate``, ``discount`` (line discount in
+    rupees) and ``gst_rate`` (percent, defaults to ``settings.DEFAULT_GST_RATE``).
+    A document-level discount (amount or percentage of subtotal) is spread over
+    the lines before tax so mixed GST rates stay correct.
+    """
+    default_bp = to_basis_points(default_gst_rate) if default_gst_rate is not None else default_gst_basis_points()
+
+    amounts = []
+    rates_bp = []
+    for item in line_items:
+        rate_paise = to_paise(item.get("rate", 0))
+        amount = quantity_times_rate(item.get("quantity", 0), rate_paise) - to_paise(item.get("discount", 0))
+        amounts.append(amount)
+        gst_rate = item.get("gst_rate")
+        rates_bp.append(to_basis_points(gst_rate) if gst_rate not in (None, "") else default_bp)
+
+    subtotal = sum(amounts)
+    if discount_percentage:
+        discount = div_round(subtotal * to_basis_points(discount_percentage), 10000)
+    else:
+        discount = to_paise(discount_amount)
+    line_discounts = allocate(discount, [max(a, 0) for a in amounts])
+
+    cgst_total = sgst_total = igst_total = 0
+    lines = []
+    for amount, line_discount, rate_bp in zip(amounts, line_discounts, rates_bp):
+        taxable = amount - line_discount
+        cgst, sgst, igst = tax_split(taxable, rate_bp, interstate)
+        cgst_total += cgst
+        sgst_total += sgst
+        igst_total += igst
+        lines.append({
+            "amount": from_paise(amount),
+            "taxable_value": from_paise(taxable),
+            "gst_rate": from_paise(rate_bp),
+            "cgst_amount": from_paise(cgst),
+            "sgst_amount": from_paise(sgst),
+            "igst_amount": from_paise(igst),
+        })
+
+    tax = cgst_total + sgst_total + igst_total
+    taxable_amount = subtotal - discount
+    return {
+        "subtotal": from_paise(subtotal),
+        "discount_amount": from_paise(discount),
+        "taxable_amount": from_paise(taxable_amount),
+        "cgst_amount": from_paise(cgst_total),
+        "sgst_amount": from_paise(sgst_total),
+        "igst_amount": from_paise(igst_total),
+        "tax_amount": from_paise(tax),
+        "total_amount": from_paise(taxable_amount + tax),
+        "lines": lines,
+    }
+
+
+def price_documents(documents: Iterable[Dict[str, Any]], default_gst_rate: Any = None) -> List[Dict[str, Any]]:
+    """
+    Bulk pricing: each document is a dict with ``line_items`` and optional
+    ``discount_amount``, ``discount_percentage`` and ``interstate``.
+    Returns totals in the same order.
+    """
+    if default_gst_rate is None:
+        default_gst_rate = settings.DEFAULT_GST_RATE
+    return [
+        price_line_items(
+            doc.get("line_items") or [],
+            discount_amount=doc.get("discount_amount"),
+            discount_percentage=doc.get("discount_percentage"),
+            interstate=bool(doc.get("interstate")),
+            default_gst_rate=default_gst_rate,
+        )
+        for doc in documents
+    ]
+
+
+def sum_invoice_lines(line_items: Iterable[Any], freight: Any = None, round_off: Any = None) -> Dict[str, Decimal]:
+    """Totals of invoice lines that already carry their tax amounts, in one pass"""
+    subtotal = cgst = sgst = igst = 0
+    for item in line_items:
+        get = item.get if isinstance(item, dict) else lambda key, _item=item: getattr(_item, key, None)
+        subtotal += to_paise(get("taxable_value"))
+        cgst += to_paise(get("cgst_amount"))
+        sgst += to_paise(get("sgst_amount"))
+        igst += to_paise(get("igst_amount"))
+    freight_paise = to_paise(freight)
+    round_off_paise = to_paise(round_off)
+    return {
+        "subtotal": from_paise(subtotal),
+        "cgst_total": from_paise(cgst),
+        "sgst_total": from_paise(sgst),
+        "igst_total": from_paise(igst),
+        "freight": from_paise(freight_paise),
+        "round_off": from_paise(round_off_paise),
+        "grand_total": from_paise(subtotal + cgst + sgst + igst + freight_paise + round_off_paise),
+    }
@@ -3,47 +3,34 @@ Utility functions for parsing and processing raw material requirements tables
 from production papers.
 """
 from typing import List, Dict, Any, Optional
-import re
 
+from app.utils.dimensions import (
+    MAX_DIMENSION, RM_SQ_M_PER_SQ_FT, UNITS_BY_VALUE, compute_areas, extract_number, laminate_sheets,
+    laminate_sq_ft, parse_numbers, parse_quantities, to_inches,
+)
 
-def extract_numeric_value(value: Any) -> float:
+# Kept under its old name (first number found in a measurement string)
+extract_numeric_value = extract_number
+
+
+def table_square_feet(widths: List[Any], heights: List[Any], quantities: List[float]) -> List[float]:
     """
-    Extract numeric value from measurement string.
-    Handles formats like "34.00\"", "34.00", 34.00, etc.
+    Square feet of each row: (Width x Height x Qty) / 144, dimensions in inches,
+    rounded to 2 decimals. A quantity of 0 counts as 1.
     """
-    if value is None or value == '-' or value == '':
-        return 0.0
-    
-    if isinstance(value, (int, float)):
-        return float(value)
-    
-    str_value = str(value).strip()
-    # Remove quotes and extract numeric value
-    str_value = str_value.replace('"', '').replace("'", '')
-    num_match = re.search(r'[\d.]+', str_value)
-    
-    if not num_match:
-        return 0.0
-    
-    try:
-        return float(num_match.group())
-    except (ValueError, AttributeError):
-        return 0.0
+    areas = compute_areas(
+        parse_numbers(widths, lenient=True),
+        parse_numbers(heights, lenient=True),
+        [extract_number(qty) or 1.0 for qty in quantities],
+    )
+    return [round(sq_ft, 2) for sq_ft in areas.sq_ft]
 
 
 def calculate_square_feet(width: Any, height: Any, qty: Any) -> float:
     """
     Calculate square feet: (Width x Height x Qty) / 144
     """
-    width_num = extract_numeric_value(width)
-    height_num = extract_numeric_value(height)
-    qty_num = extract_numeric_value(qty) or 1.0
-    
-    if width_num == 0 or height_num == 0:
-        return 0.0
-    
-    sq_ft = (width_num * height_num * qty_num) / 144.0
-    return round(sq_ft, 2)
+    return table_square_feet([width], [height], [qty])[0]
 
 
 def group_measurement_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -117,12 +104,16 @@ def parse_raw_material_table(
     table_rows = []
     total_qty = 0.0
     total_sq_ft = 0.0
+    square_feet = table_square_feet(
+        [item['ro_width'] for item in grouped_items],
+        [item['ro_height'] for item in grouped_items],
+        [item['qty'] for item in grouped_items],
+    )
     
-    for idx, item in enumerate(grouped_items, 1):
+    for idx, (item, sq_ft) in enumerate(zip(grouped_items, square_feet), 1):
         ro_width = item['ro_width']
         ro_height = item['ro_height']
         qty = item['qty']
-        sq_ft = calculate_square_feet(ro_width, ro_height, qty)
         
         table_row = {
             'sr_no': str(idx),  # Ensure sequential numbering starting from 1
@@ -147,6 +138,51 @@ def parse_raw_material_table(
     }
 
 
+def raw_material_paper_rows(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Rows of the raw material paper: items grouped by RO size in inches (each
+    value above 100 is taken as mm) with quantities summed, smallest size first.
+    Items without a usable size (blank, zero, or above MAX_DIMENSION - a code
+    in the wrong column) are left out.
+
+    Each row has the group's first item, ro_width / ro_height (inches, 2
+    decimals), quantity and the unrounded sq_ft, sq_meter, laminate_sq_ft
+    (both sides with wastage) and whole laminate_sheets.
+    """
+    raw_widths = [item.get('ro_width') or item.get('width') or item.get('w') or '' for item in items]
+    raw_heights = [item.get('ro_height') or item.get('height') or item.get('h') or '' for item in items]
+    widths = parse_numbers(raw_widths)
+    heights = parse_numbers(raw_heights)
+    usable = [
+        i for i in range(len(items))
+        if raw_widths[i] and raw_heights[i] and raw_widths[i] != '-' and raw_heights[i] != '-'
+        and not (widths[i] > MAX_DIMENSION or heights[i] > MAX_DIMENSION)
+        and widths[i] != 0 and heights[i] != 0
+    ]
+    width_in, height_in = to_inches([widths[i] for i in usable], [heights[i] for i in usable], UNITS_BY_VALUE)
+    quantities = parse_quantities([items[i].get('qty') or items[i].get('quantity') for i in usable])
+
+    groups: Dict[str, Dict[str, Any]] = {}
+    for i, width, height, qty in zip(usable, width_in, height_in, quantities):
+        key = f"{width:.2f}-{height:.2f}"
+        if key in groups:
+            groups[key]['quantity'] += qty
+        else:
+            groups[key] = {'item': items[i], 'ro_width': width, 'ro_height': height, 'quantity': qty}
+
+    rows = sorted(groups.values(), key=lambda row: (row['ro_width'], row['ro_height']))
+    areas = compute_areas(
+        [row['ro_width'] for row in rows], [row['ro_height'] for row in rows], [row['quantity'] for row in rows],
+        sq_meter_factor=RM_SQ_M_PER_SQ_FT,
+    )
+    laminate = laminate_sq_ft(areas.sq_ft)
+    for row, sq_ft, sq_meter, lam_sq_ft, sheets in zip(
+        rows, areas.sq_ft, areas.sq_meter, laminate, laminate_sheets(laminate, whole=True),
+    ):
+        row.update(sq_ft=sq_ft, sq_meter=sq_meter, laminate_sq_ft=lam_sq_ft, laminate_sheets=sheets)
+    return rows
+
+
 def format_table_for_display(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Format parsed table data for frontend display.
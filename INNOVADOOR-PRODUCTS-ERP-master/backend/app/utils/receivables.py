@@ -0,0 +1,230 @@
+"""
+Set-based recomputation of ``account_receivables`` (paid totals, due dates,
+days overdue, aging buckets and status).
+
+A refresh runs a fixed number of statements whatever the number of invoices:
+
+1. ``INSERT ... SELECT`` a receivable row for approved invoices that have none,
+2. ``UPDATE ... FROM (SELECT ... GROUP BY)`` copying invoice amount and terms
+   and the allocation totals / last allocation date onto each row,
+3. one ``UPDATE`` deriving due date, days overdue, aging bucket and status
+   from those columns and the refresh date.
+
+Credit days are parsed once per distinct ``payment_terms`` string (cached
+across runs) and applied with a ``CASE`` on the terms. Days overdue change
+every day, so ``refresh_receivables`` also runs as a CLI
+(``refresh_receivables.py``) and as a periodic in-process task
+(``RECEIVABLES_REFRESH_INTERVAL_MINUTES``). Every API process starts the task,
+but a process refreshes only after claiming the ``receivables.refresh``
+periodic task (``claim_periodic_task``), so one process per interval runs it.
+Refresh helpers only flush; the caller commits.
+"""
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
+import asyncio
+import logging
+import re
+
+from sqlalchemy import Date, Integer, case, cast, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models.accounts import (
+    AccountReceivable as DBAccountReceivable,
+    PaymentAllocation as DBPaymentAllocation,
+)
+from app.db.models.billing import TaxInvoice as DBTaxInvoice
+from app.utils.credit_exposure import EXPOSURE_INVOICE_STATUSES
+
+logger = logging.getLogger(__name__)
+
+REFRESH_TASK = "receivables.refresh"
+
+# Rows that no longer age; a targeted refresh (allocation, sync) still updates them
+CLOSED_RECEIVABLE_STATUSES = ["paid", "written_off"]
+PAID_TOLERANCE = 0.01  # Consider paid if less than 1 paisa outstanding
+
+# (upper bound of days overdue, bucket); anything above the last bound is "90+"
+AGING_BUCKETS = [(-1, "current"), (30, "0-30"), (60, "31-60"), (90, "61-90")]
+
+
+@lru_cache(maxsize=1024)
+def parse_credit_days(payment_terms: Optional[str]) -> Optional[int]:
+    """Credit days in payment terms such as "Net 30" or "Credit 45 days" (None for "Advance")"""
+    if not payment_terms:
+        return None
+    match = re.search(r'(\d+)', payment_terms)
+    return int(match.group(1)) if match else None
+
+
+def add_days(dialect: str, column, days: int):
+    """SQL expression: date column plus a number of days"""
+    if dialect == "sqlite":
+        return func.date(column, f"+{days} days", type_=Date)
+    return column + days
+
+
+def days_between(dialect: str, later: date, column):
+    """SQL expression: whole days from a date column to ``later``"""
+    if dialect == "sqlite":
+        return cast(func.julianday(literal(later.isoformat())) - func.julianday(column), Integer)
+    return literal(later) - column
+
+
+def refresh_receivables(
+    db: Session,
+    as_of: Optional[date] = None,
+    invoice_ids: Optional[Iterable[int]] = None,
+) -> Dict[str, Any]:
+    """
+    Recompute receivables as of ``as_of`` (default today). Without
+    ``invoice_ids`` every approved invoice gets a row and all open rows are
+    refreshed; with ``invoice_ids`` only those invoices are (rows are created
+    for them whatever their status, as the per-invoice sync always did).
+    """
+    as_of = as_of or date.today()
+    dialect = db.get_bind().dialect.name
+    ids = list(set(invoice_ids)) if invoice_ids is not None else None
+    db.flush()
+
+    # 1. Rows for invoices that have none
+    missing = select(
+        DBTaxInvoice.id, DBTaxInvoice.invoice_number, DBTaxInvoice.invoice_date, DBTaxInvoice.grand_total,
+        DBTaxInvoice.party_id, DBTaxInvoice.party_name, DBTaxInvoice.payment_terms,
+        literal(0), DBTaxInvoice.grand_total, literal(0), literal("outstanding"),
+    ).where(
+        ~select(DBAccountReceivable.id).where(
+            DBAccountReceivable.tax_invoice_id == DBTaxInvoice.id
+        ).exists()
+    )
+    if ids is None:
+        missing = missing.where(DBTaxInvoice.status.in_(EXPOSURE_INVOICE_STATUSES))
+    else:
+        missing = missing.where(DBTaxInvoice.id.in_(ids))
+    created = db.execute(insert(DBAccountReceivable).from_select([
+        "tax_invoice_id", "invoice_number", "invoice_date", "invoice_amount",
+        "party_id", "party_name", "payment_terms",
+        "total_paid", "outstanding_amount", "days_overdue", "status",
+    ], missing)).rowcount
+
+    if ids is None:
+        scope = DBAccountReceivable.status.notin_(CLOSED_RECEIVABLE_STATUSES)
+    else:
+        scope = DBAccountReceivable.tax_invoice_id.in_(ids)
+
+    # 2. Invoice amount / terms and allocation totals
+    paid = select(
+        DBTaxInvoice.id.label("tax_invoice_id"),
+        DBTaxInvoice.grand_total,
+        DBTaxInvoice.payment_terms,
+        func.coalesce(func.sum(DBPaymentAllocation.allocated_amount), 0).label("total_paid"),
+        func.max(DBPaymentAllocation.allocation_date).label("last_payment_date"),
+    ).select_from(DBTaxInvoice).outerjoin(
+        DBPaymentAllocation, DBPaymentAllocation.tax_invoice_id == DBTaxInvoice.id
+    ).join(
+        DBAccountReceivable, DBAccountReceivable.tax_invoice_id == DBTaxInvoice.id
+    ).where(scope).group_by(
+        DBTaxInvoice.id, DBTaxInvoice.grand_total, DBTaxInvoice.payment_terms
+    ).subquery()
+    db.execute(
+        update(DBAccountReceivable).where(
+            DBAccountReceivable.tax_invoice_id == paid.c.tax_invoice_id
+        ).values(
+            invoice_amount=paid.c.grand_total,
+            payment_terms=paid.c.payment_terms,
+            total_paid=paid.c.total_paid,
+            last_payment_date=paid.c.last_payment_date,
+        ).execution_options(synchronize_session=False)
+    )
+
+    # 3. Due date, days overdue, bucket and status
+    terms = [
+        row[0] for row in db.execute(
+            select(DBAccountReceivable.payment_terms).where(
+                scope, DBAccountReceivable.payment_terms.isnot(None)
+            ).distinct()
+        ).all()
+    ]
+    credit_days = {term: parse_credit_days(term) for term in terms}
+    credit_days = {term: days for term, days in credit_days.items() if days is not None}
+    if credit_days:
+        due_date = case(
+            *[
+                (DBAccountReceivable.payment_terms == term, add_days(dialect, DBAccountReceivable.invoice_date, days))
+                for term, days in credit_days.items()
+            ],
+            else_=None,
+        )
+        days_overdue = case(
+            (due_date < as_of, days_between(dialect, as_of, due_date)),
+            else_=0,
+        )
+    else:
+        due_date = literal(None)
+        days_overdue = literal(0)
+
+    bucket = case(
+        *[(days_overdue <= bound, name) for bound, name in AGING_BUCKETS],
+        else_="90+",
+    )
+    outstanding = DBAccountReceivable.invoice_amount - DBAccountReceivable.total_paid
+    status = case(
+        (outstanding <= PAID_TOLERANCE, "paid"),
+        (DBAccountReceivable.total_paid > 0, "partially_paid"),
+        (days_overdue > 0, "overdue"),
+        else_="outstanding",
+    )
+    refreshed = db.execute(
+        update(DBAccountReceivable).where(
+            scope, DBAccountReceivable.status != "written_off"
+        ).values(
+            outstanding_amount=outstanding,
+            due_date=due_date,
+            days_overdue=days_overdue,
+            aging_bucket=bucket,
+            status=status,
+        ).execution_options(synchronize_session=False)
+    ).rowcount
+    db.flush()
+    db.expire_all()
+    return {"as_of": as_of, "created": created, "refreshed": refreshed}
+
+
+def refresh_invoice_receivable(db: Session, invoice_id: int) -> None:
+    """Refresh (or create) the receivable of one invoice"""
+    refresh_receivables(db, invoice_ids=[invoice_id])
+
+
+async def run_receivables_refresh_loop(interval_minutes: int) -> None:
+    """Refresh all receivables every ``interval_minutes`` (started from app startup in every process)"""
+    from app.db.session import SessionLocal
+    from app.utils.jobs import claim_periodic_task, finish_periodic_task
+
+    interval = timedelta(minutes=interval_minutes)
+
+    def refresh_once() -> Optional[Dict[str, Any]]:
+        """The refresh result, or None when another process ran it within the interval"""
+        db = SessionLocal()
+        try:
+            if not claim_periodic_task(db, REFRESH_TASK, interval):
+                return None
+            result = refresh_receivables(db)
+            db.commit()
+            finish_periodic_task(db, REFRESH_TASK)
+            return result
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    while True:
+        try:
+            result = await asyncio.to_thread(refresh_once)
+            if result is None:
+                logger.debug("Receivables refresh skipped: another process ran it in the last %s minutes", interval_minutes)
+            else:
+                logger.info("Receivables refreshed: %s rows, %s created", result["refreshed"], result["created"])
+        except Exception:
+            logger.exception("Receivables refresh failed")
+        await asyncio.sleep(interval_minutes * 60)
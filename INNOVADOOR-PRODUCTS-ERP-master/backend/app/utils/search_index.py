@@ -0,0 +1,214 @@
+"""
+Ranked, prefix-matching and typo-tolerant search over ``search_documents``
+(parties, production papers, measurements, leads and quotations; see
+``app.db.models.search`` for what is indexed and how it is kept current).
+
+PostgreSQL runs a single statement using both GIN indexes:
+
+- ``to_tsvector('simple', search_text) @@ to_tsquery('w1:* & w2:*')`` - every
+  query word matches a word of the record or its prefix,
+- ``:q <% search_text`` (``pg_trgm`` word similarity) - close to some words of
+  the record, which catches typos,
+
+ranked by ``ts_rank`` plus word similarity, exact title matches first.
+
+SQLite (development) uses the FTS5 trigram table: records containing every
+query term as a substring are returned ranked by bm25 (title matches boosted).
+Only if there are none, the records sharing most trigrams with the terms are
+scored like ``word_similarity`` and those above FUZZY_THRESHOLD are returned
+(the typo-tolerant pass). Terms shorter than three characters cannot use
+trigrams and fall back to a title prefix match.
+
+Ranking is limited to the first SEARCH_CANDIDATES matching records, so a broad
+query ("PP-0") costs the same as a narrow one; narrow queries - the ones where
+order matters - are ranked in full.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+import re
+
+from sqlalchemy import bindparam, delete, select, text
+from sqlalchemy.orm import Session
+
+from app.db.models.search import (
+    FTS_TABLE, SEARCH_ENTITIES, SearchDocument as DBSearchDocument, document_values, upsert_documents,
+)
+
+MAX_TERMS = 8
+SEARCH_CANDIDATES = 1000
+REBUILD_BATCH_SIZE = 1000
+FUZZY_CANDIDATES = 200  # SQLite: trigram matches scored in Python per query
+FUZZY_THRESHOLD = 0.6  # Share of the query's trigrams found in the record (pg_trgm word_similarity default)
+
+POSTGRES_SEARCH = """
+    SELECT d.entity_type, d.entity_id, d.title, d.subtitle,
+           ts_rank(to_tsvector('simple', d.search_text), to_tsquery('simple', :tsquery))
+           + word_similarity(:q, d.search_text)
+           + CASE WHEN lower(d.title) = lower(:q) THEN 1 ELSE 0 END AS score
+    FROM (
+        SELECT id FROM search_documents
+        WHERE (to_tsvector('simple', search_text) @@ to_tsquery('simple', :tsquery) OR :q <% search_text)
+        {type_filter}
+        LIMIT :candidates
+    ) candidates
+    JOIN search_documents d ON d.id = candidates.id
+    ORDER BY score DESC, d.title
+    LIMIT :limit
+"""
+
+SQLITE_SEARCH = f"""
+    SELECT d.id, d.entity_type, d.entity_id, d.title, d.subtitle, d.search_text,
+           1 - candidates.rank
+           + CASE WHEN lower(d.title) = lower(:q) THEN 2
+                  WHEN lower(d.title) LIKE lower(:q) || '%' THEN 1 ELSE 0 END AS score
+    FROM (
+        SELECT rowid, rank FROM {FTS_TABLE}
+        WHERE {FTS_TABLE} MATCH :match
+        {{type_filter}}
+        {{order}}
+        LIMIT :candidates
+    ) candidates
+    JOIN search_documents d ON d.id = candidates.rowid
+    ORDER BY score DESC
+    LIMIT :limit
+"""
+
+SQLITE_PREFIX_SEARCH = """
+    SELECT d.id, d.entity_type, d.entity_id, d.title, d.subtitle, 0.0 AS score
+    FROM search_documents d
+    WHERE d.title LIKE :prefix ESCAPE '\\'
+    {type_filter}
+    ORDER BY d.title
+    LIMIT :limit
+"""
+
+
+def query_terms(q: str) -> List[str]:
+    """Whitespace separated terms of a query (at most MAX_TERMS)"""
+    return [term for term in q.split() if term][:MAX_TERMS]
+
+
+def trigrams(term: str) -> List[str]:
+    term = term.lower()
+    return sorted({term[i:i + 3] for i in range(len(term) - 2)})
+
+
+def padded_trigrams(value: str) -> set:
+    """Trigrams of each word padded as pg_trgm does ("  w", " wo", ..., "rd ")"""
+    grams = set()
+    for word in re.findall(r"\w+", value.lower()):
+        word = f"  {word} "
+        grams.update(word[i:i + 3] for i in range(len(word) - 2))
+    return grams
+
+
+def similarity(query_grams: set, value: str) -> float:
+    """Share of the query's trigrams present in ``value``"""
+    if not query_grams:
+        return 0.0
+    return len(query_grams & padded_trigrams(value)) / len(query_grams)
+
+
+def fts_phrase(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def with_type_filter(sql: str, column: str, entity_types: Optional[List[str]], **parts):
+    statement = text(sql.format(type_filter=f"AND {column} IN :entity_types" if entity_types else "", **parts))
+    if entity_types:
+        statement = statement.bindparams(bindparam("entity_types", expanding=True))
+    return statement
+
+
+def result_row(row) -> Dict[str, Any]:
+    return {
+        "entity_type": row.entity_type,
+        "entity_id": row.entity_id,
+        "title": row.title,
+        "subtitle": row.subtitle,
+        "score": round(float(row.score or 0), 4),
+    }
+
+
+def search_postgres(db: Session, q: str, entity_types: Optional[List[str]], limit: int) -> List[Dict[str, Any]]:
+    words = re.findall(r"\w+", q.lower())[:MAX_TERMS]
+    if not words:
+        return []
+    params = {
+        "q": q, "tsquery": " & ".join(f"{word}:*" for word in words),
+        "candidates": SEARCH_CANDIDATES, "limit": limit,
+    }
+    if entity_types:
+        params["entity_types"] = entity_types
+    rows = db.execute(with_type_filter(POSTGRES_SEARCH, "entity_type", entity_types), params).all()
+    return [result_row(row) for row in rows]
+
+
+def search_sqlite(db: Session, q: str, entity_types: Optional[List[str]], limit: int) -> List[Dict[str, Any]]:
+    terms = [term for term in query_terms(q) if len(term) >= 3]
+    base = {"q": q, "candidates": SEARCH_CANDIDATES, "limit": limit}
+    if entity_types:
+        base["entity_types"] = entity_types
+
+    if not terms:
+        escaped = re.sub(r"([\\%_])", r"\\\1", q.strip())
+        statement = with_type_filter(SQLITE_PREFIX_SEARCH, "d.entity_type", entity_types)
+        return [result_row(row) for row in db.execute(statement, {**base, "prefix": f"{escaped}%"}).all()]
+
+    statement = with_type_filter(SQLITE_SEARCH, "entity_type", entity_types, order="")
+    rows = db.execute(statement, {**base, "match": " AND ".join(fts_phrase(term) for term in terms)}).all()
+    if rows:
+        return [result_row(row) for row in rows]
+
+    # Nothing contains every term: records sharing trigrams with each term, closest first
+    query_grams = padded_trigrams(q)
+    fuzzy = " OR ".join(fts_phrase(gram) for gram in sorted({gram for term in terms for gram in trigrams(term)}))
+    statement = with_type_filter(SQLITE_SEARCH, "entity_type", entity_types, order="ORDER BY rank")
+    candidates = db.execute(statement, {
+        **base, "match": fuzzy, "candidates": FUZZY_CANDIDATES, "limit": FUZZY_CANDIDATES,
+    }).all()
+    scored = sorted(
+        ((similarity(query_grams, row.search_text), row) for row in candidates),
+        key=lambda item: (-item[0], -similarity(query_grams, item[1].title)),
+    )
+    return [
+        {**result_row(row), "score": round(score, 4)}
+        for score, row in scored[:limit] if score >= FUZZY_THRESHOLD
+    ]
+
+
+def search(db: Session, q: str, entity_types: Optional[Iterable[str]] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    """Best matches for ``q`` (optionally only some entity types), best first"""
+    q = q.strip()
+    if not q:
+        return []
+    entity_types = sorted(set(entity_types)) if entity_types else None
+    if db.get_bind().dialect.name == "postgresql":
+        return search_postgres(db, q, entity_types, limit)
+    return search_sqlite(db, q, entity_types, limit)
+
+
+def rebuild_search_index(db: Session, entity_types: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """Re-index every record of the given entity types (default all); returns rows indexed per type"""
+    connection = db.connection()
+    counts = {}
+    for entity_type in entity_types or SEARCH_ENTITIES:
+        entity = SEARCH_ENTITIES[entity_type]
+        model = entity.model
+        names = sorted({entity.title, *entity.subtitle, *entity.fields})
+        query = select(model.id, *[getattr(model, name) for name in names])
+        if entity.deleted:
+            query = query.where(getattr(model, entity.deleted).isnot(True))
+
+        db.execute(delete(DBSearchDocument).where(DBSearchDocument.entity_type == entity_type))
+        count = 0
+        batch = []
+        for row in db.execute(query.execution_options(yield_per=REBUILD_BATCH_SIZE)):
+            batch.append(document_values(entity_type, row))
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                upsert_documents(connection, batch)
+                count += len(batch)
+                batch = []
+        upsert_documents(connection, batch)
+        counts[entity_type] = count + len(batch)
+    db.flush()
+    return counts
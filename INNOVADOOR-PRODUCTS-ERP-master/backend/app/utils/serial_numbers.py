@@ -0,0 +1,244 @@
+"""
+Serial numbers of measurement item rows (A00001 ... A99999), handed out in
+leased blocks.
+
+Each user with a ``serial_number_prefix`` numbers rows from their own
+``serial_number_counter``, which wraps from 99999 back to 1. Instead of one
+request and one commit per row, a captain leases a block of N consecutive
+numbers for a whole sheet:
+
+- ``lease_serial_numbers`` reserves the block with a single
+  ``UPDATE users ... RETURNING`` (the counter is advanced in SQL, so two tabs
+  leasing at the same time never get the same numbers) and records it as a
+  ``serial_number_leases`` row. A block may wrap: counter 99990 and 20 numbers
+  give 99991..99999, 1..11.
+- ``release_unused_serials`` looks at blocks leased more than
+  ``UNUSED_AFTER`` ago, collects the ``sr_no`` values the user saved on
+  measurements and measurement entries since then, closes the lease and keeps
+  every run of numbers that was never saved as a ``free`` lease.
+- Free leases are handed out again before the counter moves: a request for N
+  numbers claims the first free block of at least N numbers with the user's
+  current prefix (claimed with a conditional ``UPDATE``, so a block is never
+  given out twice) and leaves the rest of the block free.
+- ``number_items`` gives the rows of an imported sheet that have no ``sr_no``
+  leased numbers, ``MAX_LEASE`` at a time.
+- ``close_serial_leases`` closes a user's open leases when an admin assigns a
+  new prefix (the counter restarts, old blocks must not be reused).
+
+All functions only flush, the caller commits.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.db.models.user import (
+    Measurement as DBMeasurement,
+    MeasurementEntry as DBMeasurementEntry,
+    SerialNumberLease as DBSerialNumberLease,
+    User as DBUser,
+)
+from app.utils.paper_measurement_items import parse_json_list
+
+SERIAL_MAX = 99999
+MAX_LEASE = 1000  # Numbers per lease, a measurement sheet is far smaller
+UNUSED_AFTER = timedelta(hours=24)  # A sheet not saved within this time is abandoned
+
+LEASED = "leased"
+FREE = "free"
+CLOSED = "closed"
+
+
+def serial_counters(first_counter: int, count: int) -> List[int]:
+    """Counters of a block, wrapping from SERIAL_MAX to 1"""
+    return [(first_counter - 1 + offset) % SERIAL_MAX + 1 for offset in range(count)]
+
+
+def format_serial(prefix: str, counter: int) -> str:
+    return f"{prefix}{counter:05d}"
+
+
+def lease_serials(lease: DBSerialNumberLease) -> List[str]:
+    """Serial numbers of a lease in order"""
+    return [format_serial(lease.prefix, counter) for counter in serial_counters(lease.first_counter, lease.count)]
+
+
+def reserve_counters(db: Session, user_id: int, count: int) -> Optional[Tuple[str, int]]:
+    """Advance the user's counter by ``count`` in one statement; (prefix, first counter) or None without a prefix"""
+    row = db.execute(
+        update(DBUser)
+        .where(DBUser.id == user_id, DBUser.serial_number_prefix.isnot(None))
+        .values(serial_number_counter=(func.coalesce(DBUser.serial_number_counter, 0) + count - 1) % SERIAL_MAX + 1)
+        .returning(DBUser.serial_number_prefix, DBUser.serial_number_counter)
+    ).first()
+    if row is None:
+        return None
+    prefix, last_counter = row
+    return prefix, (last_counter - count) % SERIAL_MAX + 1
+
+
+def claim_free_lease(db: Session, user_id: int, prefix: str, count: int) -> Optional[DBSerialNumberLease]:
+    """Take ``count`` numbers from the start of a free block of the user, or None when no block is large enough"""
+    candidates = db.execute(
+        select(DBSerialNumberLease.id, DBSerialNumberLease.first_counter, DBSerialNumberLease.count)
+        .where(
+            DBSerialNumberLease.user_id == user_id,
+            DBSerialNumberLease.status == FREE,
+            DBSerialNumberLease.prefix == prefix,
+            DBSerialNumberLease.count >= count,
+        )
+        .order_by(DBSerialNumberLease.id)
+        .limit(5)
+    ).all()
+    for lease_id, first_counter, free_count in candidates:
+        # Only succeeds if nobody claimed the block since it was read
+        claimed = db.execute(
+            update(DBSerialNumberLease)
+            .where(
+                DBSerialNumberLease.id == lease_id,
+                DBSerialNumberLease.status == FREE,
+                DBSerialNumberLease.count == free_count,
+            )
+            .values(status=LEASED, count=count, created_at=func.now())
+            .returning(DBSerialNumberLease.id)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if claimed is None:
+            continue
+        if free_count > count:
+            db.add(DBSerialNumberLease(
+                user_id=user_id, prefix=prefix, status=FREE,
+                first_counter=(first_counter - 1 + count) % SERIAL_MAX + 1, count=free_count - count,
+            ))
+        db.flush()
+        lease = db.get(DBSerialNumberLease, lease_id)
+        db.refresh(lease)
+        return lease
+    return None
+
+
+def lease_serial_numbers(db: Session, user_id: int, count: int) -> Tuple[DBSerialNumberLease, bool]:
+    """Lease ``count`` consecutive serial numbers for the user; (lease, reused a free block)
+
+    Raises ValueError when the user has no serial number prefix.
+    """
+    if not 1 <= count <= MAX_LEASE:
+        raise ValueError(f"A lease holds 1 to {MAX_LEASE} serial numbers")
+    prefix = db.execute(select(DBUser.serial_number_prefix).where(DBUser.id == user_id)).scalar_one_or_none()
+    if not prefix:
+        raise ValueError("Serial number prefix not assigned")
+
+    release_unused_serials(db, user_id)
+    lease = claim_free_lease(db, user_id, prefix, count)
+    if lease is not None:
+        return lease, True
+
+    reserved = reserve_counters(db, user_id, count)
+    if reserved is None:
+        raise ValueError("Serial number prefix not assigned")
+    prefix, first_counter = reserved
+    lease = DBSerialNumberLease(user_id=user_id, prefix=prefix, first_counter=first_counter, count=count, status=LEASED)
+    db.add(lease)
+    db.flush()
+    return lease, False
+
+
+def number_items(db: Session, user_id: int, items: List[Dict[str, Any]]) -> int:
+    """Set ``sr_no`` of the items without one from leased serial numbers, in order; returns items numbered
+
+    Raises ValueError when the user has no serial number prefix.
+    """
+    unnumbered = [item for item in items if not item.get("sr_no")]
+    for start in range(0, len(unnumbered), MAX_LEASE):
+        block = unnumbered[start:start + MAX_LEASE]
+        lease, _ = lease_serial_numbers(db, user_id, len(block))
+        for item, serial in zip(block, lease_serials(lease)):
+            item["sr_no"] = serial
+    return len(unnumbered)
+
+
+def as_utc(value: datetime) -> datetime:
+    """Timestamps read back without a zone (SQLite) are UTC"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def used_serials(db: Session, user_id: int, since: datetime) -> Dict[str, Set[int]]:
+    """Counters by prefix of the sr_no values on the user's measurements and entries saved since ``since``"""
+    item_lists: Iterable[str] = [
+        *db.execute(
+            select(DBMeasurement.items).where(
+                DBMeasurement.created_by == user_id,
+                or_(DBMeasurement.created_at >= since, DBMeasurement.updated_at >= since),
+            )
+        ).scalars(),
+        *db.execute(
+            select(DBMeasurementEntry.measurement_items).where(
+                DBMeasurementEntry.created_by == user_id,
+                or_(DBMeasurementEntry.created_at >= since, DBMeasurementEntry.updated_at >= since),
+            )
+        ).scalars(),
+    ]
+    used: Dict[str, Set[int]] = {}
+    for items in item_lists:
+        for item in parse_json_list(items):
+            sr_no = str(item.get("sr_no") or "").strip() if isinstance(item, dict) else ""
+            prefix = sr_no.rstrip("0123456789")
+            digits = sr_no[len(prefix):]
+            if prefix and digits:
+                used.setdefault(prefix, set()).add(int(digits))
+    return used
+
+
+def unused_runs(lease: DBSerialNumberLease, used: Set[int]) -> List[Tuple[int, int]]:
+    """(first counter, count) of each run of the lease's numbers not in ``used``"""
+    runs: List[Tuple[int, int]] = []
+    for counter in serial_counters(lease.first_counter, lease.count):
+        if counter in used:
+            continue
+        if runs and (runs[-1][0] - 1 + runs[-1][1]) % SERIAL_MAX + 1 == counter:
+            runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+        else:
+            runs.append((counter, 1))
+    return runs
+
+
+def release_unused_serials(db: Session, user_id: int, older_than: timedelta = UNUSED_AFTER) -> List[DBSerialNumberLease]:
+    """Close the user's leases older than ``older_than`` and free the numbers never saved; returns the new free leases"""
+    cutoff = datetime.now(timezone.utc) - older_than
+    stale = [
+        lease
+        for lease in db.execute(
+            select(DBSerialNumberLease).where(
+                DBSerialNumberLease.user_id == user_id, DBSerialNumberLease.status == LEASED,
+            )
+        ).scalars()
+        if lease.created_at is not None and as_utc(lease.created_at) <= cutoff
+    ]
+    if not stale:
+        return []
+
+    used = used_serials(db, user_id, min(lease.created_at for lease in stale))
+    freed = []
+    for lease in stale:
+        lease.status = CLOSED
+        for first_counter, count in unused_runs(lease, used.get(lease.prefix, set())):
+            freed.append(DBSerialNumberLease(
+                user_id=user_id, prefix=lease.prefix, first_counter=first_counter, count=count, status=FREE,
+            ))
+    db.add_all(freed)
+    db.flush()
+    return freed
+
+
+def close_serial_leases(db: Session, user_id: int) -> int:
+    """Close all leased and free blocks of the user; returns leases closed"""
+    result = db.execute(
+        update(DBSerialNumberLease)
+        .where(DBSerialNumberLease.user_id == user_id, DBSerialNumberLease.status.in_([LEASED, FREE]))
+        .values(status=CLOSED)
+        .execution_options(synchronize_session=False)
+    )
+    db.flush()
+    return result.rowcount
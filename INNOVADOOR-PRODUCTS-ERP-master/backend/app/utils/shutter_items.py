@@ -0,0 +1,71 @@
+"""
+Production shutter items and their raw material mirror, written in bulk.
+
+- ``populate_shutter_items``: one ``production_shutter_items`` row per
+  measurement item selected on a Shutter paper (areas from
+  ``app.utils.dimensions.shutter_item_areas``), inserted with a single
+  executemany.
+- ``mirror_rm_shutter_items``: replaces a paper's ``raw_material_shutter_items``
+  with a copy of its shutter items in one ``INSERT ... SELECT`` (item_no becomes
+  sr_no), so no rows travel through Python.
+
+Both return the number of rows written without loading any ORM objects or
+relationships; they only flush, the caller commits.
+"""
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.models.user import (
+    ProductionPaper as DBProductionPaper,
+    ProductionShutterItem as DBProductionShutterItem,
+    RawMaterialShutterItem as DBRawMaterialShutterItem,
+)
+from app.utils.dimensions import shutter_item_areas
+from app.utils.paper_measurement_items import selected_measurement_items
+
+
+def populate_shutter_items(db: Session, paper: DBProductionPaper) -> int:
+    """Insert shutter items for the paper's selected measurement items; returns rows inserted"""
+    selected = selected_measurement_items(db, paper.id)
+    if not selected:
+        return 0
+    thickness = str(paper.thickness or '-')
+    areas = shutter_item_areas([item for _, item in selected])
+    rows = [
+        {
+            "production_paper_id": paper.id,
+            "item_no": str(position + 1),
+            "ro_width": str(item.get('ro_width') or '-'),
+            "ro_height": str(item.get('ro_height') or '-'),
+            "thickness": thickness,
+            **item_areas,
+        }
+        for (position, item), item_areas in zip(selected, areas)
+    ]
+    db.execute(insert(DBProductionShutterItem), rows)
+    db.flush()
+    return len(rows)
+
+
+def mirror_rm_shutter_items(db: Session, paper_id: int) -> int:
+    """Replace the paper's RM shutter items with a copy of its shutter items; returns rows copied"""
+    db.execute(delete(DBRawMaterialShutterItem).where(DBRawMaterialShutterItem.production_paper_id == paper_id))
+    columns = ["production_paper_id", "sr_no", "ro_width", "ro_height", "thickness", "quantity", "sq_ft", "sq_meter", "laminate_sheets"]
+    source = (
+        select(
+            DBProductionShutterItem.production_paper_id,
+            DBProductionShutterItem.item_no,
+            DBProductionShutterItem.ro_width,
+            DBProductionShutterItem.ro_height,
+            DBProductionShutterItem.thickness,
+            DBProductionShutterItem.quantity,
+            DBProductionShutterItem.sq_ft,
+            DBProductionShutterItem.sq_meter,
+            DBProductionShutterItem.laminate_sheets,
+        )
+        .where(DBProductionShutterItem.production_paper_id == paper_id)
+        .order_by(DBProductionShutterItem.id)
+    )
+    result = db.execute(insert(DBRawMaterialShutterItem).from_select(columns, source))
+    db.flush()
+    return result.rowcount
@@ -0,0 +1,250 @@
+"""
+Site / wing fixing progress kept as counters in ``site_wing_progress``.
+
+Each row counts a wing's flats by fixing state (frames fixed, doors fixed, the
+frame-vs-door gap buckets and flats still waiting for required doors). Every
+change to a flat's ``frame_fixed`` / ``door_fixed`` / door requirements - flat
+create and update, frame and door fixing entries from site supervisors and
+carpenter captains, bulk flat import - posts the difference between the flat's
+state before and after.
+
+A wing row that does not exist yet is built from the flats table (for every
+wing of the site that is missing one), so a site's rows are either all there
+or not there at all. Reports read the counters and fall back to a
+``GROUP BY`` over flats for the sites without rows (per site, so sites
+without counters still show up next to counted ones). Posting helpers only
+flush; the caller commits.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import case, exists, func, select, union_all
+from sqlalchemy.orm import Session
+
+from app.db.models.site_supervisor import (
+    Flat as DBFlat,
+    Site as DBSite,
+    SiteWingProgress as DBSiteWingProgress,
+)
+
+COUNTER_FIELDS = [
+    "total_flats",
+    "frames_fixed",
+    "doors_fixed",
+    "both_fixed",
+    "frame_fixed_doors_pending",
+    "doors_fixed_frames_pending",
+    "both_pending",
+    "doors_required",
+    "doors_pending",
+]
+DOOR_REQUIREMENT_FIELDS = [
+    "main_door_required", "bedroom_door_required", "bathroom_door_required", "kitchen_door_required"
+]
+
+
+def flat_counters(frame_fixed: Any, door_fixed: Any, doors_required: Any) -> Dict[str, int]:
+    """Counter contributions (0/1) of one flat"""
+    frame = bool(frame_fixed)
+    door = bool(door_fixed)
+    required = bool(doors_required)
+    return {
+        "total_flats": 1,
+        "frames_fixed": int(frame),
+        "doors_fixed": int(door),
+        "both_fixed": int(frame and door),
+        "frame_fixed_doors_pending": int(frame and not door),
+        "doors_fixed_frames_pending": int(door and not frame),
+        "both_pending": int(not frame and not door),
+        "doors_required": int(required),
+        "doors_pending": int(required and not door),
+    }
+
+
+def flat_progress_state(flat: Any) -> Dict[str, int]:
+    """Counter contributions of a flat (ORM object or dict of Flat columns)"""
+    get = flat.get if isinstance(flat, dict) else lambda field: getattr(flat, field)
+    return flat_counters(
+        get("frame_fixed"),
+        get("door_fixed"),
+        any(get(field) for field in DOOR_REQUIREMENT_FIELDS),
+    )
+
+
+def counter_columns():
+    """SUM(CASE ...) expressions over flats, labelled with COUNTER_FIELDS"""
+    frame = func.coalesce(DBFlat.frame_fixed, False) == True
+    door = func.coalesce(DBFlat.door_fixed, False) == True
+    required = func.coalesce(DBFlat.main_door_required, False) == True
+    for field in DOOR_REQUIREMENT_FIELDS[1:]:
+        required = required | (func.coalesce(getattr(DBFlat, field), False) == True)
+
+    def count(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    return [
+        func.count(DBFlat.id).label("total_flats"),
+        count(frame).label("frames_fixed"),
+        count(door).label("doors_fixed"),
+        count(frame & door).label("both_fixed"),
+        count(frame & ~door).label("frame_fixed_doors_pending"),
+        count(door & ~frame).label("doors_fixed_frames_pending"),
+        count(~frame & ~door).label("both_pending"),
+        count(required).label("doors_required"),
+        count(required & ~door).label("doors_pending"),
+    ]
+
+
+def compute_wing_progress(db: Session, site_id: Optional[int] = None) -> Dict[tuple, Dict[str, int]]:
+    """(site_id, wing) -> counters straight from flats (one GROUP BY query)"""
+    query = db.query(DBFlat.site_id, DBFlat.wing, *counter_columns())
+    if site_id is not None:
+        query = query.filter(DBFlat.site_id == site_id)
+    return {
+        (row.site_id, row.wing): {field: int(getattr(row, field) or 0) for field in COUNTER_FIELDS}
+        for row in query.group_by(DBFlat.site_id, DBFlat.wing).all()
+    }
+
+
+def sync_missing_wings(db: Session, site_id: int) -> None:
+    """Create counter rows, computed from flats, for the site's wings that have none"""
+    db.flush()
+    existing = {
+        wing for (wing,) in db.query(DBSiteWingProgress.wing).filter(DBSiteWingProgress.site_id == site_id).all()
+    }
+    db.bulk_insert_mappings(DBSiteWingProgress, [
+        {"site_id": key_site_id, "wing": wing, **counters}
+        for (key_site_id, wing), counters in compute_wing_progress(db, site_id).items()
+        if wing not in existing
+    ])
+    db.flush()
+
+
+def post_progress(db: Session, site_id: int, wing: str, changes: Dict[str, int]) -> None:
+    """Apply counter changes to a wing (row built from flats if missing)"""
+    changes = {field: value for field, value in changes.items() if value}
+    if not changes:
+        return
+    row = db.query(DBSiteWingProgress).filter(
+        DBSiteWingProgress.site_id == site_id,
+        DBSiteWingProgress.wing == wing
+    ).first()
+    if row is None:
+        # Counts straight from flats already include this change
+        sync_missing_wings(db, site_id)
+        return
+
+    # Update with SQL expressions so concurrent postings cannot lose increments
+    for field, value in changes.items():
+        setattr(row, field, getattr(DBSiteWingProgress, field) + value)
+    db.flush()
+
+
+def post_flat_change(db: Session, flat: DBFlat, before: Optional[Dict[str, int]]) -> None:
+    """
+    Post a flat's change; ``before`` is ``flat_progress_state(flat)`` taken before
+    the change, or None for a new flat.
+    """
+    after = flat_progress_state(flat)
+    changes = {field: after[field] - (before[field] if before else 0) for field in COUNTER_FIELDS}
+    post_progress(db, flat.site_id, flat.wing, changes)
+
+
+def post_new_flats(db: Session, site_id: int, flats: Iterable[Dict[str, Any]]) -> None:
+    """Post already-inserted flats (dicts of Flat columns), one update per wing"""
+    by_wing: Dict[str, Dict[str, int]] = {}
+    for flat in flats:
+        totals = by_wing.setdefault(flat["wing"], {field: 0 for field in COUNTER_FIELDS})
+        for field, value in flat_progress_state(flat).items():
+            totals[field] += value
+    existing = {
+        wing for (wing,) in db.query(DBSiteWingProgress.wing).filter(DBSiteWingProgress.site_id == site_id).all()
+    }
+    # Missing wings are built from flats in one go (that count already includes these flats)
+    if set(by_wing) - existing:
+        sync_missing_wings(db, site_id)
+    for wing, changes in by_wing.items():
+        if wing in existing:
+            post_progress(db, site_id, wing, changes)
+
+
+def get_wing_progress(db: Session, site_id: int) -> Dict[str, Dict[str, int]]:
+    """wing -> counters for a site (counter rows, else GROUP BY over flats)"""
+    rows = db.query(DBSiteWingProgress).filter(DBSiteWingProgress.site_id == site_id).all()
+    if rows:
+        return {row.wing: {field: getattr(row, field) or 0 for field in COUNTER_FIELDS} for row in rows}
+    return {wing: counters for (_, wing), counters in compute_wing_progress(db, site_id).items()}
+
+
+def sum_counters(rows: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    totals = {field: 0 for field in COUNTER_FIELDS}
+    for row in rows:
+        for field in COUNTER_FIELDS:
+            totals[field] += row[field]
+    return totals
+
+
+def get_site_progress_totals(db: Session) -> List[Dict[str, Any]]:
+    """
+    Per-site counters for every site in one query: SUM over the wing rows for
+    sites that have them, UNION ALL a GROUP BY over flats for sites without.
+    """
+    site_columns = [DBSite.id.label("site_id"), DBSite.project_name, DBSite.site_status]
+    site_group = [DBSite.id, DBSite.project_name, DBSite.site_status]
+    counted = select(
+        *site_columns,
+        *[func.coalesce(func.sum(getattr(DBSiteWingProgress, field)), 0).label(field) for field in COUNTER_FIELDS],
+    ).join(DBSiteWingProgress, DBSiteWingProgress.site_id == DBSite.id).group_by(*site_group)
+    uncounted = select(*site_columns, *counter_columns()).join(
+        DBFlat, DBFlat.site_id == DBSite.id
+    ).where(
+        ~exists().where(DBSiteWingProgress.site_id == DBSite.id)
+    ).group_by(*site_group)
+    totals = union_all(counted, uncounted).subquery()
+    rows = db.execute(select(totals).order_by(totals.c.site_id)).all()
+    return [
+        {
+            "site_id": row.site_id,
+            "project_name": row.project_name,
+            "site_status": row.site_status,
+            **{field: int(getattr(row, field) or 0) for field in COUNTER_FIELDS},
+        }
+        for row in rows
+    ]
+
+
+def completion_percent(done: int, total: int) -> float:
+    return round((done / total * 100) if total > 0 else 0, 2)
+
+
+def rebuild_site_progress(db: Session) -> int:
+    """Replace all counter rows with a full recomputation from flats"""
+    db.query(DBSiteWingProgress).delete(synchronize_session=False)
+    db.flush()
+    progress = compute_wing_progress(db)
+    db.bulk_insert_mappings(DBSiteWingProgress, [
+        {"site_id": site_id, "wing": wing, **counters} for (site_id, wing), counters in progress.items()
+    ])
+    db.flush()
+    return len(progress)
+
+
+def check_site_progress(db: Session) -> List[Dict[str, Any]]:
+    """Compare stored counters with a full recomputation; returns the mismatching wings"""
+    expected = compute_wing_progress(db)
+    stored = {
+        (row.site_id, row.wing): {field: getattr(row, field) or 0 for field in COUNTER_FIELDS}
+        for row in db.query(DBSiteWingProgress).all()
+    }
+    empty = {field: 0 for field in COUNTER_FIELDS}
+    mismatches = []
+    for key in sorted(set(expected) | set(stored)):
+        want = expected.get(key, empty)
+        have = stored.get(key, empty)
+        differences = {
+            field: {"stored": have[field], "expected": want[field]}
+            for field in COUNTER_FIELDS
+            if have[field] != want[field]
+        }
+        if differences:
+            mismatches.append({"site_id": key[0], "wing": key[1], "differences": differences})
+    return mismatches
@@ -0,0 +1,88 @@
+"""
+Usernames of user ids for history, audit and list responses.
+
+Responses show ``changed_by_username`` / ``created_by_username`` next to a user
+id. Looking the user up per row costs one query per history entry or list row
+(and loading the relationship pulls the whole ``users`` row, profile image
+included). ``resolve_usernames`` answers a whole page at once:
+
+- ids already known come from a process-wide LRU (``CACHE_SIZE`` ids),
+- the rest are read with one ``SELECT id, username ... WHERE id IN (...)``.
+
+Ids that do not exist resolve to None and are not cached. The cache is kept
+right by SQLAlchemy events: a user updated or deleted through the ORM is
+dropped from it at flush and again once the session commits (so a lookup
+between the two cannot keep the old name). ``invalidate_users`` clears ids (or
+everything) for changes made with plain SQL.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.db.models.user import User as DBUser
+
+CACHE_SIZE = 4096
+
+_usernames: "OrderedDict[int, str]" = OrderedDict()
+_lock = Lock()
+
+
+def resolve_usernames(db: Session, user_ids: Iterable[Optional[int]]) -> Dict[int, Optional[str]]:
+    """Username of each id (None for unknown ids), with one query for the ids not cached"""
+    ids = {user_id for user_id in user_ids if user_id is not None}
+    resolved: Dict[int, Optional[str]] = {}
+    with _lock:
+        for user_id in ids:
+            if user_id in _usernames:
+                _usernames.move_to_end(user_id)
+                resolved[user_id] = _usernames[user_id]
+    missing = ids - resolved.keys()
+    if not missing:
+        return resolved
+
+    found = dict(db.execute(select(DBUser.id, DBUser.username).where(DBUser.id.in_(missing))).all())
+    with _lock:
+        for user_id, username in found.items():
+            _usernames[user_id] = username
+            _usernames.move_to_end(user_id)
+        while len(_usernames) > CACHE_SIZE:
+            _usernames.popitem(last=False)
+    for user_id in missing:
+        resolved[user_id] = found.get(user_id)
+    return resolved
+
+
+def username_for(db: Session, user_id: Optional[int]) -> Optional[str]:
+    """Username of one id (None when there is no such user)"""
+    if user_id is None:
+        return None
+    return resolve_usernames(db, [user_id]).get(user_id)
+
+
+def invalidate_users(user_ids: Optional[Iterable[int]] = None) -> None:
+    """Drop ids from the cache, or every id when none are given"""
+    with _lock:
+        if user_ids is None:
+            _usernames.clear()
+            return
+        for user_id in user_ids:
+            _usernames.pop(user_id, None)
+
+
+@event.listens_for(DBUser, "after_update")
+@event.listens_for(DBUser, "after_delete")
+def _user_changed(mapper, connection, user: DBUser) -> None:
+    invalidate_users([user.id])
+    session = Session.object_session(user)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(user.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _users_committed(session: Session) -> None:
+    changed = session.info.pop("changed_user_ids", None)
+    if changed:
+        invalidate_users(changed)
@@ -0,0 +1,140 @@
+"""
+Benchmark bank statement parsing and receipt matching on synthetic data.
+
+Builds open receipts (cheque, UTR and cash-like), a CSV statement whose credit
+lines pay most of them (some with bank charges deducted, some dated a few days
+later) plus unrelated lines, then times CSV parsing and the matcher. The
+statement generator knows which receipt each line pays, so proposals are also
+scored for precision per match type (wrong receipt, or a receipt proposed for a
+line that pays none). The matcher works on plain rows, so no database is needed.
+
+--check exits non-zero when a match type confirmed in bulk has precision below
+--min-precision (low-confidence types are only reported; they are reviewed one
+by one).
+
+Usage:
+    python benchmark_bank_matching.py [--receipts 50000] [--lines 10000] [--repeat 3] [--check]
+"""
+import argparse
+import csv
+import io
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.utils.bank_reconciliation import (
+    LOW_CONFIDENCE_MATCH_TYPES, confirmable_in_bulk, iter_csv_statement, match_statement_lines,
+)
+
+
+def build_receipts(count: int) -> list:
+    random.seed(1)
+    start = date(2026, 1, 1)
+    receipts = []
+    for i in range(count):
+        kind = random.random()
+        receipts.append({
+            "id": i + 1,
+            "amount": Decimal(random.randrange(50000, 50000000)) / 100,
+            "payment_date": start + timedelta(days=random.randrange(0, 180)),
+            "cheque_number": f"{random.randrange(1, 999999):06d}" if kind < 0.4 else None,
+            "transaction_reference": f"UTIB{random.randrange(10**11, 10**12)}" if 0.4 <= kind < 0.8 else None,
+        })
+    return receipts
+
+
+def build_statement(receipts: list, count: int) -> tuple:
+    """CSV content and the receipt id paid by each line number (None for unrelated lines)"""
+    random.seed(2)
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["Account Statement"])
+    writer.writerow(["Txn Date", "Narration", "Chq./Ref.No.", "Withdrawal Amt", "Deposit Amt"])
+    paid = random.sample(receipts, min(int(count * 0.85), len(receipts)))
+    rows = []
+    for receipt in paid:
+        amount = receipt["amount"]
+        if random.random() < 0.1:
+            amount -= Decimal("0.50")  # bank charges
+        day = receipt["payment_date"] + timedelta(days=random.choice([0, 0, 1, 2, 5]))
+        reference = receipt["cheque_number"] or receipt["transaction_reference"] or ""
+        narration = f"NEFT CR-{reference}-CUSTOMER" if receipt["transaction_reference"] else "CLG CHQ DEP"
+        rows.append([day.strftime("%d/%m/%Y"), narration, receipt["cheque_number"] or "", "", f"{amount:,.2f}", receipt["id"]])
+    while len(rows) < count:
+        day = date(2026, 1, 1) + timedelta(days=random.randrange(0, 180))
+        if random.random() < 0.5:
+            rows.append([day.strftime("%d/%m/%Y"), "ATM WDL", "", f"{random.randrange(100, 50000)}.00", "", None])
+        else:
+            rows.append([day.strftime("%d/%m/%Y"), "INT CREDIT", "", "", f"{random.randrange(100, 5000)}.37", None])
+    random.shuffle(rows)
+    writer.writerows(row[:-1] for row in rows)
+    truth = {line_number: row[-1] for line_number, row in enumerate(rows, start=3)}  # After title and header rows
+    return out.getvalue().encode("utf-8"), truth
+
+
+def precision_by_type(lines: list, truth: dict) -> dict:
+    """match type -> (proposed, correct)"""
+    result = {}
+    for line in lines:
+        if not line.get("payment_receipt_id"):
+            continue
+        proposed, correct = result.get(line["match_type"], (0, 0))
+        result[line["match_type"]] = (proposed + 1, correct + (truth[line["line_number"]] == line["payment_receipt_id"]))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--receipts", type=int, default=50000)
+    parser.add_argument("--lines", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-precision", type=float, default=0.99)
+    parser.add_argument("--check", action="store_true", help="Exit non-zero below the precision targets")
+    args = parser.parse_args()
+
+    receipts = build_receipts(args.receipts)
+    content, truth = build_statement(receipts, args.lines)
+    print(f"{args.receipts} receipts, {args.lines} statement lines ({len(content) / 1024:.0f} KiB CSV)")
+
+    parse_times, match_times = [], []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        lines = [{**line, "status": "unmatched"} for line in iter_csv_statement(io.BytesIO(content))]
+        parse_times.append(time.perf_counter() - started)
+
+        rows = [dict(receipt) for receipt in receipts]
+        started = time.perf_counter()
+        counts = match_statement_lines(lines, rows)
+        match_times.append(time.perf_counter() - started)
+
+    credits = sum(1 for line in lines if line["amount"] > 0)
+    print(f"parse: {min(parse_times) * 1000:.0f} ms   match: {min(match_times) * 1000:.0f} ms")
+    print(f"credit lines: {credits}, proposed: {sum(counts.values())} {counts}")
+
+    failures = []
+    precision = precision_by_type(lines, truth)
+    for match_type, (proposed, correct) in sorted(precision.items()):
+        low = match_type in LOW_CONFIDENCE_MATCH_TYPES
+        print(f"  {match_type:<14} {correct}/{proposed} correct ({correct / proposed:.1%})"
+              + ("  low confidence, not confirmed in bulk" if low else ""))
+        if not low and correct / proposed < args.min_precision:
+            failures.append(f"{match_type} precision {correct / proposed:.1%} < {args.min_precision:.0%}")
+    bulk = [line for line in lines if line.get("payment_receipt_id") and confirmable_in_bulk(line)]
+    bulk_correct = sum(truth[line["line_number"]] == line["payment_receipt_id"] for line in bulk)
+    if bulk:
+        print(f"bulk confirmable: {bulk_correct}/{len(bulk)} correct ({bulk_correct / len(bulk):.2%})")
+    missed = sum(1 for line in lines if truth[line["line_number"]] and not line.get("payment_receipt_id"))
+    print(f"paid lines left unmatched: {missed}")
+
+    if args.check:
+        for failure in failures:
+            print(f"[FAIL] {failure}")
+        if failures:
+            sys.exit(1)
+        print("[OK] match precision within targets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark the department capacity calendar on synthetic schedules.
+
+Books department schedule entries of N open schedules (as build_capacity_calendar
+does) and times booking, the overload scan and the overload check run before
+saving one more schedule. The calendar is pure Python, so no database is needed.
+
+Entries without planned_hours (what the scheduling screen sends) book the
+stage hours of their department, as build_capacity_calendar does for the
+paper's product. --check verifies that such entries overload a department when
+their stage hours exceed its capacity, that entries with no known stage
+duration are skipped, and that planned_hours above capacity are rejected.
+
+Usage:
+    python benchmark_capacity.py [--schedules 5000] [--departments 8] [--check]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from app.utils.capacity_planner import CapacityCalendar, department_stage_hours
+
+
+def build_calendar(departments: int) -> CapacityCalendar:
+    calendar = CapacityCalendar()
+    for d in range(departments):
+        calendar.add_department(d + 1, f"Department {d + 1}", 1 + d % 3)
+    return calendar
+
+
+def build_stage_hours(departments: int) -> dict:
+    return department_stage_hours([(f"Department {d + 1}", 4.0 + d % 5) for d in range(departments)])
+
+
+def build_entries(count: int, departments: int, start: date) -> list:
+    random.seed(1)
+    schedules = []
+    for _ in range(count):
+        entries = []
+        day = start + timedelta(days=random.randint(0, 180))
+        for d in random.sample(range(departments), 3):
+            end = day + timedelta(days=random.randint(0, 4))
+            entry = {
+                "department": f"Department {d + 1}",
+                "planned_start": day.isoformat(),
+                "planned_end": end.isoformat(),
+            }
+            if random.random() < 0.5:
+                entry["planned_hours"] = round(random.uniform(2, 20), 1)
+            entries.append(entry)
+            day = end
+        schedules.append(entries)
+    return schedules
+
+
+def check_hourless_overlap() -> list:
+    failures = []
+    entry = {"department": "Cutting", "planned_start": "2026-01-05", "planned_end": "2026-01-09"}
+    stages = department_stage_hours([("Cutting", 40.0), ("Pressing", 0.0)])
+
+    calendar = CapacityCalendar()
+    calendar.add_department(1, "Cutting", 1)
+    calendar.book_entries([entry], 1, stage_hours_by_department=stages)
+    if not calendar.overloads_caused_by([dict(entry)], "new", stages):
+        failures.append("two overlapping schedules of 40 stage hours each do not overload a one-supervisor department")
+
+    calendar = CapacityCalendar()
+    calendar.add_department(1, "Cutting", 1)
+    calendar.book_entries([entry], 1, stage_hours_by_department=stages)
+    if calendar.overloads_caused_by([dict(entry, department="Pressing")], "new", stages):
+        failures.append("an entry without planned_hours or a stage duration is counted against capacity")
+
+    calendar = CapacityCalendar()
+    calendar.add_department(1, "Cutting", 1)
+    calendar.book_entries([entry], 1)
+    if calendar.overloads_caused_by([dict(entry)], "new"):
+        failures.append("entries with no known stage duration overload a department")
+
+    calendar = CapacityCalendar()
+    calendar.add_department(1, "Cutting", 1)
+    calendar.book_entries([dict(entry, planned_hours=40)], 1)
+    if not calendar.overloads_caused_by([dict(entry, planned_hours=10)], "new"):
+        failures.append("planned_hours above capacity are not reported as an overload")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schedules", type=int, default=5000)
+    parser.add_argument("--departments", type=int, default=8)
+    parser.add_argument("--check", action="store_true", help="Exit non-zero if a correctness check fails")
+    args = parser.parse_args()
+
+    start = date(2026, 1, 1)
+    schedules = build_entries(args.schedules, args.departments, start)
+    stages = build_stage_hours(args.departments)
+
+    began = time.perf_counter()
+    calendar = build_calendar(args.departments)
+    for schedule_id, entries in enumerate(schedules, 1):
+        calendar.book_entries(entries, schedule_id, stage_hours_by_department=stages)
+    book_ms = (time.perf_counter() - began) * 1000
+
+    began = time.perf_counter()
+    overloads = calendar.overloads()
+    scan_ms = (time.perf_counter() - began) * 1000
+
+    began = time.perf_counter()
+    calendar.overloads_caused_by(schedules[0], "new", stages)
+    check_ms = (time.perf_counter() - began) * 1000
+
+    print(f"schedules={args.schedules} departments={args.departments}")
+    print(f"book: {book_ms:.1f} ms  overload scan: {scan_ms:.1f} ms ({len(overloads)} overloaded days)"
+          f"  check one schedule: {check_ms:.1f} ms")
+
+    if args.check:
+        failures = check_hourless_overlap()
+        for failure in failures:
+            print(f"[FAIL] {failure}")
+        if failures:
+            sys.exit(1)
+        print("[OK] schedules without planned_hours book their stage hours; entries with no duration are skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark worker cold start: time from launching N uvicorn processes at once
+(as N workers of a deployment start together) until each has answered its
+first request.
+
+Every worker gets its own port and its own client thread so each one's time
+can be measured. For each worker the benchmark reports the time from launch
+to the first /health response and to the first response of each API path (an
+unauthenticated 401/403 still means the route was resolved and its module
+loaded). The gate is the slowest worker's first response to the first path:
+/health answers before any router is loaded, so it says little about when a
+worker can serve. The default target is the eager baseline (``--eager``
+starts the workers with LAZY_ROUTERS=false). The database is a temporary
+SQLite file upgraded to the Alembic head before the workers start, and the
+in-process receivables refresh is disabled.
+
+Usage:
+    python benchmark_cold_start.py [--workers 4] [--runs 3] [--path /api/v1/production/parties]
+                                   [--target-ms 17400] [--eager]
+"""
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+# Slowest of 4 workers to the first /api/v1/production/parties response with LAZY_ROUTERS=false
+# (--eager), median of 3 runs on one CPU. Lazy routers must beat it.
+EAGER_BASELINE_MS = 17400.0
+DEFAULT_PATHS = ["/api/v1/production/parties", "/api/v1/accounts/receivables"]
+
+
+def prepare_database(path: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": f"sqlite:///{path}",
+        "MIGRATE_ON_STARTUP": "false",
+        "RECEIVABLES_REFRESH_INTERVAL_MINUTES": "0",
+    })
+    subprocess.run(
+        [sys.executable, "-c", "from app.db.migrations import upgrade_to_head; upgrade_to_head()"],
+        cwd=BACKEND_DIR, env=env, check=True, capture_output=True,
+    )
+    return env
+
+
+def first_response(port: int, path: str, deadline: float) -> float:
+    """Poll until the server answers ``path``; returns the monotonic time of the answer"""
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            connection.request("GET", path)
+            connection.getresponse().read()
+            connection.close()
+            return time.monotonic()
+        except (ConnectionError, OSError):
+            time.sleep(0.01)
+    raise TimeoutError(f"No response from port {port} for {path}")
+
+
+def worker_timings(port: int, paths: list, started: float, deadline: float) -> dict:
+    """{"health": ms, path: ms, ...} since launch: /health first, then each path in turn"""
+    timings = {"health": (first_response(port, "/health", deadline) - started) * 1000}
+    for path in paths:
+        timings[path] = (first_response(port, path, deadline) - started) * 1000
+    return timings
+
+
+def run_once(env: dict, workers: int, base_port: int, paths: list, timeout: float) -> list:
+    """Start the workers together; per worker {"health": ms, path: ms, ...} since launch"""
+    started = time.monotonic()
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+             "--port", str(base_port + i), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+        for i in range(workers)
+    ]
+    try:
+        # One client thread per worker, so no worker waits on another's requests
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(
+                lambda i: worker_timings(base_port + i, paths, started, started + timeout), range(workers)
+            ))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8700, help="First worker port")
+    parser.add_argument("--path", action="append", dest="paths", help="API path to request after /health (repeatable)")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument(
+        "--target-ms", type=float, default=EAGER_BASELINE_MS,
+        help="Fail if the slowest worker's first response to the first --path exceeds this "
+             "(default: the eager baseline, %(default).0f ms)",
+    )
+    parser.add_argument("--eager", action="store_true", help="Start the workers with LAZY_ROUTERS=false")
+    args = parser.parse_args()
+    paths = args.paths or DEFAULT_PATHS
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = prepare_database(os.path.join(directory, "cold_start.db"))
+        if args.eager:
+            env["LAZY_ROUTERS"] = "false"
+        runs = [run_once(env, args.workers, args.port, paths, args.timeout) for _ in range(args.runs)]
+
+    print(f"Workers: {args.workers}, runs: {args.runs}, CPUs: {os.cpu_count()}, "
+          f"routers: {'eager' if args.eager else 'lazy'}")
+    for key in ["health"] + paths:
+        values = [worker[key] for run in runs for worker in run]
+        slowest = [max(worker[key] for worker in run) for run in runs]
+        label = "first /health" if key == "health" else f"first {key}"
+        print(
+            f"{label:<50} median {statistics.median(values):8.0f} ms  "
+            f"slowest worker (median of runs) {statistics.median(slowest):8.0f} ms"
+        )
+
+    # A worker is ready when it has served an API request, not when /health (no router) answers
+    result = statistics.median([max(worker[paths[0]] for worker in run) for run in runs])
+    if result > args.target_ms:
+        print(f"[FAIL] Slowest worker served {paths[0]} {result:.0f} ms after launch, target {args.target_ms:.0f} ms")
+        return 1
+    print(f"[OK] Slowest worker served {paths[0]} {result:.0f} ms after launch, target {args.target_ms:.0f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Benchmark response compression for representative API payloads.
+
+Reports bytes-on-wire and CPU time per encoding for synthetic versions of the
+largest list responses (measurements with items, parties with site addresses
+and contacts, quotations with line items).
+
+Usage:
+    python benchmark_compression.py [--rows 200] [--repeat 20]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+from app.core.compression import brotli, compress_bytes
+
+
+def build_measurements(rows: int) -> list:
+    random.seed(1)
+    measurements = []
+    for m in range(rows):
+        items = []
+        for i in range(40):
+            items.append({
+                "sr_no": str(i + 1),
+                "bldg": random.choice(["A", "B", "C", "D"]),
+                "flat_no": f"{random.randint(1, 30)}0{random.randint(1, 4)}",
+                "area": random.choice(["MD", "BED", "BATH", "DRB"]),
+                "ro_width": f"{random.choice([32, 34, 36, 38])}.00",
+                "ro_height": f"{random.choice([78, 80, 84])}.00",
+                "act_width": "",
+                "act_height": "",
+                "qty": random.randint(1, 3),
+                "wall": "9\" WALL",
+            })
+        measurements.append({
+            "id": m + 1,
+            "measurement_type": "regular_shutter",
+            "measurement_number": f"A{m + 1:05d}",
+            "party_id": m % 25,
+            "party_name": f"Shree Developers Pvt Ltd {m % 25}",
+            "thickness": "35 MM",
+            "site_location": "Wakad, Pune",
+            "approval_status": "approved",
+            "items": items,
+            "created_at": "2025-01-10T10:15:00+05:30",
+        })
+    return measurements
+
+
+def build_parties(rows: int) -> list:
+    random.seed(2)
+    parties = []
+    for p in range(rows):
+        parties.append({
+            "id": p + 1,
+            "party_type": "Builder",
+            "name": f"Shree Developers Pvt Ltd {p}",
+            "customer_code": f"CUST{p:05d}",
+            "gstin_number": f"27ABCDE{p:04d}F1Z5",
+            "contact_persons": [
+                {"name": f"Contact {c}", "designation": "Site Engineer", "mobile_number": f"98{random.randint(10000000, 99999999)}", "email": f"contact{c}@example.com"}
+                for c in range(3)
+            ],
+            "site_addresses": [
+                {"project_site_name": f"Project {s}", "address_line1": "Survey No. 12, Near Highway", "city": "Pune", "state": "Maharashtra", "pin_code": "411057"}
+                for s in range(4)
+            ],
+            "frame_requirements": [{"product_type": "Frame", "wall_type": "9\" WALL", "rebate": "40MM"}],
+            "door_requirements": [{"product_type": "Main Door Shutter", "thickness": "35 MM", "laminate": "1MM"}],
+        })
+    return parties
+
+
+def build_quotations(rows: int) -> list:
+    random.seed(3)
+    quotations = []
+    for q in range(rows):
+        quotations.append({
+            "id": q + 1,
+            "quotation_number": f"QUO-2025-{q:05d}",
+            "status": "sent",
+            "line_items": [
+                {"product_type": "Bedroom Door Shutter", "description": "35MM laminated flush shutter", "quantity": random.randint(10, 200), "unit": "NOS", "rate": 3450.0, "amount": 0.0}
+                for _ in range(15)
+            ],
+            "subtotal": 0.0, "cgst_amount": 0.0, "sgst_amount": 0.0, "grand_total": 0.0,
+        })
+    return quotations
+
+
+def measure(payload: bytes, encoding: str, repeat: int, **kwargs) -> tuple:
+    start = time.process_time()
+    for _ in range(repeat):
+        compressed = compress_bytes(payload, encoding, **kwargs)
+    cpu_ms = (time.process_time() - start) * 1000 / repeat
+    return len(compressed), cpu_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200, help="Records per payload")
+    parser.add_argument("--repeat", type=int, default=20, help="Compressions per measurement")
+    args = parser.parse_args()
+
+    payloads = {
+        "measurements": build_measurements(args.rows),
+        "parties": build_parties(args.rows),
+        "quotations": build_quotations(args.rows),
+    }
+
+    configs = [("gzip", {"gzip_level": 1}), ("gzip", {"gzip_level": 6}), ("gzip", {"gzip_level": 9})]
+    if brotli is not None:
+        configs += [("br", {"brotli_quality": 1}), ("br", {"brotli_quality": 4}), ("br", {"brotli_quality": 11})]
+    else:
+        print("brotli not installed - only gzip is measured", file=sys.stderr)
+
+    print(f"{'payload':<14}{'encoding':<12}{'raw bytes':>12}{'wire bytes':>12}{'ratio':>8}{'cpu ms':>10}")
+    for name, data in payloads.items():
+        raw = json.dumps(data).encode("utf-8")
+        for encoding, kwargs in configs:
+            level = kwargs.get("gzip_level", kwargs.get("brotli_quality"))
+            size, cpu_ms = measure(raw, encoding, args.repeat, **kwargs)
+            label = f"{encoding}-{level}"
+            print(f"{name:<14}{label:<12}{len(raw):>12}{size:>12}{len(raw) / size:>8.1f}{cpu_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
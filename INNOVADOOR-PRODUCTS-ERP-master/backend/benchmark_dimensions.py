@@ -0,0 +1,164 @@
+"""
+Benchmark and golden check of the dimension / area arithmetic (app.utils.dimensions).
+
+Generates measurement items the way they arrive from the measurement screens
+(mm and inch values, quoted inches, blanks, dashes, text, codes typed into a
+dimension column, every quantity spelling) and runs the three calculations
+that use them: production shutter items, the raw material paper and the raw
+material requirements table.
+
+--check compares the output for the items stored in the golden file with the
+output stored there (recorded before the calculations were merged, so any
+difference is a change of results); --write-golden records the current output
+instead. Without either, times each calculation over --items items.
+
+Usage:
+    python benchmark_dimensions.py [--items 100000] [--repeat 3]
+    python benchmark_dimensions.py --check [--golden golden/dimension_areas.json]
+    python benchmark_dimensions.py --write-golden [--golden-items 500]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from app.utils.dimensions import shutter_item_areas
+from app.utils.raw_material_parser import parse_raw_material_table, raw_material_paper_rows
+
+GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "dimension_areas.json")
+WIDTH_KEYS = ["ro_width", "width", "w", "act_width"]
+HEIGHT_KEYS = ["ro_height", "height", "h", "act_height"]
+
+
+def dimension(rng: random.Random, mm: bool):
+    kind = rng.random()
+    value = rng.randrange(450, 1300) if mm else round(rng.uniform(18, 60), rng.choice([0, 1, 2]))
+    if kind < 0.55:
+        return str(value)
+    if kind < 0.70:
+        return value
+    if kind < 0.78:
+        return f'{value}"'
+    if kind < 0.82:
+        return f" {value} "
+    return rng.choice(["", "-", None, 0, "0", "abc", "10478", "12 in", "34.5.6", 150, 100, "100.004", "-0.001"])
+
+
+def quantity(rng: random.Random):
+    return rng.choice([None, "", 0, 1, 1, 1, 2, 3, 4, "2", "3", "2.0", "1.5", 2.7, "x", "0"])
+
+
+def build_items(count: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        mm = rng.random() < 0.6
+        item = {"sr_no": str(i + 1), "bldg": rng.choice(["A", "B", "C", ""])}
+        item[rng.choice(WIDTH_KEYS)] = dimension(rng, mm)
+        item[rng.choice(HEIGHT_KEYS)] = dimension(rng, mm)
+        if rng.random() < 0.2:
+            item[rng.choice(WIDTH_KEYS)] = dimension(rng, not mm)
+        item[rng.choice(["qty", "quantity"])] = quantity(rng)
+        if rng.random() < 0.3:
+            item["thickness"] = rng.choice(["30mm", "32mm", "35mm"])
+        items.append(item)
+    return items
+
+
+def raw_material_paper(items: list) -> dict:
+    """The numbers of the raw material paper as get_raw_material_data returns them"""
+    rows, totals = [], {"quantity": 0, "sq_ft": 0.0, "sq_meter": 0.0, "total_laminate_sq_ft": 0.0, "total_laminate_sheets": 0}
+    for i, row in enumerate(raw_material_paper_rows(items)):
+        rows.append({
+            "sr_no": i + 1,
+            "ro_width": row["ro_width"],
+            "ro_height": row["ro_height"],
+            "quantity": row["quantity"],
+            "sq_ft": round(row["sq_ft"], 3),
+            "sq_meter": round(row["sq_meter"], 4),
+            "laminate_sq_ft": round(row["laminate_sq_ft"], 3),
+            "laminate_sheets": row["laminate_sheets"],
+            "source": row["item"].get("sr_no"),
+        })
+        totals["quantity"] += row["quantity"]
+        totals["sq_ft"] += row["sq_ft"]
+        totals["sq_meter"] += row["sq_meter"]
+        totals["total_laminate_sq_ft"] += row["laminate_sq_ft"]
+        totals["total_laminate_sheets"] += row["laminate_sheets"]
+    totals.update(
+        sq_ft=round(totals["sq_ft"], 3), sq_meter=round(totals["sq_meter"], 4),
+        total_laminate_sq_ft=round(totals["total_laminate_sq_ft"], 3),
+    )
+    return {"items": rows, "totals": totals}
+
+
+CALCULATIONS = {
+    "shutter_items": shutter_item_areas,
+    "raw_material_paper": raw_material_paper,
+    "requirements_table": lambda items: parse_raw_material_table(items, 1),
+}
+
+
+def check(path: str) -> int:
+    with open(path) as f:
+        golden = json.load(f)
+    items = golden["items"]
+    failed = 0
+    for name, calculate in CALCULATIONS.items():
+        # Round trip through JSON so tuples / ints compare as they were stored
+        output = json.loads(json.dumps(calculate(items)))
+        if output == golden[name]:
+            print(f"[OK] {name}: identical for {len(items)} items")
+        else:
+            failed += 1
+            print(f"[FAIL] {name}: output differs from {os.path.relpath(path)}")
+    return 1 if failed else 0
+
+
+def write_golden(path: str, count: int) -> None:
+    items = build_items(count, seed=7)
+    golden = {"items": items, **{name: calculate(items) for name, calculate in CALCULATIONS.items()}}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(golden, f, indent=1)
+        f.write("\n")
+    print(f"Wrote {count} items and their results to {os.path.relpath(path)}")
+
+
+def benchmark(count: int, repeat: int) -> None:
+    items = build_items(count)
+    print(f"{count} measurement items, best of {repeat}")
+    for name, calculate in CALCULATIONS.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            calculate(items)
+            timings.append(time.perf_counter() - started)
+        best = min(timings)
+        print(f"{name:<20} {best * 1000:8.1f} ms  {count / best / 1000:8.0f}k items/s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--golden", default=GOLDEN)
+    parser.add_argument("--golden-items", type=int, default=500)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--check", action="store_true", help="Compare with the golden file")
+    mode.add_argument("--write-golden", action="store_true", help="Record the current output as the golden file")
+    args = parser.parse_args()
+
+    if args.check:
+        return check(args.golden)
+    if args.write_golden:
+        write_golden(args.golden, args.golden_items)
+        return 0
+    benchmark(args.items, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
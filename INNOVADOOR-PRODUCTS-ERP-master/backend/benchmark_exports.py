@@ -0,0 +1,132 @@
+"""
+Memory and time of streamed register exports (app.utils.exports).
+
+Builds a throwaway SQLite database with --rows account receivables, then
+exports them the way GET /accounts/receivables/export does, as CSV and as
+XLSX, each in a fresh process that writes the file to /dev/null and reports
+its size, the time taken and the peak RSS of the process.
+
+--check exits with 1 when an export needs more than --max-rss-mb.
+
+Usage:
+    python benchmark_exports.py [--rows 1000000]
+    python benchmark_exports.py --check [--max-rss-mb 100]
+"""
+import argparse
+import datetime
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+import app.db.models  # noqa: F401 - register all tables
+from app.db.models.accounts import AccountReceivable as DBAccountReceivable
+from app.utils.exports import csv_chunks, export_columns, iter_row_chunks, xlsx_chunks
+
+BATCH = 20000
+
+
+def create_receivables(engine, count: int) -> None:
+    start = datetime.date(2024, 4, 1)
+    with engine.begin() as connection:
+        for first in range(0, count, BATCH):
+            connection.execute(insert(DBAccountReceivable), [
+                {
+                    "id": i + 1, "tax_invoice_id": i + 1, "invoice_number": f"INV-{i + 1:07d}",
+                    "invoice_date": start + datetime.timedelta(days=i % 365), "invoice_amount": 1000 + i % 50000,
+                    "party_id": i % 500 + 1, "party_name": f"Party {i % 500 + 1}", "total_paid": i % 1000,
+                    "outstanding_amount": 1000 + i % 50000 - i % 1000, "status": "outstanding",
+                    "aging_bucket": "0-30",
+                }
+                for i in range(first, min(first + BATCH, count))
+            ])
+
+
+def peak_rss_mb() -> float:
+    """Peak RSS of this process (VmHWM: ru_maxrss would include the parent's peak, it survives exec)"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def export(path: str, export_format: str) -> None:
+    """Child process: stream the export to /dev/null and print size, rows, seconds and peak RSS"""
+    engine = create_engine(f"sqlite:///{path}")
+    Session = sessionmaker(bind=engine)
+    stmt = select(*export_columns(DBAccountReceivable)).order_by(DBAccountReceivable.invoice_date.desc())
+    header = [column.name for column in stmt.selected_columns]
+    rows = 0
+
+    def counted(chunks):
+        nonlocal rows
+        for chunk in chunks:
+            rows += len(chunk)
+            yield chunk
+
+    writer = xlsx_chunks if export_format == "xlsx" else csv_chunks
+    size = 0
+    started = time.perf_counter()
+    with open(os.devnull, "wb") as sink:
+        for data in writer(header, counted(iter_row_chunks(stmt, session_factory=Session))):
+            size += len(data)
+            sink.write(data)
+    elapsed = time.perf_counter() - started
+    peak_mb = peak_rss_mb()
+    print(size, rows, f"{elapsed:.2f}", f"{peak_mb:.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--max-rss-mb", type=float, default=100)
+    parser.add_argument("--check", action="store_true", help="Fail when an export needs more than --max-rss-mb")
+    parser.add_argument("--export", metavar="DATABASE", help=argparse.SUPPRESS)
+    parser.add_argument("--format", default="csv", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.export:
+        export(args.export, args.format)
+        return 0
+
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "benchmark.db")
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine, tables=[DBAccountReceivable.__table__])
+        create_receivables(engine, args.rows)
+        engine.dispose()
+
+        for export_format in ("csv", "xlsx"):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--export", path, "--format", export_format],
+                check=True, capture_output=True, text=True,
+            ).stdout.split()
+            size, rows, seconds, peak_mb = int(output[0]), int(output[1]), float(output[2]), float(output[3])
+            print(f"{export_format:<5} {rows:>8} rows  {size / 1024 / 1024:8.1f} MB  {seconds:7.2f} s  "
+                  f"peak RSS {peak_mb:6.1f} MB")
+            if rows != args.rows:
+                failed = True
+                print(f"[FAIL] {export_format}: exported {rows} of {args.rows} rows")
+            elif peak_mb > args.max_rss_mb:
+                failed = True
+                print(f"[FAIL] {export_format}: peak RSS above {args.max_rss_mb} MB")
+            elif args.check:
+                print(f"[OK] {export_format}: within {args.max_rss_mb} MB")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Benchmark the bulk flat import against one-request-per-flat creation.
+
+Builds a throwaway SQLite database, then imports a wing x floor x flat matrix
+twice: once the way ``POST /sites/{id}/flats`` does it (existence query,
+insert and commit per flat) and once through ``import_flats`` (one set query
+and one executemany). A second bulk run over the same matrix measures the
+all-existing path.
+
+--check also verifies the per-site progress totals when only some sites have
+counter rows: a site whose flats were inserted without counters must still be
+reported, with the same figures as a recount.
+
+Usage:
+    python benchmark_flat_import.py [--wings 5] [--floors 50] [--flats-per-floor 20] [--check]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+import app.db.models  # noqa: F401 - register all tables
+from app.db.models.site_supervisor import Flat as DBFlat, Site as DBSite, SiteWingProgress as DBSiteWingProgress
+from app.utils.flat_import import expand_flat_matrix, import_flats
+from app.utils.site_progress import COUNTER_FIELDS, compute_wing_progress, get_site_progress_totals, sum_counters
+
+
+def create_site(db) -> DBSite:
+    site = DBSite(site_project_id=1, builder_name="Benchmark Builder", project_name="Benchmark Tower", created_by=1)
+    db.add(site)
+    db.commit()
+    return site
+
+
+def import_one_by_one(db, site_id: int, rows: list) -> int:
+    created = 0
+    for row in rows:
+        existing = db.query(DBFlat).filter(
+            DBFlat.site_id == site_id,
+            DBFlat.flat_number == row["flat_number"],
+            DBFlat.wing == row["wing"]
+        ).first()
+        if existing:
+            continue
+        db.add(DBFlat(**row, site_id=site_id, created_by=1))
+        db.commit()
+        created += 1
+    return created
+
+
+def check_site_totals(db, rows: list) -> list:
+    """One site with counter rows (bulk import) and one without (flats inserted directly)"""
+    counted = create_site(db)
+    import_flats(db, counted, rows, created_by=1)
+    uncounted = create_site(db)
+    db.execute(insert(DBFlat), [{**row, "site_id": uncounted.id, "created_by": 1} for row in rows[::2]])
+    db.commit()
+
+    reported = {row["site_id"]: row for row in get_site_progress_totals(db)}
+    failures = []
+    for site in (counted, uncounted):
+        expected = sum_counters(
+            counters for (site_id, _), counters in compute_wing_progress(db).items() if site_id == site.id
+        )
+        if site.id not in reported:
+            failures.append(f"site {site.id} missing from the progress totals")
+            continue
+        differences = [field for field in COUNTER_FIELDS if reported[site.id][field] != expected[field]]
+        if differences:
+            failures.append(f"site {site.id} totals differ from a recount: {', '.join(differences)}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wings", type=int, default=5)
+    parser.add_argument("--floors", type=int, default=50)
+    parser.add_argument("--flats-per-floor", type=int, default=20)
+    parser.add_argument("--check", action="store_true", help="Exit non-zero if the site progress totals are wrong")
+    args = parser.parse_args()
+
+    wings = [chr(ord("A") + i) for i in range(args.wings)]
+    rows = expand_flat_matrix(wings, 1, args.floors, args.flats_per_floor,
+                              door_requirements={"main_door_required": True, "bedroom_door_required": True})
+    print(f"flats={len(rows)} ({args.wings} wings x {args.floors} floors x {args.flats_per_floor})")
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'benchmark.db')}")
+        Base.metadata.create_all(bind=engine, tables=[DBSite.__table__, DBFlat.__table__, DBSiteWingProgress.__table__])
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        with Session() as db:
+            site = create_site(db)
+            start = time.perf_counter()
+            created = import_one_by_one(db, site.id, rows)
+            print(f"one by one:   {time.perf_counter() - start:8.3f} s  created={created}")
+
+        with Session() as db:
+            site = create_site(db)
+            start = time.perf_counter()
+            result = import_flats(db, site, rows, created_by=1)
+            db.commit()
+            print(f"bulk import:  {time.perf_counter() - start:8.3f} s  created={result['created']}")
+
+            start = time.perf_counter()
+            result = import_flats(db, site, rows, created_by=1)
+            db.commit()
+            print(f"bulk re-run:  {time.perf_counter() - start:8.3f} s  exists={result['exists']}")
+
+        failures = []
+        if args.check:
+            with Session() as db:
+                failures = check_site_totals(db, rows)
+        engine.dispose()
+
+    if args.check:
+        for failure in failures:
+            print(f"[FAIL] {failure}")
+        if failures:
+            sys.exit(1)
+        print("[OK] progress totals include sites with and without counter rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark the logistics load planner on synthetic dispatches and vehicles.
+
+Reports planning time, trips, placed/unplaced dispatches and average vehicle
+utilisation. The planner is pure Python, so no database is needed.
+
+Two load mixes are measured:
+- heavy (the reference workload): 40-2500 kg and 0.3-9 m3 per dispatch, so
+  large drops compete for the bigger vehicles,
+- light: 40-900 kg and 0.3-4 m3, many small drops packed several to a vehicle.
+
+Usage:
+    python benchmark_load_planner.py [--dispatches 500] [--vehicles 50] [--areas 12] [--repeat 20] [--mix heavy]
+"""
+import argparse
+import random
+import time
+
+from app.utils.load_planner import plan_loads
+
+
+# mix -> (weight range in kg, volume range in m3)
+LOAD_MIXES = {
+    "heavy": ((40, 2500), (0.3, 9.0)),
+    "light": ((40, 900), (0.3, 4.0)),
+}
+
+
+def build_loads(count: int, areas: int, mix: str = "heavy") -> list:
+    random.seed(1)
+    weight, volume = LOAD_MIXES[mix]
+    return [
+        {
+            "dispatch_id": i + 1,
+            "dispatch_number": f"DSP-{i + 1:04d}",
+            "route_area": f"PIN {411 + i % areas}xxx",
+            "weight": random.uniform(*weight),
+            "volume": random.uniform(*volume),
+        }
+        for i in range(count)
+    ]
+
+
+def build_vehicles(count: int) -> list:
+    random.seed(2)
+    return [
+        {
+            "id": v + 1,
+            "vehicle_no": f"MH12AB{v + 1:04d}",
+            "capacity_tonnes": random.choice([1.5, 3.0, 7.0, 10.0]),
+            "capacity_cubic_meters": random.choice([8.0, 16.0, 28.0, None]),
+        }
+        for v in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dispatches", type=int, default=500)
+    parser.add_argument("--vehicles", type=int, default=50)
+    parser.add_argument("--areas", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--mix", choices=sorted(LOAD_MIXES), action="append",
+                        help="Load mix (repeatable; default heavy then light)")
+    args = parser.parse_args()
+
+    vehicles = build_vehicles(args.vehicles)
+    print(f"dispatches={args.dispatches} vehicles={args.vehicles} areas={args.areas}")
+    for mix in args.mix or ["heavy", "light"]:
+        loads = build_loads(args.dispatches, args.areas, mix)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            result = plan_loads(loads, vehicles)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / args.repeat
+
+        trips = [trip.as_dict() for trip in result["trips"]]
+        placed = sum(len(trip["dispatch_ids"]) for trip in trips)
+        utilisation = [t["weight_utilization"] for t in trips if t["weight_utilization"] is not None]
+        print(f"{mix}: plan time {elapsed_ms:.2f} ms  trips: {len(trips)}  placed: {placed}"
+              f"  unplaced: {len(result['unplaced'])}", end="")
+        if utilisation:
+            print(f"  average weight utilisation: {sum(utilisation) / len(utilisation):.1%}", end="")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Query count and timing of production paper responses (app.utils.paper_responses).
+
+Builds a throwaway SQLite database with parties, measurements and Shutter
+papers (shutter items, raw material items, selected measurement items from one
+or several measurements), then builds the responses of the first 1, 10 and
+--papers papers the way the list endpoint does, and the way the detail
+endpoint does (with items and selected_items_data), counting the statements
+sent to the database.
+
+--check exits with 1 when a response needs more queries for more papers.
+
+Usage:
+    python benchmark_paper_responses.py [--papers 200] [--repeat 5]
+    python benchmark_paper_responses.py --check
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+import app.db.models  # noqa: F401 - register all tables
+from app.db.models.user import (
+    Measurement as DBMeasurement,
+    Party as DBParty,
+    ProductionPaper as DBProductionPaper,
+    ProductionShutterItem as DBProductionShutterItem,
+    RawMaterialShutterItem as DBRawMaterialShutterItem,
+)
+from app.utils.paper_responses import production_paper_responses
+
+TABLES = [DBParty, DBMeasurement, DBProductionPaper, DBProductionShutterItem, DBRawMaterialShutterItem]
+ITEMS_PER_PAPER = 12
+
+
+def create_papers(db, count: int) -> None:
+    rng = random.Random(1)
+    db.execute(insert(DBParty), [{"id": i + 1, "party_type": "Builder", "name": f"Party {i + 1}", "created_by": 1}
+                                 for i in range(max(count // 4, 1))])
+    measurements = [
+        {"id": i + 1, "measurement_type": "regular_shutter", "measurement_number": f"MS-{i + 1}", "created_by": 1,
+         "items": json.dumps([{"sr_no": str(n + 1), "width": str(rng.randrange(600, 1200)), "height": "2100", "qty": 1}
+                              for n in range(ITEMS_PER_PAPER * 2)])}
+        for i in range(max(count // 2, 1))
+    ]
+    db.execute(insert(DBMeasurement), measurements)
+    papers, shutter_items, rm_items = [], [], []
+    for i in range(count):
+        measurement_id = i % len(measurements) + 1
+        if i % 2:
+            selected = list(range(0, ITEMS_PER_PAPER * 2, 2))
+        else:
+            other = (i + 1) % len(measurements) + 1
+            selected = [{"measurement_id": mid, "item_index": n, "item_type": "shutter"}
+                        for mid in (measurement_id, other) for n in range(ITEMS_PER_PAPER // 2)]
+        papers.append({
+            "id": i + 1, "paper_number": f"S-{i + 1}", "party_id": i % max(count // 4, 1) + 1,
+            "measurement_id": measurement_id, "product_category": "Shutter", "created_by": 1,
+            "selected_measurement_items": json.dumps(selected),
+        })
+        for n in range(ITEMS_PER_PAPER):
+            shutter_items.append({"production_paper_id": i + 1, "item_no": str(n + 1), "quantity": rng.randrange(1, 4)})
+            if i % 3:
+                rm_items.append({"production_paper_id": i + 1, "sr_no": str(n + 1), "quantity": rng.randrange(1, 4)})
+    db.execute(insert(DBProductionPaper), papers)
+    db.execute(insert(DBProductionShutterItem), shutter_items)
+    db.execute(insert(DBRawMaterialShutterItem), rm_items)
+    db.commit()
+
+
+def measure(Session, engine, count: int, repeat: int, **options) -> tuple:
+    statements = []
+    listener = lambda *args: statements.append(1)  # noqa: E731
+    timings, queries = [], 0
+    for _ in range(repeat):
+        with Session() as db:
+            papers = db.execute(
+                select(DBProductionPaper).order_by(DBProductionPaper.id).limit(count)
+            ).scalars().all()
+            statements.clear()
+            event.listen(engine, "before_cursor_execute", listener)
+            start = time.perf_counter()
+            responses = production_paper_responses(db, papers, **options)
+            timings.append(time.perf_counter() - start)
+            event.remove(engine, "before_cursor_execute", listener)
+            queries = len(statements)
+            assert len(responses) == len(papers)
+    return queries, min(timings) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--papers", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="Fail when the query count grows with the papers")
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'benchmark.db')}")
+        Base.metadata.create_all(bind=engine, tables=[model.__table__ for model in TABLES])
+        Session = sessionmaker(bind=engine)
+        with Session() as db:
+            create_papers(db, args.papers)
+
+        for name, options in [("list", {}), ("detail", {"items": True, "selected_items": True})]:
+            counts = set()
+            for count in sorted({1, 10, args.papers}):
+                queries, ms = measure(Session, engine, count, args.repeat, **options)
+                counts.add(queries)
+                print(f"{name:<7} {count:>5} papers  {queries:>2} queries  {ms:8.1f} ms")
+            if len(counts) > 1:
+                failed = True
+                print(f"[FAIL] {name}: query count depends on the number of papers")
+            elif args.check:
+                print(f"[OK] {name}: {counts.pop()} queries for any number of papers")
+        engine.dispose()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
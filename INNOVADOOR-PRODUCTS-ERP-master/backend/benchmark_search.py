@@ -0,0 +1,120 @@
+"""
+Benchmark the unified search on synthetic search documents.
+
+Fills ``search_documents`` with parties, production papers, measurements,
+leads and quotations (generated names, numbers, GSTINs and sites), then times
+exact number lookups, name prefixes, multi-word queries and misspelt names,
+reporting p50 / p95 per kind. Uses a temporary SQLite database (the FTS5
+fallback) unless --database-url points at PostgreSQL; the table there is
+dropped and recreated.
+
+Usage:
+    python benchmark_search.py [--documents 1000000] [--queries 200] [--database-url postgresql://...]
+"""
+import argparse
+import os
+import random
+import statistics
+import string
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.models.search import SearchDocument as DBSearchDocument
+from app.utils.search_index import search
+
+FIRST = ["Shree", "Kumar", "Patil", "Sai", "Om", "Ganesh", "Laxmi", "Mahalaxmi", "Sunrise", "Green", "Royal",
+         "Balaji", "Siddhi", "Vinayak", "Kolte", "Pride", "Nirman", "Skyline", "Silver", "Golden"]
+SECOND = ["Constructions", "Developers", "Builders", "Realty", "Infra", "Homes", "Associates", "Enterprises",
+          "Estates", "Projects"]
+SITES = ["Meadows", "Heights", "Residency", "Park", "Towers", "Enclave", "Gardens", "Vista", "Nest", "Paradise"]
+PREFIXES = {"party": "CUST", "production_paper": "PP", "measurement": "MS", "lead": "LD", "quotation": "QT"}
+
+
+def build_documents(count: int) -> list:
+    random.seed(1)
+    documents = []
+    for i in range(count):
+        entity_type = random.choice(list(PREFIXES))
+        name = f"{random.choice(FIRST)} {random.choice(SECOND)} {random.choice(string.ascii_uppercase)}{i % 997}"
+        number = f"{PREFIXES[entity_type]}-{i + 1:07d}"
+        site = f"{random.choice(FIRST)} {random.choice(SITES)}"
+        if entity_type == "party":
+            gstin = f"27{''.join(random.choices(string.ascii_uppercase, k=5))}{random.randrange(1000, 9999)}A1Z5"
+            title, subtitle, text = name, f"{number} · {gstin}", f"{name} {number} {gstin}"
+        else:
+            title, subtitle, text = number, f"{name} · {site}", f"{number} {name} {site}"
+        documents.append({
+            "entity_type": entity_type, "entity_id": i + 1,
+            "title": title, "subtitle": subtitle, "search_text": text,
+        })
+    return documents
+
+
+def misspell(word: str) -> str:
+    position = random.randrange(1, len(word) - 1)
+    return word[:position] + word[position + 1:]
+
+
+def build_queries(documents: list, count: int) -> dict:
+    random.seed(2)
+    sample = random.sample(documents, count)
+    return {
+        "number": [document["search_text"].split()[0] if document["entity_type"] != "party"
+                   else document["subtitle"].split(" · ")[0] for document in sample],
+        "prefix": [document["search_text"].split()[0][:4] for document in sample],
+        "two words": [" ".join(document["search_text"].split()[:2]) for document in sample],
+        "misspelt": [
+            " ".join(misspell(word) if len(word) > 4 else word for word in name.split()[:2])
+            for name in (random.choice(FIRST) + " " + random.choice(SECOND) for _ in sample)
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=200, help="Queries per kind")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    url = args.database_url or f"sqlite:///{os.path.join(directory.name, 'search.db')}"
+    engine = create_engine(url)
+    table = DBSearchDocument.__table__
+    table.drop(engine, checkfirst=True)
+    table.create(engine)
+
+    documents = build_documents(args.documents)
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        for i in range(0, len(documents), 10000):
+            connection.execute(table.insert(), documents[i:i + 10000])
+        if engine.dialect.name == "postgresql":
+            connection.exec_driver_sql("ANALYZE search_documents")
+    print(f"{args.documents} documents indexed in {time.perf_counter() - started:.1f} s ({engine.dialect.name})")
+
+    queries = build_queries(documents, args.queries)
+    with Session(engine) as db:
+        for kind, values in queries.items():
+            timings, hits = [], 0
+            for q in values:
+                started = time.perf_counter()
+                results = search(db, q, limit=args.limit)
+                timings.append((time.perf_counter() - started) * 1000)
+                hits += bool(results)
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(
+                f"{kind:<10} p50 {statistics.median(timings):7.1f} ms  p95 {p95:7.1f} ms  "
+                f"with results {hits}/{len(values)}   e.g. {values[0]!r}"
+            )
+    engine.dispose()
+    directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
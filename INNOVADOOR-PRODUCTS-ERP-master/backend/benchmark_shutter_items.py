@@ -0,0 +1,156 @@
+"""
+Benchmark shutter item population and raw material mirroring for a large paper.
+
+Builds a throwaway SQLite database with one Shutter production paper that
+selects --items measurement items, then times, best of --repeat:
+
+- populating production_shutter_items one ORM object per item (add_all,
+  commit, refresh of the paper) against ``populate_shutter_items`` (one
+  executemany),
+- regenerating the raw material items by loading and copying every shutter
+  item against ``mirror_rm_shutter_items`` (one INSERT ... SELECT).
+
+Usage:
+    python benchmark_shutter_items.py [--items 2000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+import app.db.models  # noqa: F401 - register all tables
+from app.db.models.search import SearchDocument as DBSearchDocument
+from app.db.models.user import (
+    Measurement as DBMeasurement,
+    ProductionPaper as DBProductionPaper,
+    ProductionPaperMeasurementItem as DBPaperMeasurementItem,
+    ProductionShutterItem as DBProductionShutterItem,
+    RawMaterialShutterItem as DBRawMaterialShutterItem,
+)
+from app.utils.dimensions import shutter_item_areas
+from app.utils.paper_measurement_items import selected_measurement_items, sync_paper_measurement_items
+from app.utils.shutter_items import mirror_rm_shutter_items, populate_shutter_items
+
+TABLES = [DBMeasurement, DBProductionPaper, DBPaperMeasurementItem, DBProductionShutterItem,
+          DBRawMaterialShutterItem, DBSearchDocument]
+
+
+def create_paper(db, count: int) -> DBProductionPaper:
+    rng = random.Random(1)
+    items = [
+        {"width": str(rng.randrange(600, 1200)), "height": str(rng.randrange(1900, 2400)),
+         "ro_width": str(rng.randrange(650, 1250)), "ro_height": str(rng.randrange(1950, 2450)),
+         "qty": rng.randrange(1, 5)}
+        for _ in range(count)
+    ]
+    measurement = DBMeasurement(measurement_type="shutter", measurement_number="MS-BENCH", items=json.dumps(items),
+                                created_by=1)
+    db.add(measurement)
+    db.flush()
+    paper = DBProductionPaper(paper_number="S-BENCH", product_category="Shutter", measurement_id=measurement.id,
+                              thickness="32mm", selected_measurement_items=json.dumps(list(range(count))),
+                              created_by=1)
+    db.add(paper)
+    db.flush()
+    sync_paper_measurement_items(db, paper)
+    db.commit()
+    return paper
+
+
+def populate_one_by_one(db, paper: DBProductionPaper) -> int:
+    selected = selected_measurement_items(db, paper.id)
+    areas = shutter_item_areas([item for _, item in selected])
+    db.add_all([
+        DBProductionShutterItem(
+            production_paper_id=paper.id, item_no=str(position + 1),
+            ro_width=str(item.get('ro_width') or '-'), ro_height=str(item.get('ro_height') or '-'),
+            thickness=str(paper.thickness or '-'), **item_areas,
+        )
+        for (position, item), item_areas in zip(selected, areas)
+    ])
+    db.commit()
+    db.refresh(paper)
+    return len(selected)
+
+
+def mirror_one_by_one(db, paper_id: int) -> int:
+    shutter_items = db.query(DBProductionShutterItem).filter(DBProductionShutterItem.production_paper_id == paper_id).all()
+    db.query(DBRawMaterialShutterItem).filter(DBRawMaterialShutterItem.production_paper_id == paper_id).delete()
+    db.add_all([
+        DBRawMaterialShutterItem(
+            production_paper_id=item.production_paper_id, sr_no=item.item_no, ro_width=item.ro_width,
+            ro_height=item.ro_height, thickness=item.thickness, quantity=item.quantity, sq_ft=item.sq_ft,
+            sq_meter=item.sq_meter, laminate_sheets=item.laminate_sheets,
+        )
+        for item in shutter_items
+    ])
+    db.commit()
+    return len(shutter_items)
+
+
+def best_of(repeat: int, setup, run) -> tuple:
+    timings, count = [], 0
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        count = run()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'benchmark.db')}")
+        Base.metadata.create_all(bind=engine, tables=[model.__table__ for model in TABLES])
+        Session = sessionmaker(bind=engine)
+
+        with Session() as db:
+            paper = create_paper(db, args.items)
+            paper_id = paper.id
+
+            def clear_shutter_items():
+                db.execute(delete(DBProductionShutterItem))
+                db.commit()
+
+            def clear_rm_items():
+                db.execute(delete(DBRawMaterialShutterItem))
+                db.commit()
+
+            def bulk_populate():
+                count = populate_shutter_items(db, paper)
+                db.commit()
+                return count
+
+            def bulk_mirror():
+                count = mirror_rm_shutter_items(db, paper_id)
+                db.commit()
+                return count
+
+            print(f"paper with {args.items} shutter items, best of {args.repeat}")
+            for name, setup, run in [
+                ("populate, one by one", clear_shutter_items, lambda: populate_one_by_one(db, paper)),
+                ("populate, bulk", clear_shutter_items, bulk_populate),
+                ("mirror RM, one by one", clear_rm_items, lambda: mirror_one_by_one(db, paper_id)),
+                ("mirror RM, INSERT SELECT", clear_rm_items, bulk_mirror),
+            ]:
+                ms, count = best_of(args.repeat, setup, run)
+                print(f"{name:<26} {ms:8.1f} ms  rows={count}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
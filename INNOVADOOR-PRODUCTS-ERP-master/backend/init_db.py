@@ -1,8 +1,8 @@
-from app.db.database import init_db
+from app.db.migrations import upgrade_to_head
 
 def main():
-    print("Creating database tables...")
-    init_db()
+    print("Creating database tables (alembic upgrade head)...")
+    upgrade_to_head()
     print("Database tables created successfully!")
 
 if __name__ == "__main__":
@@ -0,0 +1,23 @@
+"""
+Migration script to create the bank_statements and bank_statement_lines tables
+used by bank statement import and receipt matching.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import engine
+
+def migrate():
+    """Create bank_statements and bank_statement_lines tables"""
+    try:
+        from app.db.models.accounts import BankStatement, BankStatementLine
+        BankStatement.__table__.create(bind=engine, checkfirst=True)
+        BankStatementLine.__table__.create(bind=engine, checkfirst=True)
+        print("[OK] Created bank_statements and bank_statement_lines tables")
+    except Exception as e:
+        print(f"Error creating bank statement tables: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,54 @@
+"""
+Migration script to create the party_credit_exposures table and build the
+running balances from approved invoices, payment allocations and receipts.
+
+Run with --check to compare the stored balances against a full recomputation
+without changing anything.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import SessionLocal
+from app.db.database import engine
+
+def migrate():
+    """Create party_credit_exposures table and populate running balances"""
+    db = SessionLocal()
+    try:
+        from app.db.models.accounts import PartyCreditExposure
+        from app.utils.credit_exposure import rebuild_credit_exposure
+        PartyCreditExposure.__table__.create(bind=engine, checkfirst=True)
+        print("[OK] Created party_credit_exposures table")
+
+        count = rebuild_credit_exposure(db)
+        db.commit()
+        print(f"[OK] Built credit exposure for {count} parties")
+    except Exception as e:
+        db.rollback()
+        print(f"Error creating party_credit_exposures table: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+def check():
+    """Report parties whose stored exposure differs from a full recomputation"""
+    db = SessionLocal()
+    try:
+        from app.utils.credit_exposure import check_credit_exposure
+        mismatches = check_credit_exposure(db)
+        if not mismatches:
+            print("[OK] Credit exposure is consistent")
+            return 0
+        for mismatch in mismatches:
+            for field, values in mismatch["differences"].items():
+                print(f"party {mismatch['party_id']}: {field} stored={values['stored']} expected={values['expected']}")
+        print(f"[FAIL] {len(mismatches)} parties out of sync - run without --check to rebuild")
+        return 1
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    if "--check" in sys.argv:
+        sys.exit(check())
+    migrate()
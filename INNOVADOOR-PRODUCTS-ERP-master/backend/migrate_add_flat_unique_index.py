@@ -0,0 +1,48 @@
+"""
+Migration script to add the uq_flats_site_wing_flat_number unique index on
+flats (site_id, wing, flat_number), used by the bulk flat import's
+ON CONFLICT DO NOTHING insert.
+
+Existing duplicates are listed and the index is not created until they are
+resolved.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text, inspect
+from app.db.database import engine
+
+INDEX_NAME = "uq_flats_site_wing_flat_number"
+
+def migrate():
+    """Create the unique index on flats (site_id, wing, flat_number)"""
+    inspector = inspect(engine)
+    if "flats" not in inspector.get_table_names():
+        print("ERROR: flats table does not exist. Please run init_db() first.")
+        return 1
+
+    existing = {index["name"] for index in inspector.get_indexes("flats")}
+    existing |= {constraint["name"] for constraint in inspector.get_unique_constraints("flats")}
+    if INDEX_NAME in existing:
+        print(f"[OK] '{INDEX_NAME}' already exists")
+        return 0
+
+    with engine.connect() as conn:
+        duplicates = conn.execute(text(
+            "SELECT site_id, wing, flat_number, COUNT(*) FROM flats "
+            "GROUP BY site_id, wing, flat_number HAVING COUNT(*) > 1"
+        )).all()
+        if duplicates:
+            for site_id, wing, flat_number, count in duplicates:
+                print(f"site {site_id}: wing {wing} flat {flat_number} appears {count} times")
+            print(f"[FAIL] {len(duplicates)} duplicate flats - merge or delete them and re-run")
+            return 1
+
+        conn.execute(text(f"CREATE UNIQUE INDEX {INDEX_NAME} ON flats (site_id, wing, flat_number)"))
+        conn.commit()
+    print(f"[OK] Created unique index '{INDEX_NAME}'")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(migrate())
@@ -0,0 +1,65 @@
+"""
+Migration script to create the ledger_balance_snapshots table and the
+ledger_entries lookup indexes, post ledger entries for all existing invoices,
+receipts, allocations and vendor documents, and build the month-end snapshots.
+
+Run with --check to report unbalanced documents and snapshots that differ from
+the entries without changing anything.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import SessionLocal
+from app.db.database import engine
+
+def migrate():
+    """Create ledger_balance_snapshots, post all documents and build snapshots"""
+    db = SessionLocal()
+    try:
+        from app.db.models.accounts import LedgerBalanceSnapshot, LedgerEntry
+        from app.db.models.user import User
+        from app.utils.ledger_posting import repost_all_documents, rebuild_snapshots
+        LedgerBalanceSnapshot.__table__.create(bind=engine, checkfirst=True)
+        print("[OK] Created ledger_balance_snapshots table")
+        for index in LedgerEntry.__table__.indexes:
+            index.create(bind=engine, checkfirst=True)
+        print("[OK] Created ledger_entries indexes")
+
+        admin = db.query(User).filter(User.role == "admin").order_by(User.id).first()
+        if admin is None:
+            print("No admin user found - entries need a created_by user")
+            return
+        count = repost_all_documents(db, admin.id)
+        periods = rebuild_snapshots(db)
+        db.commit()
+        print(f"[OK] Posted {count} ledger entries, closed {periods} months")
+    except Exception as e:
+        db.rollback()
+        print(f"Error migrating ledger posting: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+def check():
+    """Report unbalanced documents and mismatching month-end snapshots"""
+    db = SessionLocal()
+    try:
+        from app.utils.ledger_posting import check_ledger
+        result = check_ledger(db)
+        for row in result["unbalanced_documents"]:
+            print(f"{row['reference_type']} {row['reference_id']}: debits - credits = {row['difference']}")
+        for row in result["snapshot_mismatches"]:
+            print(f"ledger {row['ledger_id']} @ {row['period_end']}: stored={row['stored']} expected={row['expected']}")
+        if not result["unbalanced_documents"] and not result["snapshot_mismatches"]:
+            print("[OK] Ledger is balanced and snapshots are consistent")
+            return 0
+        print("[FAIL] Ledger out of sync - run without --check to repost and rebuild snapshots")
+        return 1
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    if "--check" in sys.argv:
+        sys.exit(check())
+    migrate()
@@ -0,0 +1,32 @@
+"""
+Migration script to create the material_stock table and build the initial
+balances from approved GRNs, posted purchase returns and scheduled papers
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import SessionLocal
+from app.db.database import engine
+
+def migrate():
+    """Create material_stock table and populate running balances"""
+    db = SessionLocal()
+    try:
+        from app.db.models.purchase import MaterialStock
+        from app.utils.material_stock import rebuild_material_stock
+        MaterialStock.__table__.create(bind=engine, checkfirst=True)
+        print("[OK] Created material_stock table")
+
+        count = rebuild_material_stock(db)
+        db.commit()
+        print(f"[OK] Built stock balances for {count} materials")
+    except Exception as e:
+        db.rollback()
+        print(f"Error creating material_stock table: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,54 @@
+"""
+Migration script to create the site_wing_progress table and build the
+per-wing fixing progress counters from the flats table.
+
+Run with --check to compare the stored counters against a full recount
+without changing anything.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import SessionLocal
+from app.db.database import engine
+
+def migrate():
+    """Create site_wing_progress table and populate the counters"""
+    db = SessionLocal()
+    try:
+        from app.db.models.site_supervisor import SiteWingProgress
+        from app.utils.site_progress import rebuild_site_progress
+        SiteWingProgress.__table__.create(bind=engine, checkfirst=True)
+        print("[OK] Created site_wing_progress table")
+
+        count = rebuild_site_progress(db)
+        db.commit()
+        print(f"[OK] Built progress counters for {count} wings")
+    except Exception as e:
+        db.rollback()
+        print(f"Error creating site_wing_progress table: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+def check():
+    """Report wings whose stored counters differ from a full recount"""
+    db = SessionLocal()
+    try:
+        from app.utils.site_progress import check_site_progress
+        mismatches = check_site_progress(db)
+        if not mismatches:
+            print("[OK] Site progress counters are consistent")
+            return 0
+        for mismatch in mismatches:
+            for field, values in mismatch["differences"].items():
+                print(f"site {mismatch['site_id']} wing {mismatch['wing']}: {field} stored={values['stored']} expected={values['expected']}")
+        print(f"[FAIL] {len(mismatches)} wings out of sync - run without --check to rebuild")
+        return 1
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    if "--check" in sys.argv:
+        sys.exit(check())
+    migrate()
@@ -0,0 +1,77 @@
+"""
+Profile what a worker imports at start-up (``python -X importtime``).
+
+Imports the application in a fresh interpreter and reports the total import
+time, the slowest modules by their own (self) and cumulative time, and the
+time per top-level package. With --all-routers every lazily included endpoint
+router is loaded too, which is what the worker pays by the time it has served
+every module once (and what it paid at start-up before LAZY_ROUTERS).
+
+Usage:
+    python profile_startup.py [--top 20] [--all-routers] [--module app.main] [--budget-ms 1500]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_times(module: str, all_routers: bool) -> list:
+    """[(self_us, cumulative_us, module name, depth)] in import order"""
+    code = f"import {module}"
+    if all_routers:
+        code += "; from app.main import app; from app.core.lazy_router import load_lazy_routers; load_lazy_routers(app)"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(result.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), name.strip(), depth))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--all-routers", action="store_true", help="Also load every lazily included router")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if the total import time exceeds this")
+    args = parser.parse_args()
+
+    rows = import_times(args.module, args.all_routers)
+    total_ms = sum(row[0] for row in rows) / 1000
+
+    packages = defaultdict(int)
+    for self_us, _, name, _ in rows:
+        packages[name.split(".")[0]] += self_us
+
+    print(f"Total import time: {total_ms:.0f} ms ({len(rows)} modules)")
+    print(f"\nSlowest modules (self):")
+    for self_us, cumulative_us, name, _ in sorted(rows, reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+    print(f"\nSlowest modules (cumulative, direct imports of application modules):")
+    top_level = [row for row in rows if row[2].startswith("app.") or row[3] <= 1]
+    for self_us, cumulative_us, name, _ in sorted(top_level, key=lambda row: -row[1])[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+    print(f"\nBy package (self):")
+    for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"\n[FAIL] {total_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
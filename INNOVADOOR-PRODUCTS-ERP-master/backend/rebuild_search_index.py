@@ -0,0 +1,47 @@
+"""
+Re-index parties, production papers, measurements, leads and quotations in
+search_documents (the unified /search index).
+
+Records are indexed as they are saved through the ORM; run this after bulk
+updates made with UPDATE statements or direct SQL, or to (re)build the index of
+one entity type.
+
+Usage:
+    python rebuild_search_index.py [--type party] [--type quotation]
+"""
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import SessionLocal
+
+
+def main() -> None:
+    import app.db.models  # noqa: F401 - register all mappers
+    from app.db.models.search import SEARCH_ENTITIES
+    from app.utils.search_index import rebuild_search_index
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--type", action="append", dest="types", choices=sorted(SEARCH_ENTITIES),
+                        help="Entity type to re-index (repeatable; default all)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        counts = rebuild_search_index(db, args.types)
+        db.commit()
+        elapsed = time.perf_counter() - started
+        summary = ", ".join(f"{entity_type}: {count}" for entity_type, count in counts.items())
+        print(f"[OK] Indexed {sum(counts.values())} records ({summary}) in {elapsed:.2f} s")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Recompute account receivables (paid totals, due dates, days overdue, aging
+buckets and status) for all open invoices in one batch.
+
+The API process also does this every RECEIVABLES_REFRESH_INTERVAL_MINUTES;
+set that to 0 and schedule this script (e.g. daily from cron) instead when
+running several workers.
+
+Usage:
+    python refresh_receivables.py [--as-of 2026-03-31]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import SessionLocal
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None, help="Aging date (default: today)")
+    args = parser.parse_args()
+
+    import app.db.models  # noqa: F401 - register all mappers
+    from app.utils.receivables import refresh_receivables
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        result = refresh_receivables(db, args.as_of)
+        db.commit()
+        elapsed = time.perf_counter() - started
+        print(f"[OK] Receivables as of {result['as_of']}: {result['refreshed']} refreshed, "
+              f"{result['created']} created in {elapsed:.2f} s")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Run background jobs (app.utils.jobs) outside the API processes.
+
+The API processes run JOB_WORKERS worker threads each; set JOB_WORKERS=0
+and run this instead to keep heavy jobs off the web workers. Several copies
+can run at once (on PostgreSQL they claim jobs with SKIP LOCKED).
+
+Usage:
+    python run_jobs.py [--workers 2]
+    python run_jobs.py --once      # run the jobs due now, then exit
+"""
+import argparse
+import os
+import socket
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=2, help="Worker threads")
+    parser.add_argument("--once", action="store_true", help="Run the jobs due now and exit")
+    args = parser.parse_args()
+
+    import app.db.models  # noqa: F401 - register all mappers
+    from app.core.config import settings
+    from app.db.session import SessionLocal
+    from app.utils.jobs import JobWorkerPool, requeue_stale_jobs, run_pending_jobs
+
+    with SessionLocal() as db:
+        recovered = requeue_stale_jobs(db)
+    if recovered:
+        print(f"Recovered {recovered} stale jobs")
+
+    if args.once:
+        started = time.perf_counter()
+        count = run_pending_jobs(f"{socket.gethostname()}:{os.getpid()}:once")
+        print(f"[OK] Ran {count} jobs in {time.perf_counter() - started:.2f} s")
+        return
+
+    pool = JobWorkerPool(args.workers, settings.JOB_POLL_SECONDS)
+    pool.start()
+    print(f"Running {args.workers} job workers (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("Stopping after the running jobs finish...")
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -78,13 +78,11 @@ if ($LASTEXITCODE -ne 0) {
     }
 }
 
-# Initialize database if it doesn't exist
-if (-not (Test-Path "app.db")) {
-    Write-Host "Initializing database..." -ForegroundColor Yellow
-    python init_db.py
-    if ($LASTEXITCODE -ne 0) {
-        Write-Host "WARNING: Database initialization may have failed!" -ForegroundColor Yellow
-    }
+# Create or upgrade the schema (a no-op when it is current); the server does not migrate at startup
+Write-Host "Upgrading database schema..." -ForegroundColor Yellow
+python init_db.py
+if ($LASTEXITCODE -ne 0) {
+    Write-Host "WARNING: Database upgrade may have failed!" -ForegroundColor Yellow
 }
 
 # Start the server
@@ -26,10 +26,9 @@ fi
 
 pip install -r requirements.txt
 
-if [ ! -f "app.db" ]; then
-    echo "Initializing database..."
-    python init_db.py
-fi
+# Create or upgrade the schema (a no-op when it is current); the server does not migrate at startup
+echo "Upgrading database schema..."
+python init_db.py
 
 echo "Starting server on http://localhost:8000"
 uvicorn app.main:app --reload --port 8000
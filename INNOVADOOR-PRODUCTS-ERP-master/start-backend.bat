@@ -15,10 +15,8 @@ if not exist .env (
     echo ACCESS_TOKEN_EXPIRE_MINUTES=30 >> .env
 )
 pip install -r requirements.txt
-if not exist app.db (
-    echo Initializing database...
-    python init_db.py
-)
+echo Upgrading database schema...
+python init_db.py
 echo Starting server on http://localhost:8000
 uvicorn app.main:app --reload --port 8000
 pause